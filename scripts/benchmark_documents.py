@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Benchmark fuer den Dokumentlisten-Decoder (api/documents.py).
+
+Erzeugt eine synthetische /documents-Antwort, dekodiert sie mit
+decode_documents() und misst Decodierzeit sowie Speicher (RSS-Zuwachs und
+per tracemalloc gezaehlte Bytes). Zum Vergleich werden dieselben Daten in
+eine Dataclass ohne __slots__ und ohne String-Interning geladen (Aufbau wie
+das fruehere Document.from_dict mit Keyword-Argumenten).
+
+RSS-Werte schwanken je nach Allokator (freigegebene Seiten werden nicht
+immer sofort zurueckgegeben); tracemalloc zaehlt die belegten Bytes exakt.
+
+Aufruf:
+    python scripts/benchmark_documents.py
+    python scripts/benchmark_documents.py --count 100000
+"""
+
+import argparse
+import dataclasses
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.documents import BOX_TYPES, Document, decode_documents  # noqa: E402
+
+VU_NAMES = ['Allianz', 'AXA', 'Degenia', 'VEMA', 'Gothaer', 'HDI', 'Zurich', 'Ergo']
+SOURCES = ['bipro_auto', 'manual_upload', 'scan', 'mail', 'self_created']
+
+
+def _rss_bytes() -> int:
+    """Aktueller Resident Set Size (psutil, /proc oder 0)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _make_payload(count: int) -> str:
+    rng = random.Random(42)
+    rows = []
+    for i in range(1, count + 1):
+        box = rng.choice(BOX_TYPES)
+        rows.append({
+            'id': i,
+            'filename': f'doc_{i}.pdf',
+            'original_filename': f'Dokument_{i}.pdf',
+            'mime_type': 'application/pdf',
+            'file_size': rng.randint(10_000, 5_000_000),
+            'source_type': rng.choice(SOURCES),
+            'is_gdv': 0,
+            'created_at': f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 10:00:00',
+            'uploaded_by_name': 'System',
+            'vu_name': rng.choice(VU_NAMES),
+            'shipment_id': rng.randint(1, 50_000),
+            'ai_renamed': 1,
+            'box_type': box,
+            'processing_status': 'completed',
+            'document_category': None,
+            'bipro_category': '300001000',
+            'validation_status': 'OK',
+            'content_hash': f'{i:064x}',
+            'version': 1,
+            'classification_source': 'ki_gpt4o',
+            'classification_confidence': 'high',
+            'is_archived': rng.random() < 0.7,
+            'empty_page_count': 0,
+            'total_page_count': rng.randint(1, 20),
+        })
+    return json.dumps({'success': True, 'data': {'documents': rows}})
+
+
+def _legacy_class():
+    """Document-Kopie ohne __slots__ (Vergleichsbasis)."""
+    fields = [(f.name, f.type, f) for f in dataclasses.fields(Document)]
+    return dataclasses.make_dataclass('LegacyDocument', fields)
+
+
+def _decode_legacy(rows, cls):
+    """Frueheres Document.from_dict: Keyword-Aufbau, kein Interning."""
+    result = []
+    for data in rows:
+        result.append(cls(
+            id=data['id'],
+            filename=data['filename'],
+            original_filename=data.get('original_filename', data['filename']),
+            mime_type=data.get('mime_type'),
+            file_size=data.get('file_size', 0),
+            source_type=data.get('source_type') or '',
+            is_gdv=bool(data.get('is_gdv', False)),
+            created_at=data.get('created_at', ''),
+            uploaded_by_name=data.get('uploaded_by_name'),
+            vu_name=data.get('vu_name'),
+            shipment_id=data.get('shipment_id'),
+            ai_renamed=bool(data.get('ai_renamed', False)),
+            ai_processing_error=data.get('ai_processing_error'),
+            box_type=data.get('box_type', 'sonstige'),
+            processing_status=data.get('processing_status', 'completed'),
+            document_category=data.get('document_category'),
+            bipro_category=data.get('bipro_category'),
+            validation_status=data.get('validation_status'),
+            content_hash=data.get('content_hash'),
+            version=int(data.get('version', 1) or 1),
+            previous_version_id=int(data['previous_version_id']) if data.get('previous_version_id') else None,
+            classification_source=data.get('classification_source'),
+            classification_confidence=data.get('classification_confidence'),
+            classification_reason=data.get('classification_reason'),
+            classification_timestamp=data.get('classification_timestamp'),
+            bipro_document_id=data.get('bipro_document_id'),
+            source_xml_index_id=data.get('source_xml_index_id'),
+            external_shipment_id=data.get('external_shipment_id'),
+            is_archived=bool(data.get('is_archived', False)),
+            display_color=data.get('display_color'),
+            empty_page_count=int(data['empty_page_count']) if data.get('empty_page_count') is not None else None,
+            total_page_count=int(data['total_page_count']) if data.get('total_page_count') is not None else None,
+            duplicate_of_filename=data.get('duplicate_of_filename') or None,
+            duplicate_of_box_type=data.get('duplicate_of_box_type') or None,
+            duplicate_of_created_at=data.get('duplicate_of_created_at') or None,
+            duplicate_of_is_archived=bool(data.get('duplicate_of_is_archived', False)),
+            content_duplicate_of_id=int(data['content_duplicate_of_id']) if data.get('content_duplicate_of_id') else None,
+            content_duplicate_of_filename=data.get('content_duplicate_of_filename') or None,
+            content_duplicate_of_box_type=data.get('content_duplicate_of_box_type') or None,
+            content_duplicate_of_created_at=data.get('content_duplicate_of_created_at') or None,
+            content_duplicate_of_is_archived=bool(data.get('content_duplicate_of_is_archived', False)),
+        ))
+    return result
+
+
+def _measure(label: str, payload: str, decode) -> dict:
+    # 1. Zeit (ohne tracemalloc, das die Allokationen stark verlangsamt)
+    rows = json.loads(payload)['data']['documents']
+    gc.collect()
+    started = time.perf_counter()
+    documents = decode(rows)
+    elapsed = time.perf_counter() - started
+    del documents, rows
+    gc.collect()
+
+    # 2. Speicher: nur was nach Freigabe der JSON-Zeilen bestehen bleibt
+    rss_before = _rss_bytes()
+    tracemalloc.start()
+    rows = json.loads(payload)['data']['documents']
+    documents = decode(rows)
+    del rows
+    gc.collect()
+    traced, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = _rss_bytes()
+    result = {
+        'label': label,
+        'count': len(documents),
+        'decode_s': elapsed,
+        'traced_mb': traced / 1024 / 1024,
+        'rss_delta_mb': (rss_after - rss_before) / 1024 / 1024 if rss_before else None,
+    }
+    del documents
+    gc.collect()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=100_000)
+    args = parser.parse_args()
+
+    payload = _make_payload(args.count)
+    print(f"Payload: {args.count} Dokumente, {len(payload) / 1024 / 1024:.1f} MB JSON")
+
+    legacy_cls = _legacy_class()
+    results = [
+        _measure('decode_documents (slots + intern)', payload, decode_documents),
+        _measure('bisher (from_dict, ohne slots)', payload, lambda rows: _decode_legacy(rows, legacy_cls)),
+    ]
+    for r in results:
+        rss = f"{r['rss_delta_mb']:.1f} MB" if r['rss_delta_mb'] is not None else 'n/a'
+        print(
+            f"{r['label']:<36} {r['count']:>7} Stk  "
+            f"Decode {r['decode_s'] * 1000:8.1f} ms  "
+            f"Speicher {r['traced_mb']:7.1f} MB  RSS +{rss}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark fuer den lokalen Dateinamen-Index des ATLAS Index (services/search_index.py).
+
+Baut einen FTS5-Index ueber synthetische Dateinamen auf und misst die
+Antwortzeit typischer Suchanfragen im Wortanfang- und Teilstring-Modus
+(Median und Maximum ueber mehrere Durchlaeufe).
+
+Aufruf:
+    python scripts/benchmark_search_index.py
+    python scripts/benchmark_search_index.py --count 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.documents import Document  # noqa: E402
+from services.search_index import LocalSearchIndex  # noqa: E402
+
+VOCABULARY = (
+    'Versicherungsschein Beitragsrechnung Kuendigung Schadenmeldung Haftpflicht '
+    'Hausrat Wohngebaeude Unfallversicherung Lebensversicherung Rentenversicherung '
+    'Krankenversicherung Courtageabrechnung Provision Vertragsnummer Versicherungsnehmer '
+    'Beitrag Jahresbeitrag Zahlungsweise Lastschrift Selbstbeteiligung Deckungssumme '
+    'Nachtrag Antrag Police Risiko Leistung Erstattung Mahnung Ablauf Verlaengerung'
+).split()
+VU_NAMES = ['Allianz', 'AXA', 'Degenia', 'VEMA', 'Gothaer', 'HDI', 'Zurich', 'Ergo']
+QUERIES = ['Haftpflicht', 'Kuendigung Allianz', 'Versicherungsschein 4711', 'beitrag', 'Courtage']
+
+
+def _make_documents(count: int, rng: random.Random):
+    for i in range(1, count + 1):
+        vu = rng.choice(VU_NAMES)
+        name = f"{vu}_{rng.choice(VOCABULARY)}_{rng.choice(VOCABULARY)}_{i}.pdf"
+        yield Document(id=i, filename=name, original_filename=name, mime_type='application/pdf',
+                       file_size=1, source_type='scan', is_gdv=False, created_at='',
+                       box_type='sach', content_hash=f'{i:064x}')
+
+
+def _measure(index, query: str, substring: bool, runs: int):
+    timings = []
+    hits = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        hits = len(index.search(query, substring=substring))
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings), hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = LocalSearchIndex(os.path.join(tmp, 'bench.sqlite3'))
+        started = time.perf_counter()
+        index.sync_documents(_make_documents(args.count, rng))
+        size_mb = os.path.getsize(os.path.join(tmp, 'bench.sqlite3')) / 1024 / 1024
+        print(f"Index: {args.count} Dokumente in {time.perf_counter() - started:.1f} s, {size_mb:.0f} MB")
+
+        for substring in (False, True):
+            mode = 'Teilstring' if substring else 'Wortanfang'
+            for query in QUERIES:
+                median, worst, hits = _measure(index, query, substring, args.runs)
+                print(f"{mode:<10} {query!r:<28} {hits:>4} Treffer  "
+                      f"Median {median:6.1f} ms  Max {worst:6.1f} ms")
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
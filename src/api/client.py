@@ -5,6 +5,8 @@ Zentrale Klasse für alle API-Anfragen.
 """
 
 import os
+import socket
+import weakref
 import requests
 import time
 import threading
@@ -13,6 +15,8 @@ from dataclasses import dataclass
 import logging
 
 from config.server_config import API_BASE_URL, API_VERIFY_SSL
+from api.multipart_stream import StreamingMultipartEncoder, guess_mime_type
+from api.range_download import DownloadError, RangeDownloader
 
 logger = logging.getLogger(__name__)
 
@@ -32,10 +36,78 @@ class APIConfig:
 
 class APIError(Exception):
     """Fehler bei API-Anfragen"""
-    def __init__(self, message: str, status_code: int = 0, details: Dict = None):
+    def __init__(self, message: str, status_code: int = 0, details: Dict = None,
+                 retry_after: Optional[float] = None):
         super().__init__(message)
         self.status_code = status_code
         self.details = details or {}
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Wertet einen Retry-After-Header aus (Sekunden oder HTTP-Datum).
+    
+    Returns:
+        Wartezeit in Sekunden oder None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        from datetime import datetime, timezone
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class _AbortableAdapter(requests.adapters.HTTPAdapter):
+    """
+    HTTPAdapter, der laufende Requests abbrechen kann.
+
+    Session.close() schliesst nur freie Verbindungen im Pool; eine gerade
+    genutzte Verbindung wartet weiter auf die Antwort. abort() schliesst
+    zusaetzlich die Sockets aller vom Adapter geoeffneten Verbindungen,
+    der blockierte Request endet sofort mit einem Verbindungsfehler.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._connections = weakref.WeakSet()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        connections = self._connections
+
+        def tracked(pool_cls):
+            class TrackedPool(pool_cls):
+                def _new_conn(self):
+                    conn = super()._new_conn()
+                    connections.add(conn)
+                    return conn
+            return TrackedPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: tracked(pool_cls)
+            for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def abort(self) -> None:
+        for conn in list(self._connections):
+            sock = getattr(conn, 'sock', None)
+            if sock is None:
+                continue
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.close()
 
 
 class APIClient:
@@ -52,14 +124,36 @@ class APIClient:
         self.config = config or APIConfig()
         self._token: Optional[str] = None
         self._session = requests.Session()
+        self._adapter = _AbortableAdapter()
+        self._session.mount('https://', self._adapter)
+        self._session.mount('http://', self._adapter)
+        self._closed = False
         self._auth_refresh_callback: Optional[Callable[[], bool]] = None
         self._forced_logout_callback: Optional[Callable[[str], None]] = None
         self._auth_refresh_lock = threading.Lock()
+        # Zaehler fuer ausgehende HTTP-Requests (inkl. Retries), fuer Messungen
+        self._request_count = 0
+        self._request_count_lock = threading.Lock()
         
     @property
     def base_url(self) -> str:
         return self.config.base_url.rstrip('/')
     
+    def get_request_count(self) -> int:
+        """Anzahl gesendeter HTTP-Requests seit Erstellung des Clients."""
+        return self._request_count
+    
+    def close(self) -> None:
+        """
+        Schliesst die HTTP-Session und bricht laufende Requests ab.
+
+        Fuer Clients, die nur einem Worker gehoeren (z.B. SearchWorker);
+        danach schlaegt jeder Request mit einem Netzwerkfehler fehl.
+        """
+        self._closed = True
+        self._adapter.abort()
+        self._session.close()
+
     def set_token(self, token: str) -> None:
         """Setzt den JWT-Token für authentifizierte Anfragen."""
         self._token = token
@@ -157,13 +251,15 @@ class APIClient:
     
     def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
         """Verarbeitet die API-Response."""
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
         try:
             data = response.json()
         except ValueError:
             if response.status_code >= 400:
                 raise APIError(
                     f"Server-Fehler: {response.status_code}",
-                    status_code=response.status_code
+                    status_code=response.status_code,
+                    retry_after=retry_after
                 )
             return {'raw': response.text}
         
@@ -173,12 +269,14 @@ class APIClient:
             raise APIError(
                 error_msg,
                 status_code=response.status_code,
-                details=data.get('details', {})
+                details=data.get('details', {}),
+                retry_after=retry_after
             )
         
         return data
     
-    def _request_with_retry(self, method: str, url: str, max_retries: int = None, **kwargs) -> requests.Response:
+    def _request_with_retry(self, method: str, url: str, max_retries: int = None,
+                            body_factory: Callable[[], Any] = None, **kwargs) -> requests.Response:
         """
         Fuehrt einen HTTP-Request mit Retry-Logik aus.
         
@@ -189,6 +287,9 @@ class APIClient:
             method: HTTP-Methode ('GET', 'POST', 'PUT', 'DELETE')
             url: Vollstaendige URL
             max_retries: Maximale Anzahl Versuche (None = globaler Default)
+            body_factory: Erzeugt pro Versuch einen frischen Streaming-Body
+                (z.B. StreamingMultipartEncoder); ein gelesener Stream kann
+                nicht wiederholt werden
             **kwargs: Werden an requests.Session.request() weitergegeben
             
         Returns:
@@ -201,6 +302,16 @@ class APIClient:
         last_error = None
         
         for attempt in range(retries):
+            if self._closed:
+                raise requests.ConnectionError("Client geschlossen")
+            with self._request_count_lock:
+                self._request_count += 1
+            body = None
+            if body_factory is not None:
+                body = body_factory()
+                kwargs['data'] = body
+                kwargs['headers'] = {**(kwargs.get('headers') or {}),
+                                     'Content-Type': body.content_type}
             try:
                 response = self._session.request(method, url, **kwargs)
                 
@@ -230,7 +341,7 @@ class APIClient:
                     
             except requests.ConnectionError as e:
                 last_error = e
-                if attempt < retries - 1:
+                if attempt < retries - 1 and not self._closed:
                     wait_time = RETRY_BACKOFF_FACTOR * (2 ** attempt)
                     logger.warning(
                         f"{method} {url} Verbindungsfehler, "
@@ -239,6 +350,9 @@ class APIClient:
                     time.sleep(wait_time)
                 else:
                     raise
+            finally:
+                if body is not None:
+                    body.close()
         
         # Sollte nicht erreicht werden, aber Sicherheit
         raise requests.RequestException(f"Request fehlgeschlagen nach {retries} Versuchen: {last_error}")
@@ -422,7 +536,8 @@ class APIClient:
 
     def upload_multipart(self, endpoint: str, fields: Dict[str, str],
                          files: Dict[str, str],
-                         timeout: int = None) -> Dict[str, Any]:
+                         timeout: int = None,
+                         progress_callback: Callable[[int, int], None] = None) -> Dict[str, Any]:
         """
         Multipart-Upload mit mehreren Dateien und Formularfeldern.
 
@@ -431,69 +546,73 @@ class APIClient:
             fields: Dict von Formularfeldern {name: value}
             files: Dict von Dateien {field_name: file_path}
             timeout: Timeout in Sekunden (None = 2x default)
+            progress_callback: (gesendete Bytes, Gesamt-Bytes)
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        logger.debug(f"MULTIPART {url} ({len(files)} files)")
-
-        headers = {}
-        if self._token:
-            headers['Authorization'] = f'Bearer {self._token}'
-
-        file_tuples = {}
+        file_specs = {}
         for field_name, file_path in files.items():
             if file_path and os.path.isfile(file_path):
                 filename = os.path.basename(file_path)
-                ext = os.path.splitext(filename)[1].lower()
-                mime_map = {
-                    '.png': 'image/png',
-                    '.jpg': 'image/jpeg',
-                    '.jpeg': 'image/jpeg',
-                    '.gif': 'image/gif',
-                    '.webp': 'image/webp',
-                    '.log': 'text/plain',
-                    '.txt': 'text/plain',
-                    '.zip': 'application/zip',
-                }
-                mime_type = mime_map.get(ext, 'application/octet-stream')
-                with open(file_path, 'rb') as f:
-                    content = f.read()
-                file_tuples[field_name] = (filename, content, mime_type)
+                mime_type = guess_mime_type(filename)
+                file_specs[field_name] = (filename, file_path, mime_type)
                 logger.debug(
                     "Upload-Datei: field=%s, name=%s, size=%d, mime=%s",
-                    field_name, filename, len(content), mime_type,
+                    field_name, filename, os.path.getsize(file_path), mime_type,
                 )
+        return self.upload_stream(endpoint, fields, file_specs, timeout=timeout,
+                                  progress_callback=progress_callback)
+
+    def upload_stream(self, endpoint: str, fields: Optional[Dict[str, Any]],
+                      files: Dict[str, tuple],
+                      timeout: int = None,
+                      progress_callback: Callable[[int, int], None] = None) -> Dict[str, Any]:
+        """
+        Streaming-Multipart-Upload (Dateien werden blockweise von Platte gelesen).
 
+        Jeder Versuch (Retry, 401-Refresh) oeffnet die Dateien neu, es wird
+        kein Puffer mit dem Dateiinhalt gehalten.
+
+        Args:
+            endpoint: API-Endpunkt
+            fields: Formularfelder {name: value}
+            files: {field_name: (filename, file_path, mime_type)}
+            timeout: Timeout in Sekunden (None = 2x default)
+            progress_callback: (gesendete Bytes, Gesamt-Bytes), beginnt bei
+                einem Retry wieder bei 0
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        logger.debug(f"UPLOAD {url} ({len(files)} Datei(en), streaming)")
         req_timeout = timeout or self.config.timeout * 2
 
-        try:
+        for _, file_path, _ in files.values():
+            if not os.path.isfile(file_path):
+                raise APIError(f"Datei nicht gefunden: {file_path}")
+
+        def body_factory():
+            return StreamingMultipartEncoder(fields, files, progress_callback=progress_callback)
+
+        def send() -> Dict[str, Any]:
+            headers = {}
+            if self._token:
+                headers['Authorization'] = f'Bearer {self._token}'
             response = self._request_with_retry(
                 'POST', url,
+                body_factory=body_factory,
                 headers=headers,
-                data=fields,
-                files=file_tuples,
                 timeout=req_timeout,
                 verify=self.config.verify_ssl
             )
             return self._handle_response(response)
-        except APIError as e:
-            if e.status_code == 401 and self._try_auth_refresh(str(e)):
-                logger.info(f"Token erneuert, wiederhole MULTIPART {endpoint}")
-                headers = {}
-                if self._token:
-                    headers['Authorization'] = f'Bearer {self._token}'
-                try:
-                    response = self._request_with_retry(
-                        'POST', url,
-                        headers=headers,
-                        data=fields,
-                        files=file_tuples,
-                        timeout=req_timeout,
-                        verify=self.config.verify_ssl
-                    )
-                    return self._handle_response(response)
-                except APIError:
-                    raise
-            raise
+
+        try:
+            try:
+                return send()
+            except APIError as e:
+                if e.status_code == 401 and self._try_auth_refresh(str(e)):
+                    logger.info(f"Token erneuert, wiederhole UPLOAD {endpoint}")
+                    return send()
+                raise
+        except FileNotFoundError as e:
+            raise APIError(f"Datei nicht gefunden: {e.filename}")
         except requests.RequestException as e:
             logger.error(f"Upload-Fehler: {e}")
             raise APIError(f"Upload-Fehler: {e}")
@@ -558,65 +677,35 @@ class APIClient:
             raise APIError(f"Netzwerkfehler: {e}")
 
     def upload_file(self, endpoint: str, file_path: str, 
-                    additional_data: Dict = None) -> Dict[str, Any]:
-        """Datei an die API hochladen."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        logger.debug(f"UPLOAD {url} <- {file_path}")
-        
-        headers = {}
-        if self._token:
-            headers['Authorization'] = f'Bearer {self._token}'
-        
-        try:
-            # Datei einmal in Speicher lesen, damit Retries funktionieren
-            filename = os.path.basename(file_path)
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
-            
-            response = self._request_with_retry(
-                'POST', url,
-                headers=headers,
-                files={'file': (filename, file_content)},
-                data=additional_data or {},
-                timeout=self.config.timeout * 2,  # Laengerer Timeout fuer Uploads
-                verify=self.config.verify_ssl
-            )
-            return self._handle_response(response)
-        except APIError as e:
-            # Bei 401: Token-Refresh versuchen und Retry
-            if e.status_code == 401 and self._try_auth_refresh(str(e)):
-                logger.info(f"Token erneuert, wiederhole UPLOAD {endpoint}")
-                headers = {}
-                if self._token:
-                    headers['Authorization'] = f'Bearer {self._token}'
-                try:
-                    response = self._request_with_retry(
-                        'POST', url,
-                        headers=headers,
-                        files={'file': (filename, file_content)},
-                        data=additional_data or {},
-                        timeout=self.config.timeout * 2,
-                        verify=self.config.verify_ssl
-                    )
-                    return self._handle_response(response)
-                except APIError:
-                    raise  # Retry auch fehlgeschlagen
-            raise  # Kein Refresh moeglich oder kein 401
-        except FileNotFoundError:
-            raise APIError(f"Datei nicht gefunden: {file_path}")
-        except requests.RequestException as e:
-            logger.error(f"Upload-Fehler: {e}")
-            raise APIError(f"Upload-Fehler: {e}")
+                    additional_data: Dict = None,
+                    progress_callback: Callable[[int, int], None] = None) -> Dict[str, Any]:
+        """Datei an die API hochladen (streaming, siehe upload_stream)."""
+        filename = os.path.basename(file_path)
+        return self.upload_stream(
+            endpoint, additional_data or {},
+            {'file': (filename, file_path, None)},
+            progress_callback=progress_callback,
+        )
     
     def download_file(self, endpoint: str, target_path: str, 
-                       max_retries: int = MAX_RETRIES) -> str:
+                       max_retries: int = MAX_RETRIES,
+                       expected_size: Optional[int] = None,
+                       expected_sha256: Optional[str] = None,
+                       progress_callback: Callable[[int, int], None] = None) -> str:
         """
-        Datei von der API herunterladen mit Retry-Logik.
+        Datei von der API herunterladen (fortsetzbar, siehe api/range_download.py).
+        
+        Abgebrochene Downloads werden per HTTP-Range fortgesetzt, auch beim
+        naechsten Aufruf mit demselben Zielpfad (Teildatei im lokalen
+        Download-Verzeichnis, nicht im Zielordner).
         
         Args:
             endpoint: API-Endpunkt
             target_path: Zielpfad fuer die Datei
             max_retries: Maximale Anzahl Versuche (veraltet, zentral konfiguriert)
+            expected_size: Erwartete Dateigroesse in Bytes (optional, wird geprueft)
+            expected_sha256: Erwarteter SHA256 der Datei (optional, wird geprueft)
+            progress_callback: (geladene Bytes, Gesamt-Bytes oder 0)
             
         Returns:
             Pfad zur heruntergeladenen Datei
@@ -625,66 +714,125 @@ class APIClient:
             APIError: Nach allen fehlgeschlagenen Versuchen
         """
         try:
-            return self._download_file_inner(endpoint, target_path)
+            return self._download_file_inner(endpoint, target_path, expected_size,
+                                             expected_sha256, progress_callback)
         except APIError as e:
             # Bei 401: Token-Refresh versuchen und Retry
             if e.status_code == 401 and self._try_auth_refresh(str(e)):
                 logger.info(f"Token erneuert, wiederhole DOWNLOAD {endpoint}")
                 try:
-                    return self._download_file_inner(endpoint, target_path)
+                    return self._download_file_inner(endpoint, target_path, expected_size,
+                                                     expected_sha256, progress_callback)
                 except APIError:
                     raise  # Retry auch fehlgeschlagen
             raise  # Kein Refresh moeglich oder kein 401
     
-    def _download_file_inner(self, endpoint: str, target_path: str) -> str:
+    def _download_file_inner(self, endpoint: str, target_path: str,
+                             expected_size: Optional[int] = None,
+                             expected_sha256: Optional[str] = None,
+                             progress_callback: Callable[[int, int], None] = None) -> str:
         """Innere Download-Logik (ohne 401-Retry)."""
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         logger.debug(f"DOWNLOAD {url} -> {target_path}")
         
-        headers = {}
+        headers = {
+            # Keine Transport-Kompression: Groessen und Ranges beziehen sich auf die Datei
+            'Accept-Encoding': 'identity',
+        }
         if self._token:
             headers['Authorization'] = f'Bearer {self._token}'
         
-        try:
-            response = self._request_with_retry(
-                'GET', url,
-                headers=headers,
+        def request(method: str, request_url: str, request_headers: Dict[str, str]):
+            return self._request_with_retry(
+                method, request_url,
+                headers=request_headers,
                 timeout=self.config.timeout * 3,  # Laengerer Timeout fuer Downloads
                 verify=self.config.verify_ssl,
                 stream=True
             )
-            
-            # 401 sofort als APIError werfen (wird von download_file behandelt)
-            if response.status_code == 401:
-                raise APIError(
-                    f"Download fehlgeschlagen: {response.status_code}",
-                    status_code=response.status_code
-                )
-            
-            # Nicht-retryable Fehler (alles was _request_with_retry nicht retried hat)
-            if response.status_code >= 400:
-                raise APIError(
-                    f"Download fehlgeschlagen: {response.status_code}",
-                    status_code=response.status_code
-                )
-            
-            # Erfolg - Datei schreiben
-            bytes_written = 0
-            with open(target_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        bytes_written += len(chunk)
-            
+        
+        try:
+            downloader = RangeDownloader(request, progress_callback=progress_callback)
+            bytes_written = downloader.download(
+                url, target_path, headers,
+                expected_size=expected_size, expected_sha256=expected_sha256,
+            )
             logger.debug(f"Download erfolgreich: {bytes_written} bytes -> {target_path}")
             return target_path
             
+        except DownloadError as e:
+            # 401 wird von download_file behandelt (Token-Refresh)
+            raise APIError(str(e), status_code=e.status_code)
         except requests.RequestException as e:
             # Timeout/ConnectionError kommen hier an wenn alle Retries in
             # _request_with_retry erschoepft sind
             logger.error(f"Download-Fehler: {e}")
             raise APIError(f"Download-Fehler: {e}")
-    
+
+    def download_to_fileobj(self, endpoint: str, fileobj,
+                            expected_size: Optional[int] = None,
+                            expected_sha256: Optional[str] = None,
+                            progress_callback: Callable[[int, int], None] = None) -> int:
+        """
+        Datei von der API direkt in ein Dateiobjekt laden (ohne Zieldatei).
+
+        Args:
+            endpoint: API-Endpunkt
+            fileobj: Beschreibbares, seekbares Dateiobjekt (wird vorher geleert)
+            expected_size: Erwartete Dateigroesse in Bytes (optional, wird geprueft)
+            expected_sha256: Erwarteter SHA256 der Datei (optional, wird geprueft)
+            progress_callback: (geladene Bytes, Gesamt-Bytes oder 0)
+
+        Returns:
+            Anzahl geschriebener Bytes
+
+        Raises:
+            APIError: Nach allen fehlgeschlagenen Versuchen
+        """
+        try:
+            return self._download_to_fileobj_inner(endpoint, fileobj, expected_size,
+                                                   expected_sha256, progress_callback)
+        except APIError as e:
+            # Bei 401: Token-Refresh versuchen und Retry
+            if e.status_code == 401 and self._try_auth_refresh(str(e)):
+                logger.info(f"Token erneuert, wiederhole DOWNLOAD {endpoint}")
+                return self._download_to_fileobj_inner(endpoint, fileobj, expected_size,
+                                                       expected_sha256, progress_callback)
+            raise
+
+    def _download_to_fileobj_inner(self, endpoint: str, fileobj,
+                                   expected_size: Optional[int] = None,
+                                   expected_sha256: Optional[str] = None,
+                                   progress_callback: Callable[[int, int], None] = None) -> int:
+        """Innere Download-Logik fuer Dateiobjekte (ohne 401-Retry)."""
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        logger.debug(f"DOWNLOAD {url} -> Stream")
+
+        headers = {'Accept-Encoding': 'identity'}
+        if self._token:
+            headers['Authorization'] = f'Bearer {self._token}'
+
+        def request(method: str, request_url: str, request_headers: Dict[str, str]):
+            return self._request_with_retry(
+                method, request_url,
+                headers=request_headers,
+                timeout=self.config.timeout * 3,
+                verify=self.config.verify_ssl,
+                stream=True
+            )
+
+        try:
+            downloader = RangeDownloader(request, progress_callback=progress_callback)
+            return downloader.download_to_fileobj(
+                url, fileobj, headers,
+                expected_size=expected_size, expected_sha256=expected_sha256,
+            )
+        except DownloadError as e:
+            raise APIError(str(e), status_code=e.status_code)
+        except requests.RequestException as e:
+            logger.error(f"Download-Fehler: {e}")
+            raise APIError(f"Download-Fehler: {e}")
+
     def check_connection(self) -> bool:
         """Prüft ob die API erreichbar ist."""
         try:
@@ -4,12 +4,13 @@ BiPro API - Dokumente
 Upload, Download, Verwaltung von Dokumenten mit Box-System.
 """
 
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 import re
 from pathlib import Path
+from sys import intern as _intern
 
 from .client import APIClient, APIError
 
@@ -35,6 +36,9 @@ def safe_cache_filename(doc_id: int, original_filename: str) -> str:
 
 
 # Box-Typen und ihre Anzeige-Reihenfolge
+# Obergrenze fuer Folgeseiten einer vollstaendigen Synchronisation
+FULL_SYNC_MAX_PAGES = 500
+
 BOX_TYPES = ['eingang', 'verarbeitung', 'gdv', 'courtage', 'sach', 'leben', 'kranken', 'sonstige', 'roh']
 
 # Admin-only Boxen (nur fuer Admins sichtbar)
@@ -69,9 +73,13 @@ BOX_COLORS = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Document:
-    """Dokument aus dem Archiv"""
+    """Dokument aus dem Archiv
+    
+    slots=True: Das komplette Archiv liegt im DataCacheService im Speicher;
+    ohne __dict__ pro Instanz sinkt der Speicherbedarf deutlich.
+    """
     id: int
     filename: str
     original_filename: str
@@ -128,49 +136,7 @@ class Document:
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Document':
-        return cls(
-            id=data['id'],
-            filename=data['filename'],
-            original_filename=data.get('original_filename', data['filename']),
-            mime_type=data.get('mime_type'),
-            file_size=data.get('file_size', 0),
-            source_type=data.get('source_type') or '',
-            is_gdv=bool(data.get('is_gdv', False)),
-            created_at=data.get('created_at', ''),
-            uploaded_by_name=data.get('uploaded_by_name'),
-            vu_name=data.get('vu_name'),
-            shipment_id=data.get('shipment_id'),
-            ai_renamed=bool(data.get('ai_renamed', False)),
-            ai_processing_error=data.get('ai_processing_error'),
-            box_type=data.get('box_type', 'sonstige'),
-            processing_status=data.get('processing_status', 'completed'),
-            document_category=data.get('document_category'),
-            bipro_category=data.get('bipro_category'),
-            validation_status=data.get('validation_status'),
-            content_hash=data.get('content_hash'),
-            version=int(data.get('version', 1) or 1),
-            previous_version_id=int(data['previous_version_id']) if data.get('previous_version_id') else None,
-            classification_source=data.get('classification_source'),
-            classification_confidence=data.get('classification_confidence'),
-            classification_reason=data.get('classification_reason'),
-            classification_timestamp=data.get('classification_timestamp'),
-            bipro_document_id=data.get('bipro_document_id'),
-            source_xml_index_id=data.get('source_xml_index_id'),
-            external_shipment_id=data.get('external_shipment_id'),
-            is_archived=bool(data.get('is_archived', False)),
-            display_color=data.get('display_color'),
-            empty_page_count=int(data['empty_page_count']) if data.get('empty_page_count') is not None else None,
-            total_page_count=int(data['total_page_count']) if data.get('total_page_count') is not None else None,
-            duplicate_of_filename=data.get('duplicate_of_filename') or None,
-            duplicate_of_box_type=data.get('duplicate_of_box_type') or None,
-            duplicate_of_created_at=data.get('duplicate_of_created_at') or None,
-            duplicate_of_is_archived=bool(data.get('duplicate_of_is_archived', False)),
-            content_duplicate_of_id=int(data['content_duplicate_of_id']) if data.get('content_duplicate_of_id') else None,
-            content_duplicate_of_filename=data.get('content_duplicate_of_filename') or None,
-            content_duplicate_of_box_type=data.get('content_duplicate_of_box_type') or None,
-            content_duplicate_of_created_at=data.get('content_duplicate_of_created_at') or None,
-            content_duplicate_of_is_archived=bool(data.get('content_duplicate_of_is_archived', False)),
-        )
+        return _decode_document(data)
     
     @property
     def is_duplicate(self) -> bool:
@@ -270,6 +236,76 @@ class Document:
         return ''
 
 
+def _interned(value):
+    """Wiederkehrende Strings (box_type, vu_name, ...) nur einmal im Speicher halten."""
+    return _intern(value) if value.__class__ is str else value
+
+
+def _decode_document(data: Dict) -> Document:
+    """
+    Dekodiert eine Dokument-Zeile der API (Semantik wie bisher from_dict).
+    
+    Positionsargumente in Feld-Reihenfolge und lokal gebundenes data.get
+    sparen bei zehntausenden Zeilen spuerbar Zeit; Kategorie-Felder
+    werden interniert.
+    """
+    get = data.get
+    filename = data['filename']
+    empty_page_count = get('empty_page_count')
+    total_page_count = get('total_page_count')
+    previous_version_id = get('previous_version_id')
+    content_duplicate_of_id = get('content_duplicate_of_id')
+    return Document(
+        data['id'],
+        filename,
+        get('original_filename', filename),
+        _interned(get('mime_type')),
+        get('file_size', 0),
+        _interned(get('source_type') or ''),
+        bool(get('is_gdv', False)),
+        get('created_at', ''),
+        _interned(get('uploaded_by_name')),
+        _interned(get('vu_name')),
+        get('shipment_id'),
+        bool(get('ai_renamed', False)),
+        get('ai_processing_error'),
+        _interned(get('box_type', 'sonstige')),
+        _interned(get('processing_status', 'completed')),
+        _interned(get('document_category')),
+        _interned(get('bipro_category')),
+        _interned(get('validation_status')),
+        get('content_hash'),
+        int(get('version', 1) or 1),
+        int(previous_version_id) if previous_version_id else None,
+        _interned(get('classification_source')),
+        _interned(get('classification_confidence')),
+        get('classification_reason'),
+        get('classification_timestamp'),
+        get('bipro_document_id'),
+        get('source_xml_index_id'),
+        get('external_shipment_id'),
+        bool(get('is_archived', False)),
+        _interned(get('display_color')),
+        int(empty_page_count) if empty_page_count is not None else None,
+        int(total_page_count) if total_page_count is not None else None,
+        get('duplicate_of_filename') or None,
+        _interned(get('duplicate_of_box_type') or None),
+        get('duplicate_of_created_at') or None,
+        bool(get('duplicate_of_is_archived', False)),
+        int(content_duplicate_of_id) if content_duplicate_of_id else None,
+        get('content_duplicate_of_filename') or None,
+        _interned(get('content_duplicate_of_box_type') or None),
+        get('content_duplicate_of_created_at') or None,
+        bool(get('content_duplicate_of_is_archived', False)),
+    )
+
+
+def decode_documents(rows: List[Dict]) -> List[Document]:
+    """Bulk-Decoder fuer die Dokumentliste (list_documents, sync_documents)."""
+    decode = _decode_document
+    return [decode(row) for row in rows]
+
+
 @dataclass
 class BoxStats:
     """Statistiken fuer alle Boxen."""
@@ -329,10 +365,13 @@ class SearchResult:
     Enthaelt ein Document-Objekt plus Such-spezifische Felder:
     - text_preview: Erste 2000 Zeichen des extrahierten Texts (fuer Snippet-Aufbereitung)
     - relevance_score: Relevanz-Ranking (Dateiname=10, Volltext=20, beides=30)
+    - offline: Treffer der lokalen Dateinamen-Suche (Server nicht erreichbar,
+      Dokumenttext nicht durchsucht)
     """
     document: Document
     text_preview: Optional[str] = None
     relevance_score: int = 0
+    offline: bool = False
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'SearchResult':
@@ -348,6 +387,27 @@ class SearchResult:
         )
 
 
+@dataclass
+class DocumentSyncResult:
+    """Ergebnis von DocumentsAPI.sync_documents().
+    
+    - is_delta=False: documents ist die komplette Liste (Server ohne
+      Delta-Unterstuetzung oder Erst-Synchronisation)
+    - is_delta=True: nur seit dem Cursor geaenderte/neue Dokumente plus
+      Tombstones (deleted_ids)
+    - cursor: Fuer den naechsten Aufruf (None = Server unterstuetzt keine Deltas)
+    - truncated: Vollstaendige Liste nach FULL_SYNC_MAX_PAGES Seiten abgebrochen
+      (documents ist unvollstaendig und darf den Cache nicht ersetzen)
+    - pages: Anzahl geladener Seiten (> 1 = Server paginiert per has_more)
+    """
+    documents: List[Document] = field(default_factory=list)
+    deleted_ids: List[int] = field(default_factory=list)
+    cursor: Optional[str] = None
+    is_delta: bool = False
+    truncated: bool = False
+    pages: int = 1
+
+
 class DocumentsAPI:
     """
     Dokumenten-API mit Box-System.
@@ -414,12 +474,68 @@ class DocumentsAPI:
         try:
             response = self.client.get('/documents', params=params)
             if response.get('success'):
-                return [Document.from_dict(d) for d in response['data']['documents']]
+                return decode_documents(response['data']['documents'])
             return []
         except APIError as e:
             logger.error(f"Dokumente laden fehlgeschlagen: {e}")
             return []
     
+    def sync_documents(self, cursor: Optional[str] = None,
+                       max_pages: int = 20) -> Optional[DocumentSyncResult]:
+        """
+        Delta-Synchronisation der Dokumentliste.
+        
+        Ohne cursor wird die komplette Liste geladen (und ein Cursor
+        angefordert); mit cursor liefert der Server nur Dokumente, die sich
+        seitdem geaendert haben, plus die IDs geloeschter Dokumente.
+        
+        Server ohne Delta-Unterstuetzung ignorieren die Parameter und liefern
+        die komplette Liste ohne 'sync_cursor' -> is_delta=False.
+        
+        Args:
+            cursor: Cursor aus dem letzten Ergebnis (None = vollstaendig)
+            max_pages: Max. Folgeseiten bei has_more fuer Deltas; ein
+                groesseres Delta wird durch eine vollstaendige Liste ersetzt.
+                Vollstaendige Listen werden bis has_more=False geladen
+                (Obergrenze FULL_SYNC_MAX_PAGES, danach truncated=True).
+            
+        Returns:
+            DocumentSyncResult oder None bei Fehler
+        """
+        result = DocumentSyncResult()
+        params = {'sync': '1'}
+        if cursor:
+            params['changed_since'] = cursor
+        page_limit = max(1, max_pages) if cursor else FULL_SYNC_MAX_PAGES
+        
+        try:
+            for page in range(1, page_limit + 1):
+                response = self.client.get('/documents', params=params)
+                if not response.get('success'):
+                    return None
+                data = response.get('data') or {}
+                result.pages = page
+                result.documents.extend(decode_documents(data.get('documents', [])))
+                result.deleted_ids.extend(int(i) for i in data.get('deleted_ids') or [])
+                result.cursor = data.get('sync_cursor')
+                result.is_delta = bool(cursor and result.cursor and data.get('is_delta', True))
+                if not (result.cursor and data.get('has_more')):
+                    return result
+                params['changed_since'] = result.cursor
+            if cursor:
+                # Zu viele Aenderungen: lieber komplett neu laden
+                logger.info("Dokument-Delta zu gross, vollstaendige Synchronisation noetig")
+                return self.sync_documents(None)
+            logger.warning(
+                f"Dokumentliste nach {page_limit} Seiten abgebrochen "
+                f"({len(result.documents)} Stk), Ergebnis unvollstaendig"
+            )
+            result.truncated = True
+            return result
+        except APIError as e:
+            logger.error(f"Dokument-Synchronisation fehlgeschlagen: {e}")
+            return None
+    
     def search_documents(self, query: str, limit: int = 200,
                          include_raw: bool = False, substring: bool = False) -> List[SearchResult]:
         """
@@ -436,6 +552,9 @@ class DocumentsAPI:
             
         Returns:
             Liste von SearchResult-Objekten (Document + text_preview + relevance_score)
+            
+        Raises:
+            APIError: Request fehlgeschlagen (status_code 0 = keine Verbindung)
         """
         if len(query) < 3:
             return []
@@ -446,14 +565,12 @@ class DocumentsAPI:
         if substring:
             params['substring'] = '1'
         
-        try:
-            response = self.client.get('/documents/search', params=params)
-            if response.get('success'):
-                return [SearchResult.from_dict(d) for d in response['data']['documents']]
-            return []
-        except APIError as e:
-            logger.error(f"ATLAS Index Suche fehlgeschlagen: {e}")
-            return []
+        # Fehler weiterreichen: leere Treffer und Fehler muessen unterscheidbar
+        # sein (Offline-Suche in DocumentRepository)
+        response = self.client.get('/documents/search', params=params)
+        if response.get('success'):
+            return [SearchResult.from_dict(d) for d in response['data']['documents']]
+        return []
     
     def list_by_box(self, box_type: str) -> List[Document]:
         """
@@ -512,6 +629,8 @@ class DocumentsAPI:
             if response.get('success'):
                 moved = response['data'].get('moved_count', 0)
                 logger.info(f"{moved} Dokument(e) nach '{target_box}' verschoben")
+                if moved:
+                    self._forget_near_duplicates(doc_ids)
                 return moved
             return 0
         except APIError as e:
@@ -539,7 +658,8 @@ class DocumentsAPI:
                vu_name: Optional[str] = None,
                box_type: str = 'eingang',
                bipro_category: Optional[str] = None,
-               validation_status: Optional[str] = None) -> Optional[Document]:
+               validation_status: Optional[str] = None,
+               progress_callback: Optional[Callable[[int, int], None]] = None) -> Optional[Document]:
         """
         Dokument hochladen.
         
@@ -551,6 +671,8 @@ class DocumentsAPI:
             box_type: Ziel-Box (Standard: 'eingang')
             bipro_category: BiPRO-Kategorie-Code (z.B. '300001000' fuer Provision)
             validation_status: PDF-Validierungsstatus (OK, PDF_ENCRYPTED, PDF_CORRUPT, etc.)
+            progress_callback: (gesendete Bytes, Gesamt-Bytes) waehrend des
+                Streaming-Uploads
             
         Returns:
             Erstelltes Document oder None bei Fehler
@@ -572,7 +694,8 @@ class DocumentsAPI:
             response = self.client.upload_file(
                 '/documents',
                 file_path,
-                additional_data
+                additional_data,
+                progress_callback=progress_callback
             )
             
             if response.get('success'):
@@ -604,14 +727,24 @@ class DocumentsAPI:
             return None
     
     def download(self, doc_id: int, target_dir: str, 
-                  filename_override: Optional[str] = None) -> Optional[str]:
+                  filename_override: Optional[str] = None,
+                  expected_size: Optional[int] = None,
+                  expected_sha256: Optional[str] = None,
+                  progress_callback: Optional[Callable[[int, int], None]] = None) -> Optional[str]:
         """
         Dokument herunterladen mit robuster Fehlerbehandlung.
         
+        Abgebrochene Downloads werden beim naechsten Aufruf per HTTP-Range
+        fortgesetzt (.part-Datei neben dem Ziel).
+        
         Args:
             doc_id: Dokument-ID
             target_dir: Zielverzeichnis
             filename_override: Optionaler Dateiname (sonst original_filename aus API)
+            expected_size: Erwartete Dateigroesse (sonst aus Dokument-Info, falls geladen)
+            expected_sha256: Erwarteter SHA256 (sonst content_hash aus Dokument-Info);
+                mit Hash wird der lokale Blob-Cache genutzt
+            progress_callback: Optional (geladene Bytes, Gesamt-Bytes oder 0)
             
         Returns:
             Pfad zur heruntergeladenen Datei oder None
@@ -625,6 +758,8 @@ class DocumentsAPI:
                 logger.error(f"Dokument {doc_id} nicht gefunden")
                 return None
             filename = doc.original_filename
+            expected_size = expected_size or doc.file_size or None
+            expected_sha256 = expected_sha256 or doc.content_hash
         
         # Sicherstellen, dass Zielverzeichnis existiert
         target_dir_path = Path(target_dir)
@@ -647,12 +782,26 @@ class DocumentsAPI:
                 counter += 1
             logger.info(f"Datei existiert, verwende: {target_path.name}")
         
+        # Lokaler Blob-Cache (Vorschau, Verarbeitung, Downloads teilen sich eine Kopie)
+        blob_cache = self._get_blob_cache() if expected_sha256 else None
+        if blob_cache is not None and blob_cache.copy_to(doc_id, expected_sha256, str(target_path)):
+            logger.info(f"Dokument {doc_id} aus lokalem Cache: {target_path}")
+            if progress_callback:
+                size = target_path.stat().st_size
+                progress_callback(size, size)
+            return str(target_path)
+        
         try:
             result = self.client.download_file(
                 f'/documents/{doc_id}',
-                str(target_path)
+                str(target_path),
+                expected_size=expected_size,
+                expected_sha256=expected_sha256,
+                progress_callback=progress_callback
             )
             logger.info(f"Dokument heruntergeladen: {result}")
+            if blob_cache is not None and result:
+                blob_cache.put(doc_id, expected_sha256, result)
             return result
         except APIError as e:
             logger.error(f"Download fehlgeschlagen fuer Dokument {doc_id}: {e}")
@@ -664,6 +813,64 @@ class DocumentsAPI:
                     pass
             return None
     
+    def download_to_stream(self, doc_id: int, fileobj,
+                           expected_size: Optional[int] = None,
+                           expected_sha256: Optional[str] = None) -> bool:
+        """
+        Dokument direkt in ein Dateiobjekt laden (z.B. Puffer fuer ZIP-Eintraege).
+
+        Treffer im lokalen Blob-Cache werden von dort gelesen. Heruntergeladene
+        Dateien werden bewusst nicht im Blob-Cache abgelegt: ein Box-Export
+        wuerde sonst die zuletzt genutzten Dokumente verdraengen.
+
+        Args:
+            doc_id: Dokument-ID
+            fileobj: Beschreibbares, seekbares Dateiobjekt
+            expected_size: Erwartete Dateigroesse (optional, wird geprueft)
+            expected_sha256: Erwarteter SHA256 (optional, wird geprueft)
+
+        Returns:
+            True bei Erfolg
+        """
+        blob_cache = self._get_blob_cache() if expected_sha256 else None
+        if blob_cache is not None and blob_cache.read_into(doc_id, expected_sha256, fileobj):
+            return True
+
+        try:
+            self.client.download_to_fileobj(
+                f'/documents/{doc_id}',
+                fileobj,
+                expected_size=expected_size,
+                expected_sha256=expected_sha256
+            )
+            return True
+        except APIError as e:
+            logger.error(f"Download fehlgeschlagen fuer Dokument {doc_id}: {e}")
+            return False
+
+    def _get_blob_cache(self):
+        """Lokaler Blob-Cache fuer diesen Server (None wenn deaktiviert/fehlerhaft)."""
+        try:
+            from services.blob_cache import get_document_blob_cache
+            return get_document_blob_cache(self.client.base_url)
+        except Exception as e:
+            logger.debug(f"Blob-Cache nicht verfuegbar: {e}")
+            return None
+    
+    def _forget_near_duplicates(self, doc_ids: List[int]) -> None:
+        """Entfernt geloeschte/verschobene Dokumente aus dem Beinahe-Duplikat-Index.
+        
+        Der Index uebernimmt die Sparte eines archivierten Dokuments; nach
+        Loeschen, Verschieben oder Umklassifizieren ist sie nicht mehr gueltig.
+        """
+        try:
+            from services.near_duplicate_index import get_near_duplicate_index
+            index = get_near_duplicate_index(self.client.base_url)
+            for doc_id in doc_ids:
+                index.remove(doc_id)
+        except Exception as e:
+            logger.debug(f"Beinahe-Duplikat-Index nicht aktualisiert: {e}")
+    
     def delete(self, doc_id: int) -> bool:
         """
         Dokument löschen.
@@ -678,6 +885,7 @@ class DocumentsAPI:
             response = self.client.delete(f'/documents/{doc_id}')
             if response.get('success'):
                 logger.info(f"Dokument {doc_id} gelöscht")
+                self._forget_near_duplicates([doc_id])
                 return True
             return False
         except APIError as e:
@@ -702,6 +910,8 @@ class DocumentsAPI:
             if response.get('success'):
                 count = response['data'].get('deleted_count', 0)
                 logger.info(f"{count} Dokument(e) geloescht (Bulk)")
+                if count:
+                    self._forget_near_duplicates(doc_ids)
                 return count
             return 0
         except APIError as e:
@@ -801,6 +1011,8 @@ class DocumentsAPI:
             response = self.client.put(f'/documents/{doc_id}', json_data=data)
             if response.get('success'):
                 logger.info(f"Dokument {doc_id} aktualisiert: {list(data.keys())}")
+                if box_type is not None:
+                    self._forget_near_duplicates([doc_id])
                 return True
             return False
         except APIError as e:
@@ -1009,6 +1221,9 @@ class DocumentsAPI:
             )
             if response.get('success'):
                 logger.info(f"Dokument {doc_id} Datei ersetzt: {file_path}")
+                blob_cache = self._get_blob_cache()
+                if blob_cache is not None:
+                    blob_cache.remove_document(doc_id)
                 return True
             return False
         except APIError as e:
@@ -1092,6 +1307,10 @@ class DocumentsAPI:
                 return response.get('ai_data')
             return None
         except APIError as e:
+            if e.status_code == 404:
+                # Noch keine AI-Daten vorhanden (kein Fehler)
+                logger.debug(f"Keine AI-Daten fuer Dokument {doc_id}")
+                return None
             logger.error(f"AI-Daten laden fehlgeschlagen fuer Dokument {doc_id}: {e}")
             return None
     
@@ -0,0 +1,196 @@
+"""
+Streaming-Multipart-Encoder fuer Datei-Uploads.
+
+Bisher wurde jede Datei vor dem POST komplett mit f.read() in den Speicher
+gelesen (einmal pro paralleler Upload-Worker). Der Encoder liest die Datei
+stattdessen blockweise waehrend des Sendens und meldet den Fortschritt.
+
+- Content-Length wird vorab aus den Dateigroessen berechnet (kein Chunked
+  Transfer, den PHP-Backends nicht zuverlaessig unterstuetzen)
+- Dateien werden erst beim Lesen geoeffnet und danach geschlossen; fuer
+  einen Retry erzeugt APIClient einen neuen Encoder (Datei wird neu geoeffnet
+  statt einen Puffer zu halten)
+- Header-Format wie urllib3 (HTML5-Escaping fuer Dateinamen)
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# Blockgroesse, falls der Aufrufer keine Groesse vorgibt
+CHUNK_SIZE = 256 * 1024
+
+# Callback: (gesendete Bytes, Gesamt-Bytes)
+ProgressCallback = Callable[[int, int], None]
+
+_MIME_TYPES = {
+    '.pdf': 'application/pdf',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.log': 'text/plain',
+    '.txt': 'text/plain',
+    '.zip': 'application/zip',
+}
+
+
+def guess_mime_type(filename: str) -> str:
+    """MIME-Typ anhand der Dateiendung (Fallback application/octet-stream)."""
+    return _MIME_TYPES.get(os.path.splitext(filename)[1].lower(), 'application/octet-stream')
+
+
+def _quote(value: str) -> str:
+    """HTML5-Escaping fuer Header-Parameter (wie urllib3)."""
+    return value.replace('\\', '\\\\').replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+
+class _FilePart:
+    """Dateiinhalt als Multipart-Teil (lazy geoeffnet)."""
+
+    __slots__ = ('path', 'size', '_handle')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self._handle = None
+
+    def read(self, size: int) -> bytes:
+        if self._handle is None:
+            self._handle = open(self.path, 'rb')
+        return self._handle.read(size)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class StreamingMultipartEncoder:
+    """
+    Datei-aehnlicher multipart/form-data-Body fuer requests.
+
+    Verwendung:
+        encoder = StreamingMultipartEncoder({'box_type': 'eingang'},
+                                            {'file': ('a.pdf', '/tmp/a.pdf', 'application/pdf')})
+        session.post(url, data=encoder, headers={'Content-Type': encoder.content_type})
+        encoder.close()
+
+    Args:
+        fields: Formularfelder {name: wert}
+        files: Dateien {feldname: (dateiname, pfad, mime_type)};
+            mime_type None = ohne Content-Type-Header (wie requests)
+        progress_callback: Wird nach jedem gelesenen Block mit
+            (gesendete Bytes, Gesamt-Bytes) aufgerufen
+    """
+
+    def __init__(self, fields: Optional[Dict[str, object]],
+                 files: Dict[str, Tuple[str, str, Optional[str]]],
+                 progress_callback: Optional[ProgressCallback] = None,
+                 chunk_size: int = CHUNK_SIZE):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={self.boundary}'
+        self._progress_callback = progress_callback
+        self._chunk_size = chunk_size
+        self._parts: List[Union[bytes, _FilePart]] = []
+
+        for name, value in (fields or {}).items():
+            if value is None:
+                continue
+            self._parts.append(
+                f'--{self.boundary}\r\n'
+                f'Content-Disposition: form-data; name="{_quote(str(name))}"\r\n\r\n'
+                .encode('utf-8') + str(value).encode('utf-8') + b'\r\n'
+            )
+        for name, (filename, path, mime_type) in files.items():
+            content_type = f'Content-Type: {mime_type}\r\n' if mime_type else ''
+            self._parts.append(
+                f'--{self.boundary}\r\n'
+                f'Content-Disposition: form-data; name="{_quote(str(name))}"; '
+                f'filename="{_quote(filename)}"\r\n'
+                f'{content_type}\r\n'.encode('utf-8')
+            )
+            self._parts.append(_FilePart(path))
+            self._parts.append(b'\r\n')
+        self._parts.append(f'--{self.boundary}--\r\n'.encode('utf-8'))
+
+        self.len = sum(p.size if isinstance(p, _FilePart) else len(p) for p in self._parts)
+        self._index = 0
+        self._offset = 0   # Position im aktuellen bytes-Teil
+        self._sent = 0
+
+    def __len__(self) -> int:
+        return self.len
+
+    @property
+    def bytes_read(self) -> int:
+        return self._sent
+
+    def read(self, size: int = -1) -> bytes:
+        """Liefert bis zu size Bytes (b'' am Ende)."""
+        if size is None or size < 0:
+            size = self._chunk_size
+        out = bytearray()
+        while len(out) < size and self._index < len(self._parts):
+            part = self._parts[self._index]
+            if isinstance(part, _FilePart):
+                data = part.read(size - len(out))
+                if data:
+                    out += data
+                    continue
+                part.close()
+            else:
+                data = part[self._offset:self._offset + size - len(out)]
+                out += data
+                self._offset += len(data)
+                if self._offset < len(part):
+                    continue
+            self._index += 1
+            self._offset = 0
+        if out:
+            self._sent += len(out)
+            if self._progress_callback is not None:
+                self._progress_callback(self._sent, self.len)
+        return bytes(out)
+
+    def close(self) -> None:
+        for part in self._parts:
+            if isinstance(part, _FilePart):
+                part.close()
+
+
+class AggregateUploadProgress:
+    """
+    Fasst den Byte-Fortschritt paralleler Uploads zusammen.
+
+    Jeder Upload bekommt per callback_for() einen eigenen Callback; ein Retry
+    (Zaehler beginnt wieder bei 0) wird korrekt verrechnet. emit wird hoechstens
+    alle min_interval_s aufgerufen (und immer bei 100 %).
+    """
+
+    def __init__(self, total_bytes: int, emit: Callable[[int, int], None],
+                 min_interval_s: float = 0.1):
+        self.total_bytes = max(0, total_bytes)
+        self._emit = emit
+        self._min_interval_s = min_interval_s
+        self._lock = threading.Lock()
+        self._per_upload: Dict[object, int] = {}
+        self._sent = 0
+        self._last_emit = 0.0
+
+    def callback_for(self, key) -> ProgressCallback:
+        def _callback(sent: int, _total: int) -> None:
+            with self._lock:
+                self._sent += sent - self._per_upload.get(key, 0)
+                self._per_upload[key] = sent
+                now = time.monotonic()
+                done = self._sent >= self.total_bytes
+                if not done and now - self._last_emit < self._min_interval_s:
+                    return
+                self._last_emit = now
+                sent_total = min(self._sent, self.total_bytes)
+            self._emit(sent_total, self.total_bytes)
+        return _callback
@@ -11,6 +11,9 @@ from .client import (
     OpenRouterClient,
     get_ai_semaphore,
     get_ai_queue_depth,
+    get_ai_concurrency_limit,
+    get_ai_latency_histogram,
+    get_ai_concurrency_stats,
     DEFAULT_MAX_CONCURRENT_AI_CALLS,
     OPENROUTER_BASE_URL,
     DEFAULT_VISION_MODEL,
@@ -23,7 +26,9 @@ from .client import (
 )
 from .models import DocumentClassification, ExtractedDocumentData
 from .utils import _safe_json_loads, slug_de, _build_keyword_hints
-from .classification import TRIAGE_PROMPT, TRIAGE_SCHEMA
+from .classification import TRIAGE_PROMPT, TRIAGE_SCHEMA, SPARTE_PROMPT, SPARTE_SCHEMA
+from .batching import RequestBatcher, DEFAULT_BATCH_WINDOW_S, DEFAULT_MAX_BATCH_SIZE
+from .concurrency import AdaptiveConcurrencyLimiter, get_ai_limiter
 
 __all__ = [
     'OpenRouterClient',
@@ -34,6 +39,9 @@ __all__ = [
     '_build_keyword_hints',
     'get_ai_semaphore',
     'get_ai_queue_depth',
+    'get_ai_concurrency_limit',
+    'get_ai_latency_histogram',
+    'get_ai_concurrency_stats',
     'DEFAULT_MAX_CONCURRENT_AI_CALLS',
     'OPENROUTER_BASE_URL',
     'DEFAULT_VISION_MODEL',
@@ -45,4 +53,11 @@ __all__ = [
     'RETRY_BACKOFF_FACTOR',
     'TRIAGE_PROMPT',
     'TRIAGE_SCHEMA',
+    'SPARTE_PROMPT',
+    'SPARTE_SCHEMA',
+    'RequestBatcher',
+    'DEFAULT_BATCH_WINDOW_S',
+    'DEFAULT_MAX_BATCH_SIZE',
+    'AdaptiveConcurrencyLimiter',
+    'get_ai_limiter',
 ]
@@ -0,0 +1,332 @@
+"""
+Request-Batching fuer kurze KI-Klassifikationen (Triage, Sparte Stufe 1).
+
+Die Worker des DocumentProcessor schicken pro Dokument einen eigenen
+Chat-Request mit max_tokens=100-150. Bei grossen Eingangsboxen dominiert
+damit der Overhead pro Request (Proxy-Roundtrip, Prompt-Tokens der
+identischen Anweisungen).
+
+RequestBatcher sammelt gleichartige Anfragen paralleler Worker in einem
+kurzen Zeitfenster, schickt sie als EINEN strukturierten Request (JSON-Array
+mit einem Eintrag pro Dokument) und verteilt die Ergebnisse an die
+wartenden Aufrufer. Fehlt ein Eintrag oder scheitert das Parsing, wird fuer
+die betroffenen Dokumente auf Einzel-Requests zurueckgefallen - jeweils im
+Thread des wartenden Aufrufers, damit die Fallbacks parallel laufen.
+"""
+
+import copy
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sammelfenster: klein gegenueber der KI-Latenz (1-3s), gross genug damit
+# parallele Worker zusammenfinden
+DEFAULT_BATCH_WINDOW_S = 0.3
+DEFAULT_MAX_BATCH_SIZE = 6
+
+# Trennzeilen zwischen den Dokumenten im Batch-Prompt
+BATCH_DOCUMENT_SEPARATOR = '### DOKUMENT {index} ###'
+
+BATCH_INSTRUCTION = '''
+MEHRERE DOKUMENTE:
+Der TEXT oben enthaelt {count} voneinander unabhaengige Dokumente, jeweils
+eingeleitet durch "### DOKUMENT <nr> ###". Bewerte JEDES Dokument einzeln
+nach den obigen Regeln, als waere es allein.
+Antworte mit genau einem Eintrag pro Dokument im Array "results" und setze
+"index" auf die Dokumentnummer.
+'''
+
+
+def build_batch_text(texts: List[str]) -> str:
+    """Fuegt Dokument-Texte mit nummerierten Trennzeilen zusammen (1-basiert)."""
+    blocks = []
+    for i, text in enumerate(texts, start=1):
+        blocks.append(BATCH_DOCUMENT_SEPARATOR.format(index=i))
+        blocks.append(text)
+    return '\n'.join(blocks)
+
+
+def new_batch_id() -> str:
+    """Kurze ID, ueber die Dokumente desselben Batch-Requests zuordenbar sind."""
+    return uuid.uuid4().hex[:12]
+
+
+def batch_prompt_slice(batch_id: str, index: int, count: int, text: str) -> str:
+    """
+    Anteil eines Dokuments am Batch-Prompt (fuer ai_prompt_text).
+
+    Der volle Prompt enthaelt die Texte ALLER Dokumente des Batches und
+    darf deshalb nicht beim einzelnen Dokument gespeichert werden.
+    """
+    return (
+        f"[KI-Batch {batch_id}: Dokument {index}/{count}]\n"
+        f"{BATCH_DOCUMENT_SEPARATOR.format(index=index)}\n{text}"
+    )
+
+
+def batch_response_slice(batch_id: str, entry: dict) -> str:
+    """Eintrag eines Dokuments aus der Batch-Antwort (fuer ai_raw_response)."""
+    return json.dumps({'batch_id': batch_id, **entry}, ensure_ascii=False)
+
+
+def build_batch_schema(single_schema: dict, name: str) -> dict:
+    """
+    Erzeugt aus einem Einzel-JSON-Schema ein Batch-Schema.
+
+    Root bleibt ein Objekt (Structured Output verlangt das), die
+    Einzelergebnisse liegen in "results" und bekommen ein "index"-Feld.
+    """
+    item = copy.deepcopy(single_schema['schema'])
+    item['properties'] = {
+        'index': {'type': 'integer', 'description': 'Dokumentnummer (1-basiert)'},
+        **item['properties'],
+    }
+    item['required'] = ['index'] + list(item.get('required', []))
+    return {
+        'name': name,
+        'strict': True,
+        'schema': {
+            'type': 'object',
+            'properties': {
+                'results': {'type': 'array', 'items': item},
+            },
+            'required': ['results'],
+            'additionalProperties': False,
+        },
+    }
+
+
+def parse_batch_results(data: Optional[dict], count: int,
+                        required_key: str) -> List[Optional[dict]]:
+    """
+    Ordnet die Eintraege einer Batch-Antwort den Dokumenten zu.
+
+    Returns:
+        Liste der Laenge count; None fuer Dokumente ohne gueltigen Eintrag
+    """
+    mapped: List[Optional[dict]] = [None] * count
+    if not isinstance(data, dict):
+        return mapped
+    entries = data.get('results')
+    if not isinstance(entries, list):
+        return mapped
+    for entry in entries:
+        if not isinstance(entry, dict) or required_key not in entry:
+            continue
+        try:
+            idx = int(entry.get('index')) - 1
+        except (TypeError, ValueError):
+            continue
+        if 0 <= idx < count and mapped[idx] is None:
+            result = dict(entry)
+            result.pop('index', None)
+            mapped[idx] = result
+    return mapped
+
+
+def split_usage(usage: Optional[dict], weights: List[float]) -> List[dict]:
+    """Verteilt Token-Verbrauch eines Batch-Requests anteilig auf die Dokumente."""
+    usage = usage or {}
+    total_weight = sum(weights) or 1.0
+    shares = []
+    for w in weights:
+        share = w / total_weight
+        shares.append({
+            key: int(round((usage.get(key) or 0) * share))
+            for key in ('prompt_tokens', 'completion_tokens', 'total_tokens')
+        })
+    return shares
+
+
+class _PendingItem:
+    __slots__ = ('payload', 'event', 'result', 'error', 'submitted_at',
+                 'needs_single', 'is_fallback')
+
+    def __init__(self, payload: Any):
+        self.payload = payload
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.submitted_at = time.monotonic()
+        # Vom Leader gesetzt: Aufrufer fuehrt run_single selbst aus
+        self.needs_single = False
+        self.is_fallback = False
+
+
+class _OpenBatch:
+    __slots__ = ('items', 'full', 'run_single', 'run_batch')
+
+    def __init__(self, run_single: Callable, run_batch: Callable):
+        self.items: List[_PendingItem] = []
+        self.full = threading.Event()
+        self.run_single = run_single
+        self.run_batch = run_batch
+
+
+class RequestBatcher:
+    """
+    Sammelt gleichartige KI-Anfragen paralleler Threads zu Batch-Requests.
+
+    Der erste Aufrufer eines Schluessels wird "Leader": er wartet das
+    Sammelfenster ab (oder bis der Batch voll ist), fuehrt den Request aus
+    und verteilt die Ergebnisse. Alle anderen Aufrufer blockieren bis ihr
+    Ergebnis vorliegt. Einzel-Requests (Fallback, Batch-Groesse 1) fuehrt
+    jeder Aufrufer in seinem eigenen Thread aus.
+
+    run_batch(payloads) -> Liste von (Ergebnis|None) je Payload
+    run_single(payload) -> Ergebnis (Fallback und Batch-Groesse 1)
+    """
+
+    def __init__(self, window_s: float = DEFAULT_BATCH_WINDOW_S,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 cost_of: Optional[Callable[[Any], float]] = None):
+        self._window_s = window_s
+        self._max_batch_size = max(1, max_batch_size)
+        self._cost_of = cost_of or _default_cost_of
+        self._lock = threading.Lock()
+        self._open: dict = {}
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def submit(self, key: Hashable, payload: Any,
+               run_single: Callable[[Any], Any],
+               run_batch: Callable[[List[Any]], List[Any]]) -> Any:
+        """Reiht eine Anfrage ein und blockiert bis ihr Ergebnis vorliegt."""
+        item = _PendingItem(payload)
+        with self._lock:
+            batch = self._open.get(key)
+            is_leader = batch is None
+            if is_leader:
+                batch = _OpenBatch(run_single, run_batch)
+                self._open[key] = batch
+            batch.items.append(item)
+            if len(batch.items) >= self._max_batch_size:
+                # Voll: neue Anfragen landen in einem neuen Batch
+                self._open.pop(key, None)
+                batch.full.set()
+
+        if is_leader:
+            batch.full.wait(self._window_s)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+            self._flush(batch)
+        else:
+            item.event.wait()
+
+        if item.needs_single:
+            self._run_single(batch, item)
+
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def get_stats(self) -> dict:
+        """
+        Kosten und Latenz pro Dokument, getrennt nach Batch- und Einzelpfad.
+
+        Latenz = Wartezeit des Aufrufers inkl. Sammelfenster.
+        """
+        with self._stats_lock:
+            s = dict(self._stats)
+
+        def _avg(total, count):
+            return (total / count) if count else None
+
+        return {
+            'batch_requests': s['batch_requests'],
+            'batched_documents': s['batched_docs'],
+            'single_documents': s['single_docs'],
+            'fallback_documents': s['fallback_docs'],
+            'batched_latency_ms_per_doc': _avg(s['batched_latency_s'] * 1000, s['batched_docs']),
+            'single_latency_ms_per_doc': _avg(s['single_latency_s'] * 1000, s['single_docs']),
+            'batched_cost_usd_per_doc': _avg(s['batched_cost_usd'], s['batched_docs']),
+            'single_cost_usd_per_doc': _avg(s['single_cost_usd'], s['single_docs']),
+        }
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats = {
+                'batch_requests': 0,
+                'batched_docs': 0,
+                'single_docs': 0,
+                'fallback_docs': 0,
+                'batched_latency_s': 0.0,
+                'single_latency_s': 0.0,
+                'batched_cost_usd': 0.0,
+                'single_cost_usd': 0.0,
+            }
+
+    # ── Intern ────────────────────────────────────────────────────────────
+
+    def _flush(self, batch: _OpenBatch) -> None:
+        items = batch.items
+        results: List[Any] = [None] * len(items)
+
+        if len(items) > 1:
+            try:
+                results = list(batch.run_batch([it.payload for it in items]))
+                if len(results) != len(items):
+                    logger.warning(
+                        f"KI-Batch: {len(results)} Ergebnisse fuer {len(items)} Dokumente, "
+                        f"Fallback auf Einzel-Requests"
+                    )
+                    results = [None] * len(items)
+            except Exception as e:
+                logger.warning(f"KI-Batch fehlgeschlagen ({len(items)} Dokumente): {e}")
+                results = [None] * len(items)
+
+            batched = [(it, res) for it, res in zip(items, results) if res is not None]
+            if batched:
+                now = time.monotonic()
+                with self._stats_lock:
+                    self._stats['batch_requests'] += 1
+                    self._stats['batched_docs'] += len(batched)
+                    for it, res in batched:
+                        self._stats['batched_latency_s'] += now - it.submitted_at
+                        self._stats['batched_cost_usd'] += self._cost_of(res)
+                for it, res in batched:
+                    it.result = res
+                    it.event.set()
+                logger.info(
+                    f"KI-Batch: {len(batched)}/{len(items)} Dokumente in einem Request klassifiziert"
+                )
+
+        # Fallback/Einzel-Request im Thread des jeweiligen Aufrufers,
+        # der Leader arbeitet sie nicht nacheinander ab
+        for it, res in zip(items, results):
+            if res is not None:
+                continue
+            it.needs_single = True
+            it.is_fallback = len(items) > 1
+            it.event.set()
+
+    def _run_single(self, batch: _OpenBatch, item: _PendingItem) -> None:
+        try:
+            item.result = batch.run_single(item.payload)
+        except Exception as e:
+            item.error = e
+        finally:
+            now = time.monotonic()
+            with self._stats_lock:
+                self._stats['single_docs'] += 1
+                if item.is_fallback:
+                    self._stats['fallback_docs'] += 1
+                self._stats['single_latency_s'] += now - item.submitted_at
+                self._stats['single_cost_usd'] += self._cost_of(item.result)
+
+
+def _default_cost_of(result: Any) -> float:
+    if isinstance(result, dict):
+        try:
+            return float(result.get('_server_cost_usd') or 0)
+        except (TypeError, ValueError):
+            return 0.0
+    return 0.0
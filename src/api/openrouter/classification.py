@@ -65,6 +65,122 @@ TRIAGE_SCHEMA = {
 }
 
 
+# ============================================================================
+# SPARTEN-KLASSIFIKATION (Stufe 1)
+# ============================================================================
+
+# Prompt fuer Stufe 1 (Platzhalter {text}, JSON-Klammern escaped fuer .format)
+SPARTE_PROMPT = '''Klassifiziere dieses Versicherungsdokument in eine Sparte.
+
+SPARTEN:
+- courtage: Provisionsabrechnungen/Courtageabrechnungen vom VU an den MAKLER/VERMITTLER.
+  Erkennungsmerkmale: Provisionsliste, Courtageabrechnung, Vermittlerabrechnung,
+  Buchnote, Provisionskonto, Kontoauszug mit Provisions-/Courtagebetraegen,
+  DI-Provision, Bestandsprovision, Abschlussprovision, Stornoreserve,
+  Verguetungsdatenblatt, Verguetungsnachweis, Provisionsnachweis, Inkassoprovision,
+  Saldo aus Provisionen, Courtagenote.
+  Auch wenn "Kontoauszug" draufsteht: wenn Provisionen/Courtage aufgefuehrt werden = courtage!
+  NICHT courtage: Beitragsrechnungen, Kuendigungen, Policen, Nachtraege, Mahnungen,
+  Adressaenderungen, Schadensmeldungen, Zahlungserinnerungen, Antraege - auch wenn
+  sie von einer Versicherung kommen! Courtage = PROVISION FUER DEN MAKLER.
+
+- sach: KFZ, Haftpflicht, Privathaftpflicht, PHV, Tierhalterhaftpflicht, Hundehaftpflicht,
+  Hausrat, Wohngebaeude, Unfall, Unfallversicherung, Rechtsschutz, Gewerbe,
+  Betriebshaftpflicht, Glas, Reise, Gebaeudeversicherung, Inhaltsversicherung,
+  Bauherrenhaftpflicht, Elektronik, PrivatSchutzversicherung, Kombi-Schutz, Buendelversicherung,
+  Schadenaufstellung, Schadenliste, Schadenstatistik, Schadenhistorie, Schadenquote,
+  Fahrzeug, Fahrzeugerprobung, Fahrzeugschein, Fahrzeugbrief
+
+- leben: Lebensversicherung, Rente, Rentenversicherung, BU, Berufsunfaehigkeit, Riester,
+  Ruerup, Pensionskasse, Pensionsfonds, Altersvorsorge, bAV, betriebliche Altersversorgung,
+  Sterbegeld, Risikoleben, fondsgebunden, Kapitalversicherung
+
+- kranken: PKV, Krankenzusatz, Zahnzusatz, Pflege, Krankentagegeld, Krankenhaustagegeld
+
+- sonstige: Nur wenn wirklich KEINE der obigen Sparten erkennbar ist
+
+WICHTIG - HAEUFIGE VERWECHSLUNGEN:
+- Unfallversicherung = IMMER sach! Auch wenn Todesfallsumme, Invaliditaet,
+  Progressionsstaffel oder Beitragsinformation erwaehnt wird!
+  Beispiel: "Zurich Unfallversicherung Beitragsinformation" = sach, NICHT kranken!
+  Invaliditaet + Progression = typisch Unfall = sach. NIEMALS kranken!
+- PrivatSchutzversicherung, Kombi-Schutz, Buendelpolice = sach (Haftpflicht+Unfall+Hausrat)
+- NICHT leben: Todesfallsumme/Invaliditaet bei Unfallversicherung
+- Schadenlisten / Schadenaufstellungen / Schadenstatistiken = IMMER sach
+- Dokumente ueber Fahrzeuge / Fahrzeugerprobung = sach (KFZ-Versicherung)
+
+VU-SPARTEN-KUERZEL (haeufig in Dokumenten):
+- MKF, MFK = Motor-Kraftfahrt = sach
+- RR, RS = Rechtsschutz = sach
+- HV, PHV = Haftpflicht = sach
+- HR = Hausrat = sach
+- WG, WGB = Wohngebaeude = sach
+- UV, UNF = Unfall = sach
+- KFZ, KH = Kraftfahrt = sach
+- LV, LEB = Leben = leben
+- BU = Berufsunfaehigkeit = leben
+- KV, PKV = Kranken = kranken
+
+REGELN:
+1. Courtage wenn Hauptzweck = Provisionsabrechnung/Vermittlerabrechnung/Buchnote/
+   Provisionskonto fuer Makler. Auch Kontoauszuege mit Provisionsbetraegen!
+2. Kuendigung/Mahnung/Zahlungserinnerung/Rueckstandsliste/Lastschriftproblem/
+   Adressaenderung/Nachtrag/Beitragsrechnung
+   -> IMMER nach SPARTE des zugrundeliegenden Versicherungsvertrags zuordnen!
+   Beispiel: Kuendigung einer Wohngebaeudeversicherung = "sach", nicht "sonstige"
+   Beispiel: Kuendigung einer Unfallversicherung = "sach", nicht "leben"!
+   Beispiel: Rueckstandsliste fuer KFZ-Vertrag (MKF) = "sach", nicht "sonstige"!
+   Beispiel: Zahlungserinnerung fuer Rechtsschutz = "sach", nicht "sonstige"!
+3. Bei Zweifel zwischen Sach und Sonstige -> IMMER Sach
+4. Bei Zweifel zwischen Sach und Leben -> Sach bevorzugen (ausser eindeutig Lebensversicherung/Rente/BU)
+5. "sonstige" nur wenn wirklich KEINE Versicherungssparte erkennbar ist
+6. Wenn ein Dokument Versicherungsnummern (VS-Nr, VN, VSNR, Policennummer) oder
+   Mahnbetraege/Rueckstaende enthaelt, ist es ein Versicherungsdokument und
+   gehoert in eine Sparte, NICHT in sonstige
+
+CONFIDENCE:
+- "high": Sparte ist eindeutig erkennbar (z.B. "Wohngebaeudeversicherung", "Provisionsabrechnung")
+- "medium": Sparte ist wahrscheinlich, aber nicht 100%% sicher
+- "low": Sparte unklar, Dokument passt nicht eindeutig in eine Sparte
+
+TEXT:
+{text}
+
+JSON: {{"sparte": "...", "confidence": "high"|"medium"|"low", "document_date_iso": "YYYY-MM-DD" oder null, "vu_name": "..." oder null}}
+'''
+
+# JSON Schema fuer Stufe 1
+SPARTE_SCHEMA = {
+    "name": "sparte_with_confidence",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "sparte": {
+                "type": "string",
+                "enum": ["courtage", "sach", "leben", "kranken", "sonstige"],
+                "description": "Versicherungssparte. courtage NUR bei Provisionsabrechnungen fuer Makler."
+            },
+            "confidence": {
+                "type": "string",
+                "enum": ["high", "medium", "low"],
+                "description": "Wie sicher ist die Sparten-Zuordnung?"
+            },
+            "document_date_iso": {
+                "type": ["string", "null"],
+                "description": "Dokumentdatum als YYYY-MM-DD oder null"
+            },
+            "vu_name": {
+                "type": ["string", "null"],
+                "description": "Name der Versicherungsgesellschaft oder null"
+            }
+        },
+        "required": ["sparte", "confidence", "document_date_iso", "vu_name"],
+        "additionalProperties": False
+    }
+}
+
+
 class OpenRouterClassificationMixin:
     """Mixin mit Klassifikations-Methoden fuer OpenRouterClient."""
     
@@ -580,8 +696,6 @@ TEXT:
         Returns:
             dict mit 'category', 'confidence', 'detected_insurer'
         """
-        from .utils import _safe_json_loads
-        
         # Nur Vorschau verwenden (Token sparen)
         text_preview = text[:2500] if text else ""
         
@@ -593,6 +707,20 @@ TEXT:
                 "detected_insurer": None
             }
         
+        # Parallele Worker teilen sich einen Batch-Request (siehe batching.py)
+        batcher = getattr(self, '_request_batcher', None)
+        if batcher is not None:
+            return batcher.submit(
+                ('triage', model), text_preview,
+                run_single=lambda t: self._triage_single(t, model),
+                run_batch=lambda texts: self._triage_batch(texts, model),
+            )
+        return self._triage_single(text_preview, model)
+    
+    def _triage_single(self, text_preview: str, model: str) -> dict:
+        """Triage-Request fuer ein einzelnes Dokument (ungebatcht)."""
+        from .utils import _safe_json_loads
+        
         logger.info(f"Triage via {model} ({len(text_preview)} Zeichen)...")
         
         prompt = TRIAGE_PROMPT.format(text_preview=text_preview)
@@ -626,9 +754,68 @@ TEXT:
                 result["confidence"] = data.get("confidence", "low")
                 result["detected_insurer"] = data.get("detected_insurer")
         
+        result['_server_cost_usd'] = float(response.get('_cost', {}).get('real_cost_usd', 0) or 0)
+        
         logger.info(f"Triage: {result['category']} ({result['confidence']})")
         return result
     
+    def _triage_batch(self, texts: List[str], model: str) -> List[Optional[dict]]:
+        """
+        Triage fuer mehrere Dokumente in einem Request.
+        
+        Returns:
+            Ergebnis je Text; None wenn kein gueltiger Eintrag (-> Einzel-Fallback)
+        """
+        from .utils import _safe_json_loads
+        from .batching import (
+            BATCH_INSTRUCTION, build_batch_text, build_batch_schema,
+            parse_batch_results, new_batch_id,
+        )
+        
+        logger.info(f"Triage-Batch via {model} ({len(texts)} Dokumente)...")
+        
+        prompt = (
+            TRIAGE_PROMPT.format(text_preview=build_batch_text(texts))
+            + BATCH_INSTRUCTION.format(count=len(texts))
+        )
+        messages = [{"role": "user", "content": prompt}]
+        response_format = {
+            "type": "json_schema",
+            "json_schema": build_batch_schema(TRIAGE_SCHEMA, 'document_triage_batch')
+        }
+        
+        response = self._openrouter_request(
+            messages,
+            model=model,
+            response_format=response_format,
+            max_tokens=60 * len(texts) + 20
+        )
+        
+        data = None
+        if response.get('choices'):
+            content = response['choices'][0].get('message', {}).get('content', '')
+            data = _safe_json_loads(content)
+        
+        entries = parse_batch_results(data, len(texts), 'category')
+        total_cost = float(response.get('_cost', {}).get('real_cost_usd', 0) or 0)
+        total_chars = sum(len(t) for t in texts) or 1
+        batch_id = new_batch_id()
+        
+        results = []
+        for text, entry in zip(texts, entries):
+            if entry is None:
+                results.append(None)
+                continue
+            results.append({
+                "category": entry.get("category", "sonstige"),
+                "confidence": entry.get("confidence", "low"),
+                "detected_insurer": entry.get("detected_insurer"),
+                "_server_cost_usd": total_cost * len(text) / total_chars,
+                "_batch_size": len(texts),
+                "_batch_id": batch_id,
+            })
+        return results
+    
     def classify_document_smart(self, text: str) -> 'DocumentClassification':
         """
         Zweistufige Klassifikation: Triage -> Detail bei Bedarf.
@@ -720,21 +907,22 @@ TEXT:
         """
         try:
             import fitz
-            
+            from services.page_text_cache import get_page_text
+
             doc = fitz.open(pdf_path)
             text = ""
-            
+
             if for_triage:
                 # Erste 2 Seiten fuer Triage (manche Dokumente haben Begleitschreiben auf S.1)
                 max_pages = min(2, len(doc))
                 for i in range(max_pages):
-                    text += doc[i].get_text() + "\n"
+                    text += get_page_text(doc[i]) + "\n"
                 text = text[:3000]
             else:
                 # Erste 3 Seiten fuer Detailanalyse
                 max_pages = min(3, len(doc))
                 for i in range(max_pages):
-                    text += doc[i].get_text() + "\n"
+                    text += get_page_text(doc[i]) + "\n"
                 text = text[:10000]
             
             doc.close()
@@ -1044,119 +1232,30 @@ Antwort NUR als JSON:
         Returns:
             {"sparte": ..., "confidence": ..., "document_date_iso": ..., "vu_name": ...}
         """
+        # Parallele Worker teilen sich einen Batch-Request (siehe batching.py)
+        batcher = getattr(self, '_request_batcher', None)
+        if batcher is not None:
+            return batcher.submit(
+                ('sparte', model, custom_prompt, custom_max_tokens), text,
+                run_single=lambda t: self._classify_sparte_single(
+                    t, model, custom_prompt, custom_max_tokens),
+                run_batch=lambda texts: self._classify_sparte_batch(
+                    texts, model, custom_prompt, custom_max_tokens),
+            )
+        return self._classify_sparte_single(text, model, custom_prompt, custom_max_tokens)
+    
+    def _classify_sparte_single(self, text: str, model: str,
+                                custom_prompt: Optional[str],
+                                custom_max_tokens: Optional[int]) -> Optional[dict]:
+        """Stufe-1-Request fuer ein einzelnes Dokument (ungebatcht)."""
         from .utils import _safe_json_loads
         
         if custom_prompt:
             prompt = custom_prompt.replace('{text}', text)
         else:
-            prompt = '''Klassifiziere dieses Versicherungsdokument in eine Sparte.
-
-SPARTEN:
-- courtage: Provisionsabrechnungen/Courtageabrechnungen vom VU an den MAKLER/VERMITTLER.
-  Erkennungsmerkmale: Provisionsliste, Courtageabrechnung, Vermittlerabrechnung,
-  Buchnote, Provisionskonto, Kontoauszug mit Provisions-/Courtagebetraegen,
-  DI-Provision, Bestandsprovision, Abschlussprovision, Stornoreserve,
-  Verguetungsdatenblatt, Verguetungsnachweis, Provisionsnachweis, Inkassoprovision,
-  Saldo aus Provisionen, Courtagenote.
-  Auch wenn "Kontoauszug" draufsteht: wenn Provisionen/Courtage aufgefuehrt werden = courtage!
-  NICHT courtage: Beitragsrechnungen, Kuendigungen, Policen, Nachtraege, Mahnungen,
-  Adressaenderungen, Schadensmeldungen, Zahlungserinnerungen, Antraege - auch wenn
-  sie von einer Versicherung kommen! Courtage = PROVISION FUER DEN MAKLER.
-
-- sach: KFZ, Haftpflicht, Privathaftpflicht, PHV, Tierhalterhaftpflicht, Hundehaftpflicht,
-  Hausrat, Wohngebaeude, Unfall, Unfallversicherung, Rechtsschutz, Gewerbe,
-  Betriebshaftpflicht, Glas, Reise, Gebaeudeversicherung, Inhaltsversicherung,
-  Bauherrenhaftpflicht, Elektronik, PrivatSchutzversicherung, Kombi-Schutz, Buendelversicherung,
-  Schadenaufstellung, Schadenliste, Schadenstatistik, Schadenhistorie, Schadenquote,
-  Fahrzeug, Fahrzeugerprobung, Fahrzeugschein, Fahrzeugbrief
-
-- leben: Lebensversicherung, Rente, Rentenversicherung, BU, Berufsunfaehigkeit, Riester,
-  Ruerup, Pensionskasse, Pensionsfonds, Altersvorsorge, bAV, betriebliche Altersversorgung,
-  Sterbegeld, Risikoleben, fondsgebunden, Kapitalversicherung
-
-- kranken: PKV, Krankenzusatz, Zahnzusatz, Pflege, Krankentagegeld, Krankenhaustagegeld
-
-- sonstige: Nur wenn wirklich KEINE der obigen Sparten erkennbar ist
-
-WICHTIG - HAEUFIGE VERWECHSLUNGEN:
-- Unfallversicherung = IMMER sach! Auch wenn Todesfallsumme, Invaliditaet,
-  Progressionsstaffel oder Beitragsinformation erwaehnt wird!
-  Beispiel: "Zurich Unfallversicherung Beitragsinformation" = sach, NICHT kranken!
-  Invaliditaet + Progression = typisch Unfall = sach. NIEMALS kranken!
-- PrivatSchutzversicherung, Kombi-Schutz, Buendelpolice = sach (Haftpflicht+Unfall+Hausrat)
-- NICHT leben: Todesfallsumme/Invaliditaet bei Unfallversicherung
-- Schadenlisten / Schadenaufstellungen / Schadenstatistiken = IMMER sach
-- Dokumente ueber Fahrzeuge / Fahrzeugerprobung = sach (KFZ-Versicherung)
-
-VU-SPARTEN-KUERZEL (haeufig in Dokumenten):
-- MKF, MFK = Motor-Kraftfahrt = sach
-- RR, RS = Rechtsschutz = sach
-- HV, PHV = Haftpflicht = sach
-- HR = Hausrat = sach
-- WG, WGB = Wohngebaeude = sach
-- UV, UNF = Unfall = sach
-- KFZ, KH = Kraftfahrt = sach
-- LV, LEB = Leben = leben
-- BU = Berufsunfaehigkeit = leben
-- KV, PKV = Kranken = kranken
-
-REGELN:
-1. Courtage wenn Hauptzweck = Provisionsabrechnung/Vermittlerabrechnung/Buchnote/
-   Provisionskonto fuer Makler. Auch Kontoauszuege mit Provisionsbetraegen!
-2. Kuendigung/Mahnung/Zahlungserinnerung/Rueckstandsliste/Lastschriftproblem/
-   Adressaenderung/Nachtrag/Beitragsrechnung
-   -> IMMER nach SPARTE des zugrundeliegenden Versicherungsvertrags zuordnen!
-   Beispiel: Kuendigung einer Wohngebaeudeversicherung = "sach", nicht "sonstige"
-   Beispiel: Kuendigung einer Unfallversicherung = "sach", nicht "leben"!
-   Beispiel: Rueckstandsliste fuer KFZ-Vertrag (MKF) = "sach", nicht "sonstige"!
-   Beispiel: Zahlungserinnerung fuer Rechtsschutz = "sach", nicht "sonstige"!
-3. Bei Zweifel zwischen Sach und Sonstige -> IMMER Sach
-4. Bei Zweifel zwischen Sach und Leben -> Sach bevorzugen (ausser eindeutig Lebensversicherung/Rente/BU)
-5. "sonstige" nur wenn wirklich KEINE Versicherungssparte erkennbar ist
-6. Wenn ein Dokument Versicherungsnummern (VS-Nr, VN, VSNR, Policennummer) oder
-   Mahnbetraege/Rueckstaende enthaelt, ist es ein Versicherungsdokument und
-   gehoert in eine Sparte, NICHT in sonstige
-
-CONFIDENCE:
-- "high": Sparte ist eindeutig erkennbar (z.B. "Wohngebaeudeversicherung", "Provisionsabrechnung")
-- "medium": Sparte ist wahrscheinlich, aber nicht 100%% sicher
-- "low": Sparte unklar, Dokument passt nicht eindeutig in eine Sparte
-
-TEXT:
-{text}
-
-JSON: {{"sparte": "...", "confidence": "high"|"medium"|"low", "document_date_iso": "YYYY-MM-DD" oder null, "vu_name": "..." oder null}}
-'''.format(text=text)
+            prompt = SPARTE_PROMPT.format(text=text)
         
-        schema = {
-            "name": "sparte_with_confidence",
-            "strict": True,
-            "schema": {
-                "type": "object",
-                "properties": {
-                    "sparte": {
-                        "type": "string",
-                        "enum": ["courtage", "sach", "leben", "kranken", "sonstige"],
-                        "description": "Versicherungssparte. courtage NUR bei Provisionsabrechnungen fuer Makler."
-                    },
-                    "confidence": {
-                        "type": "string",
-                        "enum": ["high", "medium", "low"],
-                        "description": "Wie sicher ist die Sparten-Zuordnung?"
-                    },
-                    "document_date_iso": {
-                        "type": ["string", "null"],
-                        "description": "Dokumentdatum als YYYY-MM-DD oder null"
-                    },
-                    "vu_name": {
-                        "type": ["string", "null"],
-                        "description": "Name der Versicherungsgesellschaft oder null"
-                    }
-                },
-                "required": ["sparte", "confidence", "document_date_iso", "vu_name"],
-                "additionalProperties": False
-            }
-        }
+        schema = SPARTE_SCHEMA
         
         try:
             messages = [{"role": "user", "content": prompt}]
@@ -1206,6 +1305,86 @@ JSON: {{"sparte": "...", "confidence": "high"|"medium"|"low", "document_date_iso
             logger.error(f"Stufe-1-Klassifikation fehlgeschlagen: {e}")
         
         return None
+
+    def _classify_sparte_batch(self, texts: List[str], model: str,
+                               custom_prompt: Optional[str],
+                               custom_max_tokens: Optional[int]) -> List[Optional[dict]]:
+        """
+        Stufe 1 fuer mehrere Dokumente in einem Request.
+        
+        Token-Verbrauch und Server-Kosten werden anteilig (nach Textlaenge)
+        auf die Dokumente verteilt, damit die Kosten pro Dokument in
+        document_ai_data vergleichbar mit dem Einzelpfad bleiben.
+        
+        Returns:
+            Ergebnis je Text; None wenn kein gueltiger Eintrag (-> Einzel-Fallback)
+        """
+        from .utils import _safe_json_loads
+        from .batching import (
+            BATCH_INSTRUCTION, build_batch_text, build_batch_schema,
+            parse_batch_results, split_usage, new_batch_id,
+            batch_prompt_slice, batch_response_slice,
+        )
+        
+        batch_text = build_batch_text(texts)
+        if custom_prompt:
+            prompt = custom_prompt.replace('{text}', batch_text)
+        else:
+            prompt = SPARTE_PROMPT.format(text=batch_text)
+        prompt += BATCH_INSTRUCTION.format(count=len(texts))
+        
+        messages = [{"role": "user", "content": prompt}]
+        response_format = {
+            "type": "json_schema",
+            "json_schema": build_batch_schema(SPARTE_SCHEMA, 'sparte_with_confidence_batch')
+        }
+        max_tokens = (custom_max_tokens or 150) * len(texts)
+        
+        logger.info(f"Stufe-1-Batch via {model} ({len(texts)} Dokumente)...")
+        response = self._openrouter_request(
+            messages,
+            model=model,
+            response_format=response_format,
+            max_tokens=max_tokens
+        )
+        
+        content = ''
+        data = None
+        if response.get('choices'):
+            content = response['choices'][0].get('message', {}).get('content', '')
+            data = _safe_json_loads(content)
+        
+        entries = parse_batch_results(data, len(texts), 'sparte')
+        weights = [float(len(t)) for t in texts]
+        usages = split_usage(response.get('usage', {}), weights)
+        server_cost = response.get('_cost', {})
+        total_cost = float(server_cost.get('real_cost_usd', 0) or 0)
+        total_weight = sum(weights) or 1.0
+        
+        batch_id = new_batch_id()
+        results = []
+        for index, (text, entry, usage, weight) in enumerate(
+                zip(texts, entries, usages, weights), start=1):
+            if entry is None:
+                results.append(None)
+                continue
+            # Nur den eigenen Anteil speichern: Prompt/Antwort des Batches
+            # enthalten die Texte der anderen Dokumente
+            entry['_raw_response'] = batch_response_slice(batch_id, entry)
+            entry['_prompt_text'] = batch_prompt_slice(batch_id, index, len(texts), text)
+            entry['_usage'] = usage
+            entry['_server_cost_usd'] = total_cost * weight / total_weight
+            entry['_provider'] = server_cost.get('provider', 'unknown')
+            entry['_batch_size'] = len(texts)
+            entry['_batch_id'] = batch_id
+            if self._cost_calculator and usage.get('total_tokens'):
+                try:
+                    real = self._cost_calculator.calculate_real_cost(usage, model)
+                    entry['_real_cost_usd'] = real.real_cost_usd
+                except Exception:
+                    pass
+            results.append(entry)
+        return results
     
     def _classify_sparte_detail(self, text: str, model: str = DEFAULT_EXTRACT_MODEL,
                                 custom_prompt: str = None,
@@ -9,36 +9,58 @@ Mixins aus ocr.py und classification.py eingebracht.
 import logging
 import time
 import threading
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import requests
 
 from ..client import APIClient, APIError
 from .ocr import OpenRouterOCRMixin
 from .classification import OpenRouterClassificationMixin
+from .batching import RequestBatcher
+from .concurrency import AdaptiveConcurrencyLimiter, DEFAULT_INITIAL_LIMIT, get_ai_limiter
 
 logger = logging.getLogger(__name__)
 
 # KI-Pipeline Backpressure-Kontrolle
-# Begrenzt parallele KI-Aufrufe um Server-Ueberlastung zu vermeiden
-DEFAULT_MAX_CONCURRENT_AI_CALLS = 8
-_ai_semaphore: Optional[threading.Semaphore] = None
+# Parallele KI-Aufrufe werden adaptiv begrenzt (siehe concurrency.py);
+# DEFAULT_MAX_CONCURRENT_AI_CALLS ist nur noch der Startwert.
+DEFAULT_MAX_CONCURRENT_AI_CALLS = DEFAULT_INITIAL_LIMIT
 _ai_semaphore_lock = threading.Lock()
 _ai_queue_depth = 0  # Monitoring: Anzahl wartender Aufrufe
 
 
-def get_ai_semaphore(max_concurrent: int = DEFAULT_MAX_CONCURRENT_AI_CALLS) -> threading.Semaphore:
+def get_ai_semaphore(max_concurrent: int = DEFAULT_MAX_CONCURRENT_AI_CALLS) -> AdaptiveConcurrencyLimiter:
     """
-    Gibt die globale KI-Semaphore zurueck (Singleton).
+    Gibt den globalen KI-Limiter zurueck (Singleton).
     
-    Begrenzt die Anzahl gleichzeitiger KI-Aufrufe fuer Backpressure-Kontrolle.
+    Abwaertskompatibel zur frueheren festen Semaphore (acquire/release).
+    max_concurrent wird ignoriert, das Limit passt sich selbst an.
     """
-    global _ai_semaphore
-    with _ai_semaphore_lock:
-        if _ai_semaphore is None:
-            _ai_semaphore = threading.Semaphore(max_concurrent)
-            logger.info(f"KI-Semaphore initialisiert: max {max_concurrent} parallele Aufrufe")
-    return _ai_semaphore
+    return get_ai_limiter()
+
+
+def get_ai_concurrency_limit() -> int:
+    """Aktuelles Limit paralleler KI-Aufrufe (Monitoring)."""
+    return get_ai_limiter().get_limit()
+
+
+def get_ai_latency_histogram() -> List[Tuple[Optional[int], int]]:
+    """Latenz-Histogramm der KI-Aufrufe: [(Obergrenze_ms | None, Anzahl), ...]."""
+    return get_ai_limiter().get_latency_histogram()
+
+
+def get_ai_concurrency_stats() -> dict:
+    """
+    Momentaufnahme fuer die Verarbeitungsanzeige.
+    
+    Returns:
+        dict mit limit, in_flight, waiting, queue_depth, p50_ms, p95_ms,
+        rate_limited, server_errors, paused_for_s, histogram
+    """
+    stats = get_ai_limiter().get_stats()
+    stats['queue_depth'] = get_ai_queue_depth()
+    stats['histogram'] = get_ai_latency_histogram()
+    return stats
 
 
 def get_ai_queue_depth() -> int:
@@ -92,6 +114,10 @@ class OpenRouterClient(OpenRouterOCRMixin, OpenRouterClassificationMixin):
         self.api_client = api_client
         self._api_key: Optional[str] = None
         self._session = requests.Session()
+        # Triage/Stufe-1-Requests paralleler Worker werden gebuendelt; nur
+        # waehrend paralleler Laeufe aktiv (set_request_batching), sonst
+        # kostet das Sammelfenster jeden Einzel-Request Wartezeit
+        self._request_batcher: Optional[RequestBatcher] = None
         
         self._cost_calculator = None
         try:
@@ -155,6 +181,47 @@ class OpenRouterClient(OpenRouterOCRMixin, OpenRouterClassificationMixin):
             logger.warning(f"Fehler beim Abrufen der Credits (Proxy): {e}")
             return None
     
+    def get_batching_stats(self) -> Optional[dict]:
+        """Kosten/Latenz pro Dokument: gebuendelte vs. einzelne Requests."""
+        if self._request_batcher is None:
+            return None
+        return self._request_batcher.get_stats()
+    
+    def set_request_batching(self, enabled: bool) -> None:
+        """Schaltet das Buendeln ein (frische Statistik) oder aus.
+        
+        Nur sinnvoll, wenn mehrere Worker gleichzeitig klassifizieren;
+        ein einzelner Aufrufer wuerde nur das Sammelfenster abwarten.
+        """
+        self._request_batcher = RequestBatcher() if enabled else None
+    
+    def _build_proxy_payload(self, messages: List[dict], model: str,
+                             response_format: Optional[dict], max_tokens: int) -> dict:
+        """Proxy-Payload: Server fuegt API-Key hinzu."""
+        proxy_payload = {
+            "messages": messages,
+            "model": model,
+            "max_tokens": max_tokens
+        }
+        if response_format:
+            proxy_payload["response_format"] = response_format
+        return proxy_payload
+    
+    @staticmethod
+    def _unwrap_proxy_response(response: dict) -> dict:
+        """Server-Proxy gibt KI-Antwort in 'data' zurueck."""
+        if response.get('success') and response.get('data'):
+            data = response['data']
+            cost_info = data.get('_cost', {})
+            if cost_info.get('provider'):
+                logger.info(f"KI-Request via Provider: {cost_info['provider']}")
+            return data
+        
+        # Fehler vom Proxy
+        error_msg = response.get('error', 'Unbekannter Proxy-Fehler')
+        logger.error(f"AI-Proxy Fehler: {error_msg}")
+        raise APIError(f"AI-Proxy Fehler: {error_msg}")
+    
     def _openrouter_request(self, messages: List[dict], model: str = DEFAULT_VISION_MODEL,
                             response_format: dict = None, max_tokens: int = 4096) -> dict:
         """
@@ -163,7 +230,7 @@ class OpenRouterClient(OpenRouterOCRMixin, OpenRouterClassificationMixin):
         Der Server-Proxy (POST /ai/classify) injiziert den API-Key serverseitig
         und reduziert PII aus dem Text (SV-013).
         
-        BACKPRESSURE: Verwendet Semaphore um parallele KI-Aufrufe zu begrenzen.
+        BACKPRESSURE: Parallele KI-Aufrufe begrenzt der adaptive KI-Limiter.
         
         Args:
             messages: Chat-Nachrichten
@@ -177,8 +244,8 @@ class OpenRouterClient(OpenRouterOCRMixin, OpenRouterClassificationMixin):
         Raises:
             APIError: Bei Proxy- oder OpenRouter-Fehlern
         """
-        # BACKPRESSURE: Semaphore verwenden
-        semaphore = get_ai_semaphore()
+        # BACKPRESSURE: adaptiver Limiter, Permit pro Versuch
+        limiter = get_ai_limiter()
         _increment_queue_depth()
         queue_depth = get_ai_queue_depth()
         
@@ -187,21 +254,15 @@ class OpenRouterClient(OpenRouterOCRMixin, OpenRouterClassificationMixin):
         
         logger.debug(f"OpenRouter Proxy Request: model={model}, messages={len(messages)}, queue_depth={queue_depth}")
         
-        # Proxy-Payload: Server fuegt API-Key hinzu
-        proxy_payload = {
-            "messages": messages,
-            "model": model,
-            "max_tokens": max_tokens
-        }
-        if response_format:
-            proxy_payload["response_format"] = response_format
+        proxy_payload = self._build_proxy_payload(messages, model, response_format, max_tokens)
         
         last_error = None
         
-        # Semaphore erwerben (blockiert wenn zu viele parallele Aufrufe)
-        semaphore.acquire()
         try:
             for attempt in range(MAX_RETRIES):
+                # Permit erwerben (blockiert wenn zu viele parallele Aufrufe)
+                limiter.acquire()
+                start = time.monotonic()
                 try:
                     # SV-004: Ueber unseren Server-Proxy statt direkt an OpenRouter
                     response = self.api_client.post(
@@ -209,24 +270,12 @@ class OpenRouterClient(OpenRouterOCRMixin, OpenRouterClassificationMixin):
                         json_data=proxy_payload,
                         timeout=150
                     )
-                    
-                    # Server-Proxy gibt KI-Antwort in 'data' zurueck
-                    if response.get('success') and response.get('data'):
-                        data = response['data']
-                        cost_info = data.get('_cost', {})
-                        if cost_info.get('provider'):
-                            logger.info(f"KI-Request via Provider: {cost_info['provider']}")
-                        return data
-                    
-                    # Fehler vom Proxy
-                    error_msg = response.get('error', 'Unbekannter Proxy-Fehler')
-                    logger.error(f"AI-Proxy Fehler: {error_msg}")
-                    raise APIError(f"AI-Proxy Fehler: {error_msg}")
-                    
                 except APIError as e:
+                    limiter.record_result(time.monotonic() - start, e.status_code, e.retry_after)
+                    limiter.release()
                     # Retryable Status Codes
-                    if hasattr(e, 'status_code') and e.status_code in RETRY_STATUS_CODES:
-                        wait_time = RETRY_BACKOFF_FACTOR * (attempt + 1)
+                    if e.status_code in RETRY_STATUS_CODES:
+                        wait_time = max(RETRY_BACKOFF_FACTOR * (attempt + 1), e.retry_after or 0)
                         logger.warning(
                             f"AI-Proxy HTTP {e.status_code}, "
                             f"Retry {attempt + 1}/{MAX_RETRIES} in {wait_time:.1f}s"
@@ -236,6 +285,8 @@ class OpenRouterClient(OpenRouterOCRMixin, OpenRouterClassificationMixin):
                     raise
                     
                 except requests.RequestException as e:
+                    limiter.record_result(time.monotonic() - start, 0)
+                    limiter.release()
                     last_error = e
                     wait_time = RETRY_BACKOFF_FACTOR * (attempt + 1)
                     logger.warning(
@@ -243,11 +294,18 @@ class OpenRouterClient(OpenRouterOCRMixin, OpenRouterClassificationMixin):
                         f"Retry {attempt + 1}/{MAX_RETRIES} in {wait_time:.1f}s"
                     )
                     time.sleep(wait_time)
+                    
+                except BaseException:
+                    limiter.release()
+                    raise
+                
+                limiter.record_result(time.monotonic() - start, 200)
+                limiter.release()
+                return self._unwrap_proxy_response(response)
             
             # Alle Retries fehlgeschlagen
             logger.error(f"AI-Proxy nach {MAX_RETRIES} Versuchen nicht erreichbar")
             raise APIError(f"AI-Proxy dauerhaft nicht erreichbar: {last_error}")
         finally:
-            # BACKPRESSURE: Semaphore freigeben und Queue-Tiefe verringern
-            semaphore.release()
+            # BACKPRESSURE: Queue-Tiefe verringern
             _decrement_queue_depth()
@@ -0,0 +1,288 @@
+"""
+Adaptive Begrenzung paralleler KI-Aufrufe.
+
+Ersetzt die feste KI-Semaphore (frueher DEFAULT_MAX_CONCURRENT_AI_CALLS=8).
+Das Limit passt sich an die beobachtete Lage beim Provider an:
+
+- Latenz: Steigt der Median deutlich ueber den bisher besten Wert, wird das
+  Limit leicht gesenkt. Bleibt die Latenz stabil und ist das Limit
+  ausgeschoepft, wird es um 1 erhoeht (additiv).
+- 429: Limit multiplikativ senken; ein Retry-After-Header pausiert die
+  Vergabe neuer Permits bis zum angegebenen Zeitpunkt.
+- 5xx / Netzwerkfehler: Ab einer Fehlerquote im Fenster Limit senken.
+
+Permits werden von Threads angefordert (acquire/release, kompatibel zu
+threading.Semaphore). Wartende werden in FIFO-Reihenfolge bedient.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INITIAL_LIMIT = 8
+DEFAULT_MIN_LIMIT = 2
+DEFAULT_MAX_LIMIT = 32
+
+# Erfolgreiche Requests zwischen zwei Latenz-Bewertungen
+ADJUST_EVERY_N = 20
+# Median > Bestwert * Faktor gilt als Ueberlast
+LATENCY_DEGRADATION_FACTOR = 2.0
+# Mindestabstand zwischen zwei Absenkungen (ein 429-Schwall zaehlt einmal)
+DECREASE_COOLDOWN_S = 2.0
+# Fehlerquote (5xx/Netzwerk) im Fenster, ab der gesenkt wird
+ERROR_RATE_THRESHOLD = 0.25
+ERROR_WINDOW = 20
+
+# Histogramm-Grenzen in ms (letzter Bucket: alles darueber)
+LATENCY_BUCKETS_MS = (500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class _Waiter:
+    __slots__ = ('event', 'granted', 'abandoned')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+        self.abandoned = False
+
+    def grant(self) -> None:
+        self.granted = True
+        self.event.set()
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Thread-safe Permit-Vergabe mit adaptivem Limit (AIMD + Latenz).
+
+    Verwendung:
+        limiter.acquire()
+        start = time.monotonic()
+        try:
+            ... request ...
+            limiter.record_result(time.monotonic() - start, status_code)
+        finally:
+            limiter.release()
+    """
+
+    def __init__(self, initial_limit: int = DEFAULT_INITIAL_LIMIT,
+                 min_limit: int = DEFAULT_MIN_LIMIT,
+                 max_limit: int = DEFAULT_MAX_LIMIT,
+                 adjust_every: int = ADJUST_EVERY_N):
+        self._min_limit = max(1, min_limit)
+        self._max_limit = max(self._min_limit, max_limit)
+        self._limit = min(self._max_limit, max(self._min_limit, initial_limit))
+        self._adjust_every = max(1, adjust_every)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._paused_until = 0.0
+        self._resume_timer: Optional[threading.Timer] = None
+
+        self._latencies: deque = deque(maxlen=100)
+        self._outcomes: deque = deque(maxlen=ERROR_WINDOW)
+        self._histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._baseline_p50: Optional[float] = None
+        self._successes_since_adjust = 0
+        self._peak_in_flight = 0
+        self._last_decrease = 0.0
+        self._rate_limited = 0
+        self._server_errors = 0
+
+    # ── Permits ───────────────────────────────────────────────────────────
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """Permit anfordern (Thread). Signatur wie threading.Semaphore.acquire."""
+        waiter = _Waiter()
+        with self._lock:
+            if not self._waiters and self._can_grant_locked():
+                self._grant_locked(waiter)
+                return True
+            if not blocking:
+                return False
+            self._waiters.append(waiter)
+        waiter.event.wait(timeout)
+        with self._lock:
+            if waiter.granted:
+                return True
+            waiter.abandoned = True
+            return False
+
+    def release(self) -> None:
+        """Permit zurueckgeben."""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._dispatch_locked()
+
+    # ── Rueckmeldung ──────────────────────────────────────────────────────
+
+    def record_result(self, latency_s: Optional[float], status_code: int = 200,
+                      retry_after: Optional[float] = None) -> None:
+        """
+        Meldet das Ergebnis eines Versuchs.
+
+        Args:
+            latency_s: Dauer des Versuchs (None wenn unbekannt)
+            status_code: HTTP-Status (0 = Netzwerkfehler/Timeout)
+            retry_after: Sekunden aus dem Retry-After-Header
+        """
+        now = time.monotonic()
+        with self._lock:
+            if latency_s is not None:
+                self._add_latency_locked(latency_s)
+
+            if status_code == 429:
+                self._rate_limited += 1
+                self._outcomes.append(True)
+                self._decrease_locked(0.7, now, 'HTTP 429')
+            elif status_code == 0 or status_code >= 500:
+                self._server_errors += 1
+                self._outcomes.append(True)
+                errors = sum(self._outcomes)
+                if (len(self._outcomes) >= 5
+                        and errors / len(self._outcomes) > ERROR_RATE_THRESHOLD):
+                    self._decrease_locked(0.8, now, f'Fehlerquote {errors}/{len(self._outcomes)}')
+                    self._outcomes.clear()
+            else:
+                self._outcomes.append(False)
+                self._successes_since_adjust += 1
+                if self._successes_since_adjust >= self._adjust_every:
+                    self._adjust_for_latency_locked(now)
+
+            if retry_after and retry_after > 0:
+                self._paused_until = max(self._paused_until, now + retry_after)
+                self._schedule_resume_locked(retry_after)
+                logger.warning(f"KI-Provider: Retry-After {retry_after:.1f}s, neue Aufrufe pausiert")
+
+            self._dispatch_locked()
+
+    # ── Monitoring ────────────────────────────────────────────────────────
+
+    def get_limit(self) -> int:
+        return self._limit
+
+    def get_latency_histogram(self) -> List[Tuple[Optional[int], int]]:
+        """Liste von (Obergrenze_ms | None fuer Rest, Anzahl)."""
+        with self._lock:
+            counts = list(self._histogram)
+        bounds: List[Optional[int]] = list(LATENCY_BUCKETS_MS) + [None]
+        return list(zip(bounds, counts))
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            paused_for = max(0.0, self._paused_until - time.monotonic())
+            return {
+                'limit': self._limit,
+                'in_flight': self._in_flight,
+                'waiting': sum(1 for w in self._waiters if not w.abandoned),
+                'p50_ms': _ms(_percentile(latencies, 50)),
+                'p95_ms': _ms(_percentile(latencies, 95)),
+                'rate_limited': self._rate_limited,
+                'server_errors': self._server_errors,
+                'paused_for_s': round(paused_for, 1),
+            }
+
+    # ── Intern ────────────────────────────────────────────────────────────
+
+    def _can_grant_locked(self) -> bool:
+        return self._in_flight < self._limit and time.monotonic() >= self._paused_until
+
+    def _grant_locked(self, waiter: _Waiter) -> None:
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        waiter.grant()
+
+    def _dispatch_locked(self) -> None:
+        while self._waiters and self._can_grant_locked():
+            waiter = self._waiters.popleft()
+            if waiter.abandoned:
+                continue
+            self._grant_locked(waiter)
+
+    def _schedule_resume_locked(self, delay: float) -> None:
+        if self._resume_timer is not None:
+            self._resume_timer.cancel()
+        timer = threading.Timer(delay, self._on_resume)
+        timer.daemon = True
+        self._resume_timer = timer
+        timer.start()
+
+    def _on_resume(self) -> None:
+        with self._lock:
+            self._resume_timer = None
+            self._dispatch_locked()
+
+    def _add_latency_locked(self, latency_s: float) -> None:
+        self._latencies.append(latency_s)
+        latency_ms = latency_s * 1000
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self._histogram[i] += 1
+                break
+        else:
+            self._histogram[-1] += 1
+
+    def _decrease_locked(self, factor: float, now: float, reason: str) -> None:
+        if now - self._last_decrease < DECREASE_COOLDOWN_S:
+            return
+        self._last_decrease = now
+        new_limit = max(self._min_limit, int(self._limit * factor))
+        if new_limit != self._limit:
+            logger.info(f"KI-Parallelitaet: {self._limit} -> {new_limit} ({reason})")
+            self._limit = new_limit
+        self._successes_since_adjust = 0
+        self._peak_in_flight = self._in_flight
+
+    def _adjust_for_latency_locked(self, now: float) -> None:
+        recent = sorted(list(self._latencies)[-self._adjust_every:])
+        p50 = _percentile(recent, 50)
+        saturated = self._peak_in_flight >= self._limit
+        self._successes_since_adjust = 0
+        self._peak_in_flight = self._in_flight
+        if p50 is None:
+            return
+
+        if self._baseline_p50 is None or p50 < self._baseline_p50:
+            self._baseline_p50 = p50
+        else:
+            # Bestwert altert langsam, damit dauerhaft laengere Prompts
+            # nicht als Ueberlast gelten
+            self._baseline_p50 *= 1.05
+
+        if p50 > self._baseline_p50 * LATENCY_DEGRADATION_FACTOR:
+            self._decrease_locked(0.9, now, f'Latenz p50 {p50 * 1000:.0f}ms')
+        elif saturated and self._limit < self._max_limit:
+            self._limit += 1
+            logger.info(f"KI-Parallelitaet: {self._limit - 1} -> {self._limit} (Latenz stabil)")
+
+
+def _ms(value: Optional[float]) -> Optional[int]:
+    return int(value * 1000) if value is not None else None
+
+
+_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_ai_limiter() -> AdaptiveConcurrencyLimiter:
+    """Gibt den prozessweiten KI-Limiter zurueck (Singleton)."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveConcurrencyLimiter()
+            logger.info(
+                f"KI-Limiter initialisiert: Start {_limiter.get_limit()} parallele Aufrufe "
+                f"(adaptiv {DEFAULT_MIN_LIMIT}-{DEFAULT_MAX_LIMIT})"
+            )
+        return _limiter
@@ -109,14 +109,30 @@ class OpenRouterOCRMixin:
                 pytesseract.pytesseract.tesseract_cmd = tess_path
                 break
         
+        from services.page_text_cache import (
+            get_page_text_cache, page_content_hash, ocr_cache_key,
+        )
+        page_cache = get_page_text_cache()
+        ocr_lang = 'deu+eng'
+
         try:
             doc = fitz.open(pdf_path)
             num_pages = min(len(doc), max_pages)
             all_text = []
-            
+            cache_hits = 0
+
             for page_num in range(num_pages):
                 page = doc[page_num]
-                
+
+                # Seiten-Cache: identische Seiten nicht erneut OCRen
+                cache_key = ocr_cache_key(page_content_hash(page), dpi, ocr_lang)
+                cached_text = page_cache.get(cache_key) if cache_key else None
+                if cached_text is not None:
+                    cache_hits += 1
+                    if cached_text.strip():
+                        all_text.append(cached_text.strip())
+                    continue
+
                 # Seite zu Bild rendern (150 DPI fuer gute OCR-Qualitaet)
                 mat = fitz.Matrix(dpi / 72, dpi / 72)
                 pix = page.get_pixmap(matrix=mat)
@@ -127,19 +143,25 @@ class OpenRouterOCRMixin:
                 
                 # Tesseract OCR (deutsch + englisch)
                 page_text = pytesseract.image_to_string(
-                    pil_image, 
-                    lang='deu+eng',
+                    pil_image,
+                    lang=ocr_lang,
                     config='--psm 3'  # Fully automatic page segmentation
                 )
-                
+
+                if cache_key:
+                    page_cache.put(cache_key, page_text)
+
                 if page_text.strip():
                     all_text.append(page_text.strip())
-            
+
             doc.close()
-            
+
             result = '\n\n'.join(all_text)
             if result:
-                logger.info(f"Lokale OCR (Tesseract): {len(result)} Zeichen aus {num_pages} Seite(n)")
+                logger.info(
+                    f"Lokale OCR (Tesseract): {len(result)} Zeichen aus {num_pages} Seite(n)"
+                    f"{f', {cache_hits} aus Cache' if cache_hits else ''}"
+                )
             else:
                 logger.debug(f"Lokale OCR: kein Text erkannt in {num_pages} Seite(n)")
             
@@ -9,6 +9,8 @@ import logging
 import re
 from typing import Optional
 
+from utils.keyword_matcher import contains_keyword, register_keyword_source, scan_keywords
+
 logger = logging.getLogger(__name__)
 
 
@@ -148,11 +150,31 @@ _SPARTEN_CODE_MAP = {
 }
 
 
+# Kategorien im gemeinsamen Keyword-Matcher (utils.keyword_matcher)
+_HINT_KEYWORD_TABLES = {
+    'hint_courtage': _COURTAGE_KEYWORDS,
+    'hint_sach': _SACH_KEYWORDS,
+    'hint_leben': _LEBEN_KEYWORDS,
+    'hint_kranken': _KRANKEN_KEYWORDS,
+    'hint_mahnung': _MAHNUNG_KEYWORDS,
+    'hint_sparten_code': _SPARTEN_CODE_MAP,
+    'hint_kontoauszug': ['kontoauszug'],
+    'hint_provision': ['provision', 'courtage'],
+}
+
+_HINT_CONFLICT_CATEGORIES = (
+    'hint_courtage', 'hint_sach', 'hint_leben', 'hint_kranken',
+    'hint_mahnung', 'hint_kontoauszug',
+)
+
+register_keyword_source('openrouter_hints', lambda: _HINT_KEYWORD_TABLES)
+
+
 def _build_keyword_hints(text: str) -> str:
     """Generiert Hint-String NUR bei Keyword-Konflikten oder bekannten Problemmustern.
     
     Bei eindeutigen oder keinen Keywords: leerer String (0 extra Tokens).
-    Laeuft lokal auf bereits extrahiertem Text (~0.1ms reine CPU-Arbeit).
+    Laeuft lokal auf bereits extrahiertem Text (ein Matcher-Aufruf).
     
     Konflikt-Faelle:
     - Courtage-Keyword + Leben/Sach/Kranken-Keyword gleichzeitig
@@ -169,16 +191,17 @@ def _build_keyword_hints(text: str) -> str:
     if not text:
         return ''
     
-    text_lower = text.lower()
+    # Ein Aufruf fuer die Konflikt-Tabellen; Sparten-Codes und Provision
+    # werden wie frueher nur bei Bedarf gesucht
+    hits = scan_keywords(text, _HINT_CONFLICT_CATEGORIES)
 
-    found_courtage = [kw for kw in _COURTAGE_KEYWORDS if kw in text_lower]
-    found_sach = [kw for kw in _SACH_KEYWORDS if kw in text_lower]
-    found_leben = [kw for kw in _LEBEN_KEYWORDS if kw in text_lower]
-    found_kranken = [kw for kw in _KRANKEN_KEYWORDS if kw in text_lower]
-    found_mahnung = [kw for kw in _MAHNUNG_KEYWORDS if kw in text_lower]
-    has_kontoauszug_provision = (
-        'kontoauszug' in text_lower
-        and ('provision' in text_lower or 'courtage' in text_lower)
+    found_courtage = hits['hint_courtage']
+    found_sach = hits['hint_sach']
+    found_leben = hits['hint_leben']
+    found_kranken = hits['hint_kranken']
+    found_mahnung = hits['hint_mahnung']
+    has_kontoauszug_provision = bool(
+        hits['hint_kontoauszug'] and contains_keyword(text, 'hint_provision')
     )
 
     hints = []
@@ -204,11 +227,11 @@ def _build_keyword_hints(text: str) -> str:
     elif found_mahnung and not found_courtage:
         sparte_from_code = None
         matched_code = None
-        for code, sparte in _SPARTEN_CODE_MAP.items():
-            if code in text_lower:
-                sparte_from_code = sparte
-                matched_code = code.strip()
-                break
+        codes = scan_keywords(text, ('hint_sparten_code',))['hint_sparten_code']
+        if codes:
+            code = codes[0]
+            sparte_from_code = _SPARTEN_CODE_MAP[code]
+            matched_code = code.strip()
         if sparte_from_code:
             hints.append(
                 f'Mahnung/Rueckstandsliste ("{found_mahnung[0]}") mit '
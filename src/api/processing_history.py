@@ -7,7 +7,7 @@ Jeder Verarbeitungsschritt eines Dokuments wird protokolliert.
 
 import logging
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 from contextlib import contextmanager
 
@@ -139,6 +139,45 @@ class ProcessingHistoryAPI:
         Returns:
             ID des neuen Eintrags oder None bei Fehler
         """
+        payload = self.build_payload(
+            document_id, action, new_status,
+            previous_status=previous_status,
+            action_details=action_details,
+            success=success,
+            error_message=error_message,
+            classification_source=classification_source,
+            classification_result=classification_result,
+            duration_ms=duration_ms
+        )
+        
+        return self.create_from_payload(payload)
+    
+    def create_from_payload(self, payload: Dict) -> Optional[int]:
+        """
+        Legt einen mit build_payload() vorbereiteten Eintrag an.
+        
+        Returns:
+            ID des neuen Eintrags oder None bei Fehler
+        """
+        response = self.client.post(f'{self._endpoint}/create', json_data=payload)
+        
+        if response and response.get('success'):
+            return response.get('data', {}).get('id')
+        
+        return None
+    
+    @staticmethod
+    def build_payload(document_id: Optional[int],
+                      action: str,
+                      new_status: str,
+                      previous_status: Optional[str] = None,
+                      action_details: Optional[Dict] = None,
+                      success: bool = True,
+                      error_message: Optional[str] = None,
+                      classification_source: Optional[str] = None,
+                      classification_result: Optional[str] = None,
+                      duration_ms: Optional[int] = None) -> Dict:
+        """Baut den Request-Body fuer einen History-Eintrag."""
         payload = {
             'document_id': document_id,
             'action': action,
@@ -158,13 +197,7 @@ class ProcessingHistoryAPI:
             payload['classification_result'] = classification_result
         if duration_ms is not None:
             payload['duration_ms'] = duration_ms
-        
-        response = self.client.post(f'{self._endpoint}/create', json_data=payload)
-        
-        if response and response.get('success'):
-            return response.get('data', {}).get('id')
-        
-        return None
+        return payload
     
     def get_stats(self, 
                   from_date: Optional[str] = None,
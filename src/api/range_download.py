@@ -0,0 +1,521 @@
+"""
+Fortsetzbare Downloads mit HTTP-Range.
+
+Bisher wurde in 8-KB-Bloecken direkt in die Zieldatei geschrieben; brach die
+Verbindung bei einer grossen Datei ab, wurde die Teildatei geloescht und der
+Download begann von vorn.
+
+Der RangeDownloader
+- schreibt in eine Teildatei '<schluessel>.part' (plus '.part.json' mit
+  URL/ETag/Groesse) unter %LOCALAPPDATA%/ACENCIA-ATLAS/downloads/ und
+  verschiebt sie erst nach erfolgreicher Pruefung ans Ziel; im Zielordner
+  des Benutzers bleiben so keine Teildateien liegen,
+- setzt abgebrochene Downloads per 'Range: bytes=<offset>-' fort (auch ueber
+  Programmstarts hinweg, 'If-Range' schuetzt vor geaenderten Dateien),
+- passt die Blockgroesse an den Durchsatz an (64 KB bis 4 MB),
+- prueft Groesse (Content-Length/Content-Range bzw. erwartete Groesse) und
+  optional den SHA256 (ein abweichender SHA256 bei korrekter Groesse wird nur
+  protokolliert: ein zweiter Download lieferte dieselben Bytes),
+- laedt sehr grosse Dateien in parallelen Segmenten, wenn der Server
+  'Accept-Ranges: bytes' meldet,
+- kann ohne Teildatei direkt in ein Dateiobjekt schreiben
+  (download_to_fileobj, z.B. fuer ZIP-Exporte).
+
+Server ohne Range-Unterstuetzung antworten mit 200 statt 206; dann wird die
+Teildatei verworfen und normal geladen.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+# Ziel-Dauer pro Leseaufruf fuer die adaptive Blockgroesse
+TARGET_CHUNK_SECONDS = 0.25
+# Fortsetzungen nach Abbruechen waehrend der Uebertragung
+MAX_RESUMES = 5
+RESUME_BACKOFF_S = 1.0
+# Ab dieser Groesse parallele Segmente (nur mit Accept-Ranges)
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+PARALLEL_SEGMENTS = 4
+
+PART_SUFFIX = '.part'
+META_SUFFIX = '.part.json'
+# Nicht fortgesetzte Teildateien werden nach dieser Zeit entfernt
+STALE_PART_SECONDS = 7 * 24 * 3600
+
+_stale_parts_checked = False
+
+_CONTENT_RANGE_RE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+
+# Fehler waehrend des Lesens des Bodys (Verbindung weg, Timeout)
+_STREAM_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class DownloadError(Exception):
+    """Download fehlgeschlagen (status_code 0 = Netzwerk/Pruefung)."""
+
+    def __init__(self, message: str, status_code: int = 0):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class _AdaptiveChunk:
+    """Blockgroesse, die sich am gemessenen Durchsatz orientiert."""
+
+    def __init__(self):
+        self.size = MIN_CHUNK_SIZE
+
+    def update(self, elapsed: float) -> None:
+        if elapsed < TARGET_CHUNK_SECONDS / 2 and self.size < MAX_CHUNK_SIZE:
+            self.size = min(MAX_CHUNK_SIZE, self.size * 2)
+        elif elapsed > TARGET_CHUNK_SECONDS * 2 and self.size > MIN_CHUNK_SIZE:
+            self.size = max(MIN_CHUNK_SIZE, self.size // 2)
+
+
+class _HashingWriter:
+    """Schreibt in ein Dateiobjekt und fuehrt SHA256 und Laenge mit."""
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self.digest = hashlib.sha256()
+        self.written = 0
+
+    def write(self, data: bytes) -> None:
+        self._fileobj.write(data)
+        self.digest.update(data)
+        self.written += len(data)
+
+    def reset(self) -> None:
+        self._fileobj.seek(0)
+        self._fileobj.truncate()
+        self.digest = hashlib.sha256()
+        self.written = 0
+
+
+def get_part_dir() -> Path:
+    """Verzeichnis fuer Teildateien (beim ersten Aufruf werden alte entfernt)."""
+    global _stale_parts_checked
+    if os.name == 'nt':
+        base = Path(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')))
+    else:
+        base = Path.home() / '.local' / 'share'
+    part_dir = base / 'ACENCIA-ATLAS' / 'downloads'
+    part_dir.mkdir(parents=True, exist_ok=True)
+    if not _stale_parts_checked:
+        _stale_parts_checked = True
+        _remove_stale_parts(part_dir)
+    return part_dir
+
+
+def _remove_stale_parts(part_dir: Path) -> None:
+    cutoff = time.time() - STALE_PART_SECONDS
+    for path in part_dir.glob('*' + PART_SUFFIX + '*'):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def _parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    match = _CONTENT_RANGE_RE.match(value or '')
+    if not match:
+        return None
+    total = None if match.group(3) == '*' else int(match.group(3))
+    return int(match.group(1)), int(match.group(2)), total
+
+
+class RangeDownloader:
+    """
+    Laedt eine URL fortsetzbar in eine Zieldatei.
+
+    Args:
+        request: Funktion (method, url, headers) -> requests.Response mit
+            stream=True (APIClient kapselt Timeout, SSL und Retries)
+        progress_callback: (geladene Bytes, Gesamt-Bytes oder 0)
+        part_dir: Verzeichnis fuer Teildateien (Standard: get_part_dir())
+    """
+
+    def __init__(self, request: Callable[[str, str, Dict[str, str]], requests.Response],
+                 progress_callback: Optional[Callable[[int, int], None]] = None,
+                 parallel_min_bytes: int = PARALLEL_MIN_BYTES,
+                 parallel_segments: int = PARALLEL_SEGMENTS,
+                 part_dir: Optional[str] = None):
+        self._request = request
+        self._part_dir = part_dir
+        self._progress_callback = progress_callback
+        self._parallel_min_bytes = parallel_min_bytes
+        self._parallel_segments = max(1, parallel_segments)
+        self._progress_lock = threading.Lock()
+        self._done_bytes = 0
+        self._total = 0
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def download(self, url: str, target_path: str, headers: Dict[str, str],
+                 expected_size: Optional[int] = None,
+                 expected_sha256: Optional[str] = None) -> int:
+        """
+        Laedt url nach target_path.
+
+        Returns:
+            Anzahl Bytes der fertigen Datei
+
+        Raises:
+            DownloadError: HTTP-Fehler (status_code gesetzt) oder Pruefung fehlgeschlagen
+        """
+        part_path, meta_path = self._part_paths(url, target_path)
+        meta = self._load_meta(meta_path, url)
+        if meta is None:
+            self._discard(part_path, meta_path)
+            meta = {'url': url}
+
+        for _ in range(2):
+            total = self._download_part(url, part_path, meta_path, meta, headers)
+            size = os.path.getsize(part_path)
+            problem = self._check_size(size, total, expected_size)
+            if problem is None:
+                if expected_sha256 and self._file_sha256(part_path) != expected_sha256.lower():
+                    self._log_sha_mismatch(url)
+                self._move_into_place(part_path, target_path)
+                self._discard(meta_path)
+                return size
+            # Teildatei unbrauchbar (z.B. Datei auf dem Server ersetzt): einmal neu laden
+            logger.warning(f"Download-Pruefung fehlgeschlagen ({problem}), lade neu: {url}")
+            self._discard(part_path, meta_path)
+            meta = {'url': url}
+        raise DownloadError(f"Download-Pruefung fehlgeschlagen: {problem}")
+
+    def download_to_fileobj(self, url: str, fileobj, headers: Dict[str, str],
+                            expected_size: Optional[int] = None,
+                            expected_sha256: Optional[str] = None) -> int:
+        """
+        Laedt url in ein beschreibbares, seekbares Dateiobjekt (ohne Teildatei).
+
+        Abbrueche werden per Range ab der bereits geschriebenen Position
+        fortgesetzt; der SHA256 wird beim Schreiben berechnet. Bei falscher
+        Groesse wird fileobj geleert und einmal neu geladen.
+
+        Returns:
+            Anzahl geschriebener Bytes
+
+        Raises:
+            DownloadError: HTTP-Fehler (status_code gesetzt) oder Pruefung fehlgeschlagen
+        """
+        for _ in range(2):
+            fileobj.seek(0)
+            fileobj.truncate()
+            writer = _HashingWriter(fileobj)
+            total = self._stream_body(url, writer, headers)
+            problem = self._check_size(writer.written, total, expected_size)
+            if problem is None:
+                if expected_sha256 and writer.digest.hexdigest() != expected_sha256.lower():
+                    self._log_sha_mismatch(url)
+                return writer.written
+            logger.warning(f"Download-Pruefung fehlgeschlagen ({problem}), lade neu: {url}")
+        raise DownloadError(f"Download-Pruefung fehlgeschlagen: {problem}")
+
+    # ── Intern ────────────────────────────────────────────────────────────
+
+    def _stream_body(self, url: str, writer: '_HashingWriter',
+                     headers: Dict[str, str]) -> Optional[int]:
+        """Schreibt den Body nach writer; liefert die Gesamtgroesse (falls bekannt)."""
+        etag = None
+        total = None
+        resumes = 0
+        while True:
+            request_headers = dict(headers)
+            if writer.written:
+                request_headers['Range'] = f'bytes={writer.written}-'
+                if etag:
+                    request_headers['If-Range'] = etag
+            response = self._request('GET', url, request_headers)
+            try:
+                if response.status_code >= 400:
+                    raise DownloadError(
+                        f"Download fehlgeschlagen: {response.status_code}",
+                        status_code=response.status_code,
+                    )
+                if response.status_code == 206:
+                    content_range = _parse_content_range(response.headers.get('Content-Range'))
+                    if content_range is None or content_range[0] != writer.written:
+                        raise DownloadError("Unerwarteter Content-Range")
+                    total = content_range[2]
+                else:
+                    if writer.written:
+                        # Range ignoriert/neue Version: Hash laesst sich nicht zurueckrechnen
+                        logger.info(f"Server ignoriert Range, lade komplett: {url}")
+                        writer.reset()
+                    length = response.headers.get('Content-Length')
+                    total = int(length) if length and length.isdigit() else None
+                    etag = response.headers.get('ETag')
+                self._set_progress(writer.written, total or 0)
+                try:
+                    self._copy_body(response, writer)
+                    return total
+                except _STREAM_ERRORS as e:
+                    resumes += 1
+                    if resumes > MAX_RESUMES:
+                        raise DownloadError(f"Download abgebrochen nach {resumes} Versuchen: {e}")
+                    logger.warning(
+                        f"Download unterbrochen bei {writer.written} Bytes, setze fort "
+                        f"({resumes}/{MAX_RESUMES}): {e}"
+                    )
+                    time.sleep(RESUME_BACKOFF_S * resumes)
+            finally:
+                response.close()
+
+    def _download_part(self, url: str, part_path: str, meta_path: str,
+                       meta: dict, headers: Dict[str, str]) -> Optional[int]:
+        """Fuellt part_path vollstaendig; liefert die Gesamtgroesse (falls bekannt)."""
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        total = meta.get('total')
+        if offset and total and offset >= total:
+            return total
+        resumes = 0
+        while True:
+            request_headers = dict(headers)
+            if offset:
+                request_headers['Range'] = f'bytes={offset}-'
+                if meta.get('etag'):
+                    request_headers['If-Range'] = meta['etag']
+            response = self._request('GET', url, request_headers)
+            try:
+                if response.status_code == 416 and offset:
+                    # Teildatei passt nicht (mehr) zum Server-Stand
+                    logger.info(f"Range nicht erfuellbar, lade neu: {url}")
+                    self._truncate(part_path)
+                    offset = 0
+                    meta.pop('etag', None)
+                    continue
+                if response.status_code >= 400:
+                    raise DownloadError(
+                        f"Download fehlgeschlagen: {response.status_code}",
+                        status_code=response.status_code,
+                    )
+
+                if response.status_code == 206:
+                    content_range = _parse_content_range(response.headers.get('Content-Range'))
+                    if content_range is None or content_range[0] != offset:
+                        logger.info(f"Unerwarteter Content-Range, lade neu: {url}")
+                        self._truncate(part_path)
+                        offset = 0
+                        continue
+                    total = content_range[2]
+                else:
+                    # 200: Server liefert komplette Datei (Range ignoriert/neue Version)
+                    if offset:
+                        logger.info(f"Server ignoriert Range, lade komplett: {url}")
+                    offset = 0
+                    length = response.headers.get('Content-Length')
+                    total = int(length) if length and length.isdigit() else None
+                    meta['etag'] = response.headers.get('ETag')
+                    meta['total'] = total
+                    self._save_meta(meta_path, meta)
+                    if (total and total >= self._parallel_min_bytes
+                            and response.headers.get('Accept-Ranges', '').lower() == 'bytes'):
+                        response.close()
+                        self._download_parallel(url, part_path, headers, meta, total)
+                        return total
+
+                self._set_progress(offset, total or 0)
+                mode = 'ab' if offset else 'wb'
+                try:
+                    with open(part_path, mode) as f:
+                        self._copy_body(response, f)
+                    return total
+                except _STREAM_ERRORS as e:
+                    offset = os.path.getsize(part_path)
+                    resumes += 1
+                    if resumes > MAX_RESUMES:
+                        raise DownloadError(f"Download abgebrochen nach {resumes} Versuchen: {e}")
+                    logger.warning(
+                        f"Download unterbrochen bei {offset} Bytes, setze fort "
+                        f"({resumes}/{MAX_RESUMES}): {e}"
+                    )
+                    time.sleep(RESUME_BACKOFF_S * resumes)
+            finally:
+                response.close()
+
+    def _copy_body(self, response: requests.Response, f, limit: Optional[int] = None) -> int:
+        chunk = _AdaptiveChunk()
+        written = 0
+        while limit is None or written < limit:
+            size = chunk.size if limit is None else min(chunk.size, limit - written)
+            started = time.monotonic()
+            data = response.raw.read(size, decode_content=True)
+            if not data:
+                break
+            f.write(data)
+            written += len(data)
+            chunk.update(time.monotonic() - started)
+            self._add_progress(len(data))
+        return written
+
+    def _download_parallel(self, url: str, part_path: str, headers: Dict[str, str],
+                           meta: dict, total: int) -> None:
+        """Laedt total Bytes in parallelen Range-Segmenten in eine vorab angelegte Datei."""
+        with open(part_path, 'wb') as f:
+            f.truncate(total)
+        segment_size = -(-total // self._parallel_segments)
+        segments = [
+            (start, min(total, start + segment_size) - 1)
+            for start in range(0, total, segment_size)
+        ]
+        logger.debug(f"Paralleler Download in {len(segments)} Segmenten: {url}")
+        self._set_progress(0, total)
+        with ThreadPoolExecutor(max_workers=len(segments),
+                                thread_name_prefix="range-download") as executor:
+            futures = [
+                executor.submit(self._download_segment, url, part_path, headers, meta, start, end)
+                for start, end in segments
+            ]
+            errors = [future.exception() for future in futures]
+        failed = [e for e in errors if e is not None]
+        if failed:
+            # Segmentstand wird nicht persistiert -> beim naechsten Versuch neu
+            os.remove(part_path)
+            raise failed[0]
+
+    def _download_segment(self, url: str, part_path: str, headers: Dict[str, str],
+                          meta: dict, start: int, end: int) -> None:
+        position = start
+        resumes = 0
+        while position <= end:
+            request_headers = dict(headers)
+            request_headers['Range'] = f'bytes={position}-{end}'
+            if meta.get('etag'):
+                request_headers['If-Range'] = meta['etag']
+            response = self._request('GET', url, request_headers)
+            try:
+                content_range = _parse_content_range(response.headers.get('Content-Range'))
+                if response.status_code != 206 or content_range is None or content_range[0] != position:
+                    raise DownloadError(
+                        f"Segment-Download fehlgeschlagen: {response.status_code}",
+                        status_code=response.status_code if response.status_code >= 400 else 0,
+                    )
+                try:
+                    with open(part_path, 'r+b') as f:
+                        f.seek(position)
+                        position += self._copy_body(response, f, limit=end - position + 1)
+                except _STREAM_ERRORS as e:
+                    resumes += 1
+                    if resumes > MAX_RESUMES:
+                        raise DownloadError(f"Segment abgebrochen nach {resumes} Versuchen: {e}")
+                    time.sleep(RESUME_BACKOFF_S * resumes)
+            finally:
+                response.close()
+
+    @staticmethod
+    def _check_size(size: int, total: Optional[int], expected_size: Optional[int]) -> Optional[str]:
+        """Returns: Problembeschreibung oder None."""
+        if total is not None and size != total:
+            return f"Groesse {size} statt {total}"
+        if expected_size and size != expected_size:
+            return f"Groesse {size} statt erwartet {expected_size}"
+        return None
+
+    @staticmethod
+    def _file_sha256(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(MAX_CHUNK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _log_sha_mismatch(url: str) -> None:
+        # Groesse und Uebertragung stimmen; ein erneuter Download lieferte
+        # dieselben Bytes -> der gespeicherte Hash ist veraltet (z.B. Altbestand)
+        logger.warning(f"SHA256 stimmt nicht bei korrekter Groesse, Datei wird ohne erneuten Download uebernommen: {url}")
+
+    def _part_paths(self, url: str, target_path: str) -> Tuple[str, str]:
+        """Teildatei und Metadaten je (URL, Zielpfad) im Teildatei-Verzeichnis."""
+        part_dir = Path(self._part_dir) if self._part_dir else get_part_dir()
+        key = hashlib.sha256(f'{os.path.abspath(target_path)}\n{url}'.encode('utf-8')).hexdigest()[:32]
+        return str(part_dir / (key + PART_SUFFIX)), str(part_dir / (key + META_SUFFIX))
+
+    @staticmethod
+    def _move_into_place(part_path: str, target_path: str) -> None:
+        """Verschiebt die fertige Teildatei ans Ziel (auch ueber Laufwerksgrenzen)."""
+        try:
+            os.replace(part_path, target_path)
+            return
+        except OSError:
+            pass
+        # Anderes Laufwerk: unter temporaerem Namen kopieren, dann atomar umbenennen
+        tmp_path = target_path + '.tmp'
+        try:
+            shutil.copyfile(part_path, tmp_path)
+            os.replace(tmp_path, target_path)
+        except OSError:
+            RangeDownloader._discard(tmp_path)
+            raise
+        RangeDownloader._discard(part_path)
+
+    def _set_progress(self, done: int, total: int) -> None:
+        with self._progress_lock:
+            self._done_bytes = done
+            self._total = total
+        if self._progress_callback is not None:
+            self._progress_callback(done, total)
+
+    def _add_progress(self, count: int) -> None:
+        with self._progress_lock:
+            self._done_bytes += count
+            done, total = self._done_bytes, self._total
+        if self._progress_callback is not None:
+            self._progress_callback(done, total)
+
+    @staticmethod
+    def _truncate(part_path: str) -> None:
+        with open(part_path, 'wb'):
+            pass
+
+    @staticmethod
+    def _load_meta(meta_path: str, url: str) -> Optional[dict]:
+        """Metadaten einer Teildatei (None wenn fremd/fehlend)."""
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get('url') == url else None
+
+    @staticmethod
+    def _save_meta(meta_path: str, meta: dict) -> None:
+        try:
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        except OSError as e:
+            logger.debug(f"Download-Metadaten nicht schreibbar: {e}")
+
+    @staticmethod
+    def _discard(*paths: str) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug(f"Teildatei nicht entfernbar {path}: {e}")
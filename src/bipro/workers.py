@@ -518,6 +518,7 @@ class MailImportWorker(QThread):
     phase_changed = Signal(str, int)    # (phase_title, total_items) - neuer Progress-Toast
     completed = Signal(dict)            # Ergebnis-Statistiken
     error = Signal(str)                 # Fehlermeldung
+    upload_bytes = Signal(object, object)  # (gesendete Bytes, Gesamt-Bytes) je Anhang
     
     MAX_WORKERS = 4
 
@@ -607,9 +608,11 @@ class MailImportWorker(QThread):
 
         return jobs, errors
 
-    def _upload_single(self, file_path: str, box_type: str = None):
+    def _upload_single(self, file_path: str, box_type: str = None, progress_callback=None):
         """Thread-safe Upload einer einzelnen Datei mit per-Thread API-Client.
         
+        Die Datei wird gestreamt (nicht komplett in den Speicher gelesen).
+        
         Returns:
             (filename, success, doc_or_error_str)
         """
@@ -626,9 +629,10 @@ class MailImportWorker(QThread):
             docs_api = self._thread_apis[tid]
 
             if box_type:
-                doc = docs_api.upload(file_path, 'mail', box_type=box_type)
+                doc = docs_api.upload(file_path, 'mail', box_type=box_type,
+                                      progress_callback=progress_callback)
             else:
-                doc = docs_api.upload(file_path, 'mail')
+                doc = docs_api.upload(file_path, 'mail', progress_callback=progress_callback)
             if doc:
                 # Fruehe Text-Extraktion fuer Inhaltsduplikat-Erkennung
                 if box_type != 'roh':
@@ -670,10 +674,20 @@ class MailImportWorker(QThread):
             first_doc_id = None
             upload_success = False
             
+            from api.multipart_stream import AggregateUploadProgress
+            total_bytes = 0
+            for fp, _ in upload_jobs:
+                try:
+                    total_bytes += os.path.getsize(fp)
+                except OSError:
+                    pass
+            bytes_tracker = AggregateUploadProgress(total_bytes, self.upload_bytes.emit)
+            
             num_workers = min(self.MAX_WORKERS, max(1, len(upload_jobs)))
             with ThreadPoolExecutor(max_workers=num_workers) as executor:
                 futures = {
-                    executor.submit(self._upload_single, fp, bt): (fp, bt)
+                    executor.submit(self._upload_single, fp, bt,
+                                    bytes_tracker.callback_for(fp)): (fp, bt)
                     for fp, bt in upload_jobs
                 }
                 for future in as_completed(futures):
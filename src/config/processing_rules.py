@@ -18,6 +18,8 @@ BiPRO-Kategorien basierend auf SmartAdmin/IWM FinanzOffice Analyse (2026-02-04):
 from typing import Dict, List, Any, Optional
 from enum import Enum
 
+from utils.keyword_matcher import contains_keyword, register_keyword_source
+
 
 # ============================================================================
 # PDF VALIDATION STATUS / REASON CODES
@@ -428,6 +430,24 @@ PROCESSING_RULES: Dict[str, Any] = {
     # Verzoegerung zwischen Dokumenten (in Sekunden)
     # Um API-Rate-Limits zu vermeiden
     "processing_delay": 1.0,
+
+    # Lokaler Vorklassifikator vor der Sparten-KI (services/local_classifier.py)
+    # Eindeutige Dokumente werden ohne KI-Aufruf klassifiziert
+    "local_classifier_enabled": True,
+    # Mindest-Wahrscheinlichkeit fuer eine lokale Entscheidung
+    "local_classifier_threshold": 0.95,
+    # Mindestanzahl KI-Beispiele pro Label, bevor lokal entschieden wird
+    "local_classifier_min_samples": 5,
+    # Jede n-te sichere Vorhersage trotzdem per KI pruefen (0 = nie)
+    "local_classifier_audit_every": 10,
+
+    # Beinahe-Duplikate (SimHash-Index, services/near_duplicate_index.py)
+    # Klassifikation eines fast identischen archivierten Dokuments uebernehmen
+    "near_duplicate_enabled": True,
+    # Max. abweichende Bits im 64-Bit-SimHash (hoechstens 3)
+    "near_duplicate_max_distance": 3,
+    # Mindest-Textlaenge fuer einen Fingerprint
+    "near_duplicate_min_chars": 300,
 }
 
 
@@ -505,6 +525,88 @@ def get_bipro_download_config(key: str, default: Any = None, vu_name: str = None
     return value
 
 
+# ============================================================================
+# LOKALER DOKUMENT-CACHE
+# Inhaltsadressierter Blob-Cache fuer heruntergeladene Dokumente
+# (services/blob_cache.py): Vorschau, Verarbeitung, Duplikat-Vergleich,
+# Smart!Scan und Downloads teilen sich eine lokale, verschluesselte Kopie
+# ============================================================================
+
+DOCUMENT_BLOB_CACHE_CONFIG = {
+    # False = jeder Verbraucher laedt selbst (altes Verhalten)
+    'enabled': True,
+    
+    # Maximale Cache-Groesse in MB (aelteste Zugriffe werden zuerst entfernt)
+    'max_size_mb': 1024,
+}
+
+
+# ============================================================================
+# VORSCHAU-CACHE
+# Vorschau-Dateien im Archiv (services/preview_cache.py) mit Groessenlimit;
+# beim Durchblaettern werden die naechsten Dokumente vorab geladen
+# ============================================================================
+
+PREVIEW_CACHE_CONFIG = {
+    # Maximale Cache-Groesse in MB (aelteste Zugriffe werden zuerst entfernt)
+    'max_size_mb': 500,
+    
+    # Anzahl nachfolgender Dokumente (aktuelle Sortierung), die nach dem
+    # Oeffnen einer Vorschau im Hintergrund geladen werden (0 = aus)
+    'prefetch_count': 3,
+    
+    # Groessere Dateien werden nicht vorab geladen
+    'prefetch_max_file_mb': 25,
+}
+
+
+# ============================================================================
+# THUMBNAIL-CACHE (PDF-Viewer)
+# Gerenderte Seiten-Thumbnails je Datei-Hash, Seite und Drehung
+# (services/thumbnail_cache.py)
+# ============================================================================
+
+THUMBNAIL_CACHE_CONFIG = {
+    # False = Thumbnails werden bei jedem Oeffnen neu gerendert
+    'enabled': True,
+    
+    # Maximale Cache-Groesse in MB (am laengsten ungenutzte Dokumente zuerst)
+    'max_size_mb': 200,
+}
+
+
+# ============================================================================
+# WARM-START ARCHIV-CACHE
+# Dokumentliste + Box-Statistiken werden verschluesselt auf Platte abgelegt
+# (services/warm_cache.py) und beim Start sofort angezeigt; der normale
+# Auto-Refresh gleicht danach im Hintergrund mit dem Server ab.
+# ============================================================================
+
+ARCHIVE_WARM_CACHE_CONFIG = {
+    # False = Archiv startet leer und wartet auf den ersten Server-Abgleich
+    'enabled': True,
+    
+    # Aeltere Dateien werden beim Start verworfen (Stunden)
+    'max_age_hours': 72,
+    
+    # Mindestabstand zwischen zwei Speichervorgaengen nach Auto-Refreshes
+    # (Sekunden); beim Beenden wird immer gespeichert
+    'save_interval_seconds': 300,
+}
+
+
+# ============================================================================
+# LOKALER SUCHINDEX (ATLAS Index)
+# SQLite-FTS5-Index ueber Dateinamen (services/search_index.py);
+# Offline-Suche, wenn der Server nicht erreichbar ist
+# ============================================================================
+
+LOCAL_SEARCH_INDEX_CONFIG = {
+    # False = keine Offline-Suche (altes Verhalten)
+    'enabled': True,
+}
+
+
 def get_rule(key: str, default: Any = None) -> Any:
     """
     Holt eine Regel aus der Konfiguration.
@@ -525,25 +627,35 @@ def is_gdv_extension(extension: str) -> bool:
     return ext in PROCESSING_RULES.get("gdv_extensions", [])
 
 
+# Keyword-Tabellen aus PROCESSING_RULES fuer den gemeinsamen Matcher
+RULE_KEYWORD_CATEGORIES = (
+    "courtage_keywords",
+    "leben_keywords",
+    "sach_keywords",
+    "kranken_keywords",
+)
+
+
+def _rule_keyword_tables() -> Dict[str, List[str]]:
+    return {key: PROCESSING_RULES.get(key, []) for key in RULE_KEYWORD_CATEGORIES}
+
+
+register_keyword_source("processing_rules", _rule_keyword_tables)
+
+
 def is_courtage_keyword(text: str) -> bool:
     """Prueft ob der Text Courtage-Schluesselwoerter enthaelt."""
-    text_lower = text.lower()
-    keywords = PROCESSING_RULES.get("courtage_keywords", [])
-    return any(kw.lower() in text_lower for kw in keywords)
+    return contains_keyword(text, "courtage_keywords")
 
 
 def is_leben_keyword(text: str) -> bool:
     """Prueft ob der Text Leben-Schluesselwoerter enthaelt."""
-    text_lower = text.lower()
-    keywords = PROCESSING_RULES.get("leben_keywords", [])
-    return any(kw.lower() in text_lower for kw in keywords)
+    return contains_keyword(text, "leben_keywords")
 
 
 def is_sach_keyword(text: str) -> bool:
     """Prueft ob der Text Sach-Schluesselwoerter enthaelt."""
-    text_lower = text.lower()
-    keywords = PROCESSING_RULES.get("sach_keywords", [])
-    return any(kw.lower() in text_lower for kw in keywords)
+    return contains_keyword(text, "sach_keywords")
 
 
 def is_bipro_courtage_code(bipro_category: str) -> bool:
@@ -8,7 +8,8 @@ nie von konkreten Implementierungen.
 
 from __future__ import annotations
 
-from typing import Protocol, Optional, List, Dict, Tuple, Any, runtime_checkable, TYPE_CHECKING
+import threading
+from typing import Protocol, Optional, List, Dict, Tuple, Any, Callable, runtime_checkable, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from services.zip_handler import ZipExtractResult
@@ -38,6 +39,7 @@ class IDocumentRepository(Protocol):
         limit: int = 200,
         include_raw: bool = False,
         substring: bool = False,
+        cancel_event: Optional[threading.Event] = None,
     ) -> List[SearchResult]: ...
 
     def get_box_stats(self) -> BoxStats: ...
@@ -46,11 +48,13 @@ class IDocumentRepository(Protocol):
         self, file_path: str, *,
         source_type: str = 'manual_upload',
         box_type: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
     ) -> Optional[Document]: ...
 
     def download(
         self, doc_id: int, target_dir: str, *,
         filename_override: Optional[str] = None,
+        content_hash: Optional[str] = None,
     ) -> Optional[str]: ...
 
     def delete(self, doc_id: int) -> bool: ...
@@ -292,6 +292,7 @@ ATLAS_INDEX_SEARCH_BUTTON = "Suchen"
 ATLAS_INDEX_INCLUDE_RAW = "XML/GDV einbeziehen"
 ATLAS_INDEX_SUBSTRING_SEARCH = "Teiltreffer anzeigen"
 ATLAS_INDEX_RESULTS_COUNT = "{count} Treffer"
+ATLAS_INDEX_MORE_RESULTS_COUNT = "{count}+ Treffer (weitere beim Scrollen)"
 ATLAS_INDEX_NO_RESULTS = "Keine Dokumente gefunden"
 ATLAS_INDEX_ENTER_QUERY = "Suchbegriff eingeben..."
 ATLAS_INDEX_MIN_CHARS = "Mindestens 3 Zeichen eingeben(Zu grosse abfragen vermeiden)"
@@ -299,6 +300,8 @@ ATLAS_INDEX_SEARCHING = "Suche laeuft..."
 ATLAS_INDEX_SHOW_IN_BOX = "In Box anzeigen"
 ATLAS_INDEX_RESULT_ARCHIVED = "Archiviert"
 ATLAS_INDEX_NO_TEXT = "Kein Textinhalt verfuegbar"
+ATLAS_INDEX_OFFLINE_RESULTS_COUNT = "{count} Treffer (offline: nur Dateinamen durchsucht, Dokumenttexte erst wieder mit Serververbindung)"
+ATLAS_INDEX_OFFLINE_FILENAME_ONLY = "Offline-Treffer im Dateinamen, Dokumenttext nicht durchsucht"
 ATLAS_INDEX_PREVIEW = "Vorschau"
 ATLAS_INDEX_DOWNLOAD = "Herunterladen"
 
@@ -1096,6 +1099,7 @@ DUPLICATE_COMPARE_CONFIRM_DELETE = "Soll dieses Dokument wirklich geloescht werd
 # === Worker-/UseCase-Fehlermeldungen ===
 WORKER_HISTORY_LOAD_ERROR = "Historie konnte nicht geladen werden"
 WORKER_UPLOAD_FAILED = "Upload fehlgeschlagen"
+WORKER_UPLOAD_BYTES = "{sent_mb:.1f} / {total_mb:.1f} MB hochgeladen"
 WORKER_DOWNLOAD_FAILED = "Download fehlgeschlagen"
 WORKER_SMARTSCAN_START_ERROR = "Versand konnte nicht gestartet werden."
 WORKER_SMARTSCAN_CHUNK_ERROR = "Chunk-Verarbeitung nach Retries fehlgeschlagen."
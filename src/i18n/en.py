@@ -1083,6 +1083,7 @@ DUPLICATE_COMPARE_CONFIRM_DELETE = "Really delete this document?\n\n{filename}"
 # === Worker/UseCase error messages ===
 WORKER_HISTORY_LOAD_ERROR = "History could not be loaded"
 WORKER_UPLOAD_FAILED = "Upload failed"
+WORKER_UPLOAD_BYTES = "{sent_mb:.1f} / {total_mb:.1f} MB uploaded"
 WORKER_DOWNLOAD_FAILED = "Download failed"
 WORKER_SMARTSCAN_START_ERROR = "Sending could not be started."
 WORKER_SMARTSCAN_CHUNK_ERROR = "Chunk processing failed after retries."
@@ -1041,6 +1041,7 @@ DUPLICATE_COMPARE_CONFIRM_DELETE = "Удалить этот документ?\n\
 # === Сообщения воркеров ===
 WORKER_HISTORY_LOAD_ERROR = "Ошибка загрузки истории"
 WORKER_UPLOAD_FAILED = "Ошибка загрузки"
+WORKER_UPLOAD_BYTES = "{sent_mb:.1f} / {total_mb:.1f} МБ загружено"
 WORKER_DOWNLOAD_FAILED = "Ошибка скачивания"
 WORKER_SMARTSCAN_START_ERROR = "Не удалось начать отправку."
 WORKER_SMARTSCAN_CHUNK_ERROR = "Ошибка обработки блока после повторов."
@@ -7,9 +7,10 @@ und Domain-Entitaeten wo noetig.
 """
 
 import logging
-from typing import Optional, List, Dict, Tuple, Any
+import threading
+from typing import Optional, List, Dict, Tuple, Any, Callable
 
-from api.client import APIClient
+from api.client import APIClient, APIError
 from api.documents import DocumentsAPI, Document, BoxStats, SearchResult
 
 logger = logging.getLogger(__name__)
@@ -45,11 +46,56 @@ class DocumentRepository:
         limit: int = 200,
         include_raw: bool = False,
         substring: bool = False,
+        cancel_event: Optional[threading.Event] = None,
     ) -> List[SearchResult]:
-        return self._api.search_documents(
-            query, limit=limit,
-            include_raw=include_raw, substring=substring,
-        )
+        """Sucht auf dem Server; ohne Verbindung offline im lokalen Dateinamen-Index.
+        
+        Die Offline-Suche findet nur Dateinamen (services/search_index.py),
+        ihre Treffer sind mit offline=True markiert. HTTP-Fehler des Servers
+        werden weitergereicht. Ein gesetztes cancel_event bricht die Suche ab
+        ([] als Ergebnis, keine Offline-Suche).
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            return []
+        try:
+            results = self._api.search_documents(
+                query, limit=limit,
+                include_raw=include_raw, substring=substring,
+            )
+        except APIError as e:
+            if cancel_event is not None and cancel_event.is_set():
+                return []
+            index = self._get_local_search_index() if e.status_code == 0 else None
+            if index is None:
+                raise
+            logger.info(f"ATLAS Index: Server nicht erreichbar ({e}), Offline-Suche in Dateinamen")
+            return self._search_local(index, query, limit, include_raw, substring, cancel_event)
+        if cancel_event is not None and cancel_event.is_set():
+            return []
+        return results
+
+    def _get_local_search_index(self):
+        try:
+            from services.search_index import get_local_search_index
+            return get_local_search_index(self._client.base_url)
+        except Exception as e:
+            logger.debug(f"Lokaler Suchindex nicht verfuegbar: {e}")
+            return None
+
+    def _search_local(self, index, query: str, limit: int, include_raw: bool,
+                      substring: bool,
+                      cancel_event: Optional[threading.Event] = None) -> List[SearchResult]:
+        """Offline-Treffer; Dokument-Metadaten kommen aus dem DataCacheService."""
+        from services.data_cache import get_cache_service
+
+        cache = get_cache_service(self._client)
+        doc_ids = index.search(query, limit=limit, include_raw=include_raw, substring=substring,
+                               cancel_event=cancel_event)
+        documents = {doc.id: doc for doc in cache.get_documents_by_ids(doc_ids)}
+        return [
+            SearchResult(document=documents[doc_id], relevance_score=10, offline=True)
+            for doc_id in doc_ids if doc_id in documents
+        ]
 
     def get_box_stats(self) -> BoxStats:
         return self._api.get_box_stats()
@@ -58,16 +104,20 @@ class DocumentRepository:
         self, file_path: str, *,
         source_type: str = 'manual_upload',
         box_type: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
     ) -> Optional[Document]:
         if box_type:
-            return self._api.upload(file_path, source_type, box_type=box_type)
-        return self._api.upload(file_path, source_type)
+            return self._api.upload(file_path, source_type, box_type=box_type,
+                                    progress_callback=progress_callback)
+        return self._api.upload(file_path, source_type, progress_callback=progress_callback)
 
     def download(
         self, doc_id: int, target_dir: str, *,
         filename_override: Optional[str] = None,
+        content_hash: Optional[str] = None,
     ) -> Optional[str]:
-        return self._api.download(doc_id, target_dir, filename_override=filename_override)
+        return self._api.download(doc_id, target_dir, filename_override=filename_override,
+                                  expected_sha256=content_hash)
 
     def delete(self, doc_id: int) -> bool:
         return self._api.delete(doc_id)
@@ -237,12 +237,9 @@ def remove_empty_pages(pdf_path: str, doc_id: int, docs_api) -> bool:
             logger.debug(f"Leere-Seiten-Zaehler Update fehlgeschlagen fuer {doc_id}")
 
         try:
-            import glob as _glob
+            from services.preview_cache import get_preview_cache
 
-            cache_dir = os.path.join(tempfile.gettempdir(), "bipro_preview_cache")
-            for cached in _glob.glob(os.path.join(cache_dir, f"{doc_id}_*")):
-                os.unlink(cached)
-                logger.debug(f"Vorschau-Cache invalidiert: {cached}")
+            get_preview_cache().remove_document(doc_id)
         except Exception:
             pass
 
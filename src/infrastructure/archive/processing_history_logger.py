@@ -75,6 +75,11 @@ def log_batch_complete(history_api,
             'cost_pending': True
         }
 
+        if batch_result.time_to_first_result_s is not None:
+            action_details['time_to_first_result_s'] = round(batch_result.time_to_first_result_s, 2)
+            action_details['time_to_last_result_s'] = round(batch_result.time_to_last_result_s, 2)
+        if batch_result.lane_stats:
+            action_details['lane_stats'] = batch_result.lane_stats
         if batch_result.credits_before is not None:
             action_details['credits_before_usd'] = round(batch_result.credits_before, 6)
         if batch_result.total_cost_usd is not None and batch_result.total_cost_usd > 0:
@@ -11,6 +11,7 @@ from pathlib import Path
 import os
 import logging
 import tempfile
+import threading
 
 from PySide6.QtCore import Qt, Signal, QThread
 
@@ -48,7 +49,7 @@ class CacheDocumentLoadWorker(QThread):
     """Worker zum Laden von Dokumenten ueber den zentralen Cache-Service.
 
     Laedt ALLE Dokumente in einem API-Call in den Cache,
-    filtert dann client-seitig nach box_type und is_archived.
+    filtert dann ueber den Cache-Index nach box_type und is_archived.
     """
     finished = Signal(list)
     error = Signal(str)
@@ -65,12 +66,9 @@ class CacheDocumentLoadWorker(QThread):
         try:
             docs = self._cache.get_documents(
                 box_type=self.box_type,
-                force_refresh=self.force_refresh
+                force_refresh=self.force_refresh,
+                is_archived=self.is_archived
             )
-            if self.is_archived is True:
-                docs = [d for d in docs if d.is_archived]
-            elif self.is_archived is False:
-                docs = [d for d in docs if not d.is_archived]
             self.finished.emit(docs)
         except Exception as e:
             self.error.emit(str(e))
@@ -131,7 +129,8 @@ class MultiUploadWorker(QThread):
     """Worker zum Hochladen mehrerer Dateien via UploadDocument UseCase.
 
     Phase 1: Alle ZIPs/MSGs rekursiv entpacken -> flache Job-Liste
-    Phase 2: Parallele Uploads via ThreadPoolExecutor (max. 5 gleichzeitig)
+    Phase 2: Parallele Uploads via ThreadPoolExecutor (max. 5 gleichzeitig),
+             Dateien werden gestreamt (nicht komplett in den Speicher gelesen)
     """
     MAX_UPLOAD_WORKERS = 5
 
@@ -139,6 +138,7 @@ class MultiUploadWorker(QThread):
     file_error = Signal(str, str)
     all_finished = Signal(int, int)
     progress = Signal(int, int, str)
+    bytes_progress = Signal(object, object)  # (gesendete Bytes, Gesamt-Bytes)
 
     def __init__(self, api_client: APIClient, file_paths: list, source_type: str):
         super().__init__()
@@ -243,7 +243,8 @@ class MultiUploadWorker(QThread):
 
             from usecases.archive.upload_document import UploadDocument
             uc = UploadDocument(repo)
-            result = uc.execute(path, source_type=source_type, box_type=box_type)
+            result = uc.execute(path, source_type=source_type, box_type=box_type,
+                                progress_callback=self._bytes_tracker.callback_for(path))
 
             if result.success and result.document:
                 if box_type != 'roh':
@@ -270,6 +271,15 @@ class MultiUploadWorker(QThread):
         total = len(jobs)
         self.progress.emit(0, total, "")
 
+        from api.multipart_stream import AggregateUploadProgress
+        total_bytes = 0
+        for path, _ in jobs:
+            try:
+                total_bytes += os.path.getsize(path)
+            except OSError:
+                pass
+        self._bytes_tracker = AggregateUploadProgress(total_bytes, self.bytes_progress.emit)
+
         for name, error in self._errors:
             self.file_error.emit(name, error)
 
@@ -309,19 +319,22 @@ class PreviewDownloadWorker(QThread):
 
     Optimierungen:
     - filename_override: Spart get_document() API-Call
-    - cache_dir: Persistenter Cache fuer Vorschauen
+    - cache_dir: Persistenter Cache fuer Vorschauen (services/preview_cache.py)
+    - content_hash: Datei aus dem lokalen Blob-Cache statt Download
     """
     download_finished = Signal(object)
     download_error = Signal(str)
 
     def __init__(self, docs_api: DocumentsAPI, doc_id: int, target_dir: str,
-                 filename: str = None, cache_dir: str = None):
+                 filename: str = None, cache_dir: str = None,
+                 content_hash: str = None):
         super().__init__()
         self.docs_api = docs_api
         self.doc_id = doc_id
         self.target_dir = target_dir
         self.filename = filename
         self.cache_dir = cache_dir
+        self.content_hash = content_hash
         self._cancelled = False
 
     def cancel(self):
@@ -345,8 +358,12 @@ class PreviewDownloadWorker(QThread):
             cache_name = safe_cache_filename(self.doc_id, self.filename) if self.cache_dir and self.filename else self.filename
             result = self.docs_api.download(
                 self.doc_id, download_dir,
-                filename_override=cache_name
+                filename_override=cache_name,
+                expected_sha256=self.content_hash
             )
+            if result and self.cache_dir:
+                from services.preview_cache import get_preview_cache
+                get_preview_cache().add(result)
 
             if self._cancelled:
                 self.download_finished.emit(None)
@@ -356,6 +373,51 @@ class PreviewDownloadWorker(QThread):
             self.download_error.emit(str(e))
 
 
+class PreviewPrefetchWorker(QThread):
+    """Laedt Vorschau-Dateien der naechsten Dokumente vorab in den Vorschau-Cache.
+
+    Laeuft nacheinander (ein Download gleichzeitig), damit die Leitung fuer
+    eine explizit geoeffnete Vorschau frei bleibt. current_doc_id gibt an,
+    welches Dokument gerade geladen wird; document_ready meldet jede Datei
+    (Pfad '' = fehlgeschlagen), bevor current_doc_id zurueckgesetzt wird.
+    """
+    document_ready = Signal(int, str)  # doc_id, Pfad
+
+    def __init__(self, docs_api: DocumentsAPI, documents: list, cache):
+        super().__init__()
+        self.docs_api = docs_api
+        self.documents = list(documents)
+        self._cache = cache
+        self._cancelled = False
+        self.current_doc_id: Optional[int] = None
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        for doc in self.documents:
+            if self._cancelled:
+                break
+            if self._cache.get(doc.id, doc.original_filename):
+                continue
+            self.current_doc_id = doc.id
+            try:
+                result = self.docs_api.download(
+                    doc.id, self._cache.root,
+                    filename_override=os.path.basename(
+                        self._cache.path_for(doc.id, doc.original_filename)),
+                    expected_sha256=doc.content_hash,
+                )
+            except Exception as e:
+                logger.debug(f"Vorschau-Prefetch fehlgeschlagen fuer Dokument {doc.id}: {e}")
+                result = None
+            if result:
+                self._cache.add(result)
+                logger.debug(f"Vorschau vorab geladen: {doc.original_filename}")
+            self.document_ready.emit(doc.id, result or '')
+            self.current_doc_id = None
+
+
 class MultiDownloadWorker(QThread):
     """Worker zum Herunterladen mehrerer Dateien via DownloadDocument UseCase.
 
@@ -415,26 +477,43 @@ class MultiDownloadWorker(QThread):
 
 
 class BoxDownloadWorker(QThread):
-    """Worker zum Herunterladen aller Dokumente einer Box."""
+    """Worker zum Herunterladen aller Dokumente einer Box.
+
+    Dokumente werden parallel geladen (max. MAX_DOWNLOAD_WORKERS gleichzeitig,
+    je Thread ein eigener APIClient wie beim MultiUploadWorker).
+
+    ZIP-Modus: Jede Antwort wird in einen SpooledTemporaryFile-Puffer
+    gestreamt (bis SPOOL_MAX_BYTES im Speicher) und sofort als Eintrag in
+    das ZIP geschrieben - kein Temp-Ordner, kein erneutes Einlesen.
+    Bereits komprimierte Formate (PDF, Bilder, Office) werden unkomprimiert
+    gespeichert. Bei Abbruch enthaelt das ZIP die fertigen Dokumente.
+    """
+    MAX_DOWNLOAD_WORKERS = 6
+    SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
     progress = Signal(int, int, str)
     finished = Signal(int, int, list, list)
     status = Signal(str)
     error = Signal(str)
 
     def __init__(self, docs_api: DocumentsAPI, box_type: str,
-                 target_path: str, mode: str = 'folder'):
+                 target_path: str, mode: str = 'folder',
+                 max_workers: int = MAX_DOWNLOAD_WORKERS):
         super().__init__()
         self.docs_api = docs_api
         self.box_type = box_type
         self.target_path = target_path
         self.mode = mode
+        self.max_workers = max(1, max_workers)
         self._cancelled = False
+        self._thread_local = threading.local()
 
     def cancel(self):
         self._cancelled = True
 
     def run(self):
         import zipfile
+        from concurrent.futures import ThreadPoolExecutor, as_completed
 
         try:
             documents = self.docs_api.list_documents(
@@ -451,54 +530,56 @@ class BoxDownloadWorker(QThread):
             fehler = 0
             fehler_liste = []
             erfolgreiche_doc_ids = []
+            names = self._unique_names(documents)
 
+            zf = None
+            zip_lock = threading.Lock()
             if self.mode == 'zip':
-                temp_dir = tempfile.mkdtemp(prefix='bipro_box_download_')
-                download_dir = temp_dir
-            else:
-                download_dir = self.target_path
-                os.makedirs(download_dir, exist_ok=True)
-
-            for i, doc in enumerate(documents):
-                if self._cancelled:
-                    break
-
-                self.progress.emit(i + 1, total, doc.original_filename)
-
                 try:
-                    result = self.docs_api.download(
-                        doc.id, download_dir,
-                        filename_override=doc.original_filename
-                    )
-                    if result:
-                        erfolgreiche_doc_ids.append(doc.id)
-                        erfolge += 1
-                    else:
-                        from i18n.de import WORKER_DOWNLOAD_FAILED
-                        fehler_liste.append(f"{doc.original_filename}: {WORKER_DOWNLOAD_FAILED}")
-                        fehler += 1
-                except Exception as e:
-                    fehler_liste.append(f"{doc.original_filename}: {str(e)}")
-                    fehler += 1
+                    zf = zipfile.ZipFile(self.target_path, 'w', allowZip64=True)
+                except OSError as e:
+                    self.error.emit(f"ZIP-Erstellung fehlgeschlagen: {e}")
+                    return
+            else:
+                os.makedirs(self.target_path, exist_ok=True)
 
-            if self.mode == 'zip' and erfolge > 0 and not self._cancelled:
-                from i18n.de import BOX_DOWNLOAD_CREATING_ZIP
-                self.status.emit(BOX_DOWNLOAD_CREATING_ZIP)
+            try:
+                workers = min(self.max_workers, total)
+                with ThreadPoolExecutor(max_workers=workers,
+                                        thread_name_prefix="box-download") as executor:
+                    futures = {
+                        executor.submit(self._download_one, doc, name, zf, zip_lock): doc
+                        for doc, name in zip(documents, names)
+                    }
+                    done = 0
+                    for future in as_completed(futures):
+                        doc = futures[future]
+                        ok, message = future.result()
+                        if ok is None:
+                            continue  # nach Abbruch uebersprungen
+                        done += 1
+                        self.progress.emit(done, total, doc.original_filename)
+                        if ok:
+                            erfolgreiche_doc_ids.append(doc.id)
+                            erfolge += 1
+                        else:
+                            fehler_liste.append(f"{doc.original_filename}: {message}")
+                            fehler += 1
+            except Exception:
+                if zf is not None:
+                    zf.close()
+                raise
 
+            if zf is not None:
                 try:
-                    with zipfile.ZipFile(self.target_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                        for filename in os.listdir(download_dir):
-                            file_path = os.path.join(download_dir, filename)
-                            if os.path.isfile(file_path):
-                                zf.write(file_path, filename)
+                    zf.close()
                 except Exception as e:
                     self.error.emit(f"ZIP-Erstellung fehlgeschlagen: {e}")
                     return
-                finally:
-                    import shutil
+                if erfolge == 0:
                     try:
-                        shutil.rmtree(temp_dir, ignore_errors=True)
-                    except Exception:
+                        os.remove(self.target_path)
+                    except OSError:
                         pass
 
             self.finished.emit(erfolge, fehler, fehler_liste, erfolgreiche_doc_ids)
@@ -506,6 +587,77 @@ class BoxDownloadWorker(QThread):
         except Exception as e:
             self.error.emit(str(e))
 
+    def _download_one(self, doc, name: str, zf, zip_lock: threading.Lock):
+        """Laedt ein Dokument (Worker-Thread). Returns: (ok oder None=uebersprungen, Fehler)."""
+        if self._cancelled:
+            return None, ''
+        from i18n.de import WORKER_DOWNLOAD_FAILED
+        try:
+            docs_api = self._thread_docs_api()
+            if zf is None:
+                result = docs_api.download(
+                    doc.id, self.target_path,
+                    filename_override=name,
+                    expected_size=doc.file_size or None,
+                    expected_sha256=doc.content_hash
+                )
+                return (True, '') if result else (False, WORKER_DOWNLOAD_FAILED)
+            return self._stream_into_zip(docs_api, doc, name, zf, zip_lock)
+        except Exception as e:
+            return False, str(e)
+
+    def _stream_into_zip(self, docs_api: DocumentsAPI, doc, name: str, zf, zip_lock: threading.Lock):
+        import shutil
+        import time
+        import zipfile
+        from i18n.de import WORKER_DOWNLOAD_FAILED
+        from services.zip_handler import zip_compress_type
+
+        with tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_BYTES) as buffer:
+            if not docs_api.download_to_stream(
+                doc.id, buffer,
+                expected_size=doc.file_size or None,
+                expected_sha256=doc.content_hash
+            ):
+                return False, WORKER_DOWNLOAD_FAILED
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = zip_compress_type(name)
+            info.external_attr = 0o644 << 16
+            info.file_size = buffer.tell()
+            buffer.seek(0)
+            # Ein ZIP kann nur einen Eintrag gleichzeitig schreiben
+            with zip_lock:
+                with zf.open(info, 'w') as entry:
+                    shutil.copyfileobj(buffer, entry, 1024 * 1024)
+        return True, ''
+
+    def _thread_docs_api(self) -> DocumentsAPI:
+        """DocumentsAPI mit eigenem APIClient je Thread (requests.Session ist nicht thread-sicher)."""
+        docs_api = getattr(self._thread_local, 'docs_api', None)
+        if docs_api is None:
+            source = self.docs_api.client
+            client = APIClient(source.config)
+            client.set_token(source._token)
+            docs_api = DocumentsAPI(client)
+            self._thread_local.docs_api = docs_api
+        return docs_api
+
+    @staticmethod
+    def _unique_names(documents) -> List[str]:
+        """Eindeutige Dateinamen (ohne Beachtung der Gross-/Kleinschreibung) je Dokument."""
+        taken = set()
+        names = []
+        for doc in documents:
+            name = Path(doc.original_filename or f"dokument_{doc.id}").name
+            base, ext = os.path.splitext(name)
+            counter = 1
+            while name.lower() in taken:
+                name = f"{base}_{counter}{ext}"
+                counter += 1
+            taken.add(name.lower())
+            names.append(name)
+        return names
+
 
 class CreditsWorker(QThread):
     """Worker zum Abrufen der KI-Provider Credits/Usage."""
@@ -711,33 +863,57 @@ class ProcessingWorker(QThread):
 
 
 class SearchWorker(QThread):
-    """Worker fuer nicht-blockierende ATLAS Index Volltextsuche via SearchDocuments UseCase."""
+    """Worker fuer nicht-blockierende ATLAS Index Volltextsuche via SearchDocuments UseCase.
+
+    Jeder Worker nutzt einen eigenen APIClient (requests.Session ist nicht
+    thread-sicher). cancel() schliesst dessen Session: ein laufender
+    HTTP-Request bricht sofort ab, lokale Abfragen enden ueber das
+    cancel_event, abgebrochene Worker emittieren nichts mehr.
+    """
     finished = Signal(list)
     error = Signal(str)
 
     def __init__(self, repository, query: str, limit: int = 200,
                  include_raw: bool = False, substring: bool = False, parent=None):
         super().__init__(parent)
-        self._repo = repository
+        from infrastructure.archive.document_repository import DocumentRepository
+        source = repository._client
+        self._client = APIClient(source.config)
+        self._client.set_token(source._token)
+        self._repo = DocumentRepository(self._client)
         self.query = query
         self.limit = limit
         self.include_raw = include_raw
         self.substring = substring
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+        self._client.close()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
 
     def run(self):
         try:
             from usecases.archive.search_documents import SearchDocuments
-            uc = SearchDocuments(self._repo)
-            results = uc.execute(
+            results = SearchDocuments(self._repo).execute(
                 self.query,
                 limit=self.limit,
                 include_raw=self.include_raw,
                 substring=self.substring,
+                cancel_event=self._cancel_event,
             )
+            if self.is_cancelled():
+                return
             self.finished.emit(results)
         except Exception as e:
+            if self.is_cancelled():
+                return
             logger.error(f"ATLAS Index Suche fehlgeschlagen: {e}")
             self.error.emit(str(e))
+        finally:
+            self._client.close()
 
 
 class SmartScanWorker(QThread):
@@ -919,6 +1095,7 @@ class AIRenameWorker(QThread):
                     temp_dir = tempfile.mkdtemp(prefix='bipro_ai_')
                     pdf_path = self._repo.download(
                         doc.id, temp_dir, filename_override=doc.original_filename,
+                        content_hash=doc.content_hash,
                     )
 
                     if not pdf_path or not os.path.exists(pdf_path):
@@ -972,6 +1149,7 @@ __all__ = [
     'MissingAiDataWorker',
     'MultiUploadWorker',
     'PreviewDownloadWorker',
+    'PreviewPrefetchWorker',
     'MultiDownloadWorker',
     'BoxDownloadWorker',
     'CreditsWorker',
@@ -29,6 +29,7 @@ from infrastructure.threading.archive_workers import (
     MissingAiDataWorker,
     MultiUploadWorker,
     PreviewDownloadWorker,
+    PreviewPrefetchWorker,
     MultiDownloadWorker,
     BoxDownloadWorker,
     CreditsWorker,
@@ -380,6 +381,7 @@ class ArchivePresenter:
         file_finished_callback=None,
         file_error_callback=None,
         all_finished_callback=None,
+        bytes_progress_callback=None,
     ) -> MultiUploadWorker:
         """Startet Multi-Upload Worker."""
         self._upload_worker = MultiUploadWorker(
@@ -387,6 +389,8 @@ class ArchivePresenter:
         )
         if progress_callback:
             self._upload_worker.progress.connect(progress_callback)
+        if bytes_progress_callback:
+            self._upload_worker.bytes_progress.connect(bytes_progress_callback)
         if file_finished_callback:
             self._upload_worker.file_finished.connect(file_finished_callback)
         if file_error_callback:
@@ -447,6 +451,7 @@ class ArchivePresenter:
         self, doc_id: int, target_dir: str, *,
         filename: str = None,
         cache_dir: str = None,
+        content_hash: str = None,
         finished_callback=None,
         error_callback=None,
     ) -> PreviewDownloadWorker:
@@ -454,6 +459,7 @@ class ArchivePresenter:
         self._preview_worker = PreviewDownloadWorker(
             self._docs_api, doc_id, target_dir,
             filename=filename, cache_dir=cache_dir,
+            content_hash=content_hash,
         )
         if finished_callback:
             self._preview_worker.download_finished.connect(finished_callback)
@@ -463,6 +469,18 @@ class ArchivePresenter:
         self._preview_worker.start()
         return self._preview_worker
 
+    def start_preview_prefetch(
+        self, documents: list, cache, *,
+        ready_callback=None,
+    ) -> PreviewPrefetchWorker:
+        """Startet das vorausschauende Laden von Vorschauen in den Vorschau-Cache."""
+        worker = PreviewPrefetchWorker(self._docs_api, documents, cache)
+        if ready_callback:
+            worker.document_ready.connect(ready_callback)
+        self.register_worker(worker)
+        worker.start()
+        return worker
+
     def download_single(self, doc: Document, target_dir: str):
         """Synchroner Einzel-Download mit Auto-Archivierung."""
         return self._uc_download.execute(doc, target_dir)
@@ -0,0 +1,328 @@
+"""
+Inhaltsadressierter lokaler Cache fuer Dokument-Dateien.
+
+Dasselbe Server-Dokument wurde bisher getrennt fuer Vorschau, Verarbeitung
+(Temp-Verzeichnisse), Duplikat-Vergleich, Smart!Scan und Benutzer-Downloads
+heruntergeladen. DocumentsAPI.download() prueft jetzt zuerst diesen Cache und
+legt jede frisch geladene Datei hier ab.
+
+- Schluessel: Dokument-ID + content_hash (SHA256 der Datei). Wird die Datei
+  auf dem Server ersetzt, aendert sich der Hash und der alte Eintrag passt
+  nicht mehr; replace_document_file() entfernt ihn zusaetzlich sofort.
+- Abgelegt wird nur, wenn der SHA256 der Datei zum content_hash passt.
+- Dateien werden blockweise verschluesselt (Fernet, services/local_crypto)
+  in eine Staging-Datei geschrieben und per os.replace atomar uebernommen;
+  auch grosse Dateien liegen nie komplett im Speicher. Ohne Schluessel
+  wird nichts gecacht (keine Klartext-Kopien neben der Vorschau).
+- Groessenlimit mit LRU-Verdraengung; die Zugriffsreihenfolge wird ueber die
+  mtime der Dateien auch ueber Programmstarts hinweg erhalten.
+
+Ablage je Server unter %LOCALAPPDATA%/ACENCIA-ATLAS/blob_cache/<server>/.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+BLOB_SUFFIX = '.blob'
+STAGING_DIR = '.staging'
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+KEYRING_KEY_NAME = 'blob_cache_key'
+# Klartext je Fernet-Token; Datei = Folge aus (Laenge, Token)
+CHUNK_SIZE = 1024 * 1024
+_TOKEN_LEN = struct.Struct('>I')
+
+_HASH_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def get_cache_dir() -> Path:
+    """Gibt das Basisverzeichnis des Blob-Caches zurueck."""
+    if os.name == 'nt':
+        base = Path(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')))
+    else:
+        base = Path.home() / '.local' / 'share'
+    cache_dir = base / 'ACENCIA-ATLAS' / 'blob_cache'
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+class DocumentBlobCache:
+    """
+    Thread-sicherer Datei-Cache mit Groessenlimit.
+
+    Args:
+        root: Cache-Verzeichnis (wird angelegt)
+        fernet: Fernet-Instanz fuer die Verschluesselung der Dateien
+        max_bytes: Maximale Gesamtgroesse (verschluesselt auf der Platte)
+    """
+
+    def __init__(self, root: str, fernet, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._root = Path(root)
+        self._fernet = fernet
+        self._max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        # Dateiname -> Groesse, aeltester Zugriff zuerst
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def contains(self, doc_id: int, content_hash: Optional[str]) -> bool:
+        """True wenn das Dokument in dieser Version gecacht ist (zaehlt als Zugriff fuer LRU)."""
+        return self._lookup(doc_id, content_hash) is not None
+
+    def copy_to(self, doc_id: int, content_hash: Optional[str], target_path: str) -> bool:
+        """Entschluesselt die gecachte Datei nach target_path. False bei Cache-Miss."""
+        path = self._lookup(doc_id, content_hash)
+        if path is None:
+            return False
+        try:
+            with open(target_path, 'wb') as target:
+                ok = self._decrypt_into(doc_id, path, target)
+        except OSError as e:
+            # z.B. gleichzeitig verdraengt
+            logger.debug(f"Blob-Cache-Kopie fehlgeschlagen fuer Dokument {doc_id}: {e}")
+            ok = False
+        if not ok:
+            self._unlink(Path(target_path))
+        return ok
+
+    def read_into(self, doc_id: int, content_hash: Optional[str], fileobj) -> bool:
+        """Schreibt die gecachte Datei in ein seekbares Dateiobjekt. False bei Cache-Miss."""
+        path = self._lookup(doc_id, content_hash)
+        if path is None:
+            return False
+        fileobj.seek(0)
+        fileobj.truncate()
+        try:
+            return self._decrypt_into(doc_id, path, fileobj)
+        except OSError as e:
+            logger.debug(f"Blob-Cache-Lesen fehlgeschlagen fuer Dokument {doc_id}: {e}")
+            return False
+
+    def put(self, doc_id: int, content_hash: Optional[str], source_path: str) -> bool:
+        """
+        Legt eine verschluesselte Kopie von source_path ab.
+
+        Returns:
+            True wenn die Datei (jetzt) im Cache liegt
+        """
+        name = self._blob_name(doc_id, content_hash)
+        if name is None:
+            return False
+        try:
+            size = os.path.getsize(source_path)
+        except OSError:
+            return False
+        if size > self._max_bytes:
+            return False
+        with self._lock:
+            self._ensure_loaded()
+            if name in self._entries and (self._root / name).exists():
+                self._entries.move_to_end(name)
+                return True
+
+        # Staging im Cache-Verzeichnis: os.replace bleibt auf demselben Laufwerk
+        staging = self._root / STAGING_DIR
+        try:
+            staging.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(staging), suffix='.tmp')
+        except OSError as e:
+            logger.debug(f"Blob-Cache-Schreiben fehlgeschlagen fuer Dokument {doc_id}: {e}")
+            return False
+        digest = hashlib.sha256()
+        try:
+            with open(source_path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                for block in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    digest.update(block)
+                    token = self._fernet.encrypt(block)
+                    dst.write(_TOKEN_LEN.pack(len(token)))
+                    dst.write(token)
+                dst.flush()
+                os.fsync(dst.fileno())
+            if digest.hexdigest() != content_hash.lower():
+                # Datei passt nicht zum Server-Hash -> nicht unter diesem Schluessel ablegen
+                logger.debug(f"Blob-Cache: Hash-Abweichung fuer Dokument {doc_id}, nicht gecacht")
+                self._unlink(Path(tmp_path))
+                return False
+            os.replace(tmp_path, self._root / name)
+            stored = os.path.getsize(self._root / name)
+        except OSError as e:
+            logger.debug(f"Blob-Cache-Schreiben fehlgeschlagen fuer Dokument {doc_id}: {e}")
+            self._unlink(Path(tmp_path))
+            return False
+
+        prefix = f"{int(doc_id)}_"
+        with self._lock:
+            # Aeltere Versionen desselben Dokuments entfernen
+            for old in [n for n in self._entries if n.startswith(prefix) and n != name]:
+                self._total_bytes -= self._entries.pop(old)
+                self._unlink(self._root / old)
+            if name in self._entries:
+                self._total_bytes -= self._entries[name]
+            self._entries[name] = stored
+            self._total_bytes += stored
+            self._entries.move_to_end(name)
+            self._evict_locked()
+        return True
+
+    def remove_document(self, doc_id: int) -> None:
+        """Entfernt alle Versionen eines Dokuments (z.B. nach Datei-Ersetzung)."""
+        prefix = f"{int(doc_id)}_"
+        with self._lock:
+            self._ensure_loaded()
+            for name in [n for n in self._entries if n.startswith(prefix)]:
+                self._total_bytes -= self._entries.pop(name)
+                self._unlink(self._root / name)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self._max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    # ── Intern ────────────────────────────────────────────────────────────
+
+    def _lookup(self, doc_id: int, content_hash: Optional[str]) -> Optional[Path]:
+        """Pfad der verschluesselten Datei oder None (zaehlt als Zugriff fuer LRU)."""
+        name = self._blob_name(doc_id, content_hash)
+        if name is None:
+            return None
+        path = self._root / name
+        with self._lock:
+            self._ensure_loaded()
+            if name not in self._entries:
+                self.misses += 1
+                return None
+            if not path.exists():
+                self._total_bytes -= self._entries.pop(name)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def _decrypt_into(self, doc_id: int, path: Path, fileobj) -> bool:
+        """
+        Entschluesselt eine Cache-Datei nach fileobj.
+
+        Returns:
+            False wenn die Datei nicht entschluesselbar ist (Eintrag wird entfernt)
+
+        Raises:
+            OSError: Lesen/Schreiben fehlgeschlagen
+        """
+        from cryptography.fernet import InvalidToken
+
+        try:
+            with open(path, 'rb') as f:
+                while True:
+                    header = f.read(_TOKEN_LEN.size)
+                    if not header:
+                        return True
+                    if len(header) != _TOKEN_LEN.size:
+                        raise InvalidToken
+                    token = f.read(_TOKEN_LEN.unpack(header)[0])
+                    fileobj.write(self._fernet.decrypt(token))
+        except InvalidToken:
+            # Abgeschnitten oder mit anderem Schluessel geschrieben
+            logger.debug(f"Blob-Cache: Dokument {doc_id} nicht entschluesselbar, verworfen")
+            with self._lock:
+                size = self._entries.pop(path.name, None)
+                if size is not None:
+                    self._total_bytes -= size
+            self._unlink(path)
+            return False
+
+    @staticmethod
+    def _blob_name(doc_id: int, content_hash: Optional[str]) -> Optional[str]:
+        if not doc_id or not content_hash:
+            return None
+        content_hash = content_hash.lower()
+        if not _HASH_RE.match(content_hash):
+            return None
+        return f"{int(doc_id)}_{content_hash}{BLOB_SUFFIX}"
+
+    def _ensure_loaded(self) -> None:
+        """Liest den Verzeichnisinhalt einmalig ein (Lock muss gehalten werden)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        self._root.mkdir(parents=True, exist_ok=True)
+        shutil.rmtree(self._root / STAGING_DIR, ignore_errors=True)
+        found = []
+        for entry in os.scandir(self._root):
+            if entry.is_file() and entry.name.endswith(BLOB_SUFFIX):
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name, stat.st_size))
+        for _mtime, name, size in sorted(found):
+            self._entries[name] = size
+            self._total_bytes += size
+        self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while self._total_bytes > self._max_bytes and self._entries:
+            name, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._unlink(self._root / name)
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            # Unter Windows evtl. noch geoeffnet; wird beim naechsten Start erneut erfasst
+            pass
+
+
+_caches: Dict[str, DocumentBlobCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_document_blob_cache(server_url: str) -> Optional[DocumentBlobCache]:
+    """Gibt den Cache fuer einen Server zurueck (None wenn deaktiviert/ohne Schluessel)."""
+    from config.processing_rules import DOCUMENT_BLOB_CACHE_CONFIG
+    from services.local_crypto import get_fernet
+
+    if not DOCUMENT_BLOB_CACHE_CONFIG.get('enabled', True):
+        return None
+    fernet = get_fernet(KEYRING_KEY_NAME, get_cache_dir())
+    if fernet is None:
+        return None
+    key = hashlib.sha1((server_url or '').encode('utf-8')).hexdigest()[:12]
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            max_mb = DOCUMENT_BLOB_CACHE_CONFIG.get('max_size_mb', DEFAULT_MAX_BYTES // (1024 * 1024))
+            cache = DocumentBlobCache(str(get_cache_dir() / key), fernet, int(max_mb) * 1024 * 1024)
+            _caches[key] = cache
+        return cache
+
+
+def clear_document_blob_caches() -> None:
+    """Loescht alle Blob-Caches (z.B. wenn keine gueltige Session vorhanden ist)."""
+    with _caches_lock:
+        _caches.clear()
+        shutil.rmtree(get_cache_dir(), ignore_errors=True)
@@ -11,24 +11,29 @@ Features:
 - Persistenter Cache: Daten bleiben beim View-Wechsel erhalten
 - Auto-Refresh: Alle 30 Sekunden im Hintergrund
 - Manuelle Aktualisierung: Bei explizitem Refresh-Button
+- Delta-Sync: Nur seit dem letzten Abgleich geaenderte Dokumente laden
+- Warm-Start: Letzter Stand verschluesselt auf Platte (services/warm_cache.py)
 """
 
 import logging
 import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Set, Tuple
 
 from PySide6.QtCore import QObject, Signal, QTimer
 
 from api.client import APIClient
 from api.documents import DocumentsAPI, Document, BoxStats
+from services.document_index import DocumentIndex
 
 logger = logging.getLogger(__name__)
 
 # Cache-Konfiguration
 DEFAULT_AUTO_REFRESH_INTERVAL = 20  # Sekunden
 CACHE_TTL = 300  # 5 Minuten (als Fallback wenn Auto-Refresh nicht laeuft)
+FULL_SYNC_INTERVAL = 1800  # Vollabgleich trotz Delta-Sync spaetestens alle 30 Minuten
+SERVER_DOCUMENT_LIMIT = 10000  # Serverseitiges LIMIT von GET /documents
 
 
 @dataclass
@@ -97,9 +102,29 @@ class DataCacheService(QObject):
         self._stats_cache: Optional[CacheEntry] = None
         self._connections_cache: Optional[CacheEntry] = None
         
+        # Delta-Sync: zuletzt bekannte Dokumentliste + Server-Cursor
+        # (bleiben bei invalidate_documents() erhalten -> naechstes Laden per Delta)
+        self._sync_base: Optional[List[Document]] = None
+        self._sync_cursor: Optional[str] = None
+        self._sync_generation = 0
+        self._last_full_sync: Optional[datetime] = None
+        # Sekundaerindizes ueber _sync_base (box_type, is_archived, source_type, ...)
+        self._documents_index: Optional[DocumentIndex] = None
+        # True nur wenn die Vollstaendigkeit der Liste nachgewiesen ist
+        # (unter dem Server-LIMIT oder vollstaendig per has_more paginiert)
+        self._documents_complete = False
+        
         # Lock fuer Thread-Safety
         self._cache_lock = threading.Lock()
         
+        # Lokaler Suchindex (ATLAS Index): nach dem ersten Abgleich nur bei Aenderungen
+        self._search_index_synced = False
+        
+        # Warm-Start-Datei (erst nach load_warm_start() mit Benutzer bekannt)
+        self._warm_cache = None
+        self._warm_saved_at: Optional[datetime] = None
+        self._warm_save_lock = threading.Lock()
+        
         # Auto-Refresh Timer
         self._auto_refresh_timer = QTimer(self)
         self._auto_refresh_timer.timeout.connect(self._on_auto_refresh)
@@ -124,138 +149,261 @@ class DataCacheService(QObject):
     # DOKUMENTE
     # =========================================================================
     
-    def get_documents(self, box_type: str = None, force_refresh: bool = False) -> List[Document]:
+    def get_documents(self, box_type: str = None, force_refresh: bool = False,
+                      is_archived: Optional[bool] = None) -> List[Document]:
         """
         Holt Dokumente aus dem Cache oder laedt sie vom Server.
         
         Strategie: Einmal ALLE Dokumente laden, dann lokal nach box_type filtern.
         Das spart ~87% der API-Calls gegenueber pro-Box-Laden.
+        Gefiltert wird ueber die Sekundaerindizes (DocumentIndex).
         
         Args:
             box_type: Box-Typ oder None fuer alle
             force_refresh: True = Cache ignorieren, neu laden
+            is_archived: Optional nur (nicht) archivierte Dokumente
             
         Returns:
             Liste von Document-Objekten
         """
-        with self._cache_lock:
-            # Cache vorhanden und nicht abgelaufen?
-            if not force_refresh and 'all' in self._documents_cache:
-                entry = self._documents_cache['all']
-                if not entry.is_expired():
-                    all_docs = entry.data
-                    if box_type:
-                        filtered = [d for d in all_docs if d.box_type == box_type]
-                        logger.debug(f"Dokumente aus Cache (gefiltert): {box_type} ({len(filtered)}/{len(all_docs)} Stk)")
-                        return filtered
-                    logger.debug(f"Dokumente aus Cache: all ({len(all_docs)} Stk)")
-                    return all_docs
+        criteria = {'box_type': box_type or None, 'is_archived': is_archived}
+        if not force_refresh:
+            documents = self.query_documents(criteria)
+            if documents is not None:
+                logger.debug(f"Dokumente aus Cache: {box_type or 'all'} ({len(documents)} Stk)")
+                return documents
         
         # Neu laden (immer alle)
-        all_docs = self._load_all_documents()
+        self._load_all_documents()
         
-        if box_type:
-            return [d for d in all_docs if d.box_type == box_type]
-        return all_docs
+        with self._cache_lock:
+            if self._documents_index is not None:
+                return self._documents_index.query(criteria)
+        return []
 
-    def get_documents_cached_only(self, box_type: str = None) -> Optional[List[Document]]:
+    def get_documents_cached_only(self, box_type: str = None,
+                                  is_archived: Optional[bool] = None) -> Optional[List[Document]]:
         """
         Holt Dokumente nur aus dem Cache (kein Server-Call).
         
         Args:
             box_type: Box-Typ oder None fuer alle
+            is_archived: Optional nur (nicht) archivierte Dokumente
         
         Returns:
             Liste von Document-Objekten wenn Cache vorhanden und gueltig,
             sonst None.
         """
-        with self._cache_lock:
-            if 'all' in self._documents_cache:
-                entry = self._documents_cache['all']
-                if not entry.is_expired():
-                    all_docs = entry.data
-                    if box_type:
-                        filtered = [d for d in all_docs if d.box_type == box_type]
-                        logger.debug(f"Dokumente aus Cache (cache-only, gefiltert): {box_type} ({len(filtered)} Stk)")
-                        return filtered
-                    logger.debug(f"Dokumente aus Cache (cache-only): all ({len(all_docs)} Stk)")
-                    return all_docs
+        return self.query_documents({'box_type': box_type or None, 'is_archived': is_archived})
+    
+    def query_documents(self, criteria: Dict[str, Any],
+                        exclude: Optional[Dict[str, Any]] = None,
+                        within: Optional[List[Document]] = None) -> Optional[List[Document]]:
+        """
+        Filtert die gecachten Dokumente ueber die Sekundaerindizes (kein Server-Call).
         
-        return None
+        Args:
+            criteria: {feld: wert | [werte]} fuer Felder aus document_index.INDEXED_FIELDS
+                (box_type, is_archived, source_type, file_extension, is_gdv,
+                is_pdf, ai_renamed, display_color); None = kein Filter
+            exclude: Auszuschliessende Werte, z.B. {'box_type': 'falsch'}
+            within: Nur Dokumente aus dieser Liste (muessen die gecachten
+                Objekte sein, sonst None -> Aufrufer filtert selbst)
+        
+        Returns:
+            Gefilterte Liste (Server-Reihenfolge) oder None wenn kein gueltiger Cache
+        """
+        with self._cache_lock:
+            entry = self._documents_cache.get('all')
+            index = self._documents_index
+            if entry is None or entry.is_expired() or index is None:
+                return None
+            if within is None:
+                return index.query(criteria, exclude)
+            # Aeltere/neuere Objekte als im Index: Indizes gelten nicht fuer sie
+            if any(index.get(doc.id) is not doc for doc in within):
+                return None
+            allowed = {doc.id for doc in within}
+            return [doc for doc in index.query(criteria, exclude) if doc.id in allowed]
+    
+    def get_documents_by_ids(self, doc_ids) -> List[Document]:
+        """Gecachte Dokumente zu IDs in gegebener Reihenfolge (unbekannte IDs fehlen)."""
+        with self._cache_lock:
+            index = self._documents_index
+            if index is None:
+                return []
+            found = (index.get(doc_id) for doc_id in doc_ids)
+            return [doc for doc in found if doc is not None]
+    
+    def get_document_field_values(self, name: str) -> List[Any]:
+        """Vorkommende Werte eines indizierten Feldes (leer ohne Cache)."""
+        with self._cache_lock:
+            if self._documents_index is None:
+                return []
+            return self._documents_index.values(name)
+    
+    def set_documents_color(self, doc_ids, color: Optional[str]) -> None:
+        """Uebernimmt eine lokal gesetzte Farbmarkierung in Cache und Index."""
+        with self._cache_lock:
+            if self._documents_index is not None:
+                self._documents_index.set_field(doc_ids, 'display_color', color)
     
     def _load_all_documents(self) -> List[Document]:
         """Laedt ALLE Dokumente vom Server und cached sie zentral.
         
         Ein einzelner API-Call statt N Calls pro Box.
         Client-seitiges Filtern erfolgt in get_documents().
+        Ist bereits ein Sync-Cursor vorhanden, werden nur Aenderungen geladen
+        (siehe _sync_all_documents).
+        """
+        documents, _affected = self._sync_all_documents(self.docs_api)
+        return documents
+    
+    def _load_all_documents_with_api(self, docs_api: DocumentsAPI) -> List[Document]:
+        """Wie _load_all_documents(), aber mit uebergebener API-Instanz.
+        
+        Wird von Background-Threads verwendet, die eine eigene
+        thread-sichere requests.Session nutzen muessen.
+        """
+        documents, _affected = self._sync_all_documents(docs_api)
+        return documents
+    
+    def _sync_all_documents(self, docs_api: DocumentsAPI) -> Tuple[List[Document], Optional[Set[str]]]:
+        """Aktualisiert den 'all'-Eintrag per Delta-Sync oder Vollabgleich.
+        
+        Delta: Nur seit dem Server-Cursor geaenderte Dokumente plus Tombstones
+        werden geladen und in die bekannte Liste gemischt. Ein Vollabgleich
+        erfolgt ohne Cursor, wenn der Server keine Deltas unterstuetzt oder
+        spaetestens nach FULL_SYNC_INTERVAL.
         
         Sicherheitsmechanismus: Leere API-Antworten ueberschreiben NICHT
         einen Cache der bereits Dokumente enthaelt (verhindert Datenverlust
         durch transiente Fehler, Session-Konflikte, Netzwerkprobleme).
+        
+        Returns:
+            (Dokumente, betroffene Box-Typen); None = alle Boxen (Vollabgleich)
         """
+        with self._cache_lock:
+            base = self._sync_base
+            generation = self._sync_generation
+            cursor = self._sync_cursor
+            if base is None or (
+                self._last_full_sync is not None
+                and datetime.now() - self._last_full_sync > timedelta(seconds=FULL_SYNC_INTERVAL)
+            ):
+                cursor = None
+        
         try:
-            logger.info("Lade alle Dokumente vom Server (1 API-Call)")
+            if cursor:
+                logger.info("Lade Dokument-Aenderungen vom Server (Delta-Sync)")
+            else:
+                logger.info("Lade alle Dokumente vom Server (1 API-Call)")
             
-            documents = self.docs_api.list_documents()
+            result = docs_api.sync_documents(cursor)
+            if result is None:
+                raise RuntimeError("Dokument-Synchronisation fehlgeschlagen")
             
             with self._cache_lock:
-                cached_count = 0
-                if 'all' in self._documents_cache:
-                    cached_count = len(self._documents_cache['all'].data)
+                if result.is_delta:
+                    if self._sync_generation != generation:
+                        # Zwischenzeitlich vollstaendig neu geladen -> Delta verwerfen
+                        logger.debug("Delta-Sync verworfen (Cache zwischenzeitlich neu geladen)")
+                        return self._sync_base or [], set()
+                    documents, affected, removed, added = self._merge_document_changes(
+                        base, result.documents, result.deleted_ids)
+                    self._sync_cursor = result.cursor
+                    self._documents_index.update(documents, removed, added)
+                    self._set_documents_locked(documents, self._documents_index)
+                    logger.info(
+                        f"Delta-Sync: {len(result.documents)} geaendert, "
+                        f"{len(result.deleted_ids)} geloescht ({len(documents)} Stk gesamt)"
+                    )
+                    return documents, affected
                 
+                documents = result.documents
+                cached_count = len(self._sync_base) if self._sync_base else 0
+                if result.truncated and cached_count > 0:
+                    # Unvollstaendige Liste wuerde fehlende Dokumente "loeschen"
+                    logger.warning(
+                        f"Dokumentliste unvollstaendig ({len(documents)} Stk), "
+                        f"behalte Cache ({cached_count} Stk)"
+                    )
+                    if 'all' not in self._documents_cache:
+                        self._documents_cache['all'] = CacheEntry(data=self._sync_base)
+                    return self._sync_base, set()
                 if not documents and cached_count > 0:
                     logger.warning(
                         f"API lieferte 0 Dokumente, Cache hat {cached_count} - "
                         f"behalte Cache (transienter Fehler vermutet)"
                     )
-                    return self._documents_cache['all'].data
+                    if 'all' not in self._documents_cache:
+                        self._documents_cache['all'] = CacheEntry(data=self._sync_base)
+                    return self._sync_base, set()
                 
-                self._documents_cache['all'] = CacheEntry(data=documents)
+                # Abgeschnittene Liste: kein Cursor, damit der naechste Abgleich
+                # wieder vollstaendig laedt statt Deltas darauf aufzusetzen
+                self._sync_cursor = None if result.truncated else result.cursor
+                self._sync_generation += 1
+                self._last_full_sync = datetime.now()
+                # Serverseitiges LIMIT: eine einzelne Seite mit LIMIT Eintraegen kann
+                # abgeschnitten sein, auch wenn der Server einen Cursor liefert.
+                # Nachweis nur unter dem LIMIT oder durch Paging bis has_more=False.
+                self._documents_complete = not result.truncated and (
+                    len(documents) < SERVER_DOCUMENT_LIMIT or result.pages > 1)
+                self._set_documents_locked(documents, DocumentIndex(documents))
             
             logger.info(f"Dokumente geladen und gecached: {len(documents)} Stk")
-            return documents
+            return documents, None
             
         except Exception as e:
             logger.error(f"Fehler beim Laden der Dokumente: {e}")
             with self._cache_lock:
                 if 'all' in self._documents_cache:
-                    return self._documents_cache['all'].data
-            return []
+                    return self._documents_cache['all'].data, set()
+            return [], set()
     
-    def _load_all_documents_with_api(self, docs_api: DocumentsAPI) -> List[Document]:
-        """Wie _load_all_documents(), aber mit uebergebener API-Instanz.
+    def _set_documents_locked(self, documents: List[Document], index: DocumentIndex) -> None:
+        """Setzt den 'all'-Eintrag, Indizes und Delta-Basis (Lock muss gehalten werden)."""
+        self._sync_base = documents
+        self._documents_index = index
+        self._documents_cache['all'] = CacheEntry(data=documents)
+    
+    @staticmethod
+    def _merge_document_changes(
+        documents: List[Document], changed: List[Document], deleted_ids: List[int],
+    ) -> Tuple[List[Document], Set[str], List[Document], List[Document]]:
+        """Mischt geaenderte/neue/geloeschte Dokumente in eine neue Liste.
         
-        Wird von Background-Threads verwendet, die eine eigene
-        thread-sichere requests.Session nutzen muessen.
+        Geaenderte Dokumente behalten ihre Position, neue werden vorne
+        eingefuegt (Server sortiert neueste zuerst).
+        
+        Returns:
+            (neue Liste, betroffene Box-Typen inkl. alter Box bei Verschiebung,
+             entfernte/ersetzte Dokumente, neue/ersetzende Dokumente)
         """
-        try:
-            logger.info("Lade alle Dokumente vom Server (Background-Thread, eigene Session)")
-            
-            documents = docs_api.list_documents()
-            
-            with self._cache_lock:
-                cached_count = 0
-                if 'all' in self._documents_cache:
-                    cached_count = len(self._documents_cache['all'].data)
-                
-                if not documents and cached_count > 0:
-                    logger.warning(
-                        f"API lieferte 0 Dokumente, Cache hat {cached_count} - "
-                        f"behalte Cache (transienter Fehler vermutet)"
-                    )
-                    return self._documents_cache['all'].data
-                
-                self._documents_cache['all'] = CacheEntry(data=documents)
-            
-            logger.info(f"Dokumente geladen und gecached: {len(documents)} Stk")
-            return documents
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Laden der Dokumente (BG): {e}")
-            with self._cache_lock:
-                if 'all' in self._documents_cache:
-                    return self._documents_cache['all'].data
-            return []
+        changed_by_id = {d.id: d for d in changed}
+        deleted = set(deleted_ids)
+        affected: Set[str] = set()
+        merged: List[Document] = []
+        removed: List[Document] = []
+        replaced: List[Document] = []
+        for doc in documents:
+            if doc.id in deleted:
+                affected.add(doc.box_type)
+                removed.append(doc)
+                continue
+            new_doc = changed_by_id.pop(doc.id, None)
+            if new_doc is None:
+                merged.append(doc)
+                continue
+            affected.add(doc.box_type)
+            affected.add(new_doc.box_type)
+            removed.append(doc)
+            replaced.append(new_doc)
+            merged.append(new_doc)
+        added = [d for d in changed_by_id.values() if d.id not in deleted]
+        affected.update(d.box_type for d in added)
+        return added + merged, affected, removed, replaced + added
     
     def _load_stats_with_api(self, docs_api: DocumentsAPI) -> Any:
         """Wie _load_stats(), aber mit uebergebener API-Instanz."""
@@ -283,6 +431,8 @@ class DataCacheService(QObject):
         
         Da alle Dokumente zentral gecacht werden, invalidiert jeder Aufruf
         den gesamten Cache (egal ob box_type angegeben oder nicht).
+        Der Sync-Cursor bleibt erhalten: das naechste Laden holt nur die
+        Aenderungen seit dem letzten Abgleich.
         
         Args:
             box_type: Wird fuer Logging verwendet, invalidiert aber immer alles
@@ -328,17 +478,33 @@ class DataCacheService(QObject):
     
     def _compute_stats_from_cache(self) -> Optional[Any]:
         """
-        Berechnet Box-Statistiken aus dem Dokumente-Cache (kein API-Call).
+        Berechnet Box-Statistiken aus den Index-Groessen (kein API-Call).
+        
+        Nur wenn der Cache nachweislich vollstaendig ist: Durch das
+        serverseitige LIMIT (10000) kann die Liste abgeschnitten sein; dann
+        waeren berechnete Stats falsch (z.B. Box-Zaehler = 0) und es wird
+        None geliefert (= Fallback auf Server-Stats).
         
-        DEAKTIVIERT: Stats muessen immer vom Server kommen, da der Dokumente-Cache
-        durch das serverseitige LIMIT (z.B. 10000) unvollstaendig sein kann.
-        Wenn der Cache weniger Dokumente hat als tatsaechlich existieren,
-        waeren berechnete Stats falsch (z.B. Box-Zaehler = 0).
+        Zaehlweise wie die Sidebar: Box = nicht archiviert, <box>_archived =
+        archiviert, total = alle Dokumente.
         
         Returns:
-            Immer None (= Fallback auf Server-Stats)
+            BoxStats oder None
         """
-        return None
+        with self._cache_lock:
+            entry = self._documents_cache.get('all')
+            if (entry is None or entry.is_expired() or self._documents_index is None
+                    or not self._documents_complete):
+                return None
+            index = self._documents_index
+            stats = BoxStats(total=len(index.documents))
+            for box_type in index.values('box_type'):
+                for archived, key in ((False, box_type), (True, f"{box_type}_archived")):
+                    if hasattr(stats, key):
+                        setattr(stats, key, index.count({'box_type': box_type, 'is_archived': archived}))
+            self._stats_cache = CacheEntry(data=stats)
+        logger.debug("Statistiken aus Dokumente-Index berechnet")
+        return stats
     
     def _load_stats(self) -> Dict[str, int]:
         """Laedt Statistiken vom Server und cached sie (Fallback)."""
@@ -541,13 +707,19 @@ class DataCacheService(QObject):
             bg_client.set_token(self.api_client._token)
             bg_docs_api = DocumentsAPI(bg_client)
             
-            # 1. Alle Dokumente in einem API-Call laden (statt pro Box)
-            self._load_all_documents_with_api(bg_docs_api)
-            # 'all' Signal emittieren - UI filtert lokal
-            self.documents_updated.emit('all')
+            # 1. Dokumente in einem API-Call laden (Delta oder komplett)
+            _documents, affected = self._sync_all_documents(bg_docs_api)
+            if affected is None:
+                # Vollabgleich: 'all' Signal emittieren - UI filtert lokal
+                self.documents_updated.emit('all')
+            else:
+                # Delta: nur betroffene Boxen benachrichtigen
+                for box_type in sorted(affected):
+                    self.documents_updated.emit(box_type)
             
-            # 2. Statistiken immer vom Server laden (eigene Session)
-            self._load_stats_with_api(bg_docs_api)
+            # 2. Statistiken aus den Index-Groessen, sonst vom Server (eigene Session)
+            if self._compute_stats_from_cache() is None:
+                self._load_stats_with_api(bg_docs_api)
             self.stats_updated.emit()
             
             # VU-Verbindungen
@@ -558,6 +730,13 @@ class DataCacheService(QObject):
                 self._load_connections()
                 self.connections_updated.emit()
             
+            # Lokalen Suchindex abgleichen (Dateinamen, Texte kommen per DocumentsAPI)
+            self._sync_search_index(_documents, affected)
+            
+            # Warm-Start-Datei aktualisieren (gedrosselt, nur bei Aenderungen)
+            if affected is None or affected:
+                self.save_warm_start(force=False)
+            
             logger.info("Auto-Refresh abgeschlossen (1 API-Call fuer Dokumente)")
             
         except Exception as e:
@@ -579,6 +758,117 @@ class DataCacheService(QObject):
         self.invalidate_connections()
         self.refresh_all_async()
     
+    # =========================================================================
+    # LOKALER SUCHINDEX
+    # =========================================================================
+    
+    def _sync_search_index(self, documents: List[Document],
+                           affected: Optional[Set[str]]) -> None:
+        """Gleicht den Dateinamen-Index (services/search_index.py) mit der Dokumentliste ab."""
+        from services.search_index import get_local_search_index
+        
+        try:
+            index = get_local_search_index(self.api_client.base_url)
+            if index is None:
+                return
+            if documents and (affected is None or affected or not self._search_index_synced):
+                index.sync_documents(documents)
+                self._search_index_synced = True
+        except Exception as e:
+            logger.warning(f"Lokaler Suchindex nicht aktualisiert: {e}")
+    
+    # =========================================================================
+    # WARM-START
+    # =========================================================================
+    
+    def load_warm_start(self, username: str) -> bool:
+        """
+        Laedt den zuletzt gespeicherten Stand (Dokumente, Sync-Cursor, Stats).
+        
+        Die UI zeigt damit sofort Daten; anschliessend wird im Hintergrund
+        der normale Refresh gestartet (bei bekanntem Cursor als Delta-Sync).
+        
+        Args:
+            username: Angemeldeter Benutzer (Cache je Benutzer + Server)
+        
+        Returns:
+            True wenn Daten geladen wurden
+        """
+        from config.processing_rules import ARCHIVE_WARM_CACHE_CONFIG
+        from services.warm_cache import ArchiveWarmCache
+        
+        if not ARCHIVE_WARM_CACHE_CONFIG.get('enabled', True):
+            return False
+        warm_cache = ArchiveWarmCache(self.api_client.base_url, username)
+        with self._cache_lock:
+            self._warm_cache = warm_cache
+            if self._sync_base is not None:
+                # Bereits vom Server geladen
+                return False
+        
+        max_age = timedelta(hours=ARCHIVE_WARM_CACHE_CONFIG.get('max_age_hours', 72))
+        state = warm_cache.load(max_age=max_age)
+        if state is None:
+            return False
+        
+        documents = state['documents']
+        with self._cache_lock:
+            if self._sync_base is not None:
+                return False
+            self._sync_cursor = state['cursor']
+            self._last_full_sync = state['last_full_sync']
+            self._documents_complete = state['complete']
+            self._set_documents_locked(documents, DocumentIndex(documents))
+            if state['stats'] is not None:
+                self._stats_cache = CacheEntry(data=state['stats'])
+        logger.info(
+            f"Warm-Start: {len(documents)} Dokumente vom "
+            f"{state['saved_at']:%d.%m.%Y %H:%M} geladen, Abgleich im Hintergrund"
+        )
+        self.documents_updated.emit('all')
+        self.stats_updated.emit()
+        self.refresh_all_async()
+        return True
+    
+    def save_warm_start(self, force: bool = True) -> bool:
+        """
+        Speichert den aktuellen Stand fuer den naechsten Start.
+        
+        Args:
+            force: False = nur wenn seit dem letzten Speichern mindestens
+                save_interval_seconds vergangen sind (Auto-Refresh)
+        """
+        from config.processing_rules import ARCHIVE_WARM_CACHE_CONFIG
+        
+        with self._cache_lock:
+            warm_cache = self._warm_cache
+            if warm_cache is None or self._sync_base is None:
+                return False
+            if not force and self._warm_saved_at is not None:
+                interval = ARCHIVE_WARM_CACHE_CONFIG.get('save_interval_seconds', 300)
+                if datetime.now() - self._warm_saved_at < timedelta(seconds=interval):
+                    return False
+            documents = self._sync_base
+            cursor = self._sync_cursor
+            last_full_sync = self._last_full_sync
+            complete = self._documents_complete
+            stats = self._stats_cache.data if self._stats_cache else None
+            self._warm_saved_at = datetime.now()
+        
+        # Kodieren/Verschluesseln ausserhalb des Cache-Locks
+        with self._warm_save_lock:
+            return warm_cache.save(documents, cursor=cursor, last_full_sync=last_full_sync,
+                                   complete=complete, stats=stats)
+    
+    def discard_warm_start(self) -> None:
+        """Loescht die Warm-Start-Datei des Benutzers (Logout) und speichert nicht mehr."""
+        with self._cache_lock:
+            warm_cache = self._warm_cache
+            self._warm_cache = None
+        if warm_cache is not None:
+            with self._warm_save_lock:
+                warm_cache.delete()
+    
     # =========================================================================
     # HILFSMETHODEN
     # =========================================================================
@@ -0,0 +1,167 @@
+"""
+Sekundaerindizes fuer die gecachte Dokumentliste.
+
+Box-Wechsel und jede Filteraenderung im Archiv liefen bisher mit mehreren
+verketteten List-Comprehensions ueber das komplette Archiv. DocumentIndex
+haelt fuer die Filterfelder invertierte Indizes (Wert -> Menge von
+Dokument-IDs); ein Filter ist damit eine Schnittmenge, die Reihenfolge der
+Ergebnisliste entspricht der Server-Reihenfolge.
+
+Wird vom DataCacheService bei jedem Vollabgleich aufgebaut und bei einem
+Delta-Sync inkrementell aktualisiert. Nicht thread-sicher: der
+DataCacheService greift nur unter seinem _cache_lock zu.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from api.documents import Document
+
+# Indizierte Felder (Attribute/Properties von Document)
+INDEXED_FIELDS = (
+    'box_type',
+    'is_archived',
+    'source_type',
+    'file_extension',
+    'is_gdv',
+    'is_pdf',
+    'ai_renamed',
+    'display_color',
+)
+
+# Ab diesem Anteil ist ein Durchlauf der Liste guenstiger als Sortieren
+_SCAN_RATIO = 8
+
+
+class DocumentIndex:
+    """
+    Invertierte Indizes ueber eine Dokumentliste.
+
+    Args:
+        documents: Dokumente in Server-Reihenfolge (wird nicht kopiert)
+    """
+
+    def __init__(self, documents: List[Document]):
+        self._indexes: Dict[str, Dict[Any, Set[int]]] = {name: {} for name in INDEXED_FIELDS}
+        self._set_documents(documents)
+        for doc in documents:
+            self._add(doc)
+
+    @property
+    def documents(self) -> List[Document]:
+        return self._documents
+
+    def update(self, documents: List[Document], removed: Iterable[Document],
+               added: Iterable[Document]) -> None:
+        """
+        Uebernimmt eine neue Liste nach einem Delta-Merge.
+
+        Args:
+            documents: Neue Gesamtliste
+            removed: Entfernte bzw. ersetzte (alte) Dokumente
+            added: Neue bzw. ersetzende Dokumente
+        """
+        for doc in removed:
+            self._remove(doc)
+        for doc in added:
+            self._add(doc)
+        self._set_documents(documents)
+
+    def set_field(self, doc_ids: Iterable[int], name: str, value: Any) -> None:
+        """Setzt ein indiziertes Feld lokal (z.B. display_color) und pflegt den Index."""
+        index = self._indexes[name]
+        for doc_id in doc_ids:
+            position = self._position.get(doc_id)
+            if position is None:
+                continue
+            doc = self._documents[position]
+            old_ids = index.get(getattr(doc, name))
+            if old_ids is not None:
+                old_ids.discard(doc_id)
+            setattr(doc, name, value)
+            index.setdefault(value, set()).add(doc_id)
+
+    def get(self, doc_id: int) -> Optional[Document]:
+        position = self._position.get(doc_id)
+        return None if position is None else self._documents[position]
+
+    def values(self, name: str) -> List[Any]:
+        """Alle vorkommenden Werte eines Feldes."""
+        return [value for value, ids in self._indexes[name].items() if ids]
+
+    def counts(self, name: str) -> Counter:
+        """Anzahl Dokumente je Wert eines Feldes."""
+        return Counter({value: len(ids) for value, ids in self._indexes[name].items() if ids})
+
+    def count(self, criteria: Optional[Dict[str, Any]] = None,
+              exclude: Optional[Dict[str, Any]] = None) -> int:
+        ids = self._match(criteria, exclude)
+        return len(self._documents) if ids is None else len(ids)
+
+    def query(self, criteria: Optional[Dict[str, Any]] = None,
+              exclude: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """
+        Dokumente, die allen Kriterien entsprechen (Server-Reihenfolge).
+
+        Args:
+            criteria: {feld: wert} oder {feld: [wert, ...]} (ODER innerhalb
+                eines Feldes, UND zwischen Feldern); None-Kriterien werden ignoriert
+            exclude: {feld: wert | [wert, ...]} auszuschliessende Werte
+
+        Returns:
+            Neue Liste (bei leeren Kriterien eine Kopie der Gesamtliste)
+        """
+        ids = self._match(criteria, exclude)
+        if ids is None:
+            return list(self._documents)
+        if len(ids) * _SCAN_RATIO >= len(self._documents):
+            return [doc for doc in self._documents if doc.id in ids]
+        position = self._position
+        return [self._documents[i] for i in sorted(position[doc_id] for doc_id in ids)]
+
+    # ── Intern ────────────────────────────────────────────────────────────
+
+    def _set_documents(self, documents: List[Document]) -> None:
+        self._documents = documents
+        self._position = {doc.id: i for i, doc in enumerate(documents)}
+
+    def _add(self, doc: Document) -> None:
+        for name, index in self._indexes.items():
+            index.setdefault(getattr(doc, name), set()).add(doc.id)
+
+    def _remove(self, doc: Document) -> None:
+        for name, index in self._indexes.items():
+            ids = index.get(getattr(doc, name))
+            if ids is not None:
+                ids.discard(doc.id)
+
+    def _ids_for(self, name: str, value: Any) -> Set[int]:
+        index = self._indexes[name]
+        if isinstance(value, (list, tuple, set, frozenset)):
+            result: Set[int] = set()
+            for v in value:
+                result |= index.get(v, set())
+            return result
+        return index.get(value, set())
+
+    def _match(self, criteria: Optional[Dict[str, Any]],
+               exclude: Optional[Dict[str, Any]]) -> Optional[Set[int]]:
+        """Menge passender IDs oder None (= keine Einschraenkung)."""
+        sets = [self._ids_for(name, value)
+                for name, value in (criteria or {}).items() if value is not None]
+        excluded = [self._ids_for(name, value)
+                    for name, value in (exclude or {}).items() if value is not None]
+        if not sets and not any(excluded):
+            return None
+        if sets:
+            sets.sort(key=len)
+            ids = set(sets[0])
+            for other in sets[1:]:
+                ids &= other
+                if not ids:
+                    break
+        else:
+            ids = set(self._position)
+        for other in excluded:
+            ids -= other
+        return ids
@@ -6,12 +6,13 @@ Unterstuetzt parallele Verarbeitung fuer bessere Performance.
 """
 
 import logging
-from typing import List, Optional, Tuple, Callable
+from typing import Dict, List, Optional, Tuple, Callable
 from dataclasses import dataclass
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import threading
+import time
 import tempfile
 import os
 
@@ -21,11 +22,25 @@ from api.client import APIClient
 from api.processing_history import ProcessingHistoryAPI
 from api.processing_settings import ProcessingSettingsAPI
 from api.document_rules import DocumentRulesAPI, DocumentRulesSettings
+from services.processing_scheduler import (
+    DEFAULT_LANE_WORKERS, RunTiming, allocate_lane_workers,
+    estimate_document_cost, plan_lanes
+)
+from services.write_batcher import DocumentWriteBatcher
+from services.local_classifier import PreClassifier, filename_needs_date, get_local_classifier
+from services.near_duplicate_index import NearDuplicateIndex, get_near_duplicate_index, simhash
+from services.processing_journal import (
+    JournalEntry, ProcessingJournal, get_processing_journal,
+    STAGE_STARTED, STAGE_CLASSIFIED, STAGE_ARCHIVED, STAGE_AI_DATA,
+)
+from utils.date_utils import extract_document_date
 
 logger = logging.getLogger(__name__)
 
 # Parallele Verarbeitung
 DEFAULT_MAX_WORKERS = 8  # Anzahl gleichzeitiger Verarbeitungen
+# Liste manuell ausgeschlossener Dokumente hoechstens so alt (Sekunden)
+EXCLUDED_RECHECK_S = 10.0
 
 
 @dataclass
@@ -56,6 +71,12 @@ class BatchProcessingResult:
     cost_per_document_usd: Optional[float] = None
     currency: str = 'USD'
     provider: str = 'openrouter'
+    # KI-Request-Batching: Kosten/Latenz pro Dokument (gebuendelt vs. einzeln)
+    ai_batching_stats: Optional[dict] = None
+    # Lane-Scheduler: Zeit bis zum ersten/letzten Ergebnis (Sekunden ab Start)
+    time_to_first_result_s: Optional[float] = None
+    time_to_last_result_s: Optional[float] = None
+    lane_stats: Optional[dict] = None
     
     @property
     def success_rate(self) -> float:
@@ -104,6 +125,23 @@ class DocumentProcessor:
         self._ai_settings: Optional[dict] = None
         # Dokumenten-Regeln (einmal pro Verarbeitungslauf geladen)
         self._doc_rules: Optional[DocumentRulesSettings] = None
+        # Lokales Journal fuer Fortsetzung nach Absturz (lazy, je Server)
+        self._journal: Optional[ProcessingJournal] = None
+        # Buendelt Claims, Status-Updates und History-Eintraege
+        self._write_batcher = DocumentWriteBatcher(self.docs_api, self.history_api)
+        # Manuell ausgeschlossene Dokument-IDs (eine Abfrage fuer alle Worker)
+        self._excluded_ids: Optional[set] = None
+        self._excluded_checked_at = 0.0
+        self._excluded_lock = threading.Lock()
+        # Volltext: aus dem Seiten-Cache, vom Server (early_text_extract) oder lokal extrahiert
+        self._text_stats = {'in_memory': 0, 'reused': 0, 'extracted': 0}
+        self._text_stats_lock = threading.Lock()
+        # SHA256 des auf dem Server gespeicherten Volltexts (per get_ai_data geprueft)
+        self._stored_text_sha: Dict[int, str] = {}
+        # Lokaler Vorklassifikator vor der Sparten-KI (lazy)
+        self._pre_classifier: Optional[PreClassifier] = None
+        # SimHash-Index fuer Beinahe-Duplikate (lazy, je Server)
+        self._near_duplicates: Optional[NearDuplicateIndex] = None
         
     def _get_openrouter(self) -> OpenRouterClient:
         """Lazy-Init des OpenRouter-Clients."""
@@ -111,6 +149,84 @@ class DocumentProcessor:
             self.openrouter = OpenRouterClient(self.api_client)
         return self.openrouter
     
+    def _get_journal(self) -> Optional[ProcessingJournal]:
+        """Lazy-Init des Verarbeitungs-Journals (None wenn nicht verfuegbar)."""
+        if self._journal is None:
+            try:
+                self._journal = get_processing_journal(
+                    str(getattr(self.api_client, 'base_url', '') or '')
+                )
+            except Exception as e:
+                logger.warning(f"Verarbeitungs-Journal nicht verfuegbar: {e}")
+        return self._journal
+    
+    def _get_journal_entry(self, doc: Document) -> Optional[JournalEntry]:
+        """Offener Journal-Eintrag eines Dokuments (nur bei passendem Content-Hash)."""
+        journal = self._get_journal()
+        if journal is None:
+            return None
+        return journal.get(doc.id, content_hash=doc.content_hash)
+    
+    def _record_journal(self, doc_id: int, stage: str, **data) -> None:
+        """Vermerkt eine Stufe im Journal. Fehler brechen die Verarbeitung NICHT ab."""
+        journal = self._get_journal()
+        if journal is None:
+            return
+        try:
+            journal.record(doc_id, stage, **data)
+        except Exception as e:
+            logger.warning(f"Journal-Eintrag fehlgeschlagen fuer Dokument {doc_id} ({stage}): {e}")
+    
+    def _complete_journal(self, doc_id: int) -> None:
+        """Schliesst den Journal-Eintrag eines Dokuments ab."""
+        journal = self._get_journal()
+        if journal is None:
+            return
+        try:
+            journal.complete(doc_id)
+        except Exception as e:
+            logger.warning(f"Journal-Abschluss fehlgeschlagen fuer Dokument {doc_id}: {e}")
+    
+    def _collect_interrupted_documents(self, known_ids: set) -> List[Document]:
+        """
+        Sucht Dokumente eines abgebrochenen Laufs und setzt sie ab der
+        letzten Journal-Stufe fort.
+        
+        Nur Dokumente, die noch in der Verarbeitungs- oder Eingangsbox
+        liegen: mit Klassifikation ab der letzten Stufe, ohne solange der
+        Status noch eine laufende Verarbeitung anzeigt. Geloeschte und
+        inzwischen manuell verschobene Dokumente werden aus dem Journal
+        entfernt (ein Fortsetzen wuerde die Verschiebung ueberschreiben).
+        """
+        journal = self._get_journal()
+        if journal is None:
+            return []
+        interrupted = []
+        for doc_id in journal.pending_ids():
+            if doc_id in known_ids:
+                continue
+            try:
+                doc = self.docs_api.get_document(doc_id)
+            except Exception as e:
+                logger.warning(f"Journal: Dokument {doc_id} nicht abrufbar: {e}")
+                continue
+            entry = None
+            if doc is not None and doc.box_type in ('verarbeitung', 'eingang'):
+                entry = journal.get(doc_id, content_hash=doc.content_hash)
+            if entry is not None and entry.has(STAGE_CLASSIFIED) and entry.data.get('outcome'):
+                interrupted.append(doc)
+            elif (entry is not None and doc.box_type == 'verarbeitung'
+                    and doc.processing_status in ('processing', 'classified', 'renamed')):
+                interrupted.append(doc)
+            else:
+                self._complete_journal(doc_id)
+        if interrupted:
+            logger.info(
+                f"{len(interrupted)} unterbrochene(s) Dokument(e) aus vorherigem Lauf "
+                f"werden fortgesetzt"
+            )
+        return interrupted
+    
     def _get_cached_classification(self, content_hash: Optional[str]) -> Optional[dict]:
         """
         Prueft ob eine Klassifikation fuer diesen Content-Hash bereits im Cache liegt.
@@ -206,13 +322,182 @@ class DocumentProcessor:
         
         return kwargs
     
+    def _get_pre_classifier(self) -> Optional[PreClassifier]:
+        """Lazy-Init des lokalen Vorklassifikators (None wenn deaktiviert)."""
+        from config.processing_rules import PROCESSING_RULES
+        
+        if not PROCESSING_RULES.get('local_classifier_enabled', True):
+            return None
+        if self._pre_classifier is None:
+            try:
+                self._pre_classifier = PreClassifier(
+                    get_local_classifier(),
+                    threshold=PROCESSING_RULES.get('local_classifier_threshold', 0.95),
+                    min_samples=PROCESSING_RULES.get('local_classifier_min_samples', 5),
+                    audit_every=PROCESSING_RULES.get('local_classifier_audit_every', 10),
+                )
+            except Exception as e:
+                logger.warning(f"Lokaler Klassifikator nicht verfuegbar: {e}")
+                return None
+        return self._pre_classifier
+    
+    def _get_near_duplicate_index(self) -> Optional[NearDuplicateIndex]:
+        """Lazy-Init des Beinahe-Duplikat-Index (None wenn deaktiviert)."""
+        from config.processing_rules import PROCESSING_RULES
+        
+        if not PROCESSING_RULES.get('near_duplicate_enabled', True):
+            return None
+        if self._near_duplicates is None:
+            try:
+                self._near_duplicates = get_near_duplicate_index(
+                    str(getattr(self.api_client, 'base_url', '') or '')
+                )
+            except Exception as e:
+                logger.warning(f"Beinahe-Duplikat-Index nicht verfuegbar: {e}")
+        return self._near_duplicates
+    
+    @staticmethod
+    def _text_fingerprint(full_text: Optional[str]) -> Optional[int]:
+        """SimHash des Volltexts (None wenn zu kurz fuer einen Vergleich)."""
+        from config.processing_rules import PROCESSING_RULES
+        
+        min_chars = PROCESSING_RULES.get('near_duplicate_min_chars', 300)
+        if not full_text or len(full_text.strip()) < min_chars:
+            return None
+        return simhash(full_text)
+    
+    def _find_near_duplicate(self, doc: Document, full_text: Optional[str]) -> Optional[dict]:
+        """
+        Sparten-Ergebnis eines archivierten Beinahe-Duplikats (SimHash).
+        
+        Returns:
+            Ergebnis im Format von classify_sparte_with_date oder None
+        """
+        index = self._get_near_duplicate_index()
+        if index is None:
+            return None
+        match = index.find(self._text_fingerprint(full_text), exclude_id=doc.id)
+        if match is None:
+            return None
+        dup_id, distance, classification = match
+        sparte = classification.get('sparte')
+        if not sparte:
+            return None
+        # Nur Sparte und VU werden uebernommen; Datum und Dokumentname
+        # gehoeren zum neuen Dokument (z.B. naechste Beitragsrechnung)
+        date_iso = extract_document_date(full_text)
+        if date_iso is None and filename_needs_date(sparte, None):
+            logger.debug(f"Dokument {doc.id}: Beinahe-Duplikat {dup_id} ohne lokales Datum -> KI")
+            return None
+        logger.info(
+            f"Dokument {doc.id}: Beinahe-Duplikat von Dokument {dup_id} "
+            f"(SimHash-Distanz {distance}) -> {sparte}, KI uebersprungen"
+        )
+        return {
+            'sparte': sparte,
+            'confidence': classification.get('confidence') or 'high',
+            'document_date_iso': date_iso,
+            'vu_name': classification.get('vu_name'),
+            'document_name': None,
+            '_near_duplicate_of': dup_id,
+            '_near_duplicate_distance': distance,
+            '_ai_stage': 'near_duplicate',
+            '_server_cost_usd': 0.0,
+        }
+    
+    def _index_near_duplicate(self, doc: Document, outcome: dict) -> None:
+        """Nimmt ein archiviertes Dokument mit Sparten-Ergebnis in den SimHash-Index auf."""
+        ki_result = outcome.get('ki_result') or {}
+        if not ki_result.get('sparte') or ki_result.get('confidence') not in ('high', 'medium'):
+            return
+        index = self._get_near_duplicate_index()
+        if index is None:
+            return
+        try:
+            index.add(doc.id, self._text_fingerprint(outcome.get('extracted_text')), {
+                'sparte': ki_result.get('sparte'),
+                'confidence': ki_result.get('confidence'),
+                'vu_name': ki_result.get('vu_name'),
+            })
+        except Exception as e:
+            logger.debug(f"Beinahe-Duplikat-Index: Dokument {doc.id} nicht aufgenommen: {e}")
+    
+    def _classify_sparte(self, pdf_path: str, doc: Optional[Document] = None,
+                         full_text: Optional[str] = None) -> Optional[dict]:
+        """
+        Sparten-Klassifikation mit Beinahe-Duplikat-Index und lokalem
+        Vorklassifikator.
+        
+        Reihenfolge (erster Treffer gewinnt, jeweils ohne KI-Kosten):
+        1. Beinahe-Duplikat eines archivierten Dokuments (SimHash ueber den Volltext)
+        2. Eindeutiges Ergebnis des lokalen Klassifikators
+        3. classify_sparte_with_date(); das KI-Ergebnis wird gelernt und mit
+           der lokalen Vorhersage verglichen
+        """
+        if doc is not None:
+            near_result = self._find_near_duplicate(doc, full_text)
+            if near_result is not None:
+                return near_result
+        
+        openrouter = self._get_openrouter()
+        pre_classifier = self._get_pre_classifier()
+        text = ''
+        prediction = None
+        if pre_classifier is not None:
+            try:
+                # Gleicher Triage-Text wie Stufe 1 (Seiten-Cache, kein Mehraufwand)
+                text = openrouter._extract_relevant_text(pdf_path, for_triage=True)
+                local_result, prediction = pre_classifier.try_classify(text)
+                if local_result is not None:
+                    logger.info(
+                        f"Lokal klassifiziert: {local_result['sparte']} "
+                        f"(p={local_result['_local_probability']}), KI uebersprungen"
+                    )
+                    return local_result
+            except Exception as e:
+                logger.debug(f"Lokaler Klassifikator fehlgeschlagen: {e}")
+        
+        ki_result = openrouter.classify_sparte_with_date(pdf_path, **self._get_classify_kwargs())
+        
+        if pre_classifier is not None and text and ki_result \
+                and ki_result.get('confidence') in ('high', 'medium'):
+            try:
+                pre_classifier.observe(text, ki_result, prediction)
+            except Exception as e:
+                logger.debug(f"Lokaler Klassifikator: Lernen fehlgeschlagen: {e}")
+        return ki_result
+    
+    @staticmethod
+    def _sparte_classification_source(ki_result: dict) -> str:
+        """classification_source fuer ein Ergebnis von _classify_sparte()."""
+        if ki_result.get('_near_duplicate_of'):
+            return 'near_duplicate'
+        if ki_result.get('_local_classifier'):
+            return 'local_classifier'
+        # BUG-0007 Fix: == 'high' statt != 'medium'
+        return 'ki_gpt4o_mini' if ki_result.get('confidence', 'medium') == 'high' else 'ki_gpt4o_zweistufig'
+    
+    @staticmethod
+    def _near_duplicate_note(ki_result: dict) -> str:
+        """Zusatz fuer classification_reason: Quelle eines uebernommenen Beinahe-Duplikats."""
+        dup_id = ki_result.get('_near_duplicate_of')
+        if not dup_id:
+            return ''
+        return f", Beinahe-Duplikat von Dokument {dup_id} (SimHash-Distanz {ki_result.get('_near_duplicate_distance')})"
+    
     def process_inbox(self, 
                       progress_callback: Optional[Callable[[int, int, str], None]] = None,
-                      max_workers: int = DEFAULT_MAX_WORKERS
+                      max_workers: int = DEFAULT_MAX_WORKERS,
+                      lane_workers: Optional[Dict[str, int]] = None
                       ) -> BatchProcessingResult:
         """
         Verarbeitet alle Dokumente in der Eingangsbox PARALLEL.
         
+        Die Dokumente werden nach geschaetztem Aufwand auf Lanes mit eigener
+        Parallelitaet verteilt (ohne KI / Text-KI / OCR-Vision, siehe
+        services/processing_scheduler.py), damit guenstige Dokumente nicht
+        hinter grossen Scans warten.
+        
         Inkludiert Kosten-Tracking:
         - Guthaben vor/nach der Verarbeitung
         - Gesamtkosten und Kosten pro Dokument
@@ -220,7 +505,9 @@ class DocumentProcessor:
         
         Args:
             progress_callback: Optional - Callback fuer Fortschritt (current, total, message)
-            max_workers: Anzahl paralleler Verarbeitungen (default: 4)
+            max_workers: Obergrenze gleichzeitiger Verarbeitungen ueber alle Lanes (default: 8)
+            lane_workers: Optional - Aufteilung auf die Lanes (default: DEFAULT_LANE_WORKERS),
+                wird auf max_workers gekuerzt
             
         Returns:
             BatchProcessingResult mit allen Ergebnissen und Kosten
@@ -238,6 +525,7 @@ class DocumentProcessor:
         
         # Dokumente aus Eingangsbox holen
         inbox_docs = self.docs_api.list_by_box('eingang')
+        self._excluded_ids = None
         
         # Manuell ausgeschlossene Dokumente ueberspringen
         excluded_docs = [d for d in inbox_docs if d.processing_status == 'manual_excluded']
@@ -247,6 +535,9 @@ class DocumentProcessor:
             )
             inbox_docs = [d for d in inbox_docs if d.processing_status != 'manual_excluded']
         
+        # Unterbrochene Dokumente eines abgebrochenen Laufs fortsetzen
+        inbox_docs.extend(self._collect_interrupted_documents({d.id for d in inbox_docs}))
+        
         total = len(inbox_docs)
         
         if total == 0:
@@ -283,7 +574,33 @@ class DocumentProcessor:
         except Exception as e:
             logger.warning(f"Konnte Guthaben nicht abrufen: {e}")
         
-        logger.info(f"Verarbeite {total} Dokument(e) aus der Eingangsbox (parallel, {max_workers} Worker)")
+        # Lanes planen: Kosten je Dokument schaetzen (ohne Download)
+        estimates = [
+            (doc, estimate_document_cost(
+                doc,
+                is_xml_raw=self._is_xml_raw(doc),
+                is_cached=self._get_cached_classification(doc.content_hash) is not None,
+            ))
+            for doc in inbox_docs
+        ]
+        lanes = plan_lanes(estimates)
+        workers_per_lane = allocate_lane_workers(
+            {**DEFAULT_LANE_WORKERS, **(lane_workers or {})},
+            [lane for lane, entries in lanes.items() if entries],
+            max_workers,
+        )
+        # Harte Obergrenze auch wenn mehr Lanes aktiv sind als max_workers
+        worker_slots = threading.BoundedSemaphore(max(1, max_workers))
+        
+        lane_summary = ", ".join(
+            f"{lane}={len(entries)} ({workers_per_lane.get(lane, 1)} Worker)"
+            for lane, entries in lanes.items() if entries
+        )
+        logger.info(f"Verarbeite {total} Dokument(e) aus der Eingangsbox (parallel, Lanes: {lane_summary})")
+        
+        # KI-Requests nur buendeln, wenn mehrere Dokumente parallel laufen
+        # (Batching-Statistik pro Lauf)
+        self._get_openrouter().set_request_batching(max_workers > 1 and total > 1)
         
         # Thread-sicherer Counter fuer Progress
         completed_count = [0]  # Liste als mutable Container
@@ -291,7 +608,8 @@ class DocumentProcessor:
         
         def process_with_progress(doc: Document) -> ProcessingResult:
             """Wrapper der Progress-Callback aufruft."""
-            result = self._process_document(doc)
+            with worker_slots:
+                result = self._process_document(doc)
             
             # Thread-sicher den Counter erhoehen
             with progress_lock:
@@ -309,17 +627,26 @@ class DocumentProcessor:
             
             return result
         
-        # Parallele Verarbeitung mit ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Alle Dokumente gleichzeitig starten
-            future_to_doc = {
-                executor.submit(process_with_progress, doc): doc 
-                for doc in inbox_docs
-            }
+        # Parallele Verarbeitung: ein ThreadPoolExecutor pro Lane, innerhalb
+        # der Lane guenstige Dokumente zuerst
+        timing = RunTiming()
+        executors = {
+            lane: ThreadPoolExecutor(max_workers=workers_per_lane.get(lane, 1),
+                                     thread_name_prefix=f"inbox-{lane}")
+            for lane, entries in lanes.items() if entries
+        }
+        try:
+            timing.start()
+            future_to_doc = {}
+            for lane, entries in lanes.items():
+                for doc, _estimate in entries:
+                    future = executors[lane].submit(process_with_progress, doc)
+                    future_to_doc[future] = (doc, lane)
             
             # Ergebnisse einsammeln sobald fertig
             for future in as_completed(future_to_doc):
-                doc = future_to_doc[future]
+                doc, lane = future_to_doc[future]
+                timing.record(lane)
                 try:
                     result = future.result()
                     results.append(result)
@@ -340,6 +667,69 @@ class DocumentProcessor:
                         target_box='eingang',
                         error=str(e)
                     ))
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+            # Offene Claims und History-Eintraege senden
+            self._write_batcher.flush()
+        
+        if any(self._text_stats.values()):
+            logger.info(
+                f"Volltext: {self._text_stats['in_memory']}x aus dem Seiten-Cache, "
+                f"{self._text_stats['reused']}x gespeicherter Text wiederverwendet, "
+                f"{self._text_stats['extracted']}x lokal extrahiert"
+            )
+
+        # Lokaler Vorklassifikator: Modell sichern, Quoten protokollieren
+        if self._pre_classifier is not None:
+            pre_stats = self._pre_classifier.get_stats()
+            if pre_stats['eligible']:
+                logger.info(
+                    f"Lokaler Klassifikator: {pre_stats['skipped']}/{pre_stats['eligible']} "
+                    f"KI-Aufrufe uebersprungen (Quote {pre_stats['skip_rate']}), "
+                    f"Uebereinstimmung mit KI {pre_stats['agreement_rate']} "
+                    f"({pre_stats['compared']} Vergleiche, Audit {pre_stats['audit_agreement_rate']})"
+                )
+            self._pre_classifier.reset_stats()
+            try:
+                self._pre_classifier.save()
+            except Exception as e:
+                logger.warning(f"Lokaler Klassifikator konnte nicht gespeichert werden: {e}")
+
+        write_stats = self._write_batcher.get_stats()
+        logger.info(
+            f"Schreibzugriffe: {write_stats['updates']} Updates, "
+            f"{write_stats['claim_requests']} Bulk-Claims "
+            f"({write_stats['claims_coalesced']} eingespart), "
+            f"{write_stats['history_entries']} History-Eintraege in "
+            f"{write_stats['history_requests']} Request(s)"
+        )
+        
+        if self._near_duplicates is not None:
+            try:
+                self._near_duplicates.compact()
+            except Exception as e:
+                logger.warning(f"Beinahe-Duplikat-Index: Kompaktierung fehlgeschlagen: {e}")
+        
+        # Journal kompaktieren (nur noch offene Eintraege behalten)
+        journal = self._get_journal()
+        if journal is not None:
+            try:
+                journal.compact()
+            except Exception as e:
+                logger.warning(f"Journal-Kompaktierung fehlgeschlagen: {e}")
+        
+        lane_stats = timing.lane_stats(workers_per_lane)
+        if timing.time_to_first_result is not None:
+            logger.info(
+                f"Zeit bis erstes Ergebnis: {timing.time_to_first_result:.1f}s, "
+                f"bis letztes Ergebnis: {timing.time_to_last_result:.1f}s"
+            )
+            for lane, stats in lane_stats.items():
+                logger.info(
+                    f"  Lane {lane}: {stats['documents']} Dok., {stats['workers']} Worker, "
+                    f"erstes {stats['time_to_first_result_s']:.1f}s / letztes {stats['time_to_last_result_s']:.1f}s"
+                )
         
         # ============================================
         # KOSTEN-TRACKING: Guthaben NACH Verarbeitung
@@ -363,6 +753,11 @@ class DocumentProcessor:
         logger.info(f"Verarbeitung abgeschlossen: {successful_count}/{total} erfolgreich in {duration:.1f}s")
         logger.info(f"Akkumulierte KI-Kosten: ${accumulated_cost:.6f} USD (${cost_per_doc:.6f}/Dok)")
         
+        batching_stats = self._get_openrouter().get_batching_stats()
+        self._get_openrouter().set_request_batching(False)
+        if batching_stats and (batching_stats['batched_documents'] or batching_stats['single_documents']):
+            self._log_batching_stats(batching_stats)
+        
         if credits_provider == 'openai':
             if credits_before is not None:
                 logger.info(f"OpenAI-Usage vor Verarbeitung: ${credits_before:.6f} USD")
@@ -380,7 +775,30 @@ class DocumentProcessor:
             credits_after=None,
             total_cost_usd=accumulated_cost,
             cost_per_document_usd=cost_per_doc,
-            provider=credits_provider
+            provider=credits_provider,
+            ai_batching_stats=batching_stats,
+            time_to_first_result_s=timing.time_to_first_result,
+            time_to_last_result_s=timing.time_to_last_result,
+            lane_stats=lane_stats
+        )
+    
+    @staticmethod
+    def _log_batching_stats(stats: dict) -> None:
+        """Loggt Kosten und Latenz pro Dokument fuer gebuendelte vs. einzelne KI-Requests."""
+        def _ms(value):
+            return f"{value:.0f} ms" if value is not None else "-"
+        
+        def _usd(value):
+            return f"${value:.6f}" if value is not None else "-"
+        
+        logger.info(
+            f"KI-Batching: {stats['batched_documents']} Dok. in {stats['batch_requests']} Batch-Request(s), "
+            f"{stats['single_documents']} einzeln ({stats['fallback_documents']} Fallback)"
+        )
+        logger.info(
+            f"KI-Batching pro Dokument: gebuendelt {_ms(stats['batched_latency_ms_per_doc'])} / "
+            f"{_usd(stats['batched_cost_usd_per_doc'])} | einzeln "
+            f"{_ms(stats['single_latency_ms_per_doc'])} / {_usd(stats['single_cost_usd_per_doc'])}"
         )
     
     def log_batch_complete(self,
@@ -406,6 +824,11 @@ class DocumentProcessor:
                 'cost_pending': True
             }
             
+            if batch_result.time_to_first_result_s is not None:
+                action_details['time_to_first_result_s'] = round(batch_result.time_to_first_result_s, 2)
+                action_details['time_to_last_result_s'] = round(batch_result.time_to_last_result_s, 2)
+            if batch_result.lane_stats:
+                action_details['lane_stats'] = batch_result.lane_stats
             if batch_result.credits_before is not None:
                 action_details['credits_before_usd'] = round(batch_result.credits_before, 6)
             if batch_result.total_cost_usd is not None and batch_result.total_cost_usd > 0:
@@ -528,6 +951,24 @@ class DocumentProcessor:
             logger.warning(f"Verzoegertes Kosten-Logging fehlgeschlagen: {e}")
             return None
     
+    def _is_manually_excluded(self, doc_id: int) -> bool:
+        """
+        Prueft, ob ein Dokument nach dem Laden der Eingangsbox manuell
+        ausgeschlossen wurde.
+        
+        Statt get_document pro Dokument laedt eine Abfrage alle Dokumente mit
+        processing_status='manual_excluded'; parallele Worker teilen sich das
+        Ergebnis, nach EXCLUDED_RECHECK_S wird neu geladen.
+        """
+        with self._excluded_lock:
+            now = time.monotonic()
+            if (self._excluded_ids is None
+                    or now - self._excluded_checked_at >= EXCLUDED_RECHECK_S):
+                excluded = self.docs_api.list_documents(processing_status='manual_excluded')
+                self._excluded_ids = {d.id for d in excluded}
+                self._excluded_checked_at = now
+            return doc_id in self._excluded_ids
+    
     def _process_document(self, doc: Document) -> ProcessingResult:
         """
         Verarbeitet ein einzelnes Dokument.
@@ -563,11 +1004,9 @@ class DocumentProcessor:
         _doc_cost_usd = 0.0
         
         try:
-            # 0. Re-Verifikation: Dokument nochmal frisch vom Server holen
-            #    und pruefen ob es noch verarbeitet werden soll
-            #    (Schutz gegen Server-Caching bei list_by_box)
-            fresh_doc = self.docs_api.get_document(doc.id)
-            if fresh_doc and fresh_doc.processing_status == 'manual_excluded':
+            # 0. Re-Verifikation: pruefen ob das Dokument inzwischen manuell
+            #    ausgeschlossen wurde (Schutz gegen Server-Caching bei list_by_box)
+            if self._is_manually_excluded(doc.id):
                 logger.info(
                     f"Dokument {doc.id} ({doc.original_filename}): "
                     f"Uebersprungen (manuell ausgeschlossen)"
@@ -580,17 +1019,30 @@ class DocumentProcessor:
                     category='manual_excluded'
                 )
             
-            # 1. Status: downloaded -> processing (In Verarbeitungsbox verschieben)
-            self.docs_api.update(doc.id, 
-                                 box_type='verarbeitung', 
-                                 processing_status='processing')
-            
-            logger.debug(f"Dokument {doc.id}: Status -> processing")
+            # 0b. Journal: Unterbrochene Verarbeitung fortsetzen. Liegt die
+            #     Klassifikation bereits vor, entfaellt der komplette
+            #     Klassifikationszweig (keine erneuten KI-Kosten).
+            entry = self._get_journal_entry(doc)
+            if entry is not None and entry.has(STAGE_CLASSIFIED) and entry.data.get('outcome'):
+                logger.info(
+                    f"Dokument {doc.id}: Fortsetzung aus Journal "
+                    f"(erledigt: {', '.join(entry.stages)})"
+                )
+                return self._finalize_document(doc, entry.data['outcome'], start_time,
+                                               entry=entry, resumed=True)
             
-            # History: Start der Verarbeitung
-            self._log_history(doc.id, 'start_processing', 'processing',
-                              previous_status=previous_status,
-                              action_details={'source_box': doc.box_type})
+            # 1. Status: downloaded -> processing (In Verarbeitungsbox verschieben)
+            #    Claims paralleler Worker gehen gebuendelt per Bulk-Move raus
+            if entry is None or not entry.has(STAGE_STARTED):
+                self._write_batcher.claim(doc.id)
+                
+                logger.debug(f"Dokument {doc.id}: Status -> processing")
+                
+                # History: Start der Verarbeitung
+                self._log_history(doc.id, 'start_processing', 'processing',
+                                  previous_status=previous_status,
+                                  action_details={'source_box': doc.box_type})
+                self._record_journal(doc.id, STAGE_STARTED, content_hash=doc.content_hash)
             
             target_box = 'sonstige'
             category = None
@@ -719,12 +1171,10 @@ class DocumentProcessor:
                                         # PDF ist gueltig -> KI-Klassifikation (wie Schritt 5b/6)
                                         pdf_path = repaired_path or local_path_fb
                                         self._check_and_log_empty_pages(doc, pdf_path)
-                                        openrouter = self._get_openrouter()
-                                        ki_result = openrouter.classify_sparte_with_date(pdf_path, **self._get_classify_kwargs())
+                                        _ai_extracted_text, _ai_page_count = self._get_full_text(doc, pdf_path)
+                                        ki_result = self._classify_sparte(pdf_path, doc, _ai_extracted_text)
                                         if ki_result:
                                             _doc_cost_usd += ki_result.get('_server_cost_usd', 0) or 0
-                                        
-                                        _ai_extracted_text, _ai_page_count = self._extract_full_text(pdf_path)
                                         _ki_result_for_ai = ki_result
                                         
                                         if ki_result is None:
@@ -739,11 +1189,12 @@ class DocumentProcessor:
                                         target_box = sparte
                                         category = f'sparte_{sparte}'
                                         
-                                        classification_source = 'ki_gpt4o_mini' if ki_confidence == 'high' else 'ki_gpt4o_zweistufig'
+                                        classification_source = self._sparte_classification_source(ki_result)
                                         classification_confidence = ki_confidence
                                         classification_reason = (
                                             f'KI-Klassifikation (BiPRO 999xxx nicht-GDV PDF): '
                                             f'{sparte} ({ki_confidence})'
+                                            f'{self._near_duplicate_note(ki_result)}'
                                         )
                                         
                                         logger.info(
@@ -858,7 +1309,7 @@ class DocumentProcessor:
                                     
                                     # AI-Data: Volltext extrahieren + ki_result merken
                                     # (muss im tempfile-Block passieren, da pdf_path danach geloescht wird)
-                                    _ai_extracted_text, _ai_page_count = self._extract_full_text(pdf_path)
+                                    _ai_extracted_text, _ai_page_count = self._get_full_text(doc, pdf_path)
                                     _ki_result_for_ai = result
                                     
                                     if result:
@@ -922,13 +1373,11 @@ class DocumentProcessor:
                                     pdf_path = repaired_path or local_path
                                     # Leere-Seiten-Erkennung (informativ, blockiert nicht)
                                     self._check_and_log_empty_pages(doc, pdf_path)
-                                    openrouter = self._get_openrouter()
-                                    ki_result = openrouter.classify_sparte_with_date(pdf_path, **self._get_classify_kwargs())
+                                    # AI-Data: Volltext (auch fuer Beinahe-Duplikat-Suche) + ki_result merken
+                                    _ai_extracted_text, _ai_page_count = self._get_full_text(doc, pdf_path)
+                                    ki_result = self._classify_sparte(pdf_path, doc, _ai_extracted_text)
                                     if ki_result:
                                         _doc_cost_usd += ki_result.get('_server_cost_usd', 0) or 0
-                                    
-                                    # AI-Data: Volltext extrahieren + ki_result merken
-                                    _ai_extracted_text, _ai_page_count = self._extract_full_text(pdf_path)
                                     _ki_result_for_ai = ki_result
                                     
                                     # Schutz gegen None-Rueckgabe bei KI-Fehler
@@ -945,9 +1394,9 @@ class DocumentProcessor:
                                     category = f'sparte_{sparte}'
                                     
                                     # Audit-Metadaten - Confidence aus KI uebernehmen (BUG-0007 Fix: == 'high' statt != 'medium')
-                                    classification_source = 'ki_gpt4o_mini' if ki_confidence == 'high' else 'ki_gpt4o_zweistufig'
+                                    classification_source = self._sparte_classification_source(ki_result)
                                     classification_confidence = ki_confidence
-                                    classification_reason = f'KI-Sparten-Klassifikation: {sparte} ({ki_confidence}), BiPRO-Typ: {doc_type}'
+                                    classification_reason = f'KI-Sparten-Klassifikation: {sparte} ({ki_confidence}), BiPRO-Typ: {doc_type}' + self._near_duplicate_note(ki_result)
                                     
                                     logger.info(f"Sparte klassifiziert: {sparte} (confidence: {ki_confidence})")
                                     
@@ -1004,7 +1453,7 @@ class DocumentProcessor:
                                 openrouter = self._get_openrouter()
                                 result = openrouter.classify_courtage_minimal(pdf_path)
                                 
-                                _ai_extracted_text, _ai_page_count = self._extract_full_text(pdf_path)
+                                _ai_extracted_text, _ai_page_count = self._get_full_text(doc, pdf_path)
                                 _ki_result_for_ai = result
                                 
                                 if result:
@@ -1062,13 +1511,11 @@ class DocumentProcessor:
                                 pdf_path = repaired_path or local_path
                                 # Leere-Seiten-Erkennung (informativ, blockiert nicht)
                                 self._check_and_log_empty_pages(doc, pdf_path)
-                                openrouter = self._get_openrouter()
-                                ki_result = openrouter.classify_sparte_with_date(pdf_path, **self._get_classify_kwargs())
+                                # AI-Data: Volltext (auch fuer Beinahe-Duplikat-Suche) + ki_result merken
+                                _ai_extracted_text, _ai_page_count = self._get_full_text(doc, pdf_path)
+                                ki_result = self._classify_sparte(pdf_path, doc, _ai_extracted_text)
                                 if ki_result:
                                     _doc_cost_usd += ki_result.get('_server_cost_usd', 0) or 0
-                                
-                                # AI-Data: Volltext extrahieren + ki_result merken
-                                _ai_extracted_text, _ai_page_count = self._extract_full_text(pdf_path)
                                 _ki_result_for_ai = ki_result
                                 
                                 # Schutz gegen None-Rueckgabe bei KI-Fehler
@@ -1085,9 +1532,9 @@ class DocumentProcessor:
                                 category = f'sparte_{sparte}'
                                 
                                 # Audit-Metadaten - Confidence aus KI (BUG-0007 Fix: == 'high' statt != 'medium')
-                                classification_source = 'ki_gpt4o_mini' if ki_confidence == 'high' else 'ki_gpt4o_zweistufig'
+                                classification_source = self._sparte_classification_source(ki_result)
                                 classification_confidence = ki_confidence
-                                classification_reason = f'KI-Sparten-Klassifikation ohne BiPRO: {sparte} ({ki_confidence})'
+                                classification_reason = f'KI-Sparten-Klassifikation ohne BiPRO: {sparte} ({ki_confidence})' + self._near_duplicate_note(ki_result)
                                 
                                 logger.info(f"PDF klassifiziert: {sparte} (confidence: {ki_confidence})")
                                 
@@ -1181,108 +1628,36 @@ class DocumentProcessor:
                     'classification_reason': classification_reason,
                 })
             
-            # Schritt 1: processing -> classified (mit Klassifikations-Metadaten)
-            update_kwargs = {
-                'box_type': target_box,
-                'processing_status': 'classified',
-                'document_category': category,
+            # Journal: Klassifikation inkl. Zwischenergebnisse sichern, damit ein
+            # abgebrochener Lauf ohne erneute KI-Aufrufe fortgesetzt werden kann
+            outcome = {
+                'target_box': target_box,
+                'category': category,
+                'new_filename': new_filename,
+                'classification_source': classification_source,
+                'classification_confidence': classification_confidence,
+                'classification_reason': classification_reason,
+                'extracted_text': _ai_extracted_text,
+                'page_count': _ai_page_count,
+                'ki_result': _ki_result_for_ai,
+                'cost_usd': _doc_cost_usd,
             }
+            self._record_journal(doc.id, STAGE_CLASSIFIED, outcome=outcome)
             
-            # Audit-Metadaten hinzufuegen wenn vorhanden
-            if classification_source:
-                update_kwargs['classification_source'] = classification_source
-            if classification_confidence:
-                update_kwargs['classification_confidence'] = classification_confidence
-            if classification_reason:
-                # Auf 500 Zeichen begrenzen (DB-Limit)
-                update_kwargs['classification_reason'] = classification_reason[:500] if classification_reason else None
-            # Timestamp immer setzen wenn klassifiziert wurde
-            update_kwargs['classification_timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            self.docs_api.update(doc.id, **update_kwargs)
-            
-            # Logging: Sonstige als "nicht zugeordnet" markieren
-            if target_box == 'sonstige':
-                logger.info(f"Dokument {doc.id}: Nicht zugeordnet -> {category}")
-            else:
-                logger.debug(f"Dokument {doc.id}: Status -> classified")
-            
-            # History: Klassifikation abgeschlossen
-            duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-            self._log_history(doc.id, 'classify', 'classified',
-                              previous_status='processing',
-                              classification_source=classification_source,
-                              classification_result=f'{category} -> {target_box}',
-                              action_details={
-                                  'category': category,
-                                  'target_box': target_box,
-                                  'confidence': classification_confidence,
-                                  'reason': classification_reason[:200] if classification_reason else None
-                              },
-                              duration_ms=duration_ms)
-            
-            # Schritt 2: Falls umbenannt: classified -> renamed
-            current_status = 'classified'
-            if new_filename:
-                self.docs_api.update(doc.id, 
-                                     original_filename=new_filename,
-                                     ai_renamed=True,
-                                     processing_status='renamed')
-                current_status = 'renamed'
-                logger.debug(f"Dokument {doc.id}: Status -> renamed ({new_filename})")
-                self._log_history(doc.id, 'rename', 'renamed',
-                                  previous_status='classified',
-                                  action_details={'new_filename': new_filename})
-            
-            # Schritt 3: classified/renamed -> archived (in Ziel-Box)
-            self.docs_api.update(doc.id, processing_status='archived')
-            logger.debug(f"Dokument {doc.id}: Status -> archived (in {target_box})")
-            
-            # History: Archivierung abgeschlossen
-            self._log_history(doc.id, 'archive', 'archived',
-                              previous_status=current_status,
-                              action_details={'final_box': target_box, 'new_filename': new_filename})
-            
-            # Nachgelagerter Schritt: AI-Daten persistieren (Volltext + KI-Response)
-            # Fehler hier brechen die Verarbeitung NICHT ab
-            if _ai_extracted_text is not None or _ki_result_for_ai is not None:
-                try:
-                    self._persist_ai_data(doc, _ai_extracted_text, _ai_page_count, _ki_result_for_ai)
-                except Exception as ai_err:
-                    logger.warning(f"AI-Daten-Persistierung fehlgeschlagen fuer Dokument {doc.id}: {ai_err}")
-            
-            # Dokumenten-Regeln anwenden (Duplikate, leere Seiten)
-            # Fehler hier brechen die Verarbeitung NICHT ab
-            try:
-                self._apply_document_rules(doc)
-            except Exception as rule_err:
-                logger.warning(f"Dokumenten-Regeln fehlgeschlagen fuer Dokument {doc.id}: {rule_err}")
-            
-            # Erfolg-Logik:
-            # - Erfolgreich = GDV, Courtage, Sach, Leben, Kranken, Roh
-            # - Nicht zugeordnet = Sonstige (wird als "failed" gezaehlt)
-            is_success = target_box not in ['sonstige']
-            
-            return ProcessingResult(
-                document_id=doc.id,
-                original_filename=doc.original_filename,
-                success=is_success,
-                target_box=target_box,
-                category=category,
-                new_filename=new_filename,
-                cost_usd=_doc_cost_usd
-            )
+            return self._finalize_document(doc, outcome, start_time)
             
         except Exception as e:
             logger.exception(f"Fehler bei Verarbeitung von Dokument {doc.id}")
             
             # Fehler markieren mit Status: error
             try:
-                self.docs_api.update(doc.id, 
-                                     box_type='sonstige',
-                                     processing_status='error',
-                                     ai_processing_error=str(e)[:500])
+                self._write_batcher.update(doc.id, 
+                                           box_type='sonstige',
+                                           processing_status='error',
+                                           ai_processing_error=str(e)[:500])
                 logger.debug(f"Dokument {doc.id}: Status -> error")
+                # Dokument liegt nicht mehr in der Verarbeitungsbox
+                self._complete_journal(doc.id)
                 
                 # History: Fehler protokollieren
                 duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -1302,6 +1677,149 @@ class DocumentProcessor:
                 error=str(e)
             )
     
+    def _finalize_document(self, doc: Document, outcome: dict, start_time: datetime,
+                           entry: Optional[JournalEntry] = None,
+                           resumed: bool = False) -> ProcessingResult:
+        """
+        Schreibt eine vorliegende Klassifikation zum Server (classified ->
+        renamed -> archived) und persistiert Volltext/KI-Daten.
+        
+        Jede abgeschlossene Stufe wird im Verarbeitungs-Journal vermerkt.
+        Beim Fortsetzen (entry gesetzt) werden erledigte Stufen uebersprungen.
+        
+        Args:
+            doc: Das Dokument
+            outcome: Klassifikation + Zwischenergebnisse (siehe _process_document)
+            start_time: Start der Verarbeitung (fuer duration_ms)
+            entry: Journal-Eintrag eines unterbrochenen Laufs
+            resumed: True = KI-Kosten fielen im unterbrochenen Lauf an
+        """
+        def done(stage: str) -> bool:
+            return entry is not None and entry.has(stage)
+        
+        target_box = outcome.get('target_box') or 'sonstige'
+        category = outcome.get('category')
+        new_filename = outcome.get('new_filename')
+        _ai_extracted_text = outcome.get('extracted_text')
+        _ai_page_count = outcome.get('page_count') or 0
+        _ki_result_for_ai = outcome.get('ki_result')
+        _doc_cost_usd = 0.0 if resumed else (outcome.get('cost_usd') or 0.0)
+        
+        # Schritte 1-3: processing -> classified -> renamed -> archived.
+        # Die Zwischenstatus sind nur waehrend der Verarbeitung relevant,
+        # daher EIN zusammengefasstes Update statt drei Requests (im Journal
+        # eine Stufe: STAGE_ARCHIVED).
+        if not done(STAGE_ARCHIVED):
+            update_kwargs = self._classification_update_kwargs(outcome)
+            if new_filename:
+                update_kwargs['original_filename'] = new_filename
+                update_kwargs['ai_renamed'] = True
+            update_kwargs['processing_status'] = 'archived'
+            
+            if not self._write_batcher.update(doc.id, **update_kwargs):
+                # Journal bleibt offen -> naechster Lauf setzt ohne KI fort
+                logger.warning(f"Dokument {doc.id}: Status-Update fehlgeschlagen, bleibt in Verarbeitung")
+                return ProcessingResult(
+                    document_id=doc.id,
+                    original_filename=doc.original_filename,
+                    success=False,
+                    target_box='verarbeitung',
+                    category=category,
+                    error='Status-Update fehlgeschlagen',
+                    cost_usd=_doc_cost_usd
+                )
+            
+            # Logging: Sonstige als "nicht zugeordnet" markieren
+            if target_box == 'sonstige':
+                logger.info(f"Dokument {doc.id}: Nicht zugeordnet -> {category}")
+            logger.debug(f"Dokument {doc.id}: Status -> archived (in {target_box})")
+            
+            # History: Schritte einzeln protokollieren; der Batcher fasst sie
+            # mit 'archive' zu einem Eintrag pro Dokument zusammen
+            self._log_classification_history(doc, outcome, start_time)
+            if new_filename:
+                self._log_history(doc.id, 'rename', 'renamed',
+                                  previous_status='classified',
+                                  action_details={'new_filename': new_filename})
+            self._log_history(doc.id, 'archive', 'archived',
+                              previous_status='renamed' if new_filename else 'classified',
+                              action_details={'final_box': target_box, 'new_filename': new_filename})
+            self._record_journal(doc.id, STAGE_ARCHIVED)
+            self._index_near_duplicate(doc, outcome)
+        
+        # Nachgelagerter Schritt: AI-Daten persistieren (Volltext + KI-Response)
+        # Fehler hier brechen die Verarbeitung NICHT ab
+        if (not done(STAGE_AI_DATA)
+                and (_ai_extracted_text is not None or _ki_result_for_ai is not None)):
+            try:
+                self._persist_ai_data(doc, _ai_extracted_text, _ai_page_count, _ki_result_for_ai)
+                self._record_journal(doc.id, STAGE_AI_DATA)
+            except Exception as ai_err:
+                logger.warning(f"AI-Daten-Persistierung fehlgeschlagen fuer Dokument {doc.id}: {ai_err}")
+        
+        # Dokumenten-Regeln anwenden (Duplikate, leere Seiten)
+        # Fehler hier brechen die Verarbeitung NICHT ab
+        try:
+            self._apply_document_rules(doc)
+        except Exception as rule_err:
+            logger.warning(f"Dokumenten-Regeln fehlgeschlagen fuer Dokument {doc.id}: {rule_err}")
+        
+        # Erfolg-Logik:
+        # - Erfolgreich = GDV, Courtage, Sach, Leben, Kranken, Roh
+        # - Nicht zugeordnet = Sonstige (wird als "failed" gezaehlt)
+        is_success = target_box not in ['sonstige']
+        
+        self._complete_journal(doc.id)
+        
+        return ProcessingResult(
+            document_id=doc.id,
+            original_filename=doc.original_filename,
+            success=is_success,
+            target_box=target_box,
+            category=category,
+            new_filename=new_filename,
+            cost_usd=_doc_cost_usd
+        )
+    
+    @staticmethod
+    def _classification_update_kwargs(outcome: dict) -> dict:
+        """Ziel-Box und Klassifikations-Metadaten fuer docs_api.update."""
+        update_kwargs = {
+            'box_type': outcome.get('target_box') or 'sonstige',
+            'document_category': outcome.get('category'),
+        }
+        
+        # Audit-Metadaten hinzufuegen wenn vorhanden
+        classification_reason = outcome.get('classification_reason')
+        if outcome.get('classification_source'):
+            update_kwargs['classification_source'] = outcome['classification_source']
+        if outcome.get('classification_confidence'):
+            update_kwargs['classification_confidence'] = outcome['classification_confidence']
+        if classification_reason:
+            # Auf 500 Zeichen begrenzen (DB-Limit)
+            update_kwargs['classification_reason'] = classification_reason[:500]
+        # Timestamp immer setzen wenn klassifiziert wurde
+        update_kwargs['classification_timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return update_kwargs
+    
+    def _log_classification_history(self, doc: Document, outcome: dict, start_time: datetime) -> None:
+        """History: Klassifikation abgeschlossen."""
+        target_box = outcome.get('target_box') or 'sonstige'
+        category = outcome.get('category')
+        classification_reason = outcome.get('classification_reason')
+        duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+        self._log_history(doc.id, 'classify', 'classified',
+                          previous_status='processing',
+                          classification_source=outcome.get('classification_source'),
+                          classification_result=f'{category} -> {target_box}',
+                          action_details={
+                              'category': category,
+                              'target_box': target_box,
+                              'confidence': outcome.get('classification_confidence'),
+                              'reason': classification_reason[:200] if classification_reason else None
+                          },
+                          duration_ms=duration_ms)
+    
     def _validate_pdf(self, pdf_path: str) -> Tuple[bool, Optional[str]]:
         """
         Validiert ein PDF, erkennt Verschluesselung und versucht bei Fehler Reparatur.
@@ -1457,6 +1975,111 @@ class DocumentProcessor:
             # Fehler in der Leere-Seiten-Erkennung darf die Pipeline NICHT blockieren
             logger.warning(f"Leere-Seiten-Erkennung fehlgeschlagen fuer {doc.original_filename}: {e}")
     
+    def _get_full_text(self, doc: Document, pdf_path: str) -> tuple:
+        """
+        Volltext fuer die AI-Data-Persistierung.
+        
+        Reihenfolge:
+        1. Alle Seiten liegen bereits im Seiten-Cache (Triage hat kurze
+           Dokumente komplett gelesen) -> Text aus dem Speicher, kein Request
+        2. Bei Upload gespeicherter Text (early_text_extract, per get_ai_data)
+        3. Lokale Extraktion
+        
+        Returns:
+            Tuple (extracted_text: str, pages_with_text: int)
+        """
+        in_memory = self._get_cached_full_text(pdf_path)
+        if in_memory is not None:
+            with self._text_stats_lock:
+                self._text_stats['in_memory'] += 1
+            return in_memory
+        stored = self._get_stored_text(doc)
+        if stored is not None:
+            with self._text_stats_lock:
+                self._text_stats['reused'] += 1
+            return stored
+        with self._text_stats_lock:
+            self._text_stats['extracted'] += 1
+        return self._extract_full_text(pdf_path)
+    
+    def _get_cached_full_text(self, pdf_path: str) -> Optional[tuple]:
+        """
+        Volltext wie _extract_full_text, aber nur wenn ALLE Seiten im
+        Seiten-Cache liegen (sonst None, es wird nichts extrahiert).
+        """
+        try:
+            import fitz  # PyMuPDF
+            from services.page_text_cache import peek_page_text
+            
+            pdf_doc = fitz.open(pdf_path)
+            try:
+                texts = []
+                for page in pdf_doc:
+                    page_text = peek_page_text(page)
+                    if page_text is None:
+                        return None
+                    texts.append(page_text)
+            finally:
+                pdf_doc.close()
+        except Exception as e:
+            logger.debug(f"Seiten-Cache fuer Volltext nicht nutzbar: {e}")
+            return None
+        
+        extracted_text = ""
+        pages_with_text = 0
+        for page_text in texts:
+            if page_text and page_text.strip():
+                extracted_text += page_text + "\n"
+                pages_with_text += 1
+        return (extracted_text, pages_with_text)
+    
+    def _get_stored_text(self, doc: Document) -> Optional[tuple]:
+        """
+        Laedt den gespeicherten Volltext, wenn er aus genau dieser Datei stammt.
+        
+        Gueltig nur wenn:
+        - source_content_hash des Eintrags gleich doc.content_hash ist
+          (Datei seitdem nicht ersetzt; Eintraege ohne Hash gelten als veraltet)
+        - SHA256 des Textes zum gespeicherten extracted_text_sha256 passt
+        
+        Ein gueltiger Text wird in _persist_ai_data nicht erneut hochgeladen.
+        
+        Returns:
+            (extracted_text, pages_with_text) oder None (lokal extrahieren)
+        """
+        import hashlib
+        
+        if not doc.content_hash:
+            return None
+        try:
+            ai_data = self.docs_api.get_ai_data(doc.id)
+        except Exception as e:
+            logger.debug(f"Gespeicherter Volltext nicht abrufbar fuer Dokument {doc.id}: {e}")
+            return None
+        if not ai_data:
+            return None
+        
+        if ai_data.get('source_content_hash') != doc.content_hash:
+            logger.debug(f"Gespeicherter Volltext fuer Dokument {doc.id} veraltet, extrahiere neu")
+            return None
+        text = ai_data.get('extracted_text')
+        text_sha256 = ai_data.get('extracted_text_sha256')
+        if not text or not text.strip() or not text_sha256:
+            return None
+        if hashlib.sha256(text.encode('utf-8')).hexdigest() != text_sha256:
+            logger.debug(f"Gespeicherter Volltext fuer Dokument {doc.id} unvollstaendig (SHA256)")
+            return None
+        
+        try:
+            page_count = int(ai_data.get('extracted_page_count') or 0)
+        except (TypeError, ValueError):
+            page_count = 0
+        
+        logger.debug(f"Dokument {doc.id}: gespeicherter Volltext wiederverwendet ({len(text)} Zeichen)")
+        with self._text_stats_lock:
+            self._stored_text_sha[doc.id] = text_sha256
+        return (text, page_count)
+    
     def _extract_full_text(self, pdf_path: str) -> tuple:
         """
         Extrahiert Volltext ueber ALLE Seiten einer PDF.
@@ -1475,14 +2098,16 @@ class DocumentProcessor:
         except ImportError:
             logger.warning("PyMuPDF nicht verfuegbar fuer Volltext-Extraktion")
             return ("", 0)
-        
+
+        from services.page_text_cache import get_page_text
+
         extracted_text = ""
         pages_with_text = 0
-        
+
         try:
             pdf_doc = fitz.open(pdf_path)
             for page in pdf_doc:
-                page_text = page.get_text("text")
+                page_text = get_page_text(page)
                 if page_text and page_text.strip():
                     extracted_text += page_text + "\n"
                     pages_with_text += 1
@@ -1558,12 +2183,22 @@ class DocumentProcessor:
         text_char_count = len(extracted_text) if extracted_text else 0
         ai_response_char_count = len(ai_full_response) if ai_full_response else 0
         
-        # 5. API-Call: POST /documents/{id}/ai-data
+        # 5. Volltext liegt unveraendert auf dem Server (_get_stored_text):
+        #    nicht erneut hochladen; ohne KI-Daten entfaellt der Request ganz
+        with self._text_stats_lock:
+            stored_sha = self._stored_text_sha.pop(doc.id, None)
+        text_unchanged = text_sha256 is not None and text_sha256 == stored_sha
+        if text_unchanged and not ki_result:
+            logger.debug(f"AI-Daten fuer Dokument {doc.id} unveraendert, kein Speichern noetig")
+            return
+        
+        # 6. API-Call: POST /documents/{id}/ai-data
         data = {
             'extracted_text': extracted_text if (extracted_text and extracted_text.strip()) else None,
             'extracted_text_sha256': text_sha256,
             'extraction_method': extraction_method,
             'extracted_page_count': extracted_page_count or 0,
+            'source_content_hash': doc.content_hash,
             'ai_full_response': ai_full_response,
             'ai_prompt_text': ai_prompt_text,
             'ai_model': ai_model,
@@ -1575,6 +2210,11 @@ class DocumentProcessor:
             'completion_tokens': completion_tokens,
             'total_tokens': total_tokens,
         }
+        if text_unchanged:
+            # Upsert ergaenzt nur die KI-Felder, der gespeicherte Text bleibt
+            for key in ('extracted_text', 'extracted_text_sha256', 'extraction_method',
+                        'extracted_page_count', 'source_content_hash', 'text_char_count'):
+                del data[key]
         
         result = self.docs_api.save_ai_data(doc.id, data)
         if result:
@@ -1732,11 +2372,8 @@ class DocumentProcessor:
             
             # Vorschau-Cache invalidieren (persistiert ueber App-Neustarts)
             try:
-                import glob as _glob
-                cache_dir = os.path.join(tempfile.gettempdir(), 'bipro_preview_cache')
-                for cached in _glob.glob(os.path.join(cache_dir, f"{doc.id}_*")):
-                    os.unlink(cached)
-                    logger.debug(f"Vorschau-Cache invalidiert: {cached}")
+                from services.preview_cache import get_preview_cache
+                get_preview_cache().remove_document(doc.id)
             except Exception:
                 pass
             
@@ -1785,13 +2422,16 @@ class DocumentProcessor:
         """
         Protokolliert einen Verarbeitungsschritt in der History.
         
+        Die Schritte eines Dokuments werden zu einem Eintrag zusammengefasst
+        und im Hintergrund gesendet (siehe services/write_batcher.py);
+        flush() am Ende des Laufs.
         Fehler beim Logging werden ignoriert, um die Verarbeitung nicht zu unterbrechen.
         """
         try:
-            self.history_api.create(
-                document_id=document_id,
-                action=action,
-                new_status=new_status,
+            self._write_batcher.log_history(
+                document_id,
+                action,
+                new_status,
                 previous_status=previous_status,
                 success=success,
                 error_message=error_message,
@@ -2327,7 +2967,10 @@ class DocumentProcessor:
                 error='Dokument nicht gefunden'
             )
         
-        return self._process_document(doc)
+        try:
+            return self._process_document(doc)
+        finally:
+            self._write_batcher.flush()
     
     def classify_document_preview(self, doc: Document) -> Tuple[str, str]:
         """
@@ -7,6 +7,8 @@ Dadurch werden Inhaltsduplikate sofort in der Eingangsbox erkannt.
 
 Die spaetere KI-Verarbeitung ueberschreibt den Eintrag per Upsert
 und ergaenzt die KI-Felder (ai_full_response, ai_model, etc.).
+Der SHA256 der Datei (source_content_hash) erlaubt ihr, den Text ohne
+erneute Extraktion zu uebernehmen, solange die Datei nicht ersetzt wurde.
 """
 
 import hashlib
@@ -39,6 +41,9 @@ def extract_and_save_text(
         API-Response-Dict oder None bei Fehler. Enthaelt ggf.:
         - content_duplicate_of_id: ID des Originals
         - content_duplicate_of_filename: Name des Originals
+        - near_duplicate_of_id, near_duplicate_distance: fast identisches
+          archiviertes Dokument (lokaler SimHash-Index), auch in
+          classification_reason des Dokuments vermerkt
     """
     if not os.path.exists(local_file_path):
         return None
@@ -70,10 +75,14 @@ def extract_and_save_text(
                 'text_char_count': len(extracted_text),
             }
         
+        # Text gehoert zu genau diesem Dateiinhalt (= content_hash des Dokuments)
+        from services.atomic_ops import calculate_file_hash
+        data['source_content_hash'] = calculate_file_hash(local_file_path)
+        
         # API-Call (Upsert -- spaetere KI-Verarbeitung ueberschreibt)
         result = docs_api.save_ai_data(doc_id, data)
         
-        if result:
+        if result is not None:
             dup_id = result.get('content_duplicate_of_id')
             if dup_id:
                 dup_name = result.get('content_duplicate_of_filename', '?')
@@ -81,6 +90,25 @@ def extract_and_save_text(
                     f"Fruehe Duplikat-Erkennung: {display_name} (ID {doc_id}) "
                     f"ist inhaltlich identisch mit {dup_name} (ID {dup_id})"
                 )
+            else:
+                near = _find_near_duplicate(docs_api, doc_id, extracted_text)
+                if near:
+                    near_id, distance = near
+                    result['near_duplicate_of_id'] = near_id
+                    result['near_duplicate_distance'] = distance
+                    logger.info(
+                        f"Fruehe Duplikat-Erkennung: {display_name} (ID {doc_id}) "
+                        f"ist fast identisch mit Dokument {near_id} (SimHash-Distanz {distance})"
+                    )
+                    # Am Dokument sichtbar machen; die Verarbeitung ersetzt die
+                    # Begruendung spaeter durch ihre eigene
+                    docs_api.update(
+                        doc_id,
+                        classification_reason=(
+                            f"Beinahe-Duplikat von Dokument {near_id} "
+                            f"(SimHash-Distanz {distance})"
+                        )
+                    )
         
         return result
         
@@ -90,6 +118,31 @@ def extract_and_save_text(
         return None
 
 
+def _find_near_duplicate(docs_api, doc_id: int, extracted_text: str) -> Optional[tuple]:
+    """
+    Sucht ein archiviertes Beinahe-Duplikat im lokalen SimHash-Index.
+    
+    Returns:
+        (doc_id, Hamming-Distanz) oder None
+    """
+    from config.processing_rules import PROCESSING_RULES
+    
+    if not PROCESSING_RULES.get('near_duplicate_enabled', True):
+        return None
+    if not extracted_text or len(extracted_text.strip()) < PROCESSING_RULES.get('near_duplicate_min_chars', 300):
+        return None
+    try:
+        from services.near_duplicate_index import get_near_duplicate_index, simhash
+        
+        client = getattr(docs_api, 'client', None)
+        index = get_near_duplicate_index(str(getattr(client, 'base_url', '') or ''))
+        match = index.find(simhash(extracted_text), exclude_id=doc_id)
+    except Exception as e:
+        logger.debug(f"Beinahe-Duplikat-Suche fehlgeschlagen: {e}")
+        return None
+    return (match[0], match[1]) if match else None
+
+
 def _extract_text(file_path: str) -> tuple:
     """
     Extrahiert Text aus einer Datei.
@@ -117,14 +170,16 @@ def _extract_pdf_text(pdf_path: str) -> tuple:
         import fitz  # PyMuPDF
     except ImportError:
         return ("", 0)
-    
+
+    from services.page_text_cache import get_page_text
+
     extracted_text = ""
     pages_with_text = 0
-    
+
     try:
         pdf_doc = fitz.open(pdf_path)
         for page in pdf_doc:
-            page_text = page.get_text("text")
+            page_text = get_page_text(page)
             if page_text and page_text.strip():
                 extracted_text += page_text + "\n"
                 pages_with_text += 1
@@ -0,0 +1,384 @@
+"""
+Lokaler Vorklassifikator fuer VU-Dokumente (vor der Sparten-KI).
+
+Viele VU-Dokumente (Beitragsrechnungen, Nachtraege desselben Versicherers)
+haben nahezu identische Textlayouts und werden von der KI jedes Mal gleich
+eingeordnet. Der Vorklassifikator lernt diese Entscheidungen inkrementell
+und beantwortet eindeutige Faelle lokal, ohne KI-Aufruf.
+
+Merkmale: Wort-Uni-/Bigramme (Ziffern normalisiert), per CRC32 in einen
+festen Raum gehasht, TF-IDF-gewichtet (IDF inkrementell), L2-normiert.
+Modell: Multinomiale logistische Regression, online per SGD trainiert, ohne
+Bias (unbekannte Dokumente bekommen keine hohe Prior-Konfidenz).
+
+Label = (sparte, vu_name, document_name) aus dem KI-Ergebnis, damit auch die
+Benennung uebernommen werden kann. Courtage wird nie lokal entschieden
+(Dateiname braucht das Dokumentdatum).
+
+Die KI bleibt Referenz: jede n-te sichere Vorhersage wird trotzdem per KI
+geprueft (Audit), alle KI-Ergebnisse fliessen ins Training und in die
+Uebereinstimmungsquote ein. Das Modell liegt lokal unter
+%LOCALAPPDATA%/ACENCIA-ATLAS/local_classifier/.
+"""
+
+import gzip
+import json
+import logging
+import math
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION = 1
+MODEL_NAME = 'local-tfidf-logreg-v1'
+
+# Hash-Raum fuer Merkmale (2^20 Buckets)
+FEATURE_BUCKETS = 1 << 20
+# Nur die staerksten Merkmale je Dokument (begrenzt Modellgroesse)
+MAX_FEATURES_PER_DOC = 400
+LEARNING_RATE = 2.5
+# Labels mit kleinerem Gradienten werden nicht aktualisiert (Sparsitaet)
+MIN_GRADIENT = 0.01
+# Mindestanteil der Merkmalsmasse, der im Training schon vorkam
+MIN_KNOWN_FEATURE_MASS = 0.6
+# Gewichte unterhalb dieser Schwelle werden beim Speichern verworfen
+PRUNE_WEIGHT = 1e-4
+
+# Sparten, die nie lokal entschieden werden
+NEVER_SKIP_SPARTEN = frozenset({'courtage'})
+
+_TOKEN_RE = re.compile(r'[a-zäöüß0-9]{2,}')
+_DIGIT_RE = re.compile(r'\d')
+
+
+def get_model_path() -> Path:
+    """Gibt den Pfad der Modelldatei zurueck."""
+    if os.name == 'nt':
+        base = Path(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')))
+    else:
+        base = Path.home() / '.local' / 'share'
+    model_dir = base / 'ACENCIA-ATLAS' / 'local_classifier'
+    model_dir.mkdir(parents=True, exist_ok=True)
+    return model_dir / 'model.json.gz'
+
+
+def _tokens(text: str) -> List[str]:
+    return [_DIGIT_RE.sub('0', t) for t in _TOKEN_RE.findall(text.lower())]
+
+
+def _term_counts(text: str) -> Counter:
+    tokens = _tokens(text)
+    terms = Counter(tokens)
+    terms.update(f'{a} {b}' for a, b in zip(tokens, tokens[1:]))
+    buckets: Counter = Counter()
+    for term, count in terms.items():
+        buckets[zlib.crc32(term.encode('utf-8')) % FEATURE_BUCKETS] += count
+    return buckets
+
+
+def filename_needs_date(sparte: Optional[str], document_name: Optional[str]) -> bool:
+    """True, wenn der Dateiname der Sparte das Dokumentdatum enthaelt (analog Benennung im Processor)."""
+    if sparte in ('sach', 'leben', 'kranken'):
+        return False
+    return not (sparte == 'sonstige' and document_name)
+
+
+def label_key(sparte: str, vu_name: Optional[str], document_name: Optional[str]) -> str:
+    """Serialisiert ein Label (stabil, als Dict-Key nutzbar)."""
+    return json.dumps([sparte or 'sonstige', vu_name or None, document_name or None],
+                      ensure_ascii=False)
+
+
+def parse_label(key: str) -> dict:
+    sparte, vu_name, document_name = json.loads(key)
+    return {'sparte': sparte, 'vu_name': vu_name, 'document_name': document_name}
+
+
+class LocalClassifier:
+    """
+    Inkrementell trainierter TF-IDF/Softmax-Klassifikator (thread-safe).
+
+    Verwendung:
+        prediction = clf.predict(text)   # (label, Wahrscheinlichkeit, bekannter Anteil) | None
+        clf.learn(text, sparte, vu_name, document_name)
+        clf.save()
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._doc_count = 0
+        self._df: Dict[int, int] = {}
+        self._weights: Dict[str, Dict[int, float]] = {}
+        self._label_counts: Dict[str, int] = {}
+        self._dirty = False
+        if self._path is not None and self._path.exists():
+            self._load()
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    @property
+    def sample_count(self) -> int:
+        return self._doc_count
+
+    def label_count(self, label: dict) -> int:
+        key = label_key(label['sparte'], label.get('vu_name'), label.get('document_name'))
+        return self._label_counts.get(key, 0)
+
+    def predict(self, text: str) -> Optional[Tuple[dict, float, float]]:
+        """
+        Wahrscheinlichstes Label fuer einen Text.
+
+        Returns:
+            (label, Wahrscheinlichkeit, Anteil bekannter Merkmale) oder None
+            (kein Text / kein Modell)
+        """
+        counts = _term_counts(text or '')
+        if not counts:
+            return None
+        with self._lock:
+            if not self._weights:
+                return None
+            features, known_mass = self._vectorize_locked(counts)
+            probs = self._probabilities_locked(features)
+        best = max(probs, key=probs.get)
+        return parse_label(best), probs[best], known_mass
+
+    def learn(self, text: str, sparte: str, vu_name: Optional[str] = None,
+              document_name: Optional[str] = None) -> None:
+        """Trainiert einen Schritt mit dem KI-Ergebnis fuer diesen Text."""
+        counts = _term_counts(text or '')
+        if not counts:
+            return
+        key = label_key(sparte, vu_name, document_name)
+        with self._lock:
+            # IDF vor der Vektorisierung aktualisieren (Dokument zaehlt mit)
+            self._doc_count += 1
+            for bucket in counts:
+                self._df[bucket] = self._df.get(bucket, 0) + 1
+            features, _ = self._vectorize_locked(counts)
+            self._weights.setdefault(key, {})
+            self._label_counts[key] = self._label_counts.get(key, 0) + 1
+
+            probs = self._probabilities_locked(features)
+            for label, p in probs.items():
+                gradient = p - (1.0 if label == key else 0.0)
+                if abs(gradient) < MIN_GRADIENT:
+                    continue
+                weights = self._weights[label]
+                step = LEARNING_RATE * gradient
+                for bucket, value in features.items():
+                    weights[bucket] = weights.get(bucket, 0.0) - step * value
+            self._dirty = True
+
+    def save(self) -> bool:
+        """Speichert das Modell atomar (nur bei Aenderungen)."""
+        if self._path is None:
+            return False
+        from services.atomic_ops import safe_atomic_write
+
+        with self._lock:
+            if not self._dirty:
+                return True
+            data = {
+                'version': MODEL_VERSION,
+                'doc_count': self._doc_count,
+                'df': {str(k): v for k, v in self._df.items()},
+                'label_counts': self._label_counts,
+                'weights': {
+                    label: {str(k): round(w, 6) for k, w in weights.items() if abs(w) >= PRUNE_WEIGHT}
+                    for label, weights in self._weights.items()
+                },
+            }
+            self._dirty = False
+        content = gzip.compress(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        success, message, _ = safe_atomic_write(content, str(self._path))
+        if not success:
+            logger.warning(f"Lokaler Klassifikator: Speichern fehlgeschlagen: {message}")
+        return success
+
+    # ── Intern ────────────────────────────────────────────────────────────
+
+    def _vectorize_locked(self, counts: Counter) -> Tuple[Dict[int, float], float]:
+        n = self._doc_count
+        weighted = {}
+        known = 0.0
+        total = 0.0
+        for bucket, count in counts.items():
+            df = self._df.get(bucket, 0)
+            value = (1.0 + math.log(count)) * (math.log((n + 1) / (df + 1)) + 1.0)
+            weighted[bucket] = value
+            total += value * value
+            if df:
+                known += value * value
+        if len(weighted) > MAX_FEATURES_PER_DOC:
+            top = sorted(weighted.items(), key=lambda item: item[1], reverse=True)
+            weighted = dict(top[:MAX_FEATURES_PER_DOC])
+        norm = math.sqrt(sum(v * v for v in weighted.values())) or 1.0
+        known_mass = known / total if total else 0.0
+        return {b: v / norm for b, v in weighted.items()}, known_mass
+
+    def _probabilities_locked(self, features: Dict[int, float]) -> Dict[str, float]:
+        scores = {}
+        for label, weights in self._weights.items():
+            scores[label] = sum(weights.get(b, 0.0) * v for b, v in features.items())
+        top = max(scores.values())
+        exp_scores = {label: math.exp(s - top) for label, s in scores.items()}
+        total = sum(exp_scores.values())
+        return {label: e / total for label, e in exp_scores.items()}
+
+    def _load(self) -> None:
+        try:
+            with open(self._path, 'rb') as f:
+                data = json.loads(gzip.decompress(f.read()).decode('utf-8'))
+            if data.get('version') != MODEL_VERSION:
+                logger.info("Lokaler Klassifikator: Modellversion veraltet, starte neu")
+                return
+            self._doc_count = int(data.get('doc_count', 0))
+            self._df = {int(k): v for k, v in data.get('df', {}).items()}
+            self._label_counts = dict(data.get('label_counts', {}))
+            self._weights = {
+                label: {int(k): w for k, w in weights.items()}
+                for label, weights in data.get('weights', {}).items()
+            }
+            logger.info(
+                f"Lokaler Klassifikator geladen: {self._doc_count} Beispiele, "
+                f"{len(self._weights)} Labels"
+            )
+        except Exception as e:
+            logger.warning(f"Lokaler Klassifikator: Modell nicht lesbar, starte neu: {e}")
+
+
+class PreClassifier:
+    """
+    Entscheidungslogik vor classify_sparte_with_date.
+
+    - try_classify(): lokales Ergebnis im Format von classify_sparte_with_date
+      oder None (-> KI aufrufen)
+    - observe(): KI-Ergebnis lernen und mit der lokalen Vorhersage vergleichen
+    """
+
+    def __init__(self, classifier: LocalClassifier, threshold: float = 0.95,
+                 min_samples: int = 5, audit_every: int = 10):
+        self._clf = classifier
+        self.threshold = threshold
+        self.min_samples = max(1, min_samples)
+        self.audit_every = max(0, audit_every)
+        self._lock = threading.Lock()
+        self._confident_seen = 0
+        self._stats: Dict[str, int] = {}
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {
+                'eligible': 0,      # Dokumente mit Text vor der Sparten-KI
+                'skipped': 0,       # lokal entschieden (KI gespart)
+                'compared': 0,      # KI-Ergebnisse mit lokaler Vorhersage
+                'agreed': 0,
+                'audited': 0,       # sichere Vorhersagen, trotzdem per KI geprueft
+                'audit_agreed': 0,
+            }
+
+    def try_classify(self, text: str) -> Tuple[Optional[dict], Optional[dict]]:
+        """
+        Returns:
+            (lokales Ergebnis oder None, Vorhersage fuer observe())
+        """
+        result = self._clf.predict(text)
+        with self._lock:
+            self._stats['eligible'] += 1
+        if result is None:
+            return None, None
+        label, probability, known_mass = result
+        prediction = {'label': label, 'probability': probability, 'audit': False}
+        confident = (
+            probability >= self.threshold
+            and known_mass >= MIN_KNOWN_FEATURE_MASS
+            and label['sparte'] not in NEVER_SKIP_SPARTEN
+            and self._clf.label_count(label) >= self.min_samples
+        )
+        if not confident:
+            return None, prediction
+        from utils.date_utils import extract_document_date
+        date_iso = extract_document_date(text)
+        if date_iso is None and filename_needs_date(label['sparte'], label['document_name']):
+            # Benennung braucht das Datum -> KI extrahiert es
+            return None, prediction
+        with self._lock:
+            self._confident_seen += 1
+            if self.audit_every and self._confident_seen % self.audit_every == 0:
+                self._stats['audited'] += 1
+                prediction['audit'] = True
+                return None, prediction
+            self._stats['skipped'] += 1
+        return {
+            'sparte': label['sparte'],
+            'confidence': 'high',
+            'document_date_iso': date_iso,
+            'vu_name': label['vu_name'],
+            'document_name': label['document_name'],
+            '_local_classifier': True,
+            '_local_probability': round(probability, 4),
+            '_ai_model': MODEL_NAME,
+            '_ai_stage': 'local_classifier',
+            '_server_cost_usd': 0.0,
+        }, prediction
+
+    def observe(self, text: str, ki_result: Optional[dict],
+                prediction: Optional[dict]) -> None:
+        """Lernt aus einem KI-Ergebnis und zaehlt die Uebereinstimmung."""
+        if not ki_result or not ki_result.get('sparte'):
+            return
+        sparte = ki_result.get('sparte')
+        vu_name = ki_result.get('vu_name') or None
+        document_name = ki_result.get('document_name') or None
+        if prediction is not None:
+            label = prediction['label']
+            agreed = (label['sparte'] == sparte and label['vu_name'] == vu_name
+                      and label['document_name'] == document_name)
+            with self._lock:
+                self._stats['compared'] += 1
+                self._stats['agreed'] += int(agreed)
+                if prediction['audit']:
+                    self._stats['audit_agreed'] += int(agreed)
+            if not agreed and prediction['audit']:
+                logger.info(
+                    f"Lokaler Klassifikator: Audit-Abweichung "
+                    f"(lokal {label['sparte']}/{label['document_name']}, "
+                    f"KI {sparte}/{document_name})"
+                )
+        self._clf.learn(text, sparte, vu_name, document_name)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        eligible = stats['eligible']
+        stats['skip_rate'] = round(stats['skipped'] / eligible, 3) if eligible else None
+        stats['agreement_rate'] = round(stats['agreed'] / stats['compared'], 3) if stats['compared'] else None
+        stats['audit_agreement_rate'] = (
+            round(stats['audit_agreed'] / stats['audited'], 3) if stats['audited'] else None
+        )
+        return stats
+
+    def save(self) -> None:
+        self._clf.save()
+
+
+_classifier: Optional[LocalClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_local_classifier() -> LocalClassifier:
+    """Gibt den prozessweiten lokalen Klassifikator zurueck (Singleton)."""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = LocalClassifier(str(get_model_path()))
+        return _classifier
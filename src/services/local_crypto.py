@@ -0,0 +1,80 @@
+"""
+Verschluesselung lokaler Caches und Journale (Fernet, AES + HMAC).
+
+Warm-Start-Cache, Verarbeitungs-Journal, Dokument-Cache und Suchindex
+liegen unter %LOCALAPPDATA%/ACENCIA-ATLAS und enthalten Kundendaten
+(Volltexte, KI-Prompts, Dokumente). Der Schluessel liegt im keyring
+(Windows Credential Manager/DPAPI), Fallback wie beim Token (SV-005):
+Schluesseldatei mit restriktiven Permissions im jeweiligen Verzeichnis.
+
+Ohne cryptography oder ohne Schluessel liefert get_fernet() None; die
+Aufrufer speichern dann keine Klartext-Inhalte.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+KEYRING_SERVICE = 'acencia_atlas'
+KEY_FILE = '.key'
+
+_fernets: Dict[tuple, object] = {}
+_fernets_lock = threading.Lock()
+
+
+def load_or_create_key(key_name: str, key_dir: Path) -> Optional[bytes]:
+    """Fernet-Schluessel aus keyring bzw. Schluesseldatei (wird bei Bedarf erzeugt)."""
+    from cryptography.fernet import Fernet
+
+    # Versuch 1: keyring (bevorzugt, DPAPI-geschuetzt)
+    try:
+        import keyring
+        key = keyring.get_password(KEYRING_SERVICE, key_name)
+        if not key:
+            key = Fernet.generate_key().decode('ascii')
+            keyring.set_password(KEYRING_SERVICE, key_name, key)
+        return key.encode('ascii')
+    except Exception:
+        pass
+
+    # Versuch 2: Datei mit restriktiven Permissions (Fallback)
+    key_path = Path(key_dir) / KEY_FILE
+    try:
+        if key_path.exists():
+            return key_path.read_bytes().strip()
+        key = Fernet.generate_key()
+        key_path.write_bytes(key)
+        import stat
+        key_path.chmod(stat.S_IRUSR | stat.S_IWUSR)
+        return key
+    except OSError as e:
+        logger.warning(f"Lokale Verschluesselung: kein Schluessel verfuegbar ({key_name}): {e}")
+        return None
+
+
+def get_fernet(key_name: str, key_dir: Path):
+    """
+    Fernet-Instanz fuer einen Schluesselnamen (je Prozess gecacht).
+
+    Returns:
+        Fernet oder None (cryptography fehlt / kein Schluessel)
+    """
+    cache_key = (key_name, str(key_dir))
+    with _fernets_lock:
+        if cache_key in _fernets:
+            return _fernets[cache_key]
+        fernet = None
+        try:
+            from cryptography.fernet import Fernet
+            key = load_or_create_key(key_name, Path(key_dir))
+            if key is not None:
+                fernet = Fernet(key)
+        except ImportError:
+            logger.warning("Lokale Verschluesselung: cryptography nicht installiert")
+        except Exception as e:
+            logger.warning(f"Lokale Verschluesselung nicht verfuegbar ({key_name}): {e}")
+        _fernets[cache_key] = fernet
+        return fernet
@@ -0,0 +1,253 @@
+"""
+Lokaler SimHash-Index fuer Beinahe-Duplikate.
+
+Inhaltsduplikate erkennt der Server nur ueber den exakten SHA256 des Textes
+(content_duplicate_of_id). Neu-Scans oder PDFs, die sich nur in einem
+Zeitstempel unterscheiden, wurden dadurch erneut per KI klassifiziert.
+
+Jedes archivierte Dokument mit Volltext bekommt einen 64-Bit-SimHash
+(gewichtete 3-Wort-Shingles). Beinahe-Duplikate unterscheiden sich nur in
+wenigen Bits. Fuer die Suche wird der Fingerprint in BANDS Bloecke zerlegt:
+bei Hamming-Distanz <= BANDS-1 stimmt mindestens ein Block exakt ueberein
+(Schubfachprinzip). Gesucht wird also nur in den Buckets der Bloecke statt
+ueber alle Eintraege.
+
+Pro Eintrag wird die Sparten-Klassifikation gespeichert, damit sie fuer ein
+Beinahe-Duplikat ohne KI-Aufruf uebernommen werden kann.
+
+Format: Append-only JSONL je Server unter
+%LOCALAPPDATA%/ACENCIA-ATLAS/near_duplicates/ (letzter Eintrag je ID gilt).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+BANDS = 4
+BAND_BITS = FINGERPRINT_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+SHINGLE_SIZE = 3
+
+# Standard: max. Hamming-Distanz (muss < BANDS sein)
+DEFAULT_MAX_DISTANCE = 3
+# Kurze Texte haben zu wenige Shingles fuer einen belastbaren Fingerprint
+DEFAULT_MIN_CHARS = 300
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def get_index_dir() -> Path:
+    """Gibt das Verzeichnis fuer Beinahe-Duplikat-Indizes zurueck."""
+    if os.name == 'nt':
+        base = Path(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')))
+    else:
+        base = Path.home() / '.local' / 'share'
+    index_dir = base / 'ACENCIA-ATLAS' / 'near_duplicates'
+    index_dir.mkdir(parents=True, exist_ok=True)
+    return index_dir
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    64-Bit-SimHash eines Textes (None wenn zu wenige Woerter).
+
+    Merkmale sind SHINGLE_SIZE-Wort-Folgen, gewichtet nach Haeufigkeit.
+    """
+    words = _WORD_RE.findall((text or '').lower())
+    if len(words) < SHINGLE_SIZE:
+        return None
+    shingles = Counter(
+        ' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)
+    )
+    vector = [0] * FINGERPRINT_BITS
+    for shingle, weight in shingles.items():
+        h = int.from_bytes(
+            hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big'
+        )
+        for bit in range(FINGERPRINT_BITS):
+            if h >> bit & 1:
+                vector[bit] += weight
+            else:
+                vector[bit] -= weight
+    fingerprint = 0
+    for bit, value in enumerate(vector):
+        if value > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def _bands(fingerprint: int) -> List[int]:
+    return [(fingerprint >> (band * BAND_BITS)) & BAND_MASK for band in range(BANDS)]
+
+
+class NearDuplicateIndex:
+    """
+    Thread-safe SimHash-Index mit Band-Buckets.
+
+    Verwendung:
+        index.add(doc.id, simhash(text), classification={...})
+        match = index.find(simhash(text))   # (doc_id, distance, classification) | None
+    """
+
+    def __init__(self, path: Optional[str] = None, max_distance: int = DEFAULT_MAX_DISTANCE):
+        self._path = Path(path) if path else None
+        self.max_distance = min(max_distance, BANDS - 1)
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Tuple[int, dict]] = {}
+        self._buckets: List[Dict[int, set]] = [{} for _ in range(BANDS)]
+        self._lines = 0
+        if self._path is not None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def add(self, doc_id: int, fingerprint: Optional[int],
+            classification: Optional[dict] = None) -> None:
+        """Nimmt ein Dokument auf (ersetzt einen vorhandenen Eintrag)."""
+        if fingerprint is None:
+            return
+        classification = classification or {}
+        with self._lock:
+            if self._entries.get(doc_id) == (fingerprint, classification):
+                return
+            self._put_locked(doc_id, fingerprint, classification)
+            self._append_locked({'id': doc_id, 'fp': format(fingerprint, '016x'),
+                                 'cls': classification})
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            if doc_id not in self._entries:
+                return
+            self._drop_locked(doc_id)
+            self._append_locked({'id': doc_id, 'removed': True})
+
+    def find(self, fingerprint: Optional[int],
+             exclude_id: Optional[int] = None) -> Optional[Tuple[int, int, dict]]:
+        """
+        Naechstes Beinahe-Duplikat innerhalb von max_distance.
+
+        Returns:
+            (doc_id, Hamming-Distanz, Klassifikation) oder None
+        """
+        if fingerprint is None:
+            return None
+        best = None
+        with self._lock:
+            candidates = set()
+            for band, value in enumerate(_bands(fingerprint)):
+                candidates.update(self._buckets[band].get(value, ()))
+            candidates.discard(exclude_id)
+            for doc_id in candidates:
+                other, classification = self._entries[doc_id]
+                distance = hamming_distance(fingerprint, other)
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (doc_id, distance, dict(classification))
+        return best
+
+    def compact(self) -> None:
+        """Schreibt die Datei ohne ueberholte Zeilen neu (nur wenn lohnend)."""
+        if self._path is None:
+            return
+        from services.atomic_ops import safe_atomic_write
+
+        with self._lock:
+            if self._lines <= 2 * len(self._entries) + 100:
+                return
+            lines = [
+                json.dumps({'id': doc_id, 'fp': format(fp, '016x'), 'cls': cls},
+                           ensure_ascii=False)
+                for doc_id, (fp, cls) in self._entries.items()
+            ]
+            content = ('\n'.join(lines) + '\n' if lines else '').encode('utf-8')
+            success, message, _ = safe_atomic_write(content, str(self._path))
+            if success:
+                self._lines = len(lines)
+            else:
+                logger.warning(f"Beinahe-Duplikat-Index: Kompaktierung fehlgeschlagen: {message}")
+
+    # ── Intern ────────────────────────────────────────────────────────────
+
+    def _put_locked(self, doc_id: int, fingerprint: int, classification: dict) -> None:
+        if doc_id in self._entries:
+            self._drop_locked(doc_id)
+        self._entries[doc_id] = (fingerprint, classification)
+        for band, value in enumerate(_bands(fingerprint)):
+            self._buckets[band].setdefault(value, set()).add(doc_id)
+
+    def _drop_locked(self, doc_id: int) -> None:
+        fingerprint, _ = self._entries.pop(doc_id)
+        for band, value in enumerate(_bands(fingerprint)):
+            bucket = self._buckets[band].get(value)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del self._buckets[band][value]
+
+    def _append_locked(self, record: dict) -> None:
+        if self._path is None:
+            return
+        try:
+            with open(self._path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._lines += 1
+        except OSError as e:
+            logger.debug(f"Beinahe-Duplikat-Index: Schreiben fehlgeschlagen: {e}")
+
+    def _load(self) -> None:
+        if not self._path.exists():
+            return
+        with open(self._path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                self._lines += 1
+                try:
+                    record = json.loads(line)
+                    doc_id = int(record['id'])
+                    if record.get('removed'):
+                        if doc_id in self._entries:
+                            self._drop_locked(doc_id)
+                        continue
+                    self._put_locked(doc_id, int(record['fp'], 16), record.get('cls') or {})
+                except (ValueError, KeyError, TypeError):
+                    # Abgeschnittene Zeile (Absturz waehrend des Schreibens)
+                    continue
+        logger.debug(f"Beinahe-Duplikat-Index: {len(self._entries)} Eintraege geladen")
+
+
+_indexes: Dict[str, NearDuplicateIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_near_duplicate_index(server_url: str) -> NearDuplicateIndex:
+    """Gibt den Index fuer einen Server zurueck (Singleton je Server-URL)."""
+    from config.processing_rules import PROCESSING_RULES
+
+    key = hashlib.sha1((server_url or '').encode('utf-8')).hexdigest()[:12]
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = NearDuplicateIndex(
+                str(get_index_dir() / f'simhash_{key}.jsonl'),
+                max_distance=PROCESSING_RULES.get('near_duplicate_max_distance', DEFAULT_MAX_DISTANCE),
+            )
+            _indexes[key] = index
+        return index
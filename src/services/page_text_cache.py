@@ -0,0 +1,177 @@
+"""
+Seiten-Cache fuer Text-Extraktion und lokale OCR.
+
+Dokumente werden haeufig mehrfach verarbeitet (Retry nach Fehlern,
+manuelles Zurueckschieben in die Eingangsbox, neue Versionen derselben
+Datei). Die Ergebnisse von PyMuPDF-Textextraktion und Tesseract-OCR
+haengen nur vom Seiteninhalt ab und werden deshalb pro Seite unter einem
+Hash ueber Content-Stream, Form-XObjects, Bild-Streams und Fonts gecached.
+
+Thread-safe (ThreadPoolExecutor im DocumentProcessor), begrenzt ueber
+Eintragsanzahl und Gesamtzeichen, Verdraengung nach LRU.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Grenzen (Text ist klein, OCR-Ergebnisse ~2-5 KB pro Seite)
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_CHARS = 32 * 1024 * 1024
+
+# Cache-Arten (Teil des Keys, damit Text und OCR sich nicht ueberschreiben)
+KIND_TEXT = 'text'
+KIND_OCR = 'ocr'
+
+
+class PageTextCache:
+    """LRU-Cache: Seiten-Hash -> extrahierter Text."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_chars: int = DEFAULT_MAX_CHARS):
+        self._max_entries = max_entries
+        self._max_chars = max_chars
+        self._store: 'OrderedDict[str, str]' = OrderedDict()
+        self._total_chars = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._store.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._store.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: str, text: str) -> None:
+        if text is None:
+            return
+        with self._lock:
+            old = self._store.pop(key, None)
+            if old is not None:
+                self._total_chars -= len(old)
+            self._store[key] = text
+            self._total_chars += len(text)
+            while self._store and (len(self._store) > self._max_entries
+                                   or self._total_chars > self._max_chars):
+                _, evicted = self._store.popitem(last=False)
+                self._total_chars -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+            self._total_chars = 0
+
+    def stats(self) -> dict:
+        """Diagnose-Info (Trefferquote, Belegung)."""
+        with self._lock:
+            return {
+                'entries': len(self._store),
+                'chars': self._total_chars,
+                'hits': self._hits,
+                'misses': self._misses,
+            }
+
+
+_cache: Optional[PageTextCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_page_text_cache() -> PageTextCache:
+    """Gibt den globalen Seiten-Cache zurueck (Singleton)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageTextCache()
+    return _cache
+
+
+def page_content_hash(page) -> Optional[str]:
+    """
+    Berechnet einen Hash ueber den Inhalt einer PyMuPDF-Seite.
+
+    Beruecksichtigt Content-Stream, Rotation, Seitengroesse, alle (auch
+    verschachtelte) Form-XObjects mit Stream, Matrix und BBox, Bild-Streams
+    (Rohdaten, ohne Dekodierung) sowie Font-Namen/Encodings und
+    ToUnicode-Tabellen. Seiten, deren Inhalt in Form-XObjects liegt (z.B.
+    per show_pdf_page zusammengesetzt), haben sonst identische Content-Streams.
+    Unabhaengig von Dateiname, Xref-Nummern und Metadaten -- dieselbe Seite
+    in einer neuen Datei-Version liefert denselben Hash.
+
+    Returns:
+        SHA256-Hex oder None wenn die Seite nicht vollstaendig gelesen werden kann
+    """
+    try:
+        hasher = hashlib.sha256()
+        hasher.update(f"{page.rotation}|{tuple(page.rect)}".encode('ascii'))
+        hasher.update(page.read_contents() or b'')
+        doc = page.parent
+        # get_xobjects() liefert auch Forms innerhalb von Forms
+        for xref, name, _invoker, bbox in page.get_xobjects():
+            matrix = doc.xref_get_key(xref, 'Matrix')[1]
+            hasher.update(f"|form|{name}|{tuple(bbox)}|{matrix}|".encode('utf-8', 'replace'))
+            hasher.update(doc.xref_stream_raw(xref) or b'')
+        for img in page.get_images(full=True):
+            hasher.update(f"|img|{img[7]}|".encode('utf-8', 'replace'))
+            hasher.update(doc.xref_stream_raw(img[0]) or b'')
+        for font in page.get_fonts(full=True):
+            # (xref, ext, type, basefont, name, encoding, ...)
+            hasher.update(f"|font|{font[1:6]}".encode('utf-8', 'replace'))
+            kind, value = doc.xref_get_key(font[0], 'ToUnicode')
+            if kind == 'xref':
+                hasher.update(doc.xref_stream_raw(int(value.split()[0])) or b'')
+        return hasher.hexdigest()
+    except Exception as e:
+        # Unvollstaendiger Hash koennte fremde Seiten treffen -> nicht cachen
+        logger.debug(f"Seiten-Hash fehlgeschlagen: {e}")
+        return None
+
+
+def get_page_text(page, cache: Optional[PageTextCache] = None) -> str:
+    """
+    Liefert ``page.get_text("text")`` ueber den Seiten-Cache.
+
+    Args:
+        page: PyMuPDF-Seite
+        cache: Optionaler Cache (default: globaler Cache)
+
+    Returns:
+        Seitentext (leer wenn kein Text)
+    """
+    cache = cache or get_page_text_cache()
+    page_hash = page_content_hash(page)
+    key = f"{KIND_TEXT}:{page_hash}" if page_hash else None
+
+    if key:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    text = page.get_text("text") or ""
+    if key:
+        cache.put(key, text)
+    return text
+
+
+def peek_page_text(page, cache: Optional[PageTextCache] = None) -> Optional[str]:
+    """Seitentext nur aus dem Cache (None = nicht gecached, es wird nichts extrahiert)."""
+    cache = cache or get_page_text_cache()
+    page_hash = page_content_hash(page)
+    if not page_hash:
+        return None
+    return cache.get(f"{KIND_TEXT}:{page_hash}")
+
+
+def ocr_cache_key(page_hash: Optional[str], dpi: int, lang: str) -> Optional[str]:
+    """Cache-Key fuer ein OCR-Ergebnis (abhaengig von DPI und Sprachmodell)."""
+    if not page_hash:
+        return None
+    return f"{KIND_OCR}:{lang}:{dpi}:{page_hash}"
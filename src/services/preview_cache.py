@@ -0,0 +1,186 @@
+"""
+Begrenzter Vorschau-Cache fuer das Archiv.
+
+Vorschau-Dateien (PDF/Tabellen) lagen bisher ohne Limit in
+%TEMP%/bipro_preview_cache und wurden nie entfernt. PreviewCache verwaltet
+dasselbe Verzeichnis mit Groessenlimit und LRU-Verdraengung:
+
+- Dateiname wie bisher safe_cache_filename(doc_id, original_filename)
+- Zugriffe (get) und neue Dateien (add) zaehlen fuer die LRU-Reihenfolge;
+  sie wird ueber die mtime auch ueber Programmstarts hinweg erhalten
+- Der zuletzt genutzte Eintrag wird nie verdraengt (gerade angezeigt)
+- remove_document() invalidiert alle Dateien eines Dokuments (z.B. nach
+  PDF-Bearbeitung oder Verarbeitung)
+
+Der PreviewPrefetchWorker fuellt den Cache vorausschauend mit den
+naechsten Dokumenten der aktuellen Sortierung.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = 'bipro_preview_cache'
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+
+def get_cache_dir() -> str:
+    """Gibt das Verzeichnis des Vorschau-Caches zurueck."""
+    return os.path.join(tempfile.gettempdir(), CACHE_DIR_NAME)
+
+
+class PreviewCache:
+    """
+    Thread-sicherer Vorschau-Dateicache mit Groessenlimit.
+
+    Args:
+        root: Cache-Verzeichnis (wird angelegt)
+        max_bytes: Maximale Gesamtgroesse
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._root = os.path.abspath(root)
+        self._max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        # Dateiname -> Groesse, aeltester Zugriff zuerst
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    def path_for(self, doc_id: int, filename: str) -> str:
+        """Pfad, unter dem die Vorschau eines Dokuments abgelegt wird."""
+        from api.documents import safe_cache_filename
+        return os.path.join(self._root, safe_cache_filename(doc_id, filename))
+
+    def get(self, doc_id: int, filename: str) -> Optional[str]:
+        """Pfad der gecachten Vorschau oder None (zaehlt als Zugriff fuer LRU)."""
+        path = self.path_for(doc_id, filename)
+        name = os.path.basename(path)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        with self._lock:
+            self._ensure_loaded()
+            if size <= 0:
+                if name in self._entries:
+                    self._total_bytes -= self._entries.pop(name)
+                return None
+            self._track_locked(name, size)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def add(self, path: str) -> None:
+        """Registriert eine (neu geladene) Datei im Cache und verdraengt bei Bedarf."""
+        if not path or os.path.dirname(os.path.abspath(path)) != self._root:
+            return
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            self._track_locked(os.path.basename(path), size)
+            self._evict_locked()
+
+    def remove_document(self, doc_id: int) -> None:
+        """Entfernt alle Vorschau-Dateien eines Dokuments."""
+        prefix = f"{int(doc_id)}_"
+        with self._lock:
+            self._ensure_loaded()
+            for name in [n for n in self._entries if n.startswith(prefix)]:
+                self._total_bytes -= self._entries.pop(name)
+                if self._unlink(name):
+                    logger.debug(f"Vorschau-Cache invalidiert: {name}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self._loaded = False
+            shutil.rmtree(self._root, ignore_errors=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self._max_bytes,
+            }
+
+    # ── Intern ────────────────────────────────────────────────────────────
+
+    def _track_locked(self, name: str, size: int) -> None:
+        self._total_bytes += size - self._entries.get(name, 0)
+        self._entries[name] = size
+        self._entries.move_to_end(name)
+
+    def _ensure_loaded(self) -> None:
+        """Liest den Verzeichnisinhalt einmalig ein (Lock muss gehalten werden)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        os.makedirs(self._root, exist_ok=True)
+        found = []
+        for entry in os.scandir(self._root):
+            # '.part' = abgebrochener Download (wird von download_file fortgesetzt)
+            if entry.is_file() and not entry.name.endswith('.part'):
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name, stat.st_size))
+        for _mtime, name, size in sorted(found):
+            self._entries[name] = size
+            self._total_bytes += size
+        self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while self._total_bytes > self._max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._unlink(name)
+
+    def _unlink(self, name: str) -> bool:
+        try:
+            os.remove(os.path.join(self._root, name))
+            return True
+        except OSError:
+            # Unter Windows evtl. noch im Viewer geoeffnet; wird beim naechsten Start erneut erfasst
+            return False
+
+
+_cache: Optional[PreviewCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_preview_cache() -> PreviewCache:
+    """Gibt den (prozessweiten) Vorschau-Cache zurueck."""
+    global _cache
+    from config.processing_rules import PREVIEW_CACHE_CONFIG
+
+    with _cache_lock:
+        if _cache is None:
+            max_mb = PREVIEW_CACHE_CONFIG.get('max_size_mb', DEFAULT_MAX_BYTES // (1024 * 1024))
+            _cache = PreviewCache(get_cache_dir(), int(max_mb) * 1024 * 1024)
+        return _cache
+
+
+def clear_preview_cache() -> None:
+    """Loescht alle Vorschau-Dateien (z.B. wenn keine gueltige Session vorhanden ist)."""
+    with _cache_lock:
+        if _cache is not None:
+            _cache.clear()
+        else:
+            shutil.rmtree(get_cache_dir(), ignore_errors=True)
@@ -0,0 +1,309 @@
+"""
+Lokales Verarbeitungs-Journal fuer absturzsichere Eingangsbox-Laeufe.
+
+Wird die App waehrend process_inbox beendet, bleiben Dokumente in der
+Verarbeitungsbox (processing_status='processing'/'classified'/'renamed').
+Ohne Journal muessten sie beim naechsten Lauf komplett neu geprueft und
+per KI klassifiziert werden.
+
+Das Journal protokolliert pro Dokument die abgeschlossenen Stufen und die
+Zwischenergebnisse (Content-Hash, Volltext, Klassifikation, Ziel-Box).
+Beim Fortsetzen ueberspringt der DocumentProcessor erledigte Stufen und
+schliesst unterbrochene Verschiebungen ab, ohne bezahlte KI-Aufrufe zu
+wiederholen.
+
+Format: Append-only, eine Zeile pro Stufe. Jede Zeile ist ein Fernet-Token
+(services/local_crypto), da Volltext und KI-Prompts Kundendaten enthalten.
+Ohne Schluessel werden nur Dokument-ID, Stufe und Content-Hash als JSON
+geschrieben; ein Fortsetzen klassifiziert dann neu. Eine beim Absturz
+abgeschnittene letzte Zeile wird beim Laden ignoriert.
+compact() schreibt nur offene Eintraege atomar zurueck.
+
+fsync laeuft ausserhalb des Journal-Locks und wird fuer gleichzeitig
+schreibende Worker zusammengefasst (Group Commit): record() kehrt erst
+zurueck, wenn die eigene Zeile auf Platte ist.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stufen in Verarbeitungsreihenfolge
+STAGE_STARTED = 'started'              # In Verarbeitungsbox verschoben
+STAGE_CLASSIFIED = 'classified'        # Klassifikation liegt vor (inkl. KI)
+STAGE_ARCHIVED = 'archived'            # Ziel-Box, Name und Status archived gespeichert
+STAGE_AI_DATA = 'ai_data_saved'        # Volltext/KI-Response persistiert
+STAGE_COMPLETED = 'completed'
+
+# Offene Eintraege, die aelter sind, werden beim Kompaktieren verworfen
+MAX_ENTRY_AGE_S = 14 * 24 * 3600
+
+KEYRING_KEY_NAME = 'processing_journal_key'
+
+# Ohne Verschluesselung nur diese Felder auf Platte (keine Texte/Prompts)
+PLAIN_DATA_KEYS = ('content_hash',)
+
+
+def get_journal_dir() -> Path:
+    """Gibt das Verzeichnis fuer Verarbeitungs-Journale zurueck."""
+    if os.name == 'nt':
+        base = Path(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')))
+    else:
+        base = Path.home() / '.local' / 'share'
+    journal_dir = base / 'ACENCIA-ATLAS' / 'processing_journal'
+    journal_dir.mkdir(parents=True, exist_ok=True)
+    return journal_dir
+
+
+class JournalEntry:
+    """Stand eines Dokuments im Journal."""
+
+    __slots__ = ('doc_id', 'stages', 'data', 'updated_at')
+
+    def __init__(self, doc_id: int):
+        self.doc_id = doc_id
+        self.stages: List[str] = []
+        self.data: Dict[str, Any] = {}
+        self.updated_at = 0.0
+
+    def has(self, stage: str) -> bool:
+        return stage in self.stages
+
+    def to_dict(self) -> dict:
+        return {'stages': list(self.stages), 'data': dict(self.data)}
+
+
+class ProcessingJournal:
+    """
+    Thread-safe, append-only Journal der Verarbeitungsstufen.
+
+    Verwendung:
+        journal.record(doc.id, STAGE_STARTED, content_hash=doc.content_hash)
+        ...
+        journal.complete(doc.id)
+    """
+
+    def __init__(self, path: str, fsync: bool = True, encrypt: bool = True):
+        self._path = Path(path)
+        self._fsync = fsync
+        self._lock = threading.Lock()
+        self._entries: Dict[int, JournalEntry] = {}
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._fernet = None
+        if encrypt:
+            from services.local_crypto import get_fernet
+            self._fernet = get_fernet(KEYRING_KEY_NAME, self._path.parent)
+        # Offene Append-Datei; Schreiben unter _lock, fsync unter _sync_lock
+        self._handle = None
+        self._written_seq = 0
+        self._synced_seq = 0
+        self._sync_lock = threading.Lock()
+        self._load()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    # ── Lesen ─────────────────────────────────────────────────────────────
+
+    def get(self, doc_id: int, content_hash: Optional[str] = None) -> Optional[JournalEntry]:
+        """
+        Offener Eintrag eines Dokuments.
+
+        Passt der Content-Hash nicht (Datei wurde ersetzt), wird der Eintrag
+        verworfen und None geliefert.
+        """
+        with self._lock:
+            entry = self._entries.get(doc_id)
+            if entry is None:
+                return None
+            recorded_hash = entry.data.get('content_hash')
+            if not (content_hash and recorded_hash and content_hash != recorded_hash):
+                return entry
+            logger.info(f"Journal: Dokument {doc_id} hat neuen Inhalt, Eintrag verworfen")
+            seq = self._append({'doc': doc_id, 'stage': STAGE_COMPLETED, 'ts': time.time()})
+            del self._entries[doc_id]
+        self._sync(seq)
+        return None
+
+    def pending_ids(self) -> List[int]:
+        """IDs aller Dokumente mit unterbrochener Verarbeitung."""
+        with self._lock:
+            return list(self._entries.keys())
+
+    # ── Schreiben ─────────────────────────────────────────────────────────
+
+    def record(self, doc_id: int, stage: str, **data) -> None:
+        """Protokolliert eine abgeschlossene Stufe (dauerhaft vor Rueckkehr)."""
+        now = time.time()
+        with self._lock:
+            seq = self._append({'doc': doc_id, 'stage': stage, 'data': data, 'ts': now})
+            self._apply(doc_id, stage, data, now)
+        self._sync(seq)
+
+    def complete(self, doc_id: int) -> None:
+        """Markiert ein Dokument als fertig (Eintrag wird entfernt)."""
+        with self._lock:
+            if doc_id not in self._entries:
+                return
+            seq = self._append({'doc': doc_id, 'stage': STAGE_COMPLETED, 'ts': time.time()})
+            self._entries.pop(doc_id, None)
+        self._sync(seq)
+
+    def compact(self) -> None:
+        """Schreibt nur offene, nicht veraltete Eintraege atomar neu."""
+        from services.atomic_ops import safe_atomic_write
+
+        with self._lock:
+            cutoff = time.time() - MAX_ENTRY_AGE_S
+            for doc_id in [d for d, e in self._entries.items() if e.updated_at < cutoff]:
+                logger.info(f"Journal: veralteter Eintrag fuer Dokument {doc_id} verworfen")
+                del self._entries[doc_id]
+
+            lines = []
+            for doc_id, entry in self._entries.items():
+                lines.append(self._encode({
+                    'doc': doc_id, 'stage': None, 'entry': entry.to_dict(),
+                    'ts': entry.updated_at,
+                }))
+            content = ('\n'.join(lines) + '\n' if lines else '').encode('utf-8')
+            # Append-Datei schliessen (Windows: kein Replace offener Dateien);
+            # safe_atomic_write schreibt synchron, offene fsyncs entfallen
+            with self._sync_lock:
+                self._close_handle()
+                success, message, _ = safe_atomic_write(content, str(self._path))
+                self._synced_seq = self._written_seq
+            if not success:
+                logger.warning(f"Journal-Kompaktierung fehlgeschlagen: {message}")
+
+    def close(self) -> None:
+        """Schliesst die Append-Datei (naechster Eintrag oeffnet sie neu)."""
+        with self._lock, self._sync_lock:
+            self._close_handle()
+
+    # ── Intern ────────────────────────────────────────────────────────────
+
+    def _apply(self, doc_id: int, stage: Optional[str], data: Optional[dict], ts: float) -> None:
+        if stage == STAGE_COMPLETED:
+            self._entries.pop(doc_id, None)
+            return
+        entry = self._entries.get(doc_id)
+        if entry is None:
+            entry = JournalEntry(doc_id)
+            self._entries[doc_id] = entry
+        if stage and stage not in entry.stages:
+            entry.stages.append(stage)
+        if data:
+            entry.data.update(data)
+        entry.updated_at = ts
+
+    def _encode(self, record: dict) -> str:
+        """Eine Journal-Zeile: Fernet-Token, ohne Schluessel nur IDs/Hashes."""
+        if self._fernet is not None:
+            raw = json.dumps(record, ensure_ascii=False, default=str).encode('utf-8')
+            return self._fernet.encrypt(raw).decode('ascii')
+        plain = dict(record)
+        if 'data' in plain:
+            plain['data'] = {k: v for k, v in (plain['data'] or {}).items()
+                             if k in PLAIN_DATA_KEYS}
+        if 'entry' in plain:
+            entry = plain['entry']
+            plain['entry'] = {
+                'stages': [st for st in entry['stages'] if st == STAGE_STARTED],
+                'data': {k: v for k, v in entry['data'].items() if k in PLAIN_DATA_KEYS},
+            }
+        return json.dumps(plain, ensure_ascii=False, default=str)
+
+    def _decode(self, line: str) -> dict:
+        if line.startswith('{'):
+            # Klartext-Zeile (ohne Schluessel geschrieben)
+            return json.loads(line)
+        if self._fernet is None:
+            raise ValueError('verschluesselte Zeile ohne Schluessel')
+        return json.loads(self._fernet.decrypt(line.encode('ascii')))
+
+    def _append(self, record: dict) -> int:
+        """Schreibt eine Zeile (Aufrufer haelt _lock); liefert die Sequenznummer fuer _sync."""
+        if self._handle is None:
+            self._handle = open(self._path, 'a', encoding='utf-8')
+        self._handle.write(self._encode(record) + '\n')
+        self._handle.flush()
+        self._written_seq += 1
+        return self._written_seq
+
+    def _sync(self, seq: int) -> None:
+        """fsync bis einschliesslich seq; ein fsync deckt alle bis dahin geschriebenen Zeilen ab."""
+        if not self._fsync:
+            return
+        with self._sync_lock:
+            if self._synced_seq >= seq:
+                return
+            # Ohne _lock lesen (Lock-Reihenfolge _lock -> _sync_lock); die
+            # Datei schliessen nur compact()/close() unter _sync_lock
+            target = self._written_seq
+            handle = self._handle
+            if handle is not None:
+                os.fsync(handle.fileno())
+            self._synced_seq = target
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                pass
+            self._handle = None
+
+    def _load(self) -> None:
+        if not self._path.exists():
+            return
+        loaded = 0
+        with open(self._path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = self._decode(line)
+                    doc_id = int(record['doc'])
+                except Exception:
+                    # Abgeschnittene Zeile (Absturz waehrend des Schreibens)
+                    # oder Token eines anderen Schluessels
+                    continue
+                ts = float(record.get('ts') or 0)
+                if 'entry' in record:
+                    entry = JournalEntry(doc_id)
+                    entry.stages = list(record['entry'].get('stages', []))
+                    entry.data = dict(record['entry'].get('data', {}))
+                    entry.updated_at = ts
+                    self._entries[doc_id] = entry
+                else:
+                    self._apply(doc_id, record.get('stage'), record.get('data'), ts)
+                loaded += 1
+        if self._entries:
+            logger.info(
+                f"Verarbeitungs-Journal: {len(self._entries)} unterbrochene(s) Dokument(e) "
+                f"aus {loaded} Eintraegen geladen"
+            )
+
+
+_journals: Dict[str, ProcessingJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_processing_journal(server_url: str) -> ProcessingJournal:
+    """Gibt das Journal fuer einen Server zurueck (Singleton je Server-URL)."""
+    key = hashlib.sha1((server_url or '').encode('utf-8')).hexdigest()[:12]
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = ProcessingJournal(str(get_journal_dir() / f'journal_{key}.jsonl'))
+            _journals[key] = journal
+        return journal
@@ -0,0 +1,212 @@
+"""
+Lane-Scheduler fuer die Eingangsbox-Verarbeitung.
+
+Bisher wurden alle Dokumente in Listen-Reihenfolge an EINEN Executor
+uebergeben. Guenstige Dokumente (XML-Rohdateien, GDV per BiPRO-Code,
+kleine Tabellen) warteten dadurch hinter grossen Scans mit OCR und
+zweistufiger KI.
+
+Der Scheduler schaetzt die Kosten je Dokument aus Groesse, BiPRO-Kategorie,
+Endung und (falls bekannt) Seitenzahl und verteilt die Arbeit auf Lanes
+mit eigener Parallelitaet:
+
+- fast:    keine KI (XML-Roh, GDV, Cache-Treffer, unbekannte Typen)
+- text_ai: Text-KI (PDFs mit Textlayer, Courtage-PDFs, Tabellen)
+- vision:  OCR/Vision (Scans, grosse PDFs mit vielen Bytes pro Seite)
+
+Innerhalb einer Lane laufen guenstige Dokumente zuerst (Shortest-Job-First).
+Die Schaetzung braucht keinen Download; Fehleinschaetzungen kosten nur
+Reihenfolge, nicht Korrektheit (_process_document entscheidet weiterhin).
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LANE_FAST = 'fast'
+LANE_TEXT_AI = 'text_ai'
+LANE_VISION = 'vision'
+LANES = (LANE_FAST, LANE_TEXT_AI, LANE_VISION)
+
+# Parallelitaet je Lane: fast ist I/O-gebunden und kurz, vision belastet
+# CPU (lokale OCR) und KI-Kontingent am staerksten
+DEFAULT_LANE_WORKERS: Dict[str, int] = {
+    LANE_FAST: 4,
+    LANE_TEXT_AI: 6,
+    LANE_VISION: 3,
+}
+
+# DEFAULT_LANE_WORKERS ist die Aufteilung, nicht die Summe: die Gesamtzahl
+# paralleler Verarbeitungen begrenzt weiterhin max_workers (allocate_lane_workers)
+
+# Heuristiken fuer die Kostenschaetzung
+SCAN_BYTES_PER_PAGE = 150 * 1024        # darueber: wahrscheinlich Bild-PDF
+LARGE_PDF_BYTES = 5 * 1024 * 1024       # ohne Seitenzahl: ab hier Vision-Lane
+TEXT_PDF_BYTES_PER_PAGE = 40 * 1024     # Seitenschaetzung fuer Text-PDFs
+SCAN_PDF_BYTES_PER_PAGE = 250 * 1024    # Seitenschaetzung fuer Scans
+SPREADSHEET_EXTENSIONS = ('.csv', '.tsv', '.xlsx', '.xls')
+
+
+@dataclass
+class DocumentCostEstimate:
+    """Geschaetzte Kosten eines Dokuments (relative Einheiten)."""
+    lane: str
+    cost: float
+    estimated_pages: int
+    reason: str
+
+
+def estimate_document_cost(doc, *, is_xml_raw: bool = False,
+                           is_cached: bool = False) -> DocumentCostEstimate:
+    """
+    Schaetzt Lane und Aufwand eines Dokuments ohne es herunterzuladen.
+
+    Args:
+        doc: Document aus der Eingangsbox
+        is_xml_raw: Ergebnis von DocumentProcessor._is_xml_raw
+        is_cached: Klassifikation fuer den Content-Hash liegt bereits vor
+    """
+    from config.processing_rules import (
+        PROCESSING_RULES, is_bipro_gdv_code, is_bipro_courtage_code
+    )
+
+    size = max(0, int(getattr(doc, 'file_size', 0) or 0))
+    size_mb = size / (1024 * 1024)
+    extension = (getattr(doc, 'file_extension', '') or '').lower()
+    bipro_category = getattr(doc, 'bipro_category', None)
+    pages = getattr(doc, 'total_page_count', None) or 0
+
+    if is_cached:
+        return DocumentCostEstimate(LANE_FAST, 0.1, 0, 'cache')
+    if is_xml_raw:
+        return DocumentCostEstimate(LANE_FAST, 0.2 + size_mb, 0, 'xml_roh')
+    if bipro_category and is_bipro_gdv_code(bipro_category):
+        return DocumentCostEstimate(LANE_FAST, 0.3 + size_mb, 0, 'bipro_gdv')
+    if getattr(doc, 'is_gdv', False) or extension in PROCESSING_RULES.get('gdv_extensions', []):
+        return DocumentCostEstimate(LANE_FAST, 0.3 + size_mb, 0, 'gdv')
+
+    if getattr(doc, 'is_pdf', False):
+        if pages:
+            is_scan = size / pages > SCAN_BYTES_PER_PAGE
+        else:
+            is_scan = size > LARGE_PDF_BYTES
+        if getattr(doc, 'source_type', '') == 'scan':
+            is_scan = True
+        if not pages:
+            per_page = SCAN_PDF_BYTES_PER_PAGE if is_scan else TEXT_PDF_BYTES_PER_PAGE
+            pages = max(1, round(size / per_page))
+
+        if bipro_category and is_bipro_courtage_code(bipro_category):
+            # Courtage: KI nur fuer VU+Datum auf der ersten Seite
+            lane = LANE_VISION if is_scan else LANE_TEXT_AI
+            return DocumentCostEstimate(lane, 1.0 + size_mb, pages, 'bipro_courtage')
+        if is_scan:
+            return DocumentCostEstimate(LANE_VISION, 10.0 + pages * 5.0 + size_mb, pages, 'scan')
+        return DocumentCostEstimate(LANE_TEXT_AI, 2.0 + pages * 0.5 + size_mb, pages, 'pdf_text')
+
+    if extension in SPREADSHEET_EXTENSIONS:
+        # Nur die ersten Zeilen gehen an die KI
+        return DocumentCostEstimate(LANE_TEXT_AI, 0.5 + size_mb, 0, 'tabelle')
+
+    # Unbekannte Typen / Dateien ohne Endung (GDV-Content-Check) -> keine KI
+    return DocumentCostEstimate(LANE_FAST, 0.5 + size_mb, 0, 'sonstige')
+
+
+def plan_lanes(docs_with_estimates: List[Tuple[object, DocumentCostEstimate]]
+               ) -> Dict[str, List[Tuple[object, DocumentCostEstimate]]]:
+    """Teilt Dokumente auf Lanes auf, je Lane aufsteigend nach Kosten."""
+    lanes: Dict[str, List[Tuple[object, DocumentCostEstimate]]] = {lane: [] for lane in LANES}
+    for doc, estimate in docs_with_estimates:
+        lanes.setdefault(estimate.lane, []).append((doc, estimate))
+    for entries in lanes.values():
+        entries.sort(key=lambda entry: entry[1].cost)
+    return lanes
+
+
+def allocate_lane_workers(lane_workers: Dict[str, int], active_lanes,
+                          max_workers: int) -> Dict[str, int]:
+    """
+    Verteilt max_workers (Obergrenze ueber ALLE Lanes) auf die aktiven Lanes.
+
+    Die Lane-Werte geben das Verhaeltnis vor; passen sie nicht in
+    max_workers, werden sie anteilig gekuerzt (groesster Rest zuerst).
+    Jede aktive Lane bekommt mindestens einen Worker - bei mehr aktiven
+    Lanes als max_workers begrenzt der Aufrufer die Summe zusaetzlich
+    (siehe DocumentProcessor.process_inbox).
+
+    Args:
+        lane_workers: Gewuenschte Worker je Lane
+        active_lanes: Lanes mit Dokumenten (nur diese erhalten Worker)
+        max_workers: Obergrenze gleichzeitiger Verarbeitungen gesamt
+    """
+    requested = {lane: max(1, int(lane_workers.get(lane, 1))) for lane in active_lanes}
+    budget = max(1, int(max_workers))
+    if sum(requested.values()) <= budget:
+        return requested
+
+    total = sum(requested.values())
+    shares = {lane: budget * n / total for lane, n in requested.items()}
+    allocated = {lane: max(1, int(share)) for lane, share in shares.items()}
+    remaining = budget - sum(allocated.values())
+    for lane in sorted(shares, key=lambda l: shares[l] - int(shares[l]), reverse=True):
+        if remaining <= 0:
+            break
+        if allocated[lane] < requested[lane]:
+            allocated[lane] += 1
+            remaining -= 1
+    return allocated
+
+
+class RunTiming:
+    """
+    Zeit bis zum ersten und letzten Ergebnis, gesamt und je Lane.
+
+    Zeiten sind relativ zum Start der Verteilung (start()).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start: Optional[float] = None
+        self._first: Optional[float] = None
+        self._last: Optional[float] = None
+        self._lanes: Dict[str, dict] = {}
+
+    def start(self) -> None:
+        self._start = time.monotonic()
+
+    def record(self, lane: str) -> None:
+        """Meldet ein fertiges Ergebnis der Lane."""
+        if self._start is None:
+            return
+        elapsed = time.monotonic() - self._start
+        with self._lock:
+            if self._first is None:
+                self._first = elapsed
+            self._last = elapsed
+            stats = self._lanes.setdefault(lane, {'count': 0, 'first_s': elapsed, 'last_s': elapsed})
+            stats['count'] += 1
+            stats['last_s'] = elapsed
+
+    @property
+    def time_to_first_result(self) -> Optional[float]:
+        return self._first
+
+    @property
+    def time_to_last_result(self) -> Optional[float]:
+        return self._last
+
+    def lane_stats(self, lane_workers: Dict[str, int]) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                lane: {
+                    'workers': lane_workers.get(lane, 0),
+                    'documents': stats['count'],
+                    'time_to_first_result_s': round(stats['first_s'], 2),
+                    'time_to_last_result_s': round(stats['last_s'], 2),
+                }
+                for lane, stats in self._lanes.items()
+            }
@@ -0,0 +1,299 @@
+"""
+Lokaler Dateinamen-Index fuer die Offline-Suche im ATLAS Index (SQLite FTS5).
+
+Der ATLAS Index sucht auf dem Server (GET /documents/search, Dateiname und
+Volltext). Ist der Server nicht erreichbar, gab es bisher keine Suche.
+LocalSearchIndex haelt die Dateinamen aller Dokumente lokal in einer
+FTS5-Datenbank und beantwortet Suchen dann offline - ausdruecklich nur
+ueber Dateinamen, die Oberflaeche weist darauf hin (SearchResult.offline).
+
+Dokumenttexte werden NICHT lokal gespeichert: der Server bietet keine
+Bulk-/Delta-Quelle fuer extrahierte Texte, ein lokaler Volltext waere immer
+unvollstaendig und laege als Klartext-Kundendaten auf der Platte.
+
+- Dateinamen werden bei jedem Dokument-Sync des DataCacheService
+  abgeglichen (neu/umbenannt/geloescht)
+- Wortanfang-Suche ueber unicode61 (wie der Server-FULLTEXT), Teilstring-
+  Suche ueber den trigram-Tokenizer (ab SQLite 3.34, sonst LIKE)
+- XML/GDV-Rohdaten nur mit include_raw (wie der Server)
+- Laufende Suchen sind per cancel_event abbrechbar (SQLite-Progress-Handler)
+
+Ablage je Server unter %LOCALAPPDATA%/ACENCIA-ATLAS/search_index/<server>.sqlite3
+(Verzeichnis nur fuer den Benutzer, ohne gueltige Session geloescht:
+clear_local_search_indexes).
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = '3'
+
+# Rohdaten, die der Server ohne include_raw ausblendet
+RAW_EXTENSIONS = ('.xml', '.gdv')
+RAW_BOX_TYPES = ('roh',)
+
+_HAS_TRIGRAM = sqlite3.sqlite_version_info >= (3, 34, 0)
+
+
+def get_index_dir() -> Path:
+    """Gibt das Verzeichnis der Suchindizes zurueck."""
+    if os.name == 'nt':
+        base = Path(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')))
+    else:
+        base = Path.home() / '.local' / 'share'
+    index_dir = base / 'ACENCIA-ATLAS' / 'search_index'
+    index_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        # Datenbank samt WAL-Dateien nur fuer den Benutzer (unter Windows wirkungslos)
+        os.chmod(index_dir, 0o700)
+    except OSError:
+        pass
+    return index_dir
+
+
+def is_raw_document(doc) -> bool:
+    """XML/GDV-Rohdaten (nur mit include_raw durchsuchbar)."""
+    return bool(doc.is_gdv or doc.box_type in RAW_BOX_TYPES
+                or doc.file_extension in RAW_EXTENSIONS)
+
+
+def _fts_phrase(term: str) -> str:
+    """Quotet einen Suchbegriff als FTS5-Phrase (keine Operator-Syntax)."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+class LocalSearchIndex:
+    """
+    Thread-sicherer FTS5-Index ueber Dateinamen.
+
+    Args:
+        db_path: Pfad der SQLite-Datei (':memory:' fuer Tests)
+    """
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._has_trigram = _HAS_TRIGRAM
+        self._create_schema()
+
+    # ── Abgleich ──────────────────────────────────────────────────────────
+
+    def sync_documents(self, documents: Iterable) -> int:
+        """
+        Gleicht die Dateinamen mit der aktuellen Dokumentliste ab.
+
+        Returns:
+            Anzahl neuer, geaenderter oder entfernter Eintraege
+        """
+        with self._lock:
+            known = {
+                row[0]: (row[1], row[2])
+                for row in self._conn.execute('SELECT id, filename, is_raw FROM docs')
+            }
+            changes = 0
+            with self._conn:
+                for doc in documents:
+                    state = (doc.original_filename, int(is_raw_document(doc)))
+                    old = known.pop(doc.id, None)
+                    if old == state:
+                        continue
+                    changes += 1
+                    if old is None:
+                        self._conn.execute(
+                            'INSERT INTO docs (id, filename, is_raw) VALUES (?, ?, ?)',
+                            (doc.id, *state))
+                        self._write_fts(doc.id, state[0])
+                    else:
+                        self._conn.execute(
+                            'UPDATE docs SET filename = ?, is_raw = ? WHERE id = ?',
+                            (*state, doc.id))
+                        for table in self._fts_tables():
+                            self._conn.execute(
+                                f'UPDATE {table} SET filename = ? WHERE rowid = ?', (state[0], doc.id))
+                for doc_id in known:
+                    changes += 1
+                    self._conn.execute('DELETE FROM docs WHERE id = ?', (doc_id,))
+                    self._delete_fts(doc_id)
+        if changes:
+            logger.debug(f"Lokaler Suchindex: {changes} Eintraege abgeglichen")
+        return changes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM docs')
+            for table in self._fts_tables():
+                self._conn.execute(f'DELETE FROM {table}')
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ── Suche ─────────────────────────────────────────────────────────────
+
+    def search(self, query: str, limit: int = 200, include_raw: bool = False,
+               substring: bool = False,
+               cancel_event: Optional[threading.Event] = None) -> List[int]:
+        """
+        Durchsucht die Dateinamen (alle Woerter muessen vorkommen).
+
+        Args:
+            query: Suchbegriff (min. 3 Zeichen)
+            limit: Maximale Anzahl Treffer
+            include_raw: XML/GDV-Rohdaten einbeziehen
+            substring: Teilstring statt Wortanfang
+            cancel_event: Gesetzt -> laufende Abfrage wird abgebrochen
+
+        Returns:
+            Dokument-IDs, neueste zuerst ([] bei Abbruch)
+        """
+        query = query.strip()
+        if len(query) < 3:
+            return []
+        terms = query.split()
+        raw_filter = '' if include_raw else ' AND d.is_raw = 0'
+
+        if substring and self._has_trigram and all(len(t) >= 3 for t in terms):
+            table, expr = 'fts_sub', ' AND '.join(_fts_phrase(t) for t in terms)
+        elif substring:
+            return self._search_like(terms, limit, raw_filter, cancel_event)
+        else:
+            table, expr = 'fts', ' AND '.join(_fts_phrase(t) + '*' for t in terms)
+
+        sql = (
+            f"SELECT f.rowid FROM {table} f JOIN docs d ON d.id = f.rowid "
+            f"WHERE {table} MATCH ?{raw_filter} ORDER BY f.rowid DESC LIMIT ?"
+        )
+        with self._cancellable(cancel_event):
+            try:
+                rows = self._conn.execute(sql, (expr, limit)).fetchall()
+            except sqlite3.OperationalError as e:
+                # auch 'interrupted' (cancel_event gesetzt)
+                logger.debug(f"Lokale Suche fehlgeschlagen ({expr}): {e}")
+                return []
+        return [row[0] for row in rows]
+
+    def _search_like(self, terms: List[str], limit: int, raw_filter: str,
+                     cancel_event: Optional[threading.Event] = None) -> List[int]:
+        """Teilstring-Suche ohne trigram-Tokenizer (langsamer, Volltabellen-Scan)."""
+        conditions = ' AND '.join("f.filename LIKE ? ESCAPE '\\'" for _ in terms)
+        params = [
+            '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            for term in terms
+        ]
+        sql = (
+            f"SELECT f.rowid FROM fts f JOIN docs d ON d.id = f.rowid "
+            f"WHERE {conditions}{raw_filter} ORDER BY f.rowid DESC LIMIT ?"
+        )
+        with self._cancellable(cancel_event):
+            try:
+                rows = self._conn.execute(sql, (*params, limit)).fetchall()
+            except sqlite3.OperationalError as e:
+                logger.debug(f"Lokale Suche fehlgeschlagen (LIKE): {e}")
+                return []
+        return [row[0] for row in rows]
+
+    # ── Intern ────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def _cancellable(self, cancel_event: Optional[threading.Event]):
+        """Sperrt die Verbindung; bricht Abfragen ab, sobald cancel_event gesetzt ist."""
+        with self._lock:
+            if cancel_event is None:
+                yield
+                return
+            # Handler liefert True -> SQLite bricht die Abfrage ab (OperationalError)
+            self._conn.set_progress_handler(cancel_event.is_set, 1000)
+            try:
+                yield
+            finally:
+                self._conn.set_progress_handler(None, 0)
+
+    def _create_schema(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+            if row is not None and row[0] != SCHEMA_VERSION:
+                # Aeltere Schemata enthielten Dokumenttexte -> komplett verwerfen
+                for table in ('docs', 'fts', 'fts_sub'):
+                    self._conn.execute(f'DROP TABLE IF EXISTS {table}')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS docs ('
+                ' id INTEGER PRIMARY KEY, filename TEXT NOT NULL, is_raw INTEGER NOT NULL)')
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS fts USING fts5("
+                "filename, tokenize = 'unicode61 remove_diacritics 2')")
+            if self._has_trigram:
+                try:
+                    self._conn.execute(
+                        "CREATE VIRTUAL TABLE IF NOT EXISTS fts_sub USING fts5("
+                        "filename, tokenize = 'trigram')")
+                except sqlite3.OperationalError:
+                    self._has_trigram = False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)", (SCHEMA_VERSION,))
+
+    def _fts_tables(self) -> tuple:
+        return ('fts', 'fts_sub') if self._has_trigram else ('fts',)
+
+    def _write_fts(self, doc_id: int, filename: str) -> None:
+        for table in self._fts_tables():
+            self._conn.execute(
+                f'INSERT INTO {table} (rowid, filename) VALUES (?, ?)', (doc_id, filename))
+
+    def _delete_fts(self, doc_id: int) -> None:
+        for table in self._fts_tables():
+            self._conn.execute(f'DELETE FROM {table} WHERE rowid = ?', (doc_id,))
+
+
+_indexes: Dict[str, LocalSearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_local_search_index(server_url: str) -> Optional[LocalSearchIndex]:
+    """Gibt den Suchindex fuer einen Server zurueck (None wenn deaktiviert/fehlerhaft)."""
+    from config.processing_rules import LOCAL_SEARCH_INDEX_CONFIG
+
+    if not LOCAL_SEARCH_INDEX_CONFIG.get('enabled', True):
+        return None
+    key = hashlib.sha1((server_url or '').encode('utf-8')).hexdigest()[:12]
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            try:
+                index = LocalSearchIndex(str(get_index_dir() / f"{key}.sqlite3"))
+            except sqlite3.Error as e:
+                logger.warning(f"Lokaler Suchindex nicht verfuegbar: {e}")
+                return None
+            _indexes[key] = index
+        return index
+
+
+def clear_local_search_indexes() -> None:
+    """Loescht alle lokalen Suchindizes (z.B. wenn keine gueltige Session vorhanden ist)."""
+    with _indexes_lock:
+        for index in _indexes.values():
+            try:
+                index.close()
+            except sqlite3.Error:
+                pass
+        _indexes.clear()
+        index_dir = get_index_dir()
+        for entry in index_dir.iterdir():
+            try:
+                entry.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,147 @@
+"""
+Persistenter Thumbnail-Cache fuer den PDF-Viewer.
+
+Der Bearbeitungsmodus des PDFViewerDialog hat bei jedem Oeffnen und nach
+jedem Drehen/Loeschen alle Seiten-Thumbnails neu gerendert. ThumbnailCache
+legt gerenderte Thumbnails als PNG auf Platte ab.
+
+- Schluessel: content_hash der Datei + Seitenindex (im Original) + Drehung
+  + Breite in Pixeln (mehrere Aufloesungen, z.B. HiDPI, nebeneinander)
+- Eine Seite, die nach einer Bearbeitung nur verschoben wurde, trifft so
+  weiterhin den Cache; gedrehte Seiten werden einmal je Drehung gerendert
+- Ein Unterverzeichnis je Dokument; Groessenlimit mit Verdraengung der am
+  laengsten nicht genutzten Dokumente (mtime des Verzeichnisses)
+
+Ablage unter %LOCALAPPDATA%/ACENCIA-ATLAS/thumb_cache/.
+"""
+
+import logging
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+_HASH_RE = re.compile(r'^[0-9a-f]{16,128}$')
+
+
+def get_cache_dir() -> Path:
+    """Gibt das Verzeichnis des Thumbnail-Caches zurueck."""
+    if os.name == 'nt':
+        base = Path(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')))
+    else:
+        base = Path.home() / '.local' / 'share'
+    cache_dir = base / 'ACENCIA-ATLAS' / 'thumb_cache'
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+class ThumbnailCache:
+    """
+    Thumbnail-Ablage (PNG) je Dokument-Hash.
+
+    Args:
+        root: Cache-Verzeichnis (wird angelegt)
+        max_bytes: Maximale Gesamtgroesse (geprueft in prune())
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._root = Path(root)
+        self._max_bytes = max(0, max_bytes)
+        self._prune_lock = threading.Lock()
+        self._pruned = False
+
+    def load(self, content_hash: str, page: int, rotation: int, width: int) -> Optional[bytes]:
+        """PNG-Daten des Thumbnails oder None."""
+        path = self._path(content_hash, page, rotation, width)
+        if path is None:
+            return None
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            # Dokument als zuletzt genutzt markieren (Verdraengungsreihenfolge)
+            os.utime(path.parent)
+        except OSError:
+            pass
+        return data or None
+
+    def store(self, content_hash: str, page: int, rotation: int, width: int, png: bytes) -> bool:
+        """Legt ein Thumbnail ab (atomar ueber Temp-Datei + os.replace)."""
+        path = self._path(content_hash, page, rotation, width)
+        if path is None or not png:
+            return False
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(png)
+            os.replace(tmp, path)
+            return True
+        except OSError as e:
+            logger.debug(f"Thumbnail-Cache schreiben fehlgeschlagen: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return False
+
+    def prune(self) -> None:
+        """Entfernt die am laengsten ungenutzten Dokumente bis zum Groessenlimit (1x je Prozess)."""
+        with self._prune_lock:
+            if self._pruned:
+                return
+            self._pruned = True
+        if not self._root.is_dir():
+            return
+        documents = []
+        total = 0
+        for shard in os.scandir(self._root):
+            if not shard.is_dir():
+                continue
+            for doc_dir in os.scandir(shard.path):
+                if not doc_dir.is_dir():
+                    continue
+                size = sum(f.stat().st_size for f in os.scandir(doc_dir.path) if f.is_file())
+                documents.append((doc_dir.stat().st_mtime, doc_dir.path, size))
+                total += size
+        for _mtime, doc_path, size in sorted(documents):
+            if total <= self._max_bytes:
+                break
+            shutil.rmtree(doc_path, ignore_errors=True)
+            total -= size
+
+    def _path(self, content_hash: str, page: int, rotation: int, width: int) -> Optional[Path]:
+        content_hash = (content_hash or '').lower()
+        if not _HASH_RE.match(content_hash):
+            return None
+        return (self._root / content_hash[:2] / content_hash /
+                f"p{int(page)}_r{int(rotation) % 360}_w{int(width)}.png")
+
+
+_cache: Optional[ThumbnailCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> Optional[ThumbnailCache]:
+    """Gibt den Thumbnail-Cache zurueck (None wenn deaktiviert)."""
+    global _cache
+    from config.processing_rules import THUMBNAIL_CACHE_CONFIG
+
+    if not THUMBNAIL_CACHE_CONFIG.get('enabled', True):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            max_mb = THUMBNAIL_CACHE_CONFIG.get('max_size_mb', DEFAULT_MAX_BYTES // (1024 * 1024))
+            _cache = ThumbnailCache(str(get_cache_dir()), int(max_mb) * 1024 * 1024)
+        return _cache
+
+
+def clear_thumbnail_cache() -> None:
+    """Loescht alle Thumbnails (z.B. wenn keine gueltige Session vorhanden ist)."""
+    shutil.rmtree(get_cache_dir(), ignore_errors=True)
@@ -0,0 +1,208 @@
+"""
+Verschluesselter Warm-Start-Cache fuer das Archiv.
+
+Nach jedem App-Start war der DataCacheService leer: das erste Oeffnen des
+Archivs wartete auf list_documents() und get_box_stats(). ArchiveWarmCache
+legt Dokumentliste, Sync-Cursor und Box-Statistiken nach erfolgreichen
+Refreshes und beim Beenden lokal ab; beim naechsten Start werden sie sofort
+geladen und danach vom normalen Auto-Refresh revalidiert.
+
+- Eine Datei je Server + Benutzer (Dateiname = Hash, keine Klartextnamen)
+- Kompakt: Dokumente als Positionszeilen (ohne Feldnamen), zlib-komprimiert
+- Verschluesselt mit Fernet (AES + HMAC, cryptography); der Schluessel liegt
+  im keyring (Windows Credential Manager/DPAPI), Fallback wie beim Token
+  (SV-005): Schluesseldatei mit restriktiven Permissions
+- Geaendertes Document-Schema, fremde Benutzer/Server, abgelaufene oder
+  manipulierte Dateien werden verworfen
+
+Ablage unter %LOCALAPPDATA%/ACENCIA-ATLAS/warm_cache/.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import zlib
+from dataclasses import asdict, fields
+from datetime import datetime, timedelta
+from operator import attrgetter
+from pathlib import Path
+from sys import intern
+from typing import Any, Dict, List, Optional
+
+from api.documents import BoxStats, Document
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+CACHE_SUFFIX = '.bin'
+KEYRING_KEY_NAME = 'warm_cache_key'
+
+_DOCUMENT_FIELDS = [f.name for f in fields(Document)]
+_get_row = attrgetter(*_DOCUMENT_FIELDS)
+# Felder mit wenigen unterschiedlichen Werten (wie decode_documents)
+_INTERNED_FIELDS = {
+    'mime_type', 'source_type', 'uploaded_by_name', 'vu_name', 'box_type',
+    'processing_status', 'document_category', 'bipro_category', 'validation_status',
+    'classification_source', 'classification_confidence', 'display_color',
+    'duplicate_of_box_type', 'content_duplicate_of_box_type',
+}
+_INTERNED_POSITIONS = [i for i, name in enumerate(_DOCUMENT_FIELDS) if name in _INTERNED_FIELDS]
+
+
+def get_cache_dir() -> Path:
+    """Gibt das Verzeichnis des Warm-Start-Caches zurueck."""
+    if os.name == 'nt':
+        base = Path(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')))
+    else:
+        base = Path.home() / '.local' / 'share'
+    cache_dir = base / 'ACENCIA-ATLAS' / 'warm_cache'
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def _load_or_create_key(cache_dir: Path) -> Optional[bytes]:
+    """Fernet-Schluessel aus keyring bzw. Schluesseldatei (wird bei Bedarf erzeugt)."""
+    from services.local_crypto import load_or_create_key
+    return load_or_create_key(KEYRING_KEY_NAME, cache_dir)
+
+
+class ArchiveWarmCache:
+    """
+    Verschluesselte Warm-Start-Datei fuer einen Server und Benutzer.
+
+    Args:
+        server_url: Server-Basis-URL
+        username: Angemeldeter Benutzer
+        cache_dir: Ablageverzeichnis (Default: get_cache_dir())
+    """
+
+    def __init__(self, server_url: str, username: str, cache_dir: Optional[str] = None):
+        self._server_url = server_url or ''
+        self._username = username or ''
+        self._dir = Path(cache_dir) if cache_dir else get_cache_dir()
+        key = hashlib.sha1(f"{self._server_url}|{self._username}".encode('utf-8')).hexdigest()[:16]
+        self._path = self._dir / f"{key}{CACHE_SUFFIX}"
+        self._fernet = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def save(self, documents: List[Document], cursor: Optional[str] = None,
+             last_full_sync: Optional[datetime] = None, complete: bool = False,
+             stats: Optional[BoxStats] = None) -> bool:
+        """Schreibt den Cache atomar. False bei Fehlern (nie Exception)."""
+        try:
+            fernet = self._get_fernet()
+            if fernet is None:
+                return False
+            payload = {
+                'version': FORMAT_VERSION,
+                'server': self._server_url,
+                'user': self._username,
+                'saved_at': datetime.now().isoformat(),
+                'cursor': cursor,
+                'last_full_sync': last_full_sync.isoformat() if last_full_sync else None,
+                'complete': complete,
+                'fields': _DOCUMENT_FIELDS,
+                'documents': [_get_row(doc) for doc in documents],
+                'stats': asdict(stats) if isinstance(stats, BoxStats) else None,
+            }
+            raw = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            token = fernet.encrypt(zlib.compress(raw, 6))
+
+            from services.atomic_ops import safe_atomic_write
+            ok, msg, _hash = safe_atomic_write(token, str(self._path))
+            if not ok:
+                logger.warning(f"Warm-Start-Cache speichern fehlgeschlagen: {msg}")
+                return False
+            logger.debug(
+                f"Warm-Start-Cache gespeichert: {len(documents)} Dokumente, "
+                f"{len(token) / 1024:.0f} KB"
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Warm-Start-Cache speichern fehlgeschlagen: {e}")
+            return False
+
+    def load(self, max_age: Optional[timedelta] = None) -> Optional[Dict[str, Any]]:
+        """
+        Liest und entschluesselt den Cache.
+
+        Returns:
+            Dict mit documents, cursor, last_full_sync, complete, stats,
+            saved_at oder None (fehlt, veraltet, unlesbar)
+        """
+        if not self._path.exists():
+            return None
+        try:
+            fernet = self._get_fernet()
+            if fernet is None:
+                return None
+            payload = json.loads(zlib.decompress(fernet.decrypt(self._path.read_bytes())))
+        except Exception as e:
+            # Falscher Schluessel, manipuliert oder beschaedigt
+            logger.info(f"Warm-Start-Cache verworfen (nicht lesbar): {type(e).__name__}")
+            self.delete()
+            return None
+
+        if (payload.get('version') != FORMAT_VERSION
+                or payload.get('server') != self._server_url
+                or payload.get('user') != self._username
+                or payload.get('fields') != _DOCUMENT_FIELDS):
+            logger.info("Warm-Start-Cache verworfen (Format/Benutzer/Server geaendert)")
+            self.delete()
+            return None
+
+        saved_at = datetime.fromisoformat(payload['saved_at'])
+        if max_age is not None and datetime.now() - saved_at > max_age:
+            logger.info("Warm-Start-Cache verworfen (zu alt)")
+            self.delete()
+            return None
+
+        documents = []
+        for row in payload['documents']:
+            for i in _INTERNED_POSITIONS:
+                value = row[i]
+                if value.__class__ is str:
+                    row[i] = intern(value)
+            documents.append(Document(*row))
+
+        stats = BoxStats(**payload['stats']) if payload.get('stats') else None
+        last_full_sync = payload.get('last_full_sync')
+        return {
+            'documents': documents,
+            'cursor': payload.get('cursor'),
+            'last_full_sync': datetime.fromisoformat(last_full_sync) if last_full_sync else None,
+            'complete': bool(payload.get('complete')),
+            'stats': stats,
+            'saved_at': saved_at,
+        }
+
+    def delete(self) -> None:
+        try:
+            self._path.unlink()
+        except OSError:
+            pass
+
+    def _get_fernet(self):
+        if self._fernet is None:
+            key = _load_or_create_key(self._dir)
+            if key is None:
+                return None
+            from cryptography.fernet import Fernet
+            self._fernet = Fernet(key)
+        return self._fernet
+
+
+def clear_warm_caches() -> None:
+    """Loescht alle Warm-Start-Dateien (z.B. wenn keine gueltige Session vorhanden ist)."""
+    cache_dir = get_cache_dir()
+    # inkl. verwaister Temp-Dateien aus abgebrochenen Schreibvorgaengen
+    for pattern in (f"*{CACHE_SUFFIX}", '.tmp_*'):
+        for entry in cache_dir.glob(pattern):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,318 @@
+"""
+Client-seitiges Buendeln von Schreibzugriffen waehrend der Dokumentverarbeitung.
+
+Bisher erzeugte jedes Dokument eine Kette blockierender Requests:
+update (-> verarbeitung), History 'start_processing', update (classified),
+History 'classify', update (renamed), History 'rename', update (archived),
+History 'archive'. Der DocumentWriteBatcher reduziert das auf:
+
+- Claim (-> verarbeitung/processing): Claims paralleler Worker werden
+  gesammelt und per Bulk-Move (/documents/move) in EINEM Request gesendet.
+  Ist ein Dokument fertig, bevor sein Claim gesendet wurde, entfaellt der
+  Claim ganz (der finale Update-Request setzt die Ziel-Box ohnehin).
+- Status/Metadaten: classified/renamed/archived werden vom Aufrufer zu
+  EINEM Update zusammengefasst; update() stellt sicher, dass ein laufender
+  Claim vorher abgeschlossen ist (Reihenfolge pro Dokument).
+- History: Die Schritte eines Dokuments (start_processing, classify,
+  rename, archive, ...) werden bis zum abschliessenden Schritt ('archive'
+  oder 'error') gehalten und zu EINEM Eintrag zusammengefasst; die
+  einzelnen Schritte stehen in action_details['steps']. Der Server hat
+  keinen Bulk-Endpoint fuer die History, gesendet wird daher ein Request
+  pro Dokument, aus dem Hintergrund-Thread (ab HISTORY_BATCH_SIZE
+  Eintraegen oder nach HISTORY_MAX_DELAY_S) und der Rest mit flush().
+
+Ergebnis pro Dokument: 7 Requests (get, 3 Updates, 3 History-Eintraege)
+-> 1 Update + 1 History-Eintrag + anteiliger Bulk-Claim, also gut 2
+Requests (Re-Verifikation siehe DocumentProcessor._is_manually_excluded).
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Wartezeit, in der Claims paralleler Worker gesammelt werden
+CLAIM_LINGER_S = 0.25
+# History-Eintraege pro Sendevorgang des Hintergrund-Threads
+HISTORY_BATCH_SIZE = 50
+# Maximale Verzoegerung eines History-Eintrags waehrend eines Laufs
+HISTORY_MAX_DELAY_S = 5.0
+# Schritte, mit denen die History eines Dokuments abgeschlossen ist
+HISTORY_FINAL_ACTIONS = ('archive', 'error')
+# Hintergrund-Thread endet nach dieser Leerlaufzeit
+IDLE_EXIT_S = 10.0
+
+
+class DocumentWriteBatcher:
+    """
+    Thread-safe Sammelstelle fuer Claims, Updates und History-Eintraege.
+
+    Verwendung (aus Worker-Threads):
+        batcher.claim(doc.id)
+        batcher.log_history(doc.id, 'start_processing', 'processing', ...)
+        ...
+        batcher.update(doc.id, box_type='sach', processing_status='archived', ...)
+    Am Ende des Laufs:
+        batcher.flush()
+    """
+
+    def __init__(self, docs_api, history_api,
+                 claim_linger_s: float = CLAIM_LINGER_S,
+                 history_batch_size: int = HISTORY_BATCH_SIZE,
+                 history_max_delay_s: float = HISTORY_MAX_DELAY_S):
+        self._docs_api = docs_api
+        self._history_api = history_api
+        self._claim_linger_s = claim_linger_s
+        self._history_batch_size = max(1, history_batch_size)
+        self._history_max_delay_s = history_max_delay_s
+
+        self._cond = threading.Condition()
+        self._pending_claims: List[int] = []
+        self._inflight_claims: Set[int] = set()
+        self._first_claim_at: Optional[float] = None
+        # Schritte je Dokument bis zum abschliessenden Schritt
+        self._open_history: Dict[int, List[Dict]] = {}
+        self._history: List[Dict] = []
+        self._first_history_at: Optional[float] = None
+        self._history_sending = False
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        self._stats = {
+            'claims_queued': 0,
+            'claims_coalesced': 0,
+            'claim_requests': 0,
+            'updates': 0,
+            'history_entries': 0,
+            'history_requests': 0,
+        }
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def claim(self, doc_id: int) -> None:
+        """Merkt ein Dokument fuer den Bulk-Move in die Verarbeitungsbox vor."""
+        with self._cond:
+            if doc_id in self._pending_claims or doc_id in self._inflight_claims:
+                return
+            self._pending_claims.append(doc_id)
+            self._stats['claims_queued'] += 1
+            if self._first_claim_at is None:
+                self._first_claim_at = time.monotonic()
+            self._ensure_thread_locked()
+            self._cond.notify_all()
+
+    def update(self, doc_id: int, **fields) -> bool:
+        """
+        Sendet ein (zusammengefasstes) Metadaten-Update.
+
+        Ein noch nicht gesendeter Claim des Dokuments entfaellt, ein laufender
+        Claim wird abgewartet, damit er das Update nicht ueberschreibt.
+        """
+        with self._cond:
+            if doc_id in self._pending_claims:
+                self._pending_claims.remove(doc_id)
+                self._stats['claims_coalesced'] += 1
+                if not self._pending_claims:
+                    self._first_claim_at = None
+            while doc_id in self._inflight_claims:
+                self._cond.wait()
+            self._stats['updates'] += 1
+        return self._docs_api.update(doc_id, **fields)
+
+    def log_history(self, document_id: Optional[int], action: str, new_status: str,
+                    **kwargs) -> None:
+        """
+        Reiht einen History-Eintrag ein (Argumente wie ProcessingHistoryAPI.create).
+
+        Schritte eines Dokuments werden gehalten, bis ein Schritt aus
+        HISTORY_FINAL_ACTIONS (oder flush()) sie zu einem Eintrag zusammenfasst.
+        """
+        payload = self._history_api.build_payload(document_id, action, new_status, **kwargs)
+        with self._cond:
+            self._stats['history_entries'] += 1
+            if document_id is None:
+                self._queue_history_locked(payload)
+                return
+            steps = self._open_history.setdefault(document_id, [])
+            steps.append(payload)
+            if action in HISTORY_FINAL_ACTIONS:
+                del self._open_history[document_id]
+                self._queue_history_locked(_merge_history(steps))
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Sendet alle offenen Claims und History-Eintraege (blockierend)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            # Nicht abgeschlossene Dokumente (z.B. Duplikat-Abbruch) ebenfalls senden
+            for steps in self._open_history.values():
+                self._queue_history_locked(_merge_history(steps))
+            self._open_history.clear()
+        while True:
+            claims = self._take_claims(force=True)
+            if claims:
+                self._send_claims(claims)
+            entries = self._take_history(force=True)
+            if entries:
+                self._send_history(entries)
+            with self._cond:
+                # Hintergrund-Thread koennte gerade senden
+                while self._inflight_claims or self._history_sending:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return
+                    self._cond.wait(remaining)
+                if not self._pending_claims and not self._history:
+                    return
+
+    def close(self) -> None:
+        """Flush und Hintergrund-Thread beenden."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            return dict(self._stats)
+
+    # ── Intern ────────────────────────────────────────────────────────────
+
+    def _ensure_thread_locked(self) -> None:
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(
+                target=self._run, name="write-batcher", daemon=True
+            )
+            self._thread.start()
+
+    def _queue_history_locked(self, payload: Dict) -> None:
+        self._history.append(payload)
+        if self._first_history_at is None:
+            self._first_history_at = time.monotonic()
+        self._ensure_thread_locked()
+        self._cond.notify_all()
+
+    def _take_claims(self, force: bool = False) -> List[int]:
+        with self._cond:
+            if not self._pending_claims:
+                return []
+            if not force and time.monotonic() - self._first_claim_at < self._claim_linger_s:
+                return []
+            claims = self._pending_claims
+            self._pending_claims = []
+            self._first_claim_at = None
+            self._inflight_claims.update(claims)
+            return claims
+
+    def _take_history(self, force: bool = False) -> List[Dict]:
+        with self._cond:
+            if not self._history or self._history_sending:
+                return []
+            due = (len(self._history) >= self._history_batch_size
+                   or time.monotonic() - self._first_history_at >= self._history_max_delay_s)
+            if not force and not due:
+                return []
+            entries = self._history[:self._history_batch_size]
+            self._history = self._history[self._history_batch_size:]
+            self._first_history_at = time.monotonic() if self._history else None
+            self._history_sending = True
+            return entries
+
+    def _send_claims(self, claims: List[int]) -> None:
+        try:
+            self._docs_api.move_documents(claims, 'verarbeitung', processing_status='processing')
+            logger.debug(f"Claim: {len(claims)} Dokument(e) -> verarbeitung (1 Request)")
+        except Exception as e:
+            # Claim ist nur Sichtbarkeit; das finale Update setzt die Ziel-Box
+            logger.warning(f"Bulk-Claim fehlgeschlagen ({len(claims)} Dokumente): {e}")
+        finally:
+            with self._cond:
+                self._stats['claim_requests'] += 1
+                self._inflight_claims.difference_update(claims)
+                self._cond.notify_all()
+
+    def _send_history(self, entries: List[Dict]) -> None:
+        sent = 0
+        try:
+            for payload in entries:
+                sent += 1
+                try:
+                    self._history_api.create_from_payload(payload)
+                except Exception as e:
+                    # Fehler beim History-Logging sollten die Verarbeitung nicht stoppen
+                    logger.warning(
+                        f"History-Eintrag fehlgeschlagen (Dokument {payload.get('document_id')}): {e}"
+                    )
+        finally:
+            with self._cond:
+                self._stats['history_requests'] += sent
+                self._history_sending = False
+                self._cond.notify_all()
+
+    def _next_wakeup_locked(self) -> Optional[float]:
+        now = time.monotonic()
+        waits = []
+        if self._pending_claims:
+            waits.append(self._first_claim_at + self._claim_linger_s - now)
+        if self._history and not self._history_sending:
+            waits.append(self._first_history_at + self._history_max_delay_s - now)
+        return max(0.0, min(waits)) if waits else None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                wakeup = self._next_wakeup_locked()
+                if wakeup is None:
+                    # Nichts offen: nach IDLE_EXIT_S beenden (Neustart bei Bedarf)
+                    self._cond.wait(IDLE_EXIT_S)
+                    if self._closed or self._next_wakeup_locked() is None:
+                        self._thread = None
+                        return
+                else:
+                    self._cond.wait(wakeup)
+                if self._closed:
+                    return
+            claims = self._take_claims()
+            if claims:
+                self._send_claims(claims)
+            entries = self._take_history()
+            if entries:
+                self._send_history(entries)
+
+
+def _merge_history(steps: List[Dict]) -> Dict:
+    """
+    Fasst die History-Schritte eines Dokuments zu einem Eintrag zusammen.
+
+    Aktion, Status und Details kommen vom letzten Schritt, previous_status
+    vom ersten; die Schritte selbst bleiben in action_details['steps'].
+    """
+    if len(steps) == 1:
+        return steps[0]
+    merged = dict(steps[-1])
+    merged['success'] = all(step.get('success', True) for step in steps)
+    merged.pop('previous_status', None)
+    if steps[0].get('previous_status'):
+        merged['previous_status'] = steps[0]['previous_status']
+    for key in ('error_message', 'classification_source', 'classification_result'):
+        if key not in merged:
+            value = next((step[key] for step in steps if step.get(key)), None)
+            if value:
+                merged[key] = value
+    durations = [step['duration_ms'] for step in steps if step.get('duration_ms') is not None]
+    if durations and 'duration_ms' not in merged:
+        merged['duration_ms'] = max(durations)
+    details = dict(merged.get('action_details') or {})
+    details['steps'] = [
+        {key: step[key] for key in ('action', 'new_status', 'success', 'action_details')
+         if key in step}
+        for step in steps
+    ]
+    merged['action_details'] = details
+    return merged
@@ -5,6 +5,9 @@ Entpackt ZIP-Dateien und extrahiert deren Inhalt fuer den Upload.
 Unterstuetzt passwortgeschuetzte ZIPs (Standard-PKZIP und AES-256).
 Rekursive Verarbeitung: ZIPs in ZIPs, MSGs in ZIPs, PDFs in ZIPs.
 Die ZIP-Datei selbst geht ins Roh-Archiv.
+
+zip_compress_type() waehlt beim Erstellen von ZIPs (Box-Export) die
+Kompression je Eintrag: bereits komprimierte Formate werden gespeichert.
 """
 
 import logging
@@ -24,6 +27,14 @@ MAX_TOTAL_UNCOMPRESSED_SIZE = 500 * 1024 * 1024
 # Maximale Groesse einer einzelnen entpackten Datei (100 MB)
 MAX_SINGLE_FILE_SIZE = 100 * 1024 * 1024
 
+# Bereits komprimierte Formate: Deflate spart kaum Platz, kostet aber CPU
+STORED_EXTENSIONS = frozenset({
+    '.pdf', '.zip', '.gz', '.7z', '.rar',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.tif', '.tiff',
+    '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.msg',
+    '.mp3', '.mp4', '.mov',
+})
+
 
 @dataclass
 class ZipExtractResult:
@@ -42,6 +53,13 @@ def is_zip_file(file_path: str) -> bool:
     return Path(file_path).suffix.lower() == '.zip'
 
 
+def zip_compress_type(filename: str) -> int:
+    """Kompression fuer einen ZIP-Eintrag (ZIP_STORED fuer komprimierte Formate)."""
+    if Path(filename).suffix.lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
 def extract_zip_contents(
     zip_path: str,
     temp_dir: Optional[str] = None,
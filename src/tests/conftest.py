@@ -1,7 +1,71 @@
-"""Stellt sicher dass src/ im sys.path ist, damit Domain-/Service-Importe funktionieren."""
+"""Gemeinsame Fixtures; stellt sicher dass src/ im sys.path ist, damit Domain-/Service-Importe funktionieren."""
 import sys
 import os
 
+import pytest
+
 _src_dir = os.path.join(os.path.dirname(__file__), '..')
 if _src_dir not in sys.path:
     sys.path.insert(0, _src_dir)
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """QApplication fuer Model-/Widget-Tests (offscreen)."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    QtWidgets = pytest.importorskip('PySide6.QtWidgets')
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def no_keyring(monkeypatch):
+    """Kein echter Schluesselbund im Test -> Schluesseldatei im jeweiligen Verzeichnis."""
+    monkeypatch.setitem(sys.modules, 'keyring', None)
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Erzeugt im tmp-Verzeichnis ein PDF mit einer Seite pro Text (PyMuPDF)."""
+    fitz = pytest.importorskip("fitz")
+
+    def _make(name, texts):
+        path = tmp_path / name
+        doc = fitz.open()
+        for text in texts:
+            page = doc.new_page()
+            page.insert_text((72, 72), text)
+        doc.save(str(path))
+        doc.close()
+        return str(path)
+
+    return _make
+
+
+@pytest.fixture
+def make_document():
+    """Fabrik fuer api.documents.Document mit minimalen Pflichtfeldern."""
+    from api.documents import Document
+
+    def _make(doc_id, box_type='sach', archived=False, name=None, source='scan', ai=False):
+        name = name or f'{doc_id}.pdf'
+        return Document(id=doc_id, filename=name, original_filename=name,
+                        mime_type=None, file_size=1, source_type=source,
+                        is_gdv=False, created_at='', box_type=box_type,
+                        is_archived=archived, ai_renamed=ai)
+
+    return _make
+
+
+@pytest.fixture
+def data_cache():
+    """Frischer DataCacheService mit gemockter DocumentsAPI (Singleton wird zurueckgesetzt)."""
+    from unittest.mock import MagicMock
+    try:
+        from services.data_cache import DataCacheService
+    except ImportError as e:
+        pytest.skip(f"DataCacheService nicht importierbar (braucht Qt): {e}")
+    DataCacheService.reset_instance()
+    service = DataCacheService(MagicMock())
+    service.docs_api = MagicMock()
+    yield service
+    DataCacheService.reset_instance()
@@ -0,0 +1,63 @@
+"""
+Tests fuer das adaptive KI-Limit (api/openrouter/concurrency.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_ai_concurrency.py -v
+"""
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Tests fuer api/openrouter/concurrency."""
+
+    def test_rate_limit_lowers_limit_and_pauses(self):
+        from api.openrouter.concurrency import AdaptiveConcurrencyLimiter
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, min_limit=2)
+        limiter.record_result(1.0, 429, retry_after=0.3)
+        assert limiter.get_limit() == 7
+        assert limiter.acquire(timeout=0.05) is False  # pausiert
+        assert limiter.acquire(timeout=1.0) is True    # nach Retry-After
+        limiter.release()
+
+    def test_stable_latency_under_saturation_raises_limit(self):
+        from api.openrouter.concurrency import AdaptiveConcurrencyLimiter
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, adjust_every=5)
+        for _ in range(2):
+            assert limiter.acquire(blocking=False)
+        assert limiter.acquire(blocking=False) is False
+        for _ in range(5):
+            limiter.record_result(0.8, 200)
+        assert limiter.get_limit() == 3
+        assert limiter.acquire(blocking=False) is True
+
+    def test_waiters_are_served_fifo_on_release(self):
+        import threading
+        from api.openrouter.concurrency import AdaptiveConcurrencyLimiter
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1)
+        assert limiter.acquire()
+        order = []
+
+        def waiter(n):
+            limiter.acquire()
+            order.append(n)
+            limiter.release()
+
+        threads = []
+        for n in range(3):
+            t = threading.Thread(target=waiter, args=(n,))
+            t.start()
+            threads.append(t)
+            while limiter.get_stats()['waiting'] < n + 1:
+                pass
+        limiter.release()
+        for t in threads:
+            t.join(2)
+        assert order == [0, 1, 2]
+
+    def test_histogram_and_percentiles(self):
+        from api.openrouter.concurrency import AdaptiveConcurrencyLimiter
+        limiter = AdaptiveConcurrencyLimiter()
+        for latency in (0.2, 0.7, 1.5, 100.0):
+            limiter.record_result(latency, 200)
+        hist = dict(limiter.get_latency_histogram())
+        assert hist[500] == 1 and hist[1000] == 1 and hist[2000] == 1 and hist[None] == 1
+        assert limiter.get_stats()['p50_ms'] in (700, 1500)
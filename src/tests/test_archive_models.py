@@ -0,0 +1,65 @@
+"""
+Tests fuer das Archiv-Tabellenmodell (ui/archive/models.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_archive_models.py -v
+"""
+
+import pytest
+
+
+class TestDocumentTableModelDiff:
+    """Tests fuer DocumentTableModel.set_documents (Zeilen-Diff statt Reset)."""
+
+    @pytest.fixture
+    def model(self, qapp):
+        try:
+            from ui.archive.models import DocumentTableModel
+        except ImportError as e:
+            pytest.skip(f"PySide6 nicht verfuegbar: {e}")
+        model = DocumentTableModel()
+        events = []
+        model.modelReset.connect(lambda: events.append(('reset',)))
+        model.rowsRemoved.connect(lambda _p, first, last: events.append(('removed', first, last)))
+        model.rowsInserted.connect(lambda _p, first, last: events.append(('inserted', first, last)))
+        model.dataChanged.connect(lambda tl, br, _r=None: events.append(('changed', tl.row(), br.row())))
+        model.events = events
+        yield model
+
+    def test_keyed_diff_emits_row_signals(self, model, make_document):
+        docs = [make_document(i, 'sach') for i in range(1, 7)]
+        assert model.set_documents(docs) is True
+        assert model.events == [('reset',)]
+        model.events.clear()
+
+        assert model.set_documents(list(docs)) is False
+        assert model.events == []
+
+        renamed = make_document(4, 'sach', name='neu.pdf')
+        new_docs = [make_document(9, 'sach'), docs[0], docs[1], docs[2], renamed, docs[5]]
+        assert model.set_documents(new_docs) is True
+        assert model.events == [('removed', 4, 4), ('inserted', 0, 0), ('changed', 4, 4)]
+        assert [model.get_document(r).id for r in range(model.rowCount())] == [9, 1, 2, 3, 4, 6]
+
+    def test_reorder_or_box_switch_resets(self, model, make_document):
+        docs = [make_document(i, 'sach') for i in range(1, 5)]
+        model.set_documents(docs)
+        model.events.clear()
+        model.set_documents(list(reversed(docs)))
+        assert model.events == [('reset',)]
+        model.events.clear()
+        model.set_documents([make_document(i, 'leben') for i in range(10, 14)])
+        assert model.events == [('reset',)]
+
+    def test_row_hash_covers_tooltip_fields(self, model, make_document):
+        from ui.archive.models import DocumentTableModel
+        changes = {
+            'previous_version_id': 3, 'duplicate_of_created_at': '2025-01-02',
+            'content_duplicate_of_created_at': '2025-01-03', 'vu_name': 'Allianz',
+            'mime_type': 'application/pdf',
+        }
+        base = DocumentTableModel._row_hash(make_document(1))
+        for field, value in changes.items():
+            doc = make_document(1)
+            setattr(doc, field, value)
+            assert DocumentTableModel._row_hash(doc) != base, field
@@ -0,0 +1,229 @@
+"""
+Tests fuer die QThread-Worker des Archivs (infrastructure/threading/archive_workers.py).
+
+Die Worker werden synchron ueber run() im Test-Thread ausgefuehrt.
+
+Ausfuehrung:
+    python -m pytest src/tests/test_archive_workers.py -v
+"""
+
+
+class TestSearchWorker:
+    """Tests fuer SearchWorker: eigener APIClient, Limit und Abbruch."""
+
+    @staticmethod
+    def _source_repo(base_url='http://127.0.0.1:9'):
+        from api.client import APIClient, APIConfig
+        from infrastructure.archive.document_repository import DocumentRepository
+        client = APIClient(APIConfig(base_url=base_url))
+        client.set_token('token')
+        return DocumentRepository(client)
+
+    @staticmethod
+    def _fake_search(monkeypatch, total=75):
+        from infrastructure.archive.document_repository import DocumentRepository
+        calls = []
+
+        def search_documents(repo, query, *, limit, include_raw, substring, cancel_event=None):
+            calls.append((repo._client, limit))
+            return list(range(min(limit, total)))
+
+        monkeypatch.setattr(DocumentRepository, 'search_documents', search_documents)
+        return calls
+
+    def test_own_client_with_requested_limit(self, monkeypatch):
+        from infrastructure.threading.archive_workers import SearchWorker
+        calls = self._fake_search(monkeypatch)
+        source = self._source_repo()
+        worker = SearchWorker(source, 'Haftpflicht', limit=20)
+        emitted = []
+        worker.finished.connect(lambda r: emitted.append(len(r)))
+        worker.run()  # synchron im Test-Thread
+        assert emitted == [20]
+        client, limit = calls[0]
+        assert limit == 20
+        assert client is not source._client and client._token == 'token'
+        # Nach dem Lauf ist die eigene Session geschlossen, die Quelle nicht
+        assert client._closed and not source._client._closed
+
+    def test_cancelled_worker_emits_nothing(self, monkeypatch):
+        from infrastructure.threading.archive_workers import SearchWorker
+        self._fake_search(monkeypatch)
+        worker = SearchWorker(self._source_repo(), 'Haftpflicht', limit=20)
+        emitted = []
+        worker.finished.connect(lambda r: emitted.append(len(r)))
+        worker.cancel()
+        worker.run()
+        assert emitted == []
+
+    def test_cancel_aborts_running_request(self):
+        import http.server
+        import socketserver
+        import threading
+        import time
+        from infrastructure.threading.archive_workers import SearchWorker
+
+        class _SlowHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(3)
+                try:
+                    self.send_response(200)
+                    self.end_headers()
+                    self.wfile.write(b'{"results": []}')
+                except OSError:
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _SlowHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            repo = self._source_repo(f'http://127.0.0.1:{server.server_address[1]}')
+            worker = SearchWorker(repo, 'Haftpflicht', limit=20)
+            emitted = []
+            worker.finished.connect(lambda r: emitted.append(('finished', r)))
+            worker.error.connect(lambda e: emitted.append(('error', e)))
+            thread = threading.Thread(target=worker.run)
+            started = time.monotonic()
+            thread.start()
+            time.sleep(0.3)
+            worker.cancel()
+            thread.join(2)
+            assert not thread.is_alive()
+            assert time.monotonic() - started < 2
+            assert emitted == []
+            assert worker._client.get_request_count() == 1
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestAtlasIndexPaging:
+    """Tests fuer AtlasIndexWidget: erste Seite schnell, Rest beim Scrollen."""
+
+    def test_first_page_then_rest_on_scroll(self, qapp, make_document, monkeypatch):
+        from types import SimpleNamespace
+        from PySide6.QtCore import QObject, Signal
+        from api.documents import SearchResult
+        from ui.archive import search_widget
+
+        limits = []
+
+        class _FakeWorker(QObject):
+            finished = Signal(list)
+            error = Signal(str)
+
+            def __init__(self, repo, query, *, limit, include_raw, substring):
+                super().__init__()
+                self.limit = limit
+                limits.append(limit)
+
+            def start(self):
+                total = 45
+                self.finished.emit([
+                    SearchResult(document=make_document(i, 'sach', name=f'{i}.pdf'),
+                                 relevance_score=1.0)
+                    for i in range(min(self.limit, total))
+                ])
+
+            def isRunning(self):
+                return False
+
+        monkeypatch.setattr(search_widget, 'SearchWorker', _FakeWorker)
+        widget = search_widget.AtlasIndexWidget(SimpleNamespace())
+        widget._current_query = 'Haftpflicht'
+        widget._execute_search()
+        assert limits == [widget._PAGE_SIZE]
+        assert len(widget._results) == 20 and widget._more_available
+        assert widget._status_label.text().startswith('20+')
+
+        widget._load_more_results()
+        assert limits == [20, widget._SEARCH_LIMIT]
+        ids = [r.document.id for r in widget._results]
+        assert ids == list(range(45))
+        assert not widget._more_available
+        assert widget._status_label.text() == '45 Treffer'
+        # Keine weiteren Requests, wenn alles geladen ist
+        widget._load_more_results()
+        assert len(limits) == 2
+        widget.deleteLater()
+
+
+class TestPreviewPrefetchWorker:
+    """Tests fuer PreviewPrefetchWorker (fuellt den Vorschau-Cache vorausschauend)."""
+
+    def test_prefetch_worker_fills_cache(self, tmp_path, make_document):
+        import os
+        from services.preview_cache import PreviewCache
+        from infrastructure.threading.archive_workers import PreviewPrefetchWorker
+        cache = PreviewCache(str(tmp_path))
+
+        class _FakeDocsApi:
+            calls = []
+
+            def download(self, doc_id, target_dir, filename_override=None, expected_sha256=None):
+                self.calls.append(doc_id)
+                if doc_id == 3:
+                    return None
+                path = os.path.join(target_dir, filename_override)
+                with open(path, 'wb') as f:
+                    f.write(b'x' * 5)
+                return path
+
+        docs = [make_document(i, 'sach', name=f'Police_{i}.pdf') for i in (1, 2, 3)]
+        with open(cache.path_for(1, 'Police_1.pdf'), 'wb') as f:
+            f.write(b'x' * 5)
+        api = _FakeDocsApi()
+        worker = PreviewPrefetchWorker(api, docs, cache)
+        ready = []
+        worker.document_ready.connect(lambda doc_id, path: ready.append((doc_id, bool(path))))
+        worker.run()
+
+        assert api.calls == [2, 3]
+        assert ready == [(2, True), (3, False)]
+        assert cache.get(2, 'Police_2.pdf') and worker.current_doc_id is None
+
+
+class TestBoxDownloadWorker:
+    """Tests fuer den parallelen, gestreamten Box-Download."""
+
+    def test_worker_streams_entries_into_zip(self, tmp_path):
+        import zipfile
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+        from infrastructure.threading.archive_workers import BoxDownloadWorker
+
+        docs = [
+            SimpleNamespace(id=i, original_filename=name, file_size=0, content_hash=None)
+            for i, name in enumerate(['a.pdf', 'A.pdf', 'daten.xml', 'kaputt.pdf'], start=1)
+        ]
+        payloads = {1: b'%PDF-1' * 1000, 2: b'%PDF-2' * 1000, 3: b'<xml/>' * 1000}
+        api = MagicMock()
+        api.list_documents.return_value = docs
+
+        def download_to_stream(doc_id, fileobj, **kwargs):
+            if doc_id not in payloads:
+                return False
+            fileobj.write(payloads[doc_id])
+            return True
+
+        api.download_to_stream.side_effect = download_to_stream
+        target = str(tmp_path / 'box.zip')
+        worker = BoxDownloadWorker(api, 'courtage', target, mode='zip', max_workers=3)
+        worker._thread_docs_api = lambda: api
+        results = []
+        worker.finished.connect(lambda *args: results.append(args))
+        worker.run()  # synchron im Test-Thread
+
+        erfolge, fehler, fehler_liste, doc_ids = results[0]
+        assert (erfolge, fehler, sorted(doc_ids)) == (3, 1, [1, 2, 3])
+        assert fehler_liste[0].startswith('kaputt.pdf:')
+        with zipfile.ZipFile(target) as zf:
+            infos = {info.filename: info for info in zf.infolist()}
+            assert set(infos) == {'a.pdf', 'A_1.pdf', 'daten.xml'}
+            assert infos['a.pdf'].compress_type == zipfile.ZIP_STORED
+            assert infos['daten.xml'].compress_type == zipfile.ZIP_DEFLATED
+            assert zf.read('A_1.pdf') == payloads[2] and zf.read('daten.xml') == payloads[3]
+        assert not api.download.called
@@ -0,0 +1,88 @@
+"""
+Tests fuer den lokalen Blob-Cache (services/blob_cache.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_blob_cache.py -v
+"""
+
+import os
+
+
+class TestDocumentBlobCache:
+    """Tests fuer DocumentBlobCache und die Nutzung in DocumentsAPI.download."""
+
+    @staticmethod
+    def _blob(tmp_path, name, size):
+        import hashlib
+        path = tmp_path / name
+        path.write_bytes(os.urandom(size))
+        return str(path), hashlib.sha256(path.read_bytes()).hexdigest()
+
+    @staticmethod
+    def _fernet():
+        from cryptography.fernet import Fernet
+        return Fernet(Fernet.generate_key())
+
+    def test_put_get_verifies_hash_and_evicts_lru(self, tmp_path):
+        from services.blob_cache import DocumentBlobCache
+        fernet = self._fernet()
+        # Verschluesselt ~13,4 KB je 10-KB-Datei
+        cache = DocumentBlobCache(str(tmp_path / 'cache'), fernet, max_bytes=30_000)
+        a, hash_a = self._blob(tmp_path, 'a.pdf', 10_000)
+        b, hash_b = self._blob(tmp_path, 'b.pdf', 10_000)
+        c, hash_c = self._blob(tmp_path, 'c.pdf', 10_000)
+
+        assert not cache.put(1, hash_b, a)          # falscher Hash wird nicht abgelegt
+        assert not cache.contains(1, hash_b)
+        assert cache.put(1, hash_a, a) and cache.put(2, hash_b, b)
+        assert cache.contains(1, hash_a)             # 1 zuletzt benutzt -> 2 wird verdraengt
+        assert cache.put(3, hash_c, c)
+        assert not cache.contains(2, hash_b)
+        assert cache.copy_to(1, hash_a, str(tmp_path / 'out.pdf'))
+        assert open(tmp_path / 'out.pdf', 'rb').read() == open(a, 'rb').read()
+
+        reloaded = DocumentBlobCache(str(tmp_path / 'cache'), fernet, max_bytes=30_000)
+        assert reloaded.get_stats()['entries'] == 2
+        reloaded.remove_document(1)
+        assert not reloaded.contains(1, hash_a) and reloaded.contains(3, hash_c)
+
+    def test_blobs_are_encrypted_and_streamed(self, tmp_path, monkeypatch):
+        import io
+        import services.blob_cache as blob_cache
+        from services.blob_cache import DocumentBlobCache
+        monkeypatch.setattr(blob_cache, 'CHUNK_SIZE', 4096)
+        source, content_hash = self._blob(tmp_path, 'a.pdf', 10_000)
+        plain = open(source, 'rb').read()
+        cache = DocumentBlobCache(str(tmp_path / 'cache'), self._fernet())
+        assert cache.put(1, content_hash, source)
+        stored = [p for p in (tmp_path / 'cache').iterdir() if p.suffix == '.blob']
+        assert len(stored) == 1 and plain[:64] not in stored[0].read_bytes()
+
+        buffer = io.BytesIO(b'alt')
+        assert cache.read_into(1, content_hash, buffer) and buffer.getvalue() == plain
+        # Anderer Schluessel (z.B. neu erzeugt): Eintrag wird verworfen statt Muell zu liefern
+        other = DocumentBlobCache(str(tmp_path / 'cache'), self._fernet())
+        assert not other.copy_to(1, content_hash, str(tmp_path / 'out.pdf'))
+        assert not (tmp_path / 'out.pdf').exists() and not other.contains(1, content_hash)
+
+    def test_download_served_from_cache(self, tmp_path, monkeypatch):
+        from unittest.mock import MagicMock
+        from api.documents import DocumentsAPI
+        from services.blob_cache import DocumentBlobCache
+        source, content_hash = self._blob(tmp_path, 'src.pdf', 5_000)
+        cache = DocumentBlobCache(str(tmp_path / 'cache'), self._fernet())
+        client = MagicMock(base_url='http://test')
+
+        def fake_download(endpoint, target_path, **kwargs):
+            with open(source, 'rb') as src, open(target_path, 'wb') as dst:
+                dst.write(src.read())
+            return target_path
+
+        client.download_file.side_effect = fake_download
+        api = DocumentsAPI(client)
+        monkeypatch.setattr(api, '_get_blob_cache', lambda: cache)
+
+        first = api.download(7, str(tmp_path / 'preview'), 'a.pdf', expected_sha256=content_hash)
+        second = api.download(7, str(tmp_path / 'processing'), 'a.pdf', expected_sha256=content_hash)
+        assert client.download_file.call_count == 1
+        assert open(first, 'rb').read() == open(second, 'rb').read() == open(source, 'rb').read()
@@ -0,0 +1,57 @@
+"""
+Tests fuer den Delta-Sync der Dokumentliste (services/data_cache.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_data_cache.py -v
+"""
+
+
+class TestDocumentDeltaSync:
+    """Tests fuer DataCacheService._sync_all_documents (Delta + Tombstones)."""
+
+    def test_delta_merges_changes_and_tombstones(self, data_cache, make_document):
+        from api.documents import DocumentSyncResult
+        data_cache.docs_api.sync_documents.return_value = DocumentSyncResult(
+            documents=[make_document(1, 'eingang'), make_document(2, 'eingang'), make_document(3, 'gdv')],
+            cursor='c1')
+        documents, affected = data_cache._sync_all_documents(data_cache.docs_api)
+        assert affected is None and len(documents) == 3
+        data_cache.docs_api.sync_documents.assert_called_with(None)
+
+        data_cache.invalidate_documents()
+        data_cache.docs_api.sync_documents.return_value = DocumentSyncResult(
+            documents=[make_document(2, 'sach'), make_document(4, 'leben')],
+            deleted_ids=[3], cursor='c2', is_delta=True)
+        documents, affected = data_cache._sync_all_documents(data_cache.docs_api)
+        data_cache.docs_api.sync_documents.assert_called_with('c1')
+        assert affected == {'eingang', 'sach', 'gdv', 'leben'}
+        assert [(d.id, d.box_type) for d in documents] == [(4, 'leben'), (1, 'eingang'), (2, 'sach')]
+        assert [d.id for d in data_cache.get_documents('sach')] == [2]
+        assert data_cache._sync_cursor == 'c2'
+
+    def test_server_without_delta_support_replaces_list(self, data_cache, make_document):
+        from api.documents import DocumentSyncResult
+        data_cache.docs_api.sync_documents.return_value = DocumentSyncResult(
+            documents=[make_document(1, 'eingang')])
+        data_cache._sync_all_documents(data_cache.docs_api)
+        data_cache.docs_api.sync_documents.return_value = DocumentSyncResult(
+            documents=[make_document(5, 'gdv')])
+        documents, affected = data_cache._sync_all_documents(data_cache.docs_api)
+        data_cache.docs_api.sync_documents.assert_called_with(None)
+        assert affected is None and [d.id for d in documents] == [5]
+
+    def test_truncated_full_sync_keeps_cache(self, data_cache, make_document):
+        from api.documents import DocumentSyncResult
+        data_cache.docs_api.sync_documents.return_value = DocumentSyncResult(
+            documents=[make_document(1, 'eingang'), make_document(2, 'gdv')], cursor='c1')
+        data_cache._sync_all_documents(data_cache.docs_api)
+        data_cache._sync_cursor = None  # Vollabgleich erzwingen
+        data_cache.docs_api.sync_documents.return_value = DocumentSyncResult(
+            documents=[make_document(1, 'eingang')], cursor='c9', truncated=True)
+        documents, affected = data_cache._sync_all_documents(data_cache.docs_api)
+        assert [d.id for d in documents] == [1, 2] and affected == set()
+
+        data_cache._sync_base = None  # ohne Cache: anzeigen, aber nicht als vollstaendig werten
+        documents, _ = data_cache._sync_all_documents(data_cache.docs_api)
+        assert [d.id for d in documents] == [1]
+        assert data_cache._sync_cursor is None and not data_cache._documents_complete
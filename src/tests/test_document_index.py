@@ -0,0 +1,65 @@
+"""
+Tests fuer die Sekundaerindizes des Dokument-Caches (services/document_index.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_document_index.py -v
+"""
+
+
+class TestDocumentIndex:
+    """Tests fuer DocumentIndex und die Index-Nutzung im DataCacheService."""
+
+    def test_query_intersections_and_update(self, make_document):
+        from services.document_index import DocumentIndex
+        docs = [make_document(1, 'sach'), make_document(2, 'sach', archived=True),
+                make_document(3, 'falsch'), make_document(4, 'sach', name='4.xml', source='bipro_auto'),
+                make_document(5, 'leben', ai=True)]
+        index = DocumentIndex(docs)
+        assert [d.id for d in index.query({'box_type': 'sach', 'is_archived': False})] == [1, 4]
+        assert [d.id for d in index.query({'file_extension': ['.pdf'], 'ai_renamed': False},
+                                          exclude={'box_type': 'falsch'})] == [1, 2]
+        assert [d.id for d in index.query({'source_type': None}, exclude={'box_type': 'falsch'})] == [1, 2, 4, 5]
+        assert index.count({'file_extension': []}) == 0
+
+        index.set_field([1], 'display_color', 'green')
+        assert docs[0].display_color == 'green'
+        assert [d.id for d in index.query({'display_color': 'green'})] == [1]
+
+        moved = make_document(4, 'leben', name='4.xml')
+        index.update([docs[0], docs[1], moved, docs[4]], removed=[docs[2], docs[3]], added=[moved])
+        assert [d.id for d in index.query({'box_type': 'leben'})] == [4, 5]
+        assert index.counts('box_type') == {'sach': 2, 'leben': 2}
+
+    def test_cache_stats_from_index(self, data_cache, make_document):
+        from api.documents import DocumentSyncResult
+        data_cache.docs_api.sync_documents.return_value = DocumentSyncResult(documents=[
+            make_document(1, 'sach'), make_document(2, 'sach', archived=True), make_document(3, 'gdv')])
+        assert [d.id for d in data_cache.get_documents('sach', is_archived=True)] == [2]
+        stats = data_cache.get_stats()
+        assert (stats.sach, stats.sach_archived, stats.gdv, stats.total) == (1, 1, 1, 3)
+        data_cache.docs_api.get_box_stats.assert_not_called()
+
+    def test_stats_need_proven_complete_list(self, data_cache, make_document, monkeypatch):
+        import services.data_cache as data_cache_module
+        from api.documents import DocumentSyncResult
+        monkeypatch.setattr(data_cache_module, 'SERVER_DOCUMENT_LIMIT', 3)
+        docs = [make_document(1, 'sach'), make_document(2, 'sach'), make_document(3, 'gdv')]
+        # Eine Seite mit LIMIT Eintraegen: trotz Cursor evtl. abgeschnitten -> Server-Stats
+        data_cache.docs_api.sync_documents.return_value = DocumentSyncResult(documents=docs, cursor='c1')
+        data_cache._sync_all_documents(data_cache.docs_api)
+        assert data_cache._compute_stats_from_cache() is None
+        # Per has_more vollstaendig paginiert -> Stats aus dem Index
+        data_cache._sync_cursor = None
+        data_cache.docs_api.sync_documents.return_value = DocumentSyncResult(
+            documents=list(docs), cursor='c2', pages=2)
+        data_cache._sync_all_documents(data_cache.docs_api)
+        assert data_cache._compute_stats_from_cache().total == 3
+
+    def test_query_is_limited_to_given_documents(self, data_cache, make_document):
+        from api.documents import DocumentSyncResult
+        data_cache.docs_api.sync_documents.return_value = DocumentSyncResult(documents=[
+            make_document(1, 'sach'), make_document(2, 'sach'), make_document(3, 'gdv')])
+        documents, _ = data_cache._sync_all_documents(data_cache.docs_api)
+        assert [d.id for d in data_cache.query_documents({'box_type': 'sach'}, within=documents[1:])] == [2]
+        # Nicht aus dem Cache stammende Objekte: Aufrufer muss selbst filtern
+        assert data_cache.query_documents({'box_type': 'sach'}, within=[make_document(1, 'sach')]) is None
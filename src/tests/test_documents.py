@@ -0,0 +1,67 @@
+"""
+Tests fuer die kompakten Dokument-Records (api/documents.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_documents.py -v
+"""
+
+
+class TestDocumentDecoder:
+    """Tests fuer Document(slots) und decode_documents."""
+
+    def test_bulk_decode_slots_and_interning(self):
+        import json
+        from api.documents import decode_documents
+        rows = json.loads(json.dumps([
+            {'id': i, 'filename': f'{i}.pdf', 'box_type': 'courtage', 'vu_name': 'Degenia',
+             'previous_version_id': '3' if i == 2 else None, 'empty_page_count': '0',
+             'content_duplicate_of_id': 0, 'is_archived': 1}
+            for i in (1, 2)
+        ]))
+        first, second = decode_documents(rows)
+        assert not hasattr(first, '__dict__')
+        assert first.box_type is second.box_type and first.vu_name is second.vu_name
+        assert first.original_filename == '1.pdf' and first.source_type == ''
+        assert second.previous_version_id == 3 and first.previous_version_id is None
+        assert first.empty_page_count == 0 and first.content_duplicate_of_id is None
+        assert first.is_archived is True and first.processing_status == 'completed'
+
+
+class TestSyncDocuments:
+    """Tests fuer DocumentsAPI.sync_documents (Paging, Delta-Ueberlauf)."""
+
+    @staticmethod
+    def _api(pages):
+        from unittest.mock import MagicMock
+        from api.documents import DocumentsAPI
+        client = MagicMock()
+        responses = iter(pages)
+        client.get.side_effect = lambda path, params: next(responses)
+        return DocumentsAPI(client), client
+
+    @staticmethod
+    def _page(doc_id, has_more, is_delta=False):
+        return {'success': True, 'data': {
+            'documents': [{'id': doc_id, 'filename': f'{doc_id}.pdf', 'box_type': 'sach'}],
+            'sync_cursor': f'c{doc_id}', 'has_more': has_more, 'is_delta': is_delta}}
+
+    def test_full_sync_pages_until_complete(self):
+        api, client = self._api([self._page(i, i < 29) for i in range(30)])
+        result = api.sync_documents(None)
+        assert len(result.documents) == 30 and not result.truncated and not result.is_delta
+        assert result.cursor == 'c29' and client.get.call_count == 30
+
+    def test_delta_overflow_falls_back_to_complete_full_sync(self):
+        delta = [self._page(100 + i, True, is_delta=True) for i in range(2)]
+        full = [self._page(i, i < 4) for i in range(5)]
+        api, client = self._api(delta + full)
+        result = api.sync_documents('c0', max_pages=2)
+        assert not result.is_delta and not result.truncated
+        assert [d.id for d in result.documents] == [0, 1, 2, 3, 4]
+
+    def test_full_sync_beyond_page_limit_is_truncated(self, monkeypatch):
+        import api.documents as documents
+        monkeypatch.setattr(documents, 'FULL_SYNC_MAX_PAGES', 3)
+        api, _ = self._api([self._page(i, True) for i in range(3)])
+        result = api.sync_documents(None)
+        assert result.truncated and len(result.documents) == 3
@@ -0,0 +1,106 @@
+"""
+Tests fuer die Wiederverwendung des Upload-Volltexts (services/early_text_extract.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_early_text_extract.py -v
+"""
+
+
+class TestStoredTextReuse:
+    """Tests fuer DocumentProcessor._get_full_text (early_text_extract)."""
+
+    @staticmethod
+    def _processor(ai_data):
+        from unittest.mock import MagicMock
+        from services.document_processor import DocumentProcessor
+        processor = DocumentProcessor(MagicMock())
+        processor.docs_api = MagicMock()
+        processor.docs_api.get_ai_data.return_value = ai_data
+        processor._extract_full_text = MagicMock(return_value=('lokal', 1))
+        processor._get_cached_full_text = MagicMock(return_value=None)
+        return processor
+
+    @staticmethod
+    def _early_data(path):
+        import hashlib
+        from services.early_text_extract import _extract_text
+        from services.atomic_ops import calculate_file_hash
+        text, pages = _extract_text(path)
+        return {'extracted_text': text, 'extraction_method': 'text', 'extracted_page_count': pages,
+                'extracted_text_sha256': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+                'source_content_hash': calculate_file_hash(path)}
+
+    @staticmethod
+    def _doc(path, **kwargs):
+        from types import SimpleNamespace
+        from services.atomic_ops import calculate_file_hash
+        return SimpleNamespace(id=1, content_hash=calculate_file_hash(path), **kwargs)
+
+    def test_reuses_valid_stored_text(self, make_pdf):
+        pdf = make_pdf('a.pdf', ['Versicherungsschein Seite 1', 'Seite 2'])
+        data = self._early_data(pdf)
+        processor = self._processor(data)
+        assert processor._get_full_text(self._doc(pdf), pdf) == (data['extracted_text'], 2)
+        processor._extract_full_text.assert_not_called()
+        assert processor._text_stats == {'in_memory': 0, 'reused': 1, 'extracted': 0}
+
+    def test_unchanged_stored_text_is_not_uploaded_again(self, make_pdf):
+        pdf = make_pdf('a.pdf', ['Versicherungsschein Seite 1', 'Seite 2'])
+        data = self._early_data(pdf)
+        processor = self._processor(data)
+        doc = self._doc(pdf, original_filename='a.pdf')
+        text, pages = processor._get_full_text(doc, pdf)
+
+        # Ohne KI-Ergebnis: nichts Neues -> kein Request
+        processor._persist_ai_data(doc, text, pages, None)
+        processor.docs_api.save_ai_data.assert_not_called()
+
+        # Mit KI-Ergebnis: nur die KI-Felder, nicht der Text
+        processor._get_full_text(doc, pdf)
+        processor._persist_ai_data(doc, text, pages, {'_ai_model': 'm'})
+        sent = processor.docs_api.save_ai_data.call_args[0][1]
+        assert 'extracted_text' not in sent and sent['ai_model'] == 'm'
+
+        # Geaenderter Text wird normal gespeichert
+        processor._get_full_text(doc, pdf)
+        processor._persist_ai_data(doc, 'neu', 1, None)
+        assert processor.docs_api.save_ai_data.call_args[0][1]['extracted_text'] == 'neu'
+
+    def test_full_text_from_page_cache_without_request(self, make_pdf):
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+        from services.document_processor import DocumentProcessor
+        from services.page_text_cache import get_page_text_cache
+        get_page_text_cache().clear()
+        pdf = make_pdf('c.pdf', ['Kurzer Brief Seite 1', 'Seite 2'])
+        processor = DocumentProcessor(MagicMock())
+        processor.docs_api = MagicMock()
+        assert processor._get_cached_full_text(pdf) is None
+
+        expected = processor._extract_full_text(pdf)
+        assert processor._get_full_text(SimpleNamespace(id=1), pdf) == expected
+        processor.docs_api.get_ai_data.assert_not_called()
+        assert processor._text_stats['in_memory'] == 1
+
+    def test_falls_back_when_missing_corrupt_or_stale(self, make_pdf):
+        pdf = make_pdf('a.pdf', ['Versicherungsschein Seite 1', 'Seite 2'])
+        # Ersetzte Datei mit gleichem Anfang: nur der Content-Hash unterscheidet
+        replaced = make_pdf('b.pdf', ['Versicherungsschein Seite 1', 'Seite 2', 'Nachtrag'])
+        data = self._early_data(pdf)
+        corrupt = dict(data, extracted_text_sha256='0' * 64)
+        without_hash = {k: v for k, v in data.items() if k != 'source_content_hash'}
+        for ai_data, path in ((None, pdf), (corrupt, pdf), (without_hash, pdf), (data, replaced)):
+            processor = self._processor(ai_data)
+            assert processor._get_full_text(self._doc(path), path) == ('lokal', 1)
+            processor._extract_full_text.assert_called_once_with(path)
+
+    def test_upload_stores_source_content_hash(self, make_pdf):
+        from unittest.mock import MagicMock
+        from services.atomic_ops import calculate_file_hash
+        from services.early_text_extract import extract_and_save_text
+        pdf = make_pdf('a.pdf', ['Versicherungsschein Seite 1'])
+        docs_api = MagicMock()
+        docs_api.save_ai_data.return_value = {}
+        extract_and_save_text(docs_api, 1, pdf)
+        sent = docs_api.save_ai_data.call_args[0][1]
+        assert sent['source_content_hash'] == calculate_file_hash(pdf)
@@ -0,0 +1,58 @@
+"""
+Tests fuer den Keyword-Matcher (utils/keyword_matcher.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_keyword_matcher.py -v
+"""
+
+
+class TestKeywordMatcher:
+    """Tests fuer utils/keyword_matcher."""
+
+    def test_overlapping_hits_in_table_order(self):
+        from utils.keyword_matcher import KeywordMatcher
+        matcher = KeywordMatcher({
+            'leben': ['lebensversicherung', 'leben', 'risikoleben'],
+            'sach': ['haus', 'hausrat'],
+        })
+        hits = matcher.scan('RisikoLebensversicherung und Hausrat')
+        assert hits['leben'] == ['lebensversicherung', 'leben', 'risikoleben']
+        assert hits['sach'] == ['haus', 'hausrat']
+        assert matcher.scan('nichts') == {'leben': [], 'sach': []}
+
+    def test_matches_naive_substring_search(self):
+        import random
+        from utils.keyword_matcher import KeywordMatcher
+        tables = {'a': ['he', 'she', 'his', 'hers'], 'b': ['us', 'ush', 'e']}
+        matcher = KeywordMatcher(tables)
+        rnd = random.Random(7)
+        for _ in range(500):
+            text = ''.join(rnd.choice('hesrui ') for _ in range(rnd.randint(0, 20)))
+            expected = {c: [k for k in kws if k in text] for c, kws in tables.items()}
+            assert matcher.scan(text) == expected
+
+    def test_contains_and_category_subset(self):
+        from utils.keyword_matcher import KeywordMatcher
+        matcher = KeywordMatcher({
+            'leben': ['Lebensversicherung', '', 'leben'],
+            'sach': ['haus', 'leben'],
+        })
+        assert matcher.contains('Ihre LEBENSVERSICHERUNG', 'leben')
+        assert not matcher.contains('Ihre Lebensversicherung', 'kranken')
+        assert not matcher.contains('', 'leben')
+        hits = matcher.scan('Leben im Haus', ['sach'])
+        assert hits == {'sach': ['haus', 'leben']}
+
+    def test_rebuilds_only_when_rules_change(self):
+        from config.processing_rules import PROCESSING_RULES, is_sach_keyword
+        from utils.keyword_matcher import get_keyword_matcher
+        first = get_keyword_matcher()
+        assert get_keyword_matcher() is first
+        original = PROCESSING_RULES['sach_keywords']
+        try:
+            PROCESSING_RULES['sach_keywords'] = original + ['drohnenversicherung']
+            assert is_sach_keyword('Ihre Drohnenversicherung')
+            assert get_keyword_matcher() is not first
+        finally:
+            PROCESSING_RULES['sach_keywords'] = original
+        assert not is_sach_keyword('Ihre Drohnenversicherung')
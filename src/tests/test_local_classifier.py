@@ -0,0 +1,94 @@
+"""
+Tests fuer den lokalen Vorklassifikator (services/local_classifier.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_local_classifier.py -v
+"""
+
+
+class TestLocalClassifier:
+    """Tests fuer LocalClassifier/PreClassifier."""
+
+    RECHNUNG = ('Allianz Versicherungs-AG Beitragsrechnung Kfz-Haftpflicht Versicherungsschein '
+                'Nr. {n} Beitrag faellig zum 01.{m:02d}.2025 Zahlungsweise jaehrlich SEPA-Lastschrift')
+    LEBEN = ('Volksfuersorge Lebensversicherung Standmitteilung {n} Rueckkaufswert Ueberschussbeteiligung '
+             'garantierte Rente Beitragsdynamik Stand 31.{m:02d}.2024')
+
+    def _train(self, clf, rounds=8):
+        for i in range(rounds):
+            clf.learn(self.RECHNUNG.format(n=1000 + i, m=i % 12 + 1), 'sach', 'Allianz', 'Beitragsrechnung')
+            clf.learn(self.LEBEN.format(n=2000 + i, m=i % 12 + 1), 'leben', 'Volksfuersorge', 'Standmitteilung')
+
+    def test_learns_persists_and_predicts(self, tmp_path):
+        from services.local_classifier import LocalClassifier
+        path = tmp_path / 'model.json.gz'
+        clf = LocalClassifier(str(path))
+        assert clf.predict('irgendein Text') is None
+        self._train(clf)
+        assert clf.save()
+
+        reloaded = LocalClassifier(str(path))
+        assert reloaded.sample_count == 16
+        label, probability, known_mass = reloaded.predict(self.RECHNUNG.format(n=9999, m=7))
+        assert label == {'sparte': 'sach', 'vu_name': 'Allianz', 'document_name': 'Beitragsrechnung'}
+        assert probability >= 0.95 and known_mass > 0.9
+        # Unbekanntes Layout: kaum bekannte Merkmale
+        _, _, unknown_mass = reloaded.predict('Schadenmeldung Wasserschaden Keller Gutachter Termin')
+        assert unknown_mass < 0.6
+
+    def test_skips_ai_only_when_confident_and_audits(self):
+        from services.local_classifier import LocalClassifier, PreClassifier
+        clf = LocalClassifier()
+        self._train(clf)
+        pre = PreClassifier(clf, threshold=0.9, min_samples=5, audit_every=3)
+
+        results = [pre.try_classify(self.RECHNUNG.format(n=5000 + i, m=3)) for i in range(3)]
+        assert [r is not None for r, _ in results] == [True, True, False]  # 3. = Audit
+        assert results[0][0]['sparte'] == 'sach' and results[0][0]['_server_cost_usd'] == 0.0
+        pre.observe(self.RECHNUNG.format(n=5002, m=3),
+                    {'sparte': 'sach', 'vu_name': 'Allianz', 'document_name': 'Beitragsrechnung'},
+                    results[2][1])
+
+        # Unbekanntes Layout -> KI
+        local, prediction = pre.try_classify('Schadenmeldung Wasserschaden Keller Gutachter Termin')
+        assert local is None
+        pre.observe('Schadenmeldung Wasserschaden Keller Gutachter Termin',
+                    {'sparte': 'sach', 'vu_name': 'Allianz', 'document_name': 'Schadenmeldung'},
+                    prediction)
+
+        stats = pre.get_stats()
+        assert stats['eligible'] == 4 and stats['skipped'] == 2
+        assert stats['skip_rate'] == 0.5
+        assert stats['audited'] == 1 and stats['audit_agreement_rate'] == 1.0
+        assert stats['compared'] == 2 and stats['agreement_rate'] == 0.5
+
+    def test_courtage_is_never_skipped(self):
+        from services.local_classifier import LocalClassifier, PreClassifier
+        clf = LocalClassifier()
+        text = 'Provisionsabrechnung Courtage Abrechnungszeitraum {m:02d}/2025 Vermittlernummer 4711'
+        for m in range(1, 10):
+            clf.learn(text.format(m=m), 'courtage', 'Allianz', None)
+        local, prediction = PreClassifier(clf, threshold=0.5, min_samples=1).try_classify(text.format(m=11))
+        assert local is None and prediction['label']['sparte'] == 'courtage'
+
+    def test_extracts_document_date_or_defers_to_ai(self):
+        from services.local_classifier import LocalClassifier, PreClassifier
+        from utils.date_utils import extract_document_date
+        assert extract_document_date('Beginn 01.01.2020\nMuenchen, den 15. Maerz 2024') == '2024-03-15'
+        assert extract_document_date('Rechnung vom 3.2.24') == '2024-02-03'
+        assert extract_document_date('31.02.2024 Nr. 12.34.5678') is None
+
+        clf = LocalClassifier()
+        self._train(clf)
+        pre = PreClassifier(clf, threshold=0.9, min_samples=5)
+        local, _ = pre.try_classify(self.RECHNUNG.format(n=5000, m=3))
+        assert local['document_date_iso'] == '2025-03-01'
+
+        text = 'Kfz Versicherungsschein Fahrzeug Kennzeichen Typklasse Regionalklasse Nr. {n} Datum {d}'
+        for i in range(8):
+            clf.learn(text.format(n=3000 + i, d=''), 'kfz', 'HUK', None)
+        # Dateiname "<VU>_Kfz_<Datum>" braucht das Datum -> ohne lokalen Fund zur KI
+        local, prediction = pre.try_classify(text.format(n=3999, d=''))
+        assert local is None and prediction['label']['sparte'] == 'kfz'
+        local, _ = pre.try_classify(text.format(n=3999, d='02.05.2025'))
+        assert local['document_date_iso'] == '2025-05-02'
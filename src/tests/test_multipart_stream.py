@@ -0,0 +1,74 @@
+"""
+Tests fuer den Streaming-Multipart-Upload (api/multipart_stream.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_multipart_stream.py -v
+"""
+
+import os
+
+
+class TestStreamingMultipartUpload:
+    """Tests fuer StreamingMultipartEncoder und APIClient.upload_stream."""
+
+    def test_encoder_streams_valid_multipart(self, tmp_path):
+        from email.parser import BytesParser
+        from email.policy import HTTP
+        from api.multipart_stream import StreamingMultipartEncoder
+        payload = os.urandom(300_000)
+        path = tmp_path / 'scan "1".pdf'
+        path.write_bytes(payload)
+        progress = []
+        encoder = StreamingMultipartEncoder(
+            {'box_type': 'eingang', 'vu_name': 'Allianz'},
+            {'file': (path.name, str(path), 'application/pdf')},
+            progress_callback=lambda sent, total: progress.append((sent, total)),
+        )
+        chunks = []
+        while True:
+            chunk = encoder.read(8192)
+            if not chunk:
+                break
+            assert len(chunk) <= 8192
+            chunks.append(chunk)
+        encoder.close()
+        body = b''.join(chunks)
+        assert len(body) == len(encoder) and progress[-1] == (len(body), len(body))
+
+        message = BytesParser(policy=HTTP).parsebytes(
+            f'Content-Type: {encoder.content_type}\r\n\r\n'.encode() + body)
+        parts = {p.get_param('name', header='content-disposition'): p for p in message.iter_parts()}
+        assert parts['box_type'].get_content() == 'eingang'
+        assert parts['file'].get_payload(decode=True) == payload
+        assert parts['file'].get_filename() == 'scan %221%22.pdf'
+
+    def test_retry_reopens_file(self, tmp_path):
+        from unittest.mock import MagicMock
+        import requests
+        from api.client import APIClient, APIConfig
+        path = tmp_path / 'a.pdf'
+        path.write_bytes(b'%PDF-1.4 ' + b'x' * 50_000)
+
+        bodies = []
+
+        def fake_request(method, url, data=None, headers=None, **kwargs):
+            bodies.append(data.read(1 << 20) + data.read(1 << 20))
+            if len(bodies) == 1:
+                raise requests.ConnectionError('reset')
+            response = MagicMock(status_code=200, headers={})
+            response.json.return_value = {'success': True, 'data': {'id': 1}}
+            return response
+
+        client = APIClient(APIConfig(base_url='http://test'))
+        client._session = MagicMock()
+        client._session.request.side_effect = fake_request
+        import api.client as client_module
+        backoff = client_module.RETRY_BACKOFF_FACTOR
+        client_module.RETRY_BACKOFF_FACTOR = 0
+        try:
+            assert client.upload_file('/documents', str(path), {'box_type': 'eingang'})['success']
+        finally:
+            client_module.RETRY_BACKOFF_FACTOR = backoff
+        # Beide Versuche senden die komplette Datei (neu geoeffnet, neue Boundary)
+        assert len(bodies) == 2
+        assert all(path.read_bytes() in body for body in bodies)
@@ -0,0 +1,119 @@
+"""
+Tests fuer die Beinahe-Duplikat-Erkennung (services/near_duplicate_index.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_near_duplicate_index.py -v
+"""
+
+
+class TestNearDuplicateIndex:
+    """Tests fuer SimHash und NearDuplicateIndex."""
+
+    TEXT = ('Sehr geehrter Herr Mustermann, anbei erhalten Sie den Nachtrag zu Ihrem '
+            'Versicherungsvertrag Wohngebaeude Nr. 55-123456. Die Versicherungssumme wurde '
+            'an den aktuellen Baupreisindex angepasst. Der neue Jahresbeitrag betraegt '
+            '512,40 EUR und wird zum Hauptfaelligkeitstermin eingezogen. Bitte pruefen Sie '
+            'die beigefuegten Unterlagen und teilen Sie uns Aenderungen mit. ') * 3
+
+    def test_finds_near_duplicate_and_persists(self, tmp_path):
+        from services.near_duplicate_index import NearDuplicateIndex, simhash
+        path = tmp_path / 'index.jsonl'
+        index = NearDuplicateIndex(str(path))
+        index.add(1, simhash(self.TEXT + ' Druckdatum 01.02.2025 10:15'), {'sparte': 'sach'})
+        index.add(2, simhash('Standmitteilung Lebensversicherung Rueckkaufswert ' * 20), {'sparte': 'leben'})
+
+        rescan = self.TEXT + ' Druckdatum 03.02.2025 08:42'
+        reloaded = NearDuplicateIndex(str(path))
+        assert len(reloaded) == 2
+        doc_id, distance, cls = reloaded.find(simhash(rescan))
+        assert doc_id == 1 and distance <= 3 and cls == {'sparte': 'sach'}
+        assert reloaded.find(simhash(rescan), exclude_id=1) is None
+        assert reloaded.find(simhash('Kfz Schadenanzeige Unfallhergang Gegner Kennzeichen ' * 20)) is None
+
+        reloaded.remove(1)
+        assert NearDuplicateIndex(str(path)).find(simhash(rescan)) is None
+
+    def test_processor_reuses_near_duplicate_classification(self, tmp_path):
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+        from services.document_processor import DocumentProcessor
+        from services.near_duplicate_index import NearDuplicateIndex
+
+        processor = DocumentProcessor(MagicMock())
+        processor._near_duplicates = NearDuplicateIndex()
+        processor._index_near_duplicate(SimpleNamespace(id=7), {
+            'extracted_text': self.TEXT,
+            'ki_result': {'sparte': 'sach', 'confidence': 'high', 'vu_name': 'Allianz',
+                          'document_name': 'Nachtrag'},
+        })
+        processor.openrouter = MagicMock()
+
+        result = processor._classify_sparte('x.pdf', SimpleNamespace(id=8),
+                                            self.TEXT + ' Datum 03.02.2025')
+        processor.openrouter.classify_sparte_with_date.assert_not_called()
+        assert result['sparte'] == 'sach' and result['_near_duplicate_of'] == 7
+        assert result['vu_name'] == 'Allianz' and result['document_name'] is None
+        assert result['document_date_iso'] == '2025-02-03'
+        assert processor._sparte_classification_source(result) == 'near_duplicate'
+        assert 'Beinahe-Duplikat von Dokument 7' in processor._near_duplicate_note(result)
+
+    def test_sparte_without_local_date_goes_to_ai(self):
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+        from services.document_processor import DocumentProcessor
+        from services.near_duplicate_index import NearDuplicateIndex
+
+        processor = DocumentProcessor(MagicMock())
+        processor._near_duplicates = NearDuplicateIndex()
+        processor._index_near_duplicate(SimpleNamespace(id=7), {
+            'extracted_text': self.TEXT,
+            'ki_result': {'sparte': 'sonstige', 'confidence': 'high', 'vu_name': 'Allianz',
+                          'document_name': 'Nachtrag'},
+        })
+        # Dateiname "<VU>_Sonstige_<Datum>" braucht das Datum des neuen Dokuments
+        assert processor._find_near_duplicate(SimpleNamespace(id=8), self.TEXT + ' Kopie') is None
+
+    def test_delete_and_move_drop_index_entries(self, monkeypatch):
+        from unittest.mock import MagicMock
+        from api.documents import DocumentsAPI
+        from services import near_duplicate_index
+        from services.near_duplicate_index import NearDuplicateIndex, simhash
+
+        index = NearDuplicateIndex()
+        for doc_id in (1, 2, 3, 4):
+            index.add(doc_id, simhash(f'Dokument {doc_id} ' + self.TEXT), {'sparte': 'sach'})
+        monkeypatch.setattr(near_duplicate_index, 'get_near_duplicate_index', lambda url: index)
+        client = MagicMock(base_url='https://example.invalid')
+        client.delete.return_value = {'success': True}
+        client.post.side_effect = lambda path, json_data: {
+            'success': True, 'data': {'deleted_count': 1, 'moved_count': 1}}
+        client.put.return_value = {'success': True}
+        api = DocumentsAPI(client)
+
+        api.delete(1)
+        api.delete_documents([2])
+        api.move_documents([3], 'leben')
+        api.update(4, original_filename='x.pdf')
+        assert len(index) == 1
+        api.update(4, box_type='kranken')
+        assert len(index) == 0
+
+    def test_upload_reports_near_duplicate(self, monkeypatch, tmp_path):
+        from unittest.mock import MagicMock
+        from services import near_duplicate_index
+        from services.early_text_extract import extract_and_save_text
+        from services.near_duplicate_index import NearDuplicateIndex, simhash
+
+        index = NearDuplicateIndex()
+        index.add(7, simhash(self.TEXT + ' Druckdatum 01.02.2025'), {'sparte': 'sach'})
+        monkeypatch.setattr(near_duplicate_index, 'get_near_duplicate_index', lambda url: index)
+        path = tmp_path / 'rescan.txt'
+        path.write_text(self.TEXT + ' Druckdatum 03.02.2025', encoding='utf-8')
+        docs_api = MagicMock()
+        docs_api.save_ai_data.return_value = {}
+
+        result = extract_and_save_text(docs_api, 8, str(path))
+        assert result['near_duplicate_of_id'] == 7
+        reason = docs_api.update.call_args.kwargs['classification_reason']
+        assert docs_api.update.call_args.args == (8,)
+        assert 'Beinahe-Duplikat von Dokument 7' in reason
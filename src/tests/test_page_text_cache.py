@@ -0,0 +1,82 @@
+"""
+Tests fuer den Seiten-Text-Cache (services/page_text_cache.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_page_text_cache.py -v
+"""
+
+import pytest
+
+
+class TestPageTextCache:
+    """Tests fuer services/page_text_cache."""
+
+    def test_lru_eviction_by_entries(self):
+        from services.page_text_cache import PageTextCache
+        cache = PageTextCache(max_entries=2, max_chars=1000)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        assert cache.get('a') == 'A'  # a ist jetzt zuletzt benutzt
+        cache.put('c', 'C')
+        assert cache.get('b') is None
+        assert cache.get('a') == 'A'
+        assert cache.get('c') == 'C'
+
+    def test_eviction_by_chars(self):
+        from services.page_text_cache import PageTextCache
+        cache = PageTextCache(max_entries=100, max_chars=10)
+        cache.put('a', 'x' * 6)
+        cache.put('b', 'y' * 6)
+        assert cache.get('a') is None
+        assert cache.stats()['chars'] == 6
+
+    def test_same_page_content_same_hash(self, make_pdf):
+        fitz = pytest.importorskip("fitz")
+        from services.page_text_cache import page_content_hash
+        p1 = make_pdf('a.pdf', ['Wohngebaeudeversicherung', 'Seite 2'])
+        p2 = make_pdf('b.pdf', ['Wohngebaeudeversicherung', 'Anders'])
+        d1, d2 = fitz.open(p1), fitz.open(p2)
+        try:
+            assert page_content_hash(d1[0]) == page_content_hash(d2[0])
+            assert page_content_hash(d1[1]) != page_content_hash(d2[1])
+        finally:
+            d1.close()
+            d2.close()
+
+    def test_form_xobject_content_changes_hash(self, make_pdf):
+        fitz = pytest.importorskip("fitz")
+        from services.page_text_cache import page_content_hash
+        source = fitz.open(make_pdf('src.pdf', ['Wohngebaeudeversicherung', 'Lebensversicherung']))
+
+        def compose(pages, nested=False):
+            doc = fitz.open()
+            for number in pages:
+                page = doc.new_page()
+                page.show_pdf_page(page.rect, source, number)
+            if not nested:
+                return doc
+            outer = fitz.open()
+            for number in range(len(doc)):
+                page = outer.new_page()
+                page.show_pdf_page(page.rect, doc, number)
+            return outer
+
+        try:
+            # Seiten-Content ist jeweils nur "zeichne Form X" -> Form-Inhalt entscheidet
+            for nested in (False, True):
+                doc = compose([0, 1], nested)
+                assert page_content_hash(doc[0]) != page_content_hash(doc[1])
+                assert page_content_hash(doc[0]) == page_content_hash(compose([0], nested)[0])
+        finally:
+            source.close()
+
+    def test_get_page_text_uses_cache(self, make_pdf):
+        fitz = pytest.importorskip("fitz")
+        from services.page_text_cache import PageTextCache, get_page_text
+        cache = PageTextCache()
+        path = make_pdf('a.pdf', ['Hausratversicherung'])
+        for _ in range(2):
+            doc = fitz.open(path)
+            assert 'Hausrat' in get_page_text(doc[0], cache)
+            doc.close()
+        assert cache.stats()['hits'] == 1
@@ -0,0 +1,100 @@
+"""
+Tests fuer den PDF-Viewer (ui/viewers/pdf_viewer.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_pdf_viewer.py -v
+"""
+
+import pytest
+
+
+class TestThumbnailWorker:
+    """Tests fuer den cache-gestuetzten _ThumbnailWorker."""
+
+    def test_worker_renders_once_then_uses_cache(self, tmp_path, monkeypatch):
+        fitz = pytest.importorskip('fitz')
+        from services import thumbnail_cache
+        from services.thumbnail_cache import ThumbnailCache
+        from ui.viewers.pdf_viewer import _ThumbnailWorker
+
+        pdf_path = str(tmp_path / 'doc.pdf')
+        pdf = fitz.open()
+        for _ in range(3):
+            pdf.new_page()
+        pdf.save(pdf_path)
+        pdf.close()
+        monkeypatch.setattr(thumbnail_cache, '_cache', ThumbnailCache(str(tmp_path / 'thumbs')))
+
+        def render(jobs, replace_with=None):
+            worker = _ThumbnailWorker(pdf_path, jobs, content_hash='c' * 64)
+            if replace_with is not None:
+                assert worker.set_jobs(replace_with)  # z.B. nach dem Scrollen
+            opened = []
+            original_open = worker._open_document
+            monkeypatch.setattr(worker, '_open_document', lambda: opened.append(1) or original_open())
+            ready = []
+            worker.thumbnail_ready.connect(lambda idx, origin, rot, img: ready.append((idx, img.width())))
+            worker.run()  # synchron im Test-Thread
+            assert worker.set_jobs([(0, 0, 0)]) is False
+            return ready, bool(opened)
+
+        ready, opened = render([(0, 0, 0)], replace_with=[(2, 2, 0), (0, 0, 0), (1, 1, 0)])
+        assert [idx for idx, _w in ready] == [2, 0, 1] and opened
+        assert all(width == 120 for _idx, width in ready)
+        # Nach dem Loeschen von Seite 0: Seiten wandern, Cache trifft ueber die Originalseite
+        ready, opened = render([(0, 1, 0), (1, 2, 0)])
+        assert [idx for idx, _w in ready] == [0, 1] and not opened
+
+    def test_worker_for_replaced_file_does_not_fill_cache(self, tmp_path, monkeypatch):
+        fitz = pytest.importorskip('fitz')
+        from services import thumbnail_cache
+        from services.thumbnail_cache import ThumbnailCache
+        from ui.viewers.pdf_viewer import _ThumbnailWorker
+
+        pdf_path = str(tmp_path / 'doc.pdf')
+        pdf = fitz.open()
+        pdf.new_page()
+        pdf.save(pdf_path)
+        pdf.close()
+        cache = ThumbnailCache(str(tmp_path / 'thumbs'))
+        monkeypatch.setattr(thumbnail_cache, '_cache', cache)
+
+        # Viewer arbeitet inzwischen auf einer neuen Temp-Datei (gedreht/geloescht)
+        worker = _ThumbnailWorker(pdf_path, [(0, 0, 0)], content_hash='c' * 64,
+                                  current_path=lambda: str(tmp_path / 'edit_b.pdf'))
+        ready = []
+        worker.thumbnail_ready.connect(lambda idx, origin, rot, img: ready.append(idx))
+        worker.run()
+        assert ready == [0]
+        assert cache.load('c' * 64, 0, 0, 120) is None
+
+
+class TestThumbnailWindow:
+    """Tests fuer PDFViewerDialog._update_thumbnail_window (Wiederverwendung des Workers)."""
+
+    def test_worker_reused_only_for_current_file(self, qapp, make_pdf, monkeypatch):
+        from unittest.mock import MagicMock
+        from ui.viewers.pdf_viewer import PDFViewerDialog
+
+        started = []
+        monkeypatch.setattr(PDFViewerDialog, '_start_thumbnail_worker',
+                            lambda self, jobs: started.append(jobs))
+        pdf = make_pdf('a.pdf', ['Seite 1', 'Seite 2'])
+        dialog = PDFViewerDialog(pdf, doc_id=1, docs_api=MagicMock(), editable=True)
+        started.clear()
+
+        worker = MagicMock()
+        worker.isRunning.return_value = True
+        worker.set_jobs.return_value = True
+        worker.pdf_path = pdf
+        dialog._thumb_worker = worker
+        dialog._update_thumbnail_window()
+        assert worker.set_jobs.called and started == []
+
+        # Nach Drehen/Loeschen: neue Temp-Datei -> neuer Worker statt set_jobs
+        worker.set_jobs.reset_mock()
+        dialog._temp_pdf_path = pdf + '.edit'
+        dialog._update_thumbnail_window()
+        assert not worker.set_jobs.called and len(started) == 1
+        dialog._thumb_worker = None
+        dialog.deleteLater()
@@ -0,0 +1,41 @@
+"""
+Tests fuer den Vorschau-Cache (services/preview_cache.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_preview_cache.py -v
+"""
+
+
+class TestPreviewCache:
+    """Tests fuer PreviewCache (Groessenlimit, LRU, Invalidierung)."""
+
+    @staticmethod
+    def _write(cache, doc_id, name, size):
+        path = cache.path_for(doc_id, name)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        return path
+
+    def test_lru_eviction_and_invalidation(self, tmp_path):
+        from services.preview_cache import PreviewCache
+        cache = PreviewCache(str(tmp_path), max_bytes=250)
+        for doc_id in (1, 2):
+            cache.add(self._write(cache, doc_id, 'a.pdf', 100))
+        assert cache.get(1, 'a.pdf')  # 1 ist jetzt juengster Zugriff
+        cache.add(self._write(cache, 3, 'a.pdf', 100))
+        assert cache.get(2, 'a.pdf') is None
+        assert cache.get(1, 'a.pdf') and cache.get(3, 'a.pdf')
+
+        # Zuletzt genutzte Datei wird nie verdraengt, auch wenn sie allein zu gross ist
+        cache.add(self._write(cache, 4, 'gross.pdf', 400))
+        assert cache.get_stats()['entries'] == 1
+        assert cache.get(4, 'gross.pdf')
+
+        cache.remove_document(4)
+        assert cache.get(4, 'gross.pdf') is None
+        assert list(tmp_path.iterdir()) == []
+
+        # Bestand wird beim Start eingelesen, Dateien ausserhalb ignoriert
+        self._write(cache, 5, 'b.pdf', 10)
+        cache.add(str(tmp_path.parent / 'fremd.pdf'))
+        assert PreviewCache(str(tmp_path)).get_stats()['total_bytes'] == 10
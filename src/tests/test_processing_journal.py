@@ -0,0 +1,184 @@
+"""
+Tests fuer das Verarbeitungs-Journal (services/processing_journal.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_processing_journal.py -v
+"""
+
+
+import pytest
+
+
+class TestProcessingJournal:
+    """Tests fuer services/processing_journal."""
+
+    @pytest.fixture(autouse=True)
+    def _no_keyring(self, no_keyring):
+        pass
+
+    def test_reload_ignores_torn_last_line(self, tmp_path):
+        from services.processing_journal import (
+            ProcessingJournal, STAGE_STARTED, STAGE_CLASSIFIED
+        )
+        path = tmp_path / 'journal.jsonl'
+        journal = ProcessingJournal(str(path), fsync=False)
+        journal.record(1, STAGE_STARTED, content_hash='abc')
+        journal.record(1, STAGE_CLASSIFIED, outcome={'target_box': 'sach'})
+        journal.record(2, STAGE_STARTED, content_hash='def')
+        journal.complete(2)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"doc": 3, "stage": "sta')
+
+        reloaded = ProcessingJournal(str(path), fsync=False)
+        assert reloaded.pending_ids() == [1]
+        entry = reloaded.get(1, content_hash='abc')
+        assert entry.has(STAGE_CLASSIFIED)
+        assert entry.data['outcome']['target_box'] == 'sach'
+        # Neuer Inhalt -> Eintrag verworfen
+        assert reloaded.get(1, content_hash='anders') is None
+        assert reloaded.pending_ids() == []
+
+    def test_payload_is_encrypted_on_disk(self, tmp_path):
+        from services.processing_journal import ProcessingJournal, STAGE_CLASSIFIED
+        path = tmp_path / 'journal.jsonl'
+        journal = ProcessingJournal(str(path))
+        journal.record(1, STAGE_CLASSIFIED, outcome={
+            'extracted_text': 'Max Mustermann IBAN DE02', 'ki_result': {'_prompt_text': 'Prompt'},
+        })
+        journal.compact()
+        journal.record(2, STAGE_CLASSIFIED, outcome={'extracted_text': 'Erika Musterfrau'})
+        raw = path.read_text(encoding='utf-8')
+        assert 'Mustermann' not in raw and 'Musterfrau' not in raw and 'Prompt' not in raw
+        reloaded = ProcessingJournal(str(path))
+        assert reloaded.get(1).data['outcome']['extracted_text'] == 'Max Mustermann IBAN DE02'
+        assert reloaded.get(2).data['outcome']['extracted_text'] == 'Erika Musterfrau'
+
+    def test_without_key_only_ids_and_hashes_are_written(self, tmp_path):
+        from services.processing_journal import (
+            ProcessingJournal, STAGE_STARTED, STAGE_CLASSIFIED
+        )
+        path = tmp_path / 'journal.jsonl'
+        journal = ProcessingJournal(str(path), fsync=False, encrypt=False)
+        journal.record(1, STAGE_STARTED, content_hash='abc')
+        journal.record(1, STAGE_CLASSIFIED, outcome={'extracted_text': 'Max Mustermann'})
+        assert 'Mustermann' not in path.read_text(encoding='utf-8')
+        entry = ProcessingJournal(str(path), fsync=False, encrypt=False).get(1)
+        assert entry.data == {'content_hash': 'abc'}
+        assert not entry.data.get('outcome')
+
+    def test_concurrent_records_share_fsyncs(self, tmp_path, monkeypatch):
+        import os
+        import threading
+        import time
+        from services import processing_journal
+        from services.processing_journal import ProcessingJournal, STAGE_STARTED
+        syncs = []
+        real_fsync = os.fsync
+
+        def slow_fsync(fd):
+            syncs.append(fd)
+            time.sleep(0.02)
+            real_fsync(fd)
+
+        monkeypatch.setattr(processing_journal.os, 'fsync', slow_fsync)
+        journal = ProcessingJournal(str(tmp_path / 'journal.jsonl'))
+        threads = [threading.Thread(target=journal.record, args=(i, STAGE_STARTED))
+                   for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        journal.close()
+        assert sorted(journal.pending_ids()) == list(range(20))
+        assert 1 <= len(syncs) < 20
+        assert sorted(ProcessingJournal(str(tmp_path / 'journal.jsonl')).pending_ids()) == list(range(20))
+
+    def test_compact_keeps_open_entries(self, tmp_path):
+        from services.processing_journal import ProcessingJournal, STAGE_STARTED
+        path = tmp_path / 'journal.jsonl'
+        journal = ProcessingJournal(str(path), fsync=False)
+        for doc_id in range(10):
+            journal.record(doc_id, STAGE_STARTED, content_hash=str(doc_id))
+            if doc_id != 7:
+                journal.complete(doc_id)
+        journal.compact()
+        assert len(path.read_text(encoding='utf-8').splitlines()) == 1
+        assert ProcessingJournal(str(path), fsync=False).get(7).data['content_hash'] == '7'
+
+    def test_resume_skips_classification_and_done_stages(self, tmp_path):
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+        from services.document_processor import DocumentProcessor
+        from services.processing_journal import ProcessingJournal, STAGE_STARTED, STAGE_CLASSIFIED
+        journal = ProcessingJournal(str(tmp_path / 'journal.jsonl'), fsync=False)
+        journal.record(5, STAGE_STARTED, content_hash='h5')
+        journal.record(5, STAGE_CLASSIFIED, outcome={
+            'target_box': 'sach', 'category': 'sach', 'new_filename': 'Allianz_Sach.pdf',
+            'classification_source': 'ki_gpt4o', 'extracted_text': 'Text',
+            'page_count': 1, 'ki_result': {'sparte': 'sach'}, 'cost_usd': 0.002,
+        })
+
+        processor = DocumentProcessor(MagicMock())
+        processor._journal = journal
+        processor.docs_api = MagicMock()
+        processor._write_batcher._docs_api = processor.docs_api
+        processor.docs_api.get_document.return_value = None
+        processor._persist_ai_data = MagicMock()
+        processor._apply_document_rules = MagicMock()
+        processor._log_history = MagicMock()
+        processor._get_openrouter = MagicMock(side_effect=AssertionError('keine KI beim Fortsetzen'))
+
+        doc = SimpleNamespace(id=5, original_filename='scan.pdf', processing_status='classified',
+                              box_type='verarbeitung', content_hash='h5')
+        # Fehlgeschlagenes Update: nichts als erledigt vermerken, spaeter erneut
+        processor.docs_api.update.return_value = False
+        result = processor._process_document(doc)
+        assert not result.success and result.target_box == 'verarbeitung'
+        processor._persist_ai_data.assert_not_called()
+        assert journal.pending_ids() == [5] and journal.get(5).stages == ['started', 'classified']
+
+        processor.docs_api.update.return_value = True
+        result = processor._process_document(doc)
+        assert result.success and result.target_box == 'sach'
+        assert result.cost_usd == 0.0
+        kwargs = processor.docs_api.update.call_args.kwargs
+        assert (kwargs['box_type'], kwargs['original_filename'], kwargs['processing_status']) == (
+            'sach', 'Allianz_Sach.pdf', 'archived')
+        processor._persist_ai_data.assert_called_once_with(doc, 'Text', 1, {'sparte': 'sach'})
+        assert journal.pending_ids() == []
+
+    def test_interrupted_documents_resume_only_in_processing_boxes(self, tmp_path):
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+        from services.document_processor import DocumentProcessor
+        from services.processing_journal import (
+            ProcessingJournal, STAGE_STARTED, STAGE_CLASSIFIED, STAGE_ARCHIVED
+        )
+        journal = ProcessingJournal(str(tmp_path / 'journal.jsonl'), fsync=False)
+        # 1: archiviert; 2: nur gestartet, manuell verschoben; 4: klassifiziert,
+        # danach manuell verschoben (Fortsetzen wuerde die Verschiebung ueberschreiben)
+        journal.record(1, STAGE_STARTED, content_hash='h1')
+        journal.record(1, STAGE_CLASSIFIED, outcome={'target_box': 'sach'})
+        journal.record(1, STAGE_ARCHIVED)
+        journal.record(2, STAGE_STARTED, content_hash='h2')
+        journal.record(3, STAGE_STARTED, content_hash='h3')
+        journal.record(4, STAGE_STARTED, content_hash='h4')
+        journal.record(4, STAGE_CLASSIFIED, outcome={'target_box': 'sach'})
+        journal.record(5, STAGE_STARTED, content_hash='h5')
+        journal.record(5, STAGE_CLASSIFIED, outcome={'target_box': 'sach'})
+
+        docs = {
+            1: SimpleNamespace(id=1, box_type='sach', processing_status='archived', content_hash='h1'),
+            2: SimpleNamespace(id=2, box_type='leben', processing_status='archived', content_hash='h2'),
+            3: SimpleNamespace(id=3, box_type='verarbeitung', processing_status='processing', content_hash='h3'),
+            4: SimpleNamespace(id=4, box_type='leben', processing_status='archived', content_hash='h4'),
+            5: SimpleNamespace(id=5, box_type='verarbeitung', processing_status='classified', content_hash='h5'),
+        }
+        processor = DocumentProcessor(MagicMock())
+        processor._journal = journal
+        processor.docs_api = MagicMock()
+        processor.docs_api.get_document.side_effect = docs.get
+
+        resumed = processor._collect_interrupted_documents(set())
+        assert [d.id for d in resumed] == [3, 5]
+        assert sorted(journal.pending_ids()) == [3, 5]
@@ -0,0 +1,66 @@
+"""
+Tests fuer den Lane-Scheduler der Eingangsbox (services/processing_scheduler.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_processing_scheduler.py -v
+"""
+
+import os
+
+
+class TestProcessingScheduler:
+    """Tests fuer services/processing_scheduler."""
+
+    @staticmethod
+    def _doc(name, size, bipro=None, pages=None, source='manual_upload'):
+        from types import SimpleNamespace
+        ext = os.path.splitext(name)[1].lower()
+        return SimpleNamespace(
+            original_filename=name, file_size=size, file_extension=ext,
+            bipro_category=bipro, total_page_count=pages, source_type=source,
+            is_gdv=False, is_pdf=ext == '.pdf',
+        )
+
+    def test_estimates_route_to_lanes(self):
+        from services.processing_scheduler import (
+            estimate_document_cost, LANE_FAST, LANE_TEXT_AI, LANE_VISION
+        )
+        assert estimate_document_cost(self._doc('Lieferung_Roh_1.xml', 5000), is_xml_raw=True).lane == LANE_FAST
+        assert estimate_document_cost(self._doc('a.pdf', 90000, bipro='999010010')).lane == LANE_FAST
+        assert estimate_document_cost(self._doc('a.pdf', 90000), is_cached=True).lane == LANE_FAST
+        assert estimate_document_cost(self._doc('liste.xlsx', 20000)).lane == LANE_TEXT_AI
+        assert estimate_document_cost(self._doc('brief.pdf', 120000, pages=3)).lane == LANE_TEXT_AI
+        scan = estimate_document_cost(self._doc('scan.pdf', 24 * 1024 * 1024, pages=80))
+        assert scan.lane == LANE_VISION
+        assert scan.estimated_pages == 80
+        assert estimate_document_cost(self._doc('x.pdf', 100000, source='scan')).lane == LANE_VISION
+
+    def test_plan_orders_cheapest_first_within_lane(self):
+        from services.processing_scheduler import estimate_document_cost, plan_lanes, LANE_TEXT_AI
+        docs = [self._doc('gross.pdf', 2_000_000, pages=40), self._doc('klein.pdf', 50_000, pages=1)]
+        lanes = plan_lanes([(d, estimate_document_cost(d)) for d in docs])
+        assert [d.original_filename for d, _ in lanes[LANE_TEXT_AI]] == ['klein.pdf', 'gross.pdf']
+
+    def test_max_workers_caps_total_across_lanes(self):
+        from services.processing_scheduler import DEFAULT_LANE_WORKERS, allocate_lane_workers
+        lanes = ['fast', 'text_ai', 'vision']
+        allocated = allocate_lane_workers(DEFAULT_LANE_WORKERS, lanes, 8)
+        assert sum(allocated.values()) == 8
+        assert allocated == {'fast': 2, 'text_ai': 4, 'vision': 2}
+        # Reicht das Budget, bleibt die Aufteilung; leere Lanes bekommen nichts
+        assert allocate_lane_workers(DEFAULT_LANE_WORKERS, lanes, 20) == DEFAULT_LANE_WORKERS
+        assert allocate_lane_workers(DEFAULT_LANE_WORKERS, ['vision'], 8) == {'vision': 3}
+        assert allocate_lane_workers(DEFAULT_LANE_WORKERS, lanes, 1) == {
+            'fast': 1, 'text_ai': 1, 'vision': 1}
+
+    def test_run_timing_per_lane(self):
+        from services.processing_scheduler import RunTiming
+        timing = RunTiming()
+        assert timing.time_to_first_result is None
+        timing.start()
+        timing.record('fast')
+        timing.record('vision')
+        timing.record('fast')
+        stats = timing.lane_stats({'fast': 4, 'vision': 3})
+        assert stats['fast']['documents'] == 2 and stats['vision']['workers'] == 3
+        assert timing.time_to_first_result <= timing.time_to_last_result
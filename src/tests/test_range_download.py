@@ -0,0 +1,141 @@
+"""
+Tests fuer fortsetzbare Downloads (api/range_download.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_range_download.py -v
+"""
+
+import os
+
+import pytest
+
+
+class _FakeRangeServer:
+    """Liefert payload mit Range-Unterstuetzung; optional Abbruch nach n Bytes."""
+
+    def __init__(self, payload, accept_ranges=True, fail_after=None):
+        self.payload = payload
+        self.accept_ranges = accept_ranges
+        self.fail_after = fail_after
+        self.requests = []
+
+    def __call__(self, method, url, headers):
+        import io
+        import re
+        from unittest.mock import MagicMock
+        self.requests.append(dict(headers))
+        body, status = self.payload, 200
+        response_headers = {'Content-Length': str(len(self.payload)), 'ETag': '"v1"'}
+        match = re.match(r'bytes=(\d+)-(\d*)', headers.get('Range', ''))
+        if match and self.accept_ranges:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(self.payload) - 1
+            body, status = self.payload[start:end + 1], 206
+            response_headers['Content-Range'] = f'bytes {start}-{end}/{len(self.payload)}'
+        if self.accept_ranges:
+            response_headers['Accept-Ranges'] = 'bytes'
+        stream = io.BytesIO(body)
+        fail_after, self.fail_after = self.fail_after, None
+
+        def read(size, decode_content=True):
+            if fail_after is not None and stream.tell() >= fail_after:
+                raise ConnectionError('reset')
+            return stream.read(size if fail_after is None else min(size, fail_after - stream.tell()))
+
+        response = MagicMock(status_code=status, headers=response_headers)
+        response.raw.read.side_effect = read
+        return response
+
+
+class TestRangeDownload:
+    """Tests fuer RangeDownloader (Fortsetzen, Fallback, Pruefung, Segmente)."""
+
+    @pytest.fixture(autouse=True)
+    def _no_backoff(self, monkeypatch, tmp_path):
+        import api.range_download as range_download
+        monkeypatch.setattr(range_download, 'RESUME_BACKOFF_S', 0)
+        part_dir = tmp_path / 'parts'
+        part_dir.mkdir()
+        monkeypatch.setattr(range_download, 'get_part_dir', lambda: part_dir)
+        self.part_dir = part_dir
+
+    def test_resumes_after_connection_drop(self, tmp_path):
+        import hashlib
+        from api.range_download import RangeDownloader
+        payload = os.urandom(500_000)
+        server = _FakeRangeServer(payload, fail_after=200_000)
+        progress = []
+        target = str(tmp_path / 'a.pdf')
+        size = RangeDownloader(server, progress_callback=lambda d, t: progress.append((d, t))).download(
+            'http://test/documents/1', target, {},
+            expected_size=len(payload), expected_sha256=hashlib.sha256(payload).hexdigest())
+        assert size == len(payload)
+        assert open(target, 'rb').read() == payload
+        assert server.requests[1]['Range'] == 'bytes=200000-' and server.requests[1]['If-Range'] == '"v1"'
+        assert progress[-1] == (len(payload), len(payload))
+        assert sorted(os.listdir(tmp_path)) == ['a.pdf', 'parts'] and not os.listdir(self.part_dir)
+
+    def test_server_without_range_restarts(self, tmp_path):
+        from api.range_download import RangeDownloader
+        payload = os.urandom(100_000)
+        target = str(tmp_path / 'a.pdf')
+        downloader = RangeDownloader(_FakeRangeServer(payload, accept_ranges=False))
+        part_path, meta_path = downloader._part_paths('http://test/documents/1', target)
+        with open(part_path, 'wb') as f:
+            f.write(b'stale' * 1000)
+        with open(meta_path, 'w') as f:
+            f.write('{"url": "http://test/documents/1", "etag": "\\"v0\\"", "total": 100000}')
+        server = _FakeRangeServer(payload, accept_ranges=False)
+        RangeDownloader(server).download('http://test/documents/1', target, {})
+        assert open(target, 'rb').read() == payload
+        assert server.requests[0]['Range'] == 'bytes=5000-'
+
+    def test_size_mismatch_raises(self, tmp_path):
+        from api.range_download import DownloadError, RangeDownloader
+        target = str(tmp_path / 'a.pdf')
+        with pytest.raises(DownloadError):
+            RangeDownloader(_FakeRangeServer(b'abc' * 1000)).download(
+                'http://test/documents/1', target, {}, expected_size=4000)
+        assert os.listdir(tmp_path) == ['parts'] and not os.listdir(self.part_dir)
+
+    def test_sha_mismatch_is_logged_without_second_download(self, tmp_path, caplog):
+        import io
+        from api.range_download import RangeDownloader
+        payload = os.urandom(50_000)
+        server = _FakeRangeServer(payload)
+        target = str(tmp_path / 'a.pdf')
+        RangeDownloader(server).download('http://test/documents/1', target, {},
+                                         expected_sha256='0' * 64)
+        assert open(target, 'rb').read() == payload and len(server.requests) == 1
+        buffer = io.BytesIO()
+        RangeDownloader(server).download_to_fileobj('http://test/documents/1', buffer, {},
+                                                    expected_sha256='0' * 64)
+        assert buffer.getvalue() == payload and len(server.requests) == 2
+        assert sum('SHA256 stimmt nicht' in r.message for r in caplog.records) == 2
+
+    def test_parallel_segments(self, tmp_path):
+        from api.range_download import RangeDownloader
+        payload = os.urandom(1_000_003)
+        server = _FakeRangeServer(payload)
+        target = str(tmp_path / 'big.pdf')
+        RangeDownloader(server, parallel_min_bytes=1000, parallel_segments=4).download(
+            'http://test/documents/1', target, {})
+        assert open(target, 'rb').read() == payload
+        assert sorted(r['Range'] for r in server.requests[1:])[0] == 'bytes=0-250000'
+        assert len(server.requests) == 5
+
+    def test_download_to_fileobj_resumes_and_verifies(self):
+        import hashlib
+        import io
+        from api.range_download import DownloadError, RangeDownloader
+        payload = os.urandom(300_000)
+        server = _FakeRangeServer(payload, fail_after=100_000)
+        buffer = io.BytesIO(b'alt')
+        size = RangeDownloader(server).download_to_fileobj(
+            'http://test/documents/1', buffer, {},
+            expected_sha256=hashlib.sha256(payload).hexdigest())
+        assert size == len(payload) and buffer.getvalue() == payload
+        assert server.requests[1]['Range'] == 'bytes=100000-'
+        with pytest.raises(DownloadError):
+            RangeDownloader(_FakeRangeServer(payload)).download_to_fileobj(
+                'http://test/documents/1', io.BytesIO(), {}, expected_size=1)
@@ -0,0 +1,134 @@
+"""
+Tests fuer das Buendeln von KI-Requests (api/openrouter/batching.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_request_batching.py -v
+"""
+
+import pytest
+
+
+class TestRequestBatcher:
+    """Tests fuer api/openrouter/batching."""
+
+    def _run_parallel(self, batcher, payloads, run_single, run_batch):
+        import threading
+        results = {}
+
+        def worker(p):
+            results[p] = batcher.submit('k', p, run_single, run_batch)
+
+        threads = [threading.Thread(target=worker, args=(p,)) for p in payloads]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        return results
+
+    def test_concurrent_calls_share_one_batch(self):
+        from api.openrouter.batching import RequestBatcher
+        batcher = RequestBatcher(window_s=0.5, max_batch_size=4)
+        batch_calls = []
+
+        def run_batch(payloads):
+            batch_calls.append(list(payloads))
+            return [p.upper() for p in payloads]
+
+        results = self._run_parallel(batcher, ['a', 'b', 'c', 'd'],
+                                     lambda p: 'single', run_batch)
+        assert results == {'a': 'A', 'b': 'B', 'c': 'C', 'd': 'D'}
+        assert len(batch_calls) == 1
+        assert batcher.get_stats()['batched_documents'] == 4
+
+    def test_missing_entries_fall_back_to_single(self):
+        from api.openrouter.batching import RequestBatcher
+        batcher = RequestBatcher(window_s=0.5, max_batch_size=3)
+
+        def run_batch(payloads):
+            return [None if p == 'b' else p.upper() for p in payloads]
+
+        results = self._run_parallel(batcher, ['a', 'b', 'c'],
+                                     lambda p: f'single-{p}', run_batch)
+        assert results['b'] == 'single-b'
+        assert results['a'] == 'A'
+        assert batcher.get_stats()['fallback_documents'] == 1
+
+    def test_fallbacks_run_in_caller_threads(self):
+        import threading
+        import time
+        from api.openrouter.batching import RequestBatcher
+        batcher = RequestBatcher(window_s=0.2, max_batch_size=3)
+        single_threads = set()
+
+        def run_single(p):
+            single_threads.add(threading.get_ident())
+            time.sleep(0.3)
+            return f'single-{p}'
+
+        start = time.monotonic()
+        results = self._run_parallel(batcher, ['a', 'b', 'c'], run_single,
+                                     lambda payloads: [None] * len(payloads))
+        elapsed = time.monotonic() - start
+        assert results == {'a': 'single-a', 'b': 'single-b', 'c': 'single-c'}
+        assert len(single_threads) == 3
+        # Parallel statt nacheinander im Leader (3 x 0.3s)
+        assert elapsed < 0.8
+        assert batcher.get_stats()['fallback_documents'] == 3
+
+    def test_parse_batch_results_by_index(self):
+        from api.openrouter.batching import parse_batch_results
+        data = {'results': [
+            {'index': 2, 'sparte': 'leben'},
+            {'index': 1, 'sparte': 'sach'},
+            {'index': 9, 'sparte': 'sach'},
+        ]}
+        parsed = parse_batch_results(data, 3, 'sparte')
+        assert parsed[0] == {'sparte': 'sach'}
+        assert parsed[1] == {'sparte': 'leben'}
+        assert parsed[2] is None
+        assert parse_batch_results(None, 2, 'sparte') == [None, None]
+
+    def test_sparte_batch_splits_costs(self):
+        import json
+        from api.openrouter.classification import OpenRouterClassificationMixin
+
+        class _Fake(OpenRouterClassificationMixin):
+            _cost_calculator = None
+            _request_batcher = None
+
+            def _openrouter_request(self, messages, **kwargs):
+                return {
+                    'choices': [{'message': {'content': json.dumps({'results': [
+                        {'index': 1, 'sparte': 'sach', 'confidence': 'high',
+                         'document_date_iso': None, 'vu_name': 'A'},
+                        {'index': 2, 'sparte': 'leben', 'confidence': 'high',
+                         'document_date_iso': None, 'vu_name': 'B'},
+                    ]})}}],
+                    'usage': {'prompt_tokens': 300, 'completion_tokens': 60, 'total_tokens': 360},
+                    '_cost': {'real_cost_usd': 0.003, 'provider': 'openrouter'},
+                }
+
+        results = _Fake()._classify_sparte_batch(['x' * 100, 'y' * 200], 'm', None, None)
+        assert [r['sparte'] for r in results] == ['sach', 'leben']
+        assert results[0]['_server_cost_usd'] == pytest.approx(0.001)
+        assert results[1]['_usage']['total_tokens'] == 240
+        # Pro Dokument nur der eigene Anteil von Prompt und Antwort
+        assert 'y' * 200 not in results[0]['_prompt_text']
+        assert 'x' * 100 in results[0]['_prompt_text']
+        assert '"leben"' not in results[0]['_raw_response']
+        assert results[0]['_batch_id'] == results[1]['_batch_id']
+        assert results[0]['_batch_id'] in results[1]['_prompt_text']
+
+    def test_batching_only_when_enabled(self):
+        from unittest.mock import MagicMock
+        from api.openrouter.client import OpenRouterClient
+        client = OpenRouterClient(MagicMock())
+        client._triage_single = MagicMock(return_value={'category': 'sonstige'})
+        # Einzelverarbeitung: kein Sammelfenster
+        assert client.triage_document('x' * 100) == {'category': 'sonstige'}
+        assert client.get_batching_stats() is None
+        client.set_request_batching(True)
+        client.triage_document('x' * 100)
+        assert client.get_batching_stats()['single_documents'] == 1
+        client.set_request_batching(False)
+        assert client._request_batcher is None
@@ -0,0 +1,113 @@
+"""
+Tests fuer den lokalen Suchindex des ATLAS Index (services/search_index.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_search_index.py -v
+"""
+
+import pytest
+
+
+class TestLocalSearchIndex:
+    """Tests fuer LocalSearchIndex (SQLite FTS5)."""
+
+    @pytest.fixture
+    def index(self):
+        from services.search_index import LocalSearchIndex
+        index = LocalSearchIndex(':memory:')
+        yield index
+        index.close()
+
+    def test_search_modes_and_raw_filter(self, index, make_document):
+        index.sync_documents([make_document(1, 'sach', name='Haftpflicht_Allianz.pdf'),
+                              make_document(2, 'sach', name='Privathaftpflicht.pdf'),
+                              make_document(3, 'roh', name='Haftpflicht.xml')])
+        assert index.search('haftpflicht') == [1]
+        assert index.search('haftpflicht', substring=True) == [2, 1]
+        assert index.search('haftpflicht', substring=True, include_raw=True) == [3, 2, 1]
+        assert index.search('allianz haft') == [1]
+        assert index.search('"OR') == []
+
+    def test_incremental_sync(self, index, make_document):
+        index.sync_documents([make_document(1, 'sach', name='Alt.pdf'), make_document(2, 'sach')])
+        assert len(index) == 2
+        assert index.sync_documents([make_document(1, 'sach', name='Neu.pdf')]) == 2
+        assert index.search('Neu.pdf') == [1]
+        assert index.search('Alt') == []
+        assert len(index) == 1
+
+    def test_old_schema_with_texts_is_discarded(self, tmp_path, make_document):
+        import sqlite3
+        from services.search_index import LocalSearchIndex
+        path = str(tmp_path / 'index.sqlite3')
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+        conn.execute("INSERT INTO meta VALUES ('schema', '2')")
+        conn.execute('CREATE VIRTUAL TABLE fts USING fts5(filename, content)')
+        conn.execute("INSERT INTO fts (rowid, filename, content) VALUES (1, 'a.pdf', 'Mustermann')")
+        conn.commit()
+        conn.close()
+
+        index = LocalSearchIndex(path)
+        index.sync_documents([make_document(1, 'sach', name='a.pdf')])
+        assert index.search('Mustermann') == []
+        index.close()
+        assert b'Mustermann' not in open(path, 'rb').read()
+
+    def test_local_index_query_is_interrupted(self, index, make_document):
+        import threading
+        index.sync_documents([make_document(i, 'sach', name=f'Police_{i}.pdf')
+                              for i in range(1, 501)])
+        cancel_event = threading.Event()
+        assert len(index.search('Police', cancel_event=cancel_event)) == 200
+        cancel_event.set()
+        assert index.search('Police', cancel_event=cancel_event) == []
+        assert index.search('Police', substring=True, cancel_event=cancel_event) == []
+
+class TestOfflineSearch:
+    """Tests fuer die Offline-Suche im DocumentRepository."""
+
+    @pytest.fixture
+    def repo(self, monkeypatch, make_document):
+        from unittest.mock import MagicMock
+        from services import search_index
+        from infrastructure.archive.document_repository import DocumentRepository
+        import services.data_cache as data_cache_module
+        index = search_index.LocalSearchIndex(':memory:')
+        index.sync_documents([make_document(1, 'sach', name='Police_Haftpflicht.pdf')])
+        monkeypatch.setattr(search_index, 'get_local_search_index', lambda url: index)
+        cache = MagicMock()
+        cache.get_documents_by_ids.side_effect = lambda ids: [
+            make_document(i, 'sach', name='Police_Haftpflicht.pdf') for i in ids]
+        monkeypatch.setattr(data_cache_module, 'get_cache_service', lambda client: cache)
+        client = MagicMock(base_url='https://example.invalid')
+        repo = DocumentRepository(client)
+        yield repo
+        index.close()
+
+    def test_server_results_are_used_online(self, repo):
+        repo._client.get.return_value = {'success': True, 'data': {'documents': []}}
+        assert repo.search_documents('Haftpflicht') == []
+        repo._client.check_connection.assert_not_called()
+
+    def test_offline_only_on_connection_error(self, repo):
+        from api.client import APIError
+        repo._client.get.side_effect = APIError('Netzwerkfehler: timeout')
+        results = repo.search_documents('Haftpflicht')
+        assert [(r.document.id, r.offline) for r in results] == [(1, True)]
+
+        repo._client.get.side_effect = APIError('Serverfehler', status_code=500)
+        with pytest.raises(APIError):
+            repo.search_documents('Haftpflicht')
+
+    def test_cancelled_search_does_not_fall_back(self, repo):
+        import threading
+        from api.client import APIError
+        cancel_event = threading.Event()
+
+        def cancelled_request(*args, **kwargs):
+            cancel_event.set()
+            raise APIError('Netzwerkfehler: Verbindung geschlossen')
+
+        repo._client.get.side_effect = cancelled_request
+        assert repo.search_documents('Haftpflicht', cancel_event=cancel_event) == []
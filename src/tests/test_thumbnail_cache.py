@@ -0,0 +1,27 @@
+"""
+Tests fuer den Thumbnail-Cache des PDF-Viewers (services/thumbnail_cache.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_thumbnail_cache.py -v
+"""
+
+import os
+
+
+class TestThumbnailCache:
+    """Tests fuer ThumbnailCache (Ablage, Schluessel, Verdraengung)."""
+
+    def test_store_load_and_prune(self, tmp_path):
+        from services.thumbnail_cache import ThumbnailCache
+        cache = ThumbnailCache(str(tmp_path), max_bytes=150)
+        assert cache.store('a' * 64, 0, 90, 120, b'x' * 100)
+        assert cache.load('a' * 64, 0, 90, 120) == b'x' * 100
+        assert cache.load('a' * 64, 0, 450, 120) == b'x' * 100  # Drehung modulo 360
+        assert cache.load('a' * 64, 0, 0, 120) is None
+        assert cache.store('../etc', 0, 0, 120, b'x') is False
+
+        os.utime(tmp_path / 'aa' / ('a' * 64), (1, 1))  # aelter
+        cache.store('b' * 64, 0, 0, 120, b'y' * 100)
+        cache.prune()
+        assert cache.load('a' * 64, 0, 90, 120) is None
+        assert cache.load('b' * 64, 0, 0, 120) == b'y' * 100
@@ -0,0 +1,40 @@
+"""
+Tests fuer den verschluesselten Warm-Start-Cache (services/warm_cache.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_warm_cache.py -v
+"""
+
+import sys
+
+import pytest
+
+
+class TestArchiveWarmCache:
+    """Tests fuer den verschluesselten Warm-Start-Cache."""
+
+    @pytest.fixture(autouse=True)
+    def no_keyring(self, monkeypatch):
+        # Kein echter Schluesselbund im Test -> Schluesseldatei im tmp-Verzeichnis
+        monkeypatch.setitem(sys.modules, 'keyring', None)
+
+    def test_roundtrip_encrypted_and_scoped(self, tmp_path, make_document):
+        from datetime import datetime, timedelta
+        from api.documents import BoxStats
+        from services.warm_cache import ArchiveWarmCache
+        docs = [make_document(1, 'sach', name='Vertrag Müller.pdf'), make_document(2, 'gdv', archived=True)]
+        cache = ArchiveWarmCache('https://srv', 'anna', cache_dir=str(tmp_path))
+        synced = datetime(2026, 1, 2, 3, 4, 5)
+        assert cache.save(docs, cursor='c7', last_full_sync=synced, complete=True,
+                          stats=BoxStats(sach=1, gdv_archived=1, total=2))
+        assert b'Vertrag' not in cache.path.read_bytes()
+
+        state = cache.load(max_age=timedelta(hours=1))
+        assert state['documents'] == docs
+        assert state['documents'][0].box_type is docs[0].box_type
+        assert (state['cursor'], state['last_full_sync'], state['complete']) == ('c7', synced, True)
+        assert state['stats'].gdv_archived == 1
+
+        assert ArchiveWarmCache('https://srv', 'bernd', cache_dir=str(tmp_path)).load() is None
+        cache.path.write_bytes(cache.path.read_bytes()[:-4] + b'AAAA')
+        assert cache.load() is None and not cache.path.exists()
@@ -0,0 +1,105 @@
+"""
+Tests fuer gebuendelte Schreibzugriffe (services/write_batcher.py).
+
+Ausfuehrung:
+    python -m pytest src/tests/test_write_batcher.py -v
+"""
+
+
+class TestDocumentWriteBatcher:
+    """Tests fuer services/write_batcher."""
+
+    def test_claims_coalesce_and_history_is_deferred(self):
+        from unittest.mock import MagicMock
+        from api.processing_history import ProcessingHistoryAPI
+        from services.write_batcher import DocumentWriteBatcher
+        docs_api = MagicMock()
+        history_api = MagicMock()
+        history_api.build_payload.side_effect = ProcessingHistoryAPI.build_payload
+        batcher = DocumentWriteBatcher(docs_api, history_api, claim_linger_s=60)
+
+        batcher.claim(1)
+        batcher.claim(2)
+        for doc_id in (1, 2):
+            batcher.log_history(doc_id, 'start_processing', 'processing')
+        batcher.update(1, box_type='sach', processing_status='archived')
+        batcher.flush()
+
+        docs_api.update.assert_called_once_with(1, box_type='sach', processing_status='archived')
+        docs_api.move_documents.assert_called_once_with([2], 'verarbeitung', processing_status='processing')
+        # Ohne abschliessenden Schritt erst mit flush() gesendet
+        sent = [c.args[0]['document_id'] for c in history_api.create_from_payload.call_args_list]
+        assert sorted(sent) == [1, 2]
+        stats = batcher.get_stats()
+        assert stats['claims_coalesced'] == 1 and stats['history_requests'] == 2
+        batcher.close()
+
+    def test_history_steps_merge_into_one_entry(self):
+        from unittest.mock import MagicMock
+        from api.processing_history import ProcessingHistoryAPI
+        from services.write_batcher import DocumentWriteBatcher
+        history_api = MagicMock()
+        history_api.build_payload.side_effect = ProcessingHistoryAPI.build_payload
+        batcher = DocumentWriteBatcher(MagicMock(), history_api, history_max_delay_s=60)
+
+        batcher.log_history(7, 'start_processing', 'processing', previous_status='pending',
+                            action_details={'source_box': 'eingang'})
+        batcher.log_history(7, 'classify', 'classified', previous_status='processing',
+                            classification_source='ki_gpt4o', classification_result='sach',
+                            duration_ms=1200)
+        batcher.log_history(7, 'archive', 'archived', previous_status='classified',
+                            action_details={'final_box': 'sach'})
+        batcher.flush()
+
+        history_api.create_from_payload.assert_called_once()
+        entry = history_api.create_from_payload.call_args.args[0]
+        assert (entry['action'], entry['new_status'], entry['previous_status']) == (
+            'archive', 'archived', 'pending')
+        assert entry['classification_source'] == 'ki_gpt4o' and entry['duration_ms'] == 1200
+        assert entry['action_details']['final_box'] == 'sach'
+        assert [step['action'] for step in entry['action_details']['steps']] == [
+            'start_processing', 'classify', 'archive']
+        stats = batcher.get_stats()
+        assert stats['history_entries'] == 3 and stats['history_requests'] == 1
+        batcher.close()
+
+    def test_requests_per_document_reduced(self, tmp_path):
+        import json
+        from unittest.mock import MagicMock
+        from api.client import APIClient, APIConfig
+        from services.document_processor import DocumentProcessor
+        from services.processing_journal import ProcessingJournal
+
+        def fake_request(method, url, **kwargs):
+            response = MagicMock(status_code=200, headers={})
+            if method == 'GET' and url.endswith('/documents'):
+                payload = {'success': True, 'data': {'documents': []}}
+            else:
+                payload = {'success': True, 'data': {'moved_count': 1, 'created_count': 1}}
+            response.json.return_value = payload
+            response.text = json.dumps(payload)
+            return response
+
+        client = APIClient(APIConfig(base_url='https://example.invalid/api'))
+        client._session = MagicMock()
+        client._session.request.side_effect = fake_request
+        processor = DocumentProcessor(client)
+        processor._journal = ProcessingJournal(str(tmp_path / 'journal.jsonl'), fsync=False)
+        processor._doc_rules = None
+        processor._load_document_rules = MagicMock()
+
+        docs = [MagicMock(id=i, original_filename=f'brief_{i}.docx', file_extension='.docx',
+                          box_type='eingang', processing_status='pending', content_hash=f'h{i}',
+                          bipro_category=None, is_gdv=False, is_pdf=False)
+                for i in range(1, 11)]
+        before = client.get_request_count()
+        for doc in docs:
+            assert processor._process_document(doc).target_box == 'sonstige'
+        processor._write_batcher.flush()
+        per_doc = (client.get_request_count() - before) / len(docs)
+
+        # Vorher: get + update(processing) + update(classified) + update(archived)
+        #         + 3 History-Eintraege = 7 Requests pro Dokument
+        # Jetzt: ein Update + ein zusammengefasster History-Eintrag, dazu eine
+        #        gemeinsame Abfrage der ausgeschlossenen Dokumente (Claim entfaellt)
+        assert per_doc <= 7 / 3, per_doc
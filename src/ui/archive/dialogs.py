@@ -526,7 +526,8 @@ class DuplicateCompareDialog(QDialog):
             worker = PreviewDownloadWorker(
                 self._docs_api, doc.id, self._preview_cache_dir,
                 filename=doc.original_filename,
-                cache_dir=self._preview_cache_dir)
+                cache_dir=self._preview_cache_dir,
+                content_hash=doc.content_hash)
             worker.download_finished.connect(
                 lambda path, s=side: self._on_preview_ready(s, path))
             worker.download_error.connect(
@@ -53,9 +53,15 @@ class DocumentTableModel(QAbstractTableModel):
         '.jpeg': 'Bild', '.png': 'Bild', '.gif': 'Bild', '.zip': 'ZIP',
     }
     
+    # Unterhalb dieses Anteils gemeinsamer Zeilen (z.B. Box-Wechsel) ist ein
+    # Reset guenstiger als ein Zeilen-Diff
+    _DIFF_MIN_OVERLAP = 0.5
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self._documents: List[Document] = []
+        # Hash der angezeigten Felder je Zeile (parallel zu _documents)
+        self._row_hashes: List[int] = []
         self._box_font = QFont("Open Sans", 9, QFont.Weight.Medium)
         # Header-Labels (werden in headerData verwendet)
         from i18n.de import DUPLICATE_COLUMN_HEADER, EMPTY_PAGES_COLUMN_HEADER
@@ -240,11 +246,69 @@ class DocumentTableModel(QAbstractTableModel):
             return Qt.ItemFlag.NoItemFlags
         return Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
     
-    def set_documents(self, documents: List[Document]):
-        """Setzt die gesamte Dokumentliste (ersetzt _populate_table)."""
-        self.beginResetModel()
+    def set_documents(self, documents: List[Document], reset: bool = False) -> bool:
+        """
+        Setzt die Dokumentliste (ersetzt _populate_table).
+        
+        Vergleicht alte und neue Liste per Dokument-ID und Zeilen-Hash und
+        meldet nur betroffene Zeilen (rowsRemoved/rowsInserted/dataChanged).
+        Selektion und Scroll-Position bleiben dadurch erhalten. Ein Reset
+        erfolgt nur bei reset=True, geaenderter Reihenfolge oder wenn sich
+        die Listen kaum ueberschneiden.
+        
+        Returns:
+            True wenn sich etwas geaendert hat
+        """
+        documents = list(documents)
+        new_hashes = [self._row_hash(doc) for doc in documents]
+        old_ids = [doc.id for doc in self._documents]
+        new_ids = [doc.id for doc in documents]
+        
+        if not reset and old_ids == new_ids:
+            changed_rows = [row for row, (old, new) in enumerate(zip(self._row_hashes, new_hashes))
+                            if old != new]
+            self._documents = documents
+            self._row_hashes = new_hashes
+            self._emit_rows_changed(changed_rows)
+            return bool(changed_rows)
+        
+        old_set = set(old_ids)
+        new_set = set(new_ids)
+        common = old_set & new_set
+        kept_order = [doc_id for doc_id in old_ids if doc_id in new_set]
+        if (reset or not old_ids or not new_ids
+                or len(common) < self._DIFF_MIN_OVERLAP * max(len(old_ids), len(new_ids))
+                or kept_order != [doc_id for doc_id in new_ids if doc_id in old_set]):
+            self.beginResetModel()
+            self._documents = documents
+            self._row_hashes = new_hashes
+            self.endResetModel()
+            return True
+        
+        # 1. Entfernte Zeilen (zusammenhaengende Bereiche, von unten nach oben)
+        removed_rows = [row for row, doc_id in enumerate(old_ids) if doc_id not in new_set]
+        for first, last in reversed(self._row_ranges(removed_rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._documents[first:last + 1]
+            del self._row_hashes[first:last + 1]
+            self.endRemoveRows()
+        
+        # 2. Neue Zeilen an ihrer Zielposition einfuegen
+        inserted_rows = [row for row, doc_id in enumerate(new_ids) if doc_id not in old_set]
+        for first, last in self._row_ranges(inserted_rows):
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._documents[first:first] = documents[first:last + 1]
+            self._row_hashes[first:first] = new_hashes[first:last + 1]
+            self.endInsertRows()
+        
+        # 3. Geaenderte Zeilen (IDs stimmen jetzt zeilenweise ueberein)
+        inserted = set(inserted_rows)
+        changed_rows = [row for row in range(len(documents))
+                        if row not in inserted and self._row_hashes[row] != new_hashes[row]]
         self._documents = documents
-        self.endResetModel()
+        self._row_hashes = new_hashes
+        self._emit_rows_changed(changed_rows)
+        return True
     
     def get_document(self, row: int) -> Optional[Document]:
         """Zugriff auf ein Dokument per Zeilen-Index."""
@@ -261,10 +325,42 @@ class DocumentTableModel(QAbstractTableModel):
         for row, doc in enumerate(self._documents):
             if doc.id in doc_ids:
                 doc.display_color = color
+                self._row_hashes[row] = self._row_hash(doc)
                 top_left = self.index(row, 0)
                 bottom_right = self.index(row, self.COLUMN_COUNT - 1)
                 self.dataChanged.emit(top_left, bottom_right, [Qt.ItemDataRole.BackgroundRole])
     
+    @staticmethod
+    def _row_hash(doc: Document) -> int:
+        """Hash ueber alle Felder, die in einer Zeile angezeigt werden (inkl. Tooltips)."""
+        return hash((
+            doc.id, doc.version, doc.original_filename, doc.mime_type, doc.box_type,
+            doc.source_type, doc.vu_name, doc.is_gdv, doc.is_archived, doc.display_color,
+            doc.ai_renamed, doc.ai_processing_error, doc.processing_status, doc.created_at,
+            doc.uploaded_by_name, doc.empty_page_count, doc.total_page_count,
+            doc.previous_version_id, doc.duplicate_of_filename, doc.duplicate_of_box_type,
+            doc.duplicate_of_created_at, doc.duplicate_of_is_archived,
+            doc.content_duplicate_of_id, doc.content_duplicate_of_filename,
+            doc.content_duplicate_of_box_type, doc.content_duplicate_of_created_at,
+            doc.content_duplicate_of_is_archived,
+        ))
+    
+    @staticmethod
+    def _row_ranges(rows: List[int]) -> List[tuple]:
+        """Fasst aufsteigende Zeilennummern zu (erste, letzte)-Bereichen zusammen."""
+        ranges = []
+        for row in rows:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1] = (ranges[-1][0], row)
+            else:
+                ranges.append((row, row))
+        return ranges
+    
+    def _emit_rows_changed(self, rows: List[int]):
+        """Emittiert dataChanged je zusammenhaengendem Zeilenbereich."""
+        for first, last in self._row_ranges(rows):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, self.COLUMN_COUNT - 1))
+    
     @staticmethod
     def _get_file_type(doc) -> str:
         """Ermittelt den Dateityp fuer die Anzeige."""
@@ -273,6 +369,11 @@ class DocumentTableModel(QAbstractTableModel):
         ext = doc.file_extension.lower() if hasattr(doc, 'file_extension') else ""
         if not ext and '.' in doc.original_filename:
             ext = '.' + doc.original_filename.rsplit('.', 1)[-1].lower()
+        return DocumentTableModel._file_type_for_extension(ext)
+
+    @staticmethod
+    def _file_type_for_extension(ext: str) -> str:
+        """Anzeige-Dateityp fuer eine Endung (lowercase, mit Punkt; ohne GDV-Flag)."""
         return DocumentTableModel._TYPE_MAP.get(ext, ext.upper().lstrip('.') if ext else '?')
 
     @staticmethod
@@ -56,7 +56,9 @@ class SearchResultCard(QFrame):
     
     def _setup_ui(self):
         from html import escape
-        from i18n.de import ATLAS_INDEX_RESULT_ARCHIVED, ATLAS_INDEX_NO_TEXT
+        from i18n.de import (
+            ATLAS_INDEX_RESULT_ARCHIVED, ATLAS_INDEX_NO_TEXT, ATLAS_INDEX_OFFLINE_FILENAME_ONLY
+        )
         
         doc = self.result.document
         self.setFrameStyle(QFrame.Shape.StyledPanel | QFrame.Shadow.Plain)
@@ -121,7 +123,9 @@ class SearchResultCard(QFrame):
             snippet_label.setStyleSheet(f"color: {TEXT_SECONDARY}; font-size: 12px; border: none; background: transparent; padding: 2px 0 0 0;")
             layout.addWidget(snippet_label)
         else:
-            no_text_label = QLabel(f"<i>{escape(ATLAS_INDEX_NO_TEXT)}</i>")
+            # Offline-Treffer: nur der Dateiname wurde durchsucht
+            no_text = ATLAS_INDEX_OFFLINE_FILENAME_ONLY if self.result.offline else ATLAS_INDEX_NO_TEXT
+            no_text_label = QLabel(f"<i>{escape(no_text)}</i>")
             no_text_label.setTextFormat(Qt.TextFormat.RichText)
             no_text_label.setStyleSheet(f"color: {TEXT_SECONDARY}; font-size: 11px; border: none; background: transparent; padding: 2px 0 0 0;")
             layout.addWidget(no_text_label)
@@ -231,13 +235,27 @@ class AtlasIndexWidget(QWidget):
     ATLAS Index - Globale Volltextsuche ueber alle Dokumente.
     
     Virtuelle "Box" im Archiv, die server-seitige Suche mit FULLTEXT-Index
-    auf document_ai_data.extracted_text nutzt. Snippet-basierte Ergebnisdarstellung.
+    auf document_ai_data.extracted_text nutzt. Ohne Serververbindung sucht
+    sie offline nur in Dateinamen (services/search_index.py) und weist im
+    Status darauf hin.
+    Snippet-basierte Ergebnisdarstellung.
+    
+    Eine neue Eingabe bricht die laufende Suche ab (SearchWorker.cancel()).
+    Zuerst wird nur die erste Seite (_PAGE_SIZE Treffer) angefragt und
+    sofort angezeigt; erreicht der Nutzer das Listenende, holt ein zweiter
+    Request bis _SEARCH_LIMIT Treffer (die API kennt keinen Offset, bereits
+    angezeigte Dokumente werden uebersprungen). Karten entstehen seitenweise.
     """
     # Signale fuer Interaktion mit dem ArchiveBoxesView
     preview_requested = Signal(object)       # Document -> Vorschau oeffnen
     show_in_box_requested = Signal(object)   # Document -> Zur Box wechseln
     download_requested = Signal(object)      # Document -> Download
     
+    _SEARCH_LIMIT = 200
+    _PAGE_SIZE = 20
+    # Abstand zum Listenende (px), ab dem die naechste Seite Karten entsteht
+    _LOAD_MORE_THRESHOLD = 300
+    
     def __init__(self, repository, parent=None):
         super().__init__(parent)
         self._repo = repository
@@ -247,7 +265,12 @@ class AtlasIndexWidget(QWidget):
         self._debounce_timer.setInterval(400)
         self._debounce_timer.timeout.connect(self._execute_search)
         self._current_query = ""
+        self._results: List[SearchResult] = []
+        # Erste Seite war voll -> weitere Treffer beim Scrollen nachladen
+        self._more_available = False
         self._result_cards: List[SearchResultCard] = []
+        # Abgebrochene Worker bis zum Thread-Ende referenzieren (sonst Qt-Absturz)
+        self._cancelled_workers: List[SearchWorker] = []
         self._setup_ui()
     
     def _setup_ui(self):
@@ -375,6 +398,8 @@ class AtlasIndexWidget(QWidget):
         self._results_layout.addStretch()
         
         self._scroll_area.setWidget(self._results_container)
+        self._scroll_area.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        self._scroll_area.verticalScrollBar().rangeChanged.connect(self._on_scroll_range_changed)
         layout.addWidget(self._scroll_area, 1)  # stretch=1 -> nimmt restlichen Platz
     
     def _on_text_changed(self, text: str):
@@ -388,6 +413,7 @@ class AtlasIndexWidget(QWidget):
                 self._status_label.setText(ATLAS_INDEX_ENTER_QUERY)
             else:
                 self._status_label.setText(ATLAS_INDEX_MIN_CHARS)
+            self._cancel_search()
             self._clear_results()
             return
         
@@ -425,39 +451,94 @@ class AtlasIndexWidget(QWidget):
         if len(query) < 3:
             return
         
-        # Laufenden Worker abbrechen
-        if self._search_worker is not None and self._search_worker.isRunning():
-            try:
-                self._search_worker.finished.disconnect(self._on_search_finished)
-                self._search_worker.error.disconnect(self._on_search_error)
-            except RuntimeError:
-                pass
-            self._search_worker = None
+        # Laufenden Worker abbrechen (keine weiteren Server-Requests/DB-Abfragen)
+        self._cancel_search()
         
         self._status_label.setText(ATLAS_INDEX_SEARCHING)
         
+        self._start_worker(self._PAGE_SIZE, self._on_search_finished, self._on_search_error)
+    
+    def _start_worker(self, limit: int, on_finished, on_error):
+        """Startet einen SearchWorker fuer die aktuelle Anfrage."""
         self._search_worker = SearchWorker(
-            self._repo, query,
+            self._repo, self._current_query,
+            limit=limit,
             include_raw=self._include_raw_cb.isChecked(),
-            substring=self._substring_cb.isChecked()
+            substring=self._substring_cb.isChecked(),
         )
-        self._search_worker.finished.connect(self._on_search_finished)
-        self._search_worker.error.connect(self._on_search_error)
+        self._search_worker.finished.connect(on_finished)
+        self._search_worker.error.connect(on_error)
         self._search_worker.start()
     
+    def _cancel_search(self):
+        """Bricht den laufenden SearchWorker ab und trennt seine Signale."""
+        self._cancelled_workers = [w for w in self._cancelled_workers if w.isRunning()]
+        worker = self._search_worker
+        self._search_worker = None
+        if worker is None or not worker.isRunning():
+            return
+        worker.cancel()
+        try:
+            worker.finished.disconnect()
+            worker.error.disconnect()
+        except RuntimeError:
+            pass
+        self._cancelled_workers.append(worker)
+    
     def _on_search_finished(self, results: List[SearchResult]):
-        """Callback wenn Suchergebnisse vorliegen."""
-        from i18n.de import ATLAS_INDEX_RESULTS_COUNT, ATLAS_INDEX_NO_RESULTS
+        """Callback wenn die erste Seite Suchergebnisse vorliegt."""
+        from i18n.de import ATLAS_INDEX_NO_RESULTS
         
+        self._search_worker = None
         self._clear_results()
+        self._results = list(results)
+        self._more_available = len(self._results) >= self._PAGE_SIZE
         
-        if not results:
+        if not self._results:
             self._status_label.setText(ATLAS_INDEX_NO_RESULTS)
             return
         
-        self._status_label.setText(ATLAS_INDEX_RESULTS_COUNT.format(count=len(results)))
-        
-        for result in results:
+        self._update_status()
+        self._append_cards()
+    
+    def _load_more_results(self):
+        """Listenende erreicht -> restliche Treffer (bis _SEARCH_LIMIT) anfragen."""
+        if not self._more_available or self._search_worker is not None:
+            return
+        self._more_available = False
+        self._start_worker(self._SEARCH_LIMIT, self._on_more_results, self._on_more_error)
+    
+    def _on_more_results(self, results: List[SearchResult]):
+        """Haengt die nachgeladenen Treffer an (bereits angezeigte uebersprungen)."""
+        self._search_worker = None
+        shown = {r.document.id for r in self._results}
+        self._results.extend(r for r in results if r.document.id not in shown)
+        self._update_status()
+        self._append_cards()
+    
+    def _on_more_error(self, error_msg: str):
+        """Nachladen fehlgeschlagen (vom Worker geloggt) -> angezeigte Treffer bleiben stehen."""
+        self._search_worker = None
+        self._update_status()
+    
+    def _update_status(self):
+        """Trefferzahl im Status; '+' solange weitere nachgeladen werden koennen."""
+        from i18n.de import (
+            ATLAS_INDEX_RESULTS_COUNT, ATLAS_INDEX_MORE_RESULTS_COUNT,
+            ATLAS_INDEX_OFFLINE_RESULTS_COUNT
+        )
+        count = len(self._results)
+        if any(r.offline for r in self._results):
+            self._status_label.setText(ATLAS_INDEX_OFFLINE_RESULTS_COUNT.format(count=count))
+        elif self._more_available:
+            self._status_label.setText(ATLAS_INDEX_MORE_RESULTS_COUNT.format(count=count))
+        else:
+            self._status_label.setText(ATLAS_INDEX_RESULTS_COUNT.format(count=count))
+    
+    def _append_cards(self):
+        """Erzeugt Karten fuer die naechsten _PAGE_SIZE Treffer."""
+        start = len(self._result_cards)
+        for result in self._results[start:start + self._PAGE_SIZE]:
             card = SearchResultCard(result, self._current_query)
             card.double_clicked.connect(self._on_card_double_clicked)
             card.context_menu_requested.connect(self._on_card_context_menu)
@@ -465,8 +546,27 @@ class AtlasIndexWidget(QWidget):
             # Vor dem Stretch einfuegen
             self._results_layout.insertWidget(self._results_layout.count() - 1, card)
     
+    def _on_scrolled(self, value: int):
+        """Nahe am Listenende -> naechste Seite Karten erzeugen oder Treffer nachladen."""
+        if value < self._scroll_area.verticalScrollBar().maximum() - self._LOAD_MORE_THRESHOLD:
+            return
+        if len(self._result_cards) < len(self._results):
+            self._append_cards()
+        else:
+            self._load_more_results()
+    
+    def _on_scroll_range_changed(self, _minimum: int, maximum: int):
+        """Fuellen die Karten den sichtbaren Bereich nicht, direkt nachlegen."""
+        if maximum != 0:
+            return
+        if len(self._result_cards) < len(self._results):
+            self._append_cards()
+        else:
+            self._load_more_results()
+    
     def _on_search_error(self, error_msg: str):
         """Callback bei Suchfehler."""
+        self._search_worker = None
         self._clear_results()
         self._status_label.setText(f"Fehler: {error_msg}")
     
@@ -476,6 +576,8 @@ class AtlasIndexWidget(QWidget):
             card.setParent(None)
             card.deleteLater()
         self._result_cards.clear()
+        self._results = []
+        self._more_available = False
     
     def _on_card_double_clicked(self, result: SearchResult):
         """Doppelklick auf Ergebnis-Karte -> Vorschau."""
@@ -511,10 +613,4 @@ class AtlasIndexWidget(QWidget):
     def cleanup(self):
         """Bereinigt laufende Worker."""
         self._debounce_timer.stop()
-        if self._search_worker is not None and self._search_worker.isRunning():
-            try:
-                self._search_worker.finished.disconnect(self._on_search_finished)
-                self._search_worker.error.disconnect(self._on_search_error)
-            except RuntimeError:
-                pass
-            self._search_worker = None
+        self._cancel_search()
@@ -593,6 +593,17 @@ class ProcessingProgressOverlay(QWidget):
         self._status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         container_layout.addWidget(self._status_label)
         
+        # KI-Auslastung (adaptives Limit, Warteschlange, Latenz)
+        self._ai_stats_label = QLabel("")
+        self._ai_stats_label.setStyleSheet(f"""
+            font-family: {FONT_BODY};
+            font-size: 11px;
+            color: {TEXT_SECONDARY};
+        """)
+        self._ai_stats_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._ai_stats_label.setVisible(False)
+        container_layout.addWidget(self._ai_stats_label)
+        
         container_layout.addSpacing(8)
         
         # Fazit-Bereich (initial versteckt)
@@ -662,6 +673,7 @@ class ProcessingProgressOverlay(QWidget):
         
         self._summary_frame.setVisible(False)
         self._done_label.setVisible(False)
+        self._ai_stats_label.setVisible(False)
         
         self.setGeometry(self.parent().rect() if self.parent() else self.rect())
         self.raise_()
@@ -680,6 +692,38 @@ class ProcessingProgressOverlay(QWidget):
             message = message[:47] + "..."
         
         self._status_label.setText(f"{message}\n({current} / {total})")
+        self._update_ai_stats()
+    
+    def _update_ai_stats(self):
+        """Zeigt KI-Limit, Warteschlange und Latenz-Histogramm an."""
+        try:
+            from api.openrouter import get_ai_concurrency_stats
+            stats = get_ai_concurrency_stats()
+        except Exception:
+            self._ai_stats_label.setVisible(False)
+            return
+        
+        parts = [
+            f"KI: {stats['in_flight']}/{stats['limit']} parallel",
+            f"{stats['queue_depth']} in Warteschlange",
+        ]
+        if stats.get('p50_ms') is not None:
+            parts.append(f"p50 {stats['p50_ms'] / 1000:.1f}s / p95 {stats['p95_ms'] / 1000:.1f}s")
+        if stats.get('paused_for_s'):
+            parts.append(f"Pause {stats['paused_for_s']:.0f}s (Rate-Limit)")
+        text = " · ".join(parts)
+        
+        counts = [count for _, count in stats.get('histogram', [])]
+        peak = max(counts) if counts else 0
+        if peak > 0:
+            bars = "▁▂▃▄▅▆▇█"
+            text += "\n" + "".join(
+                bars[min(len(bars) - 1, (c * (len(bars) - 1)) // peak)] if c else " "
+                for c in counts
+            ) + "  (0,5s … >64s)"
+        
+        self._ai_stats_label.setText(text)
+        self._ai_stats_label.setVisible(True)
     
     def show_completion(self, batch_result, auto_close_seconds: int = 6):
         """
@@ -716,6 +760,7 @@ class ProcessingProgressOverlay(QWidget):
         self._subtitle_label.setText("")
         self._progress_bar.setValue(100)
         self._status_label.setText("")
+        self._ai_stats_label.setVisible(False)
         
         # Verteilung nach Ziel-Box
         box_counts = {}
@@ -11,6 +11,7 @@ from infrastructure.threading.archive_workers import (
     MissingAiDataWorker,
     MultiUploadWorker,
     PreviewDownloadWorker,
+    PreviewPrefetchWorker,
     MultiDownloadWorker,
     BoxDownloadWorker,
     CreditsWorker,
@@ -31,6 +32,7 @@ __all__ = [
     'MissingAiDataWorker',
     'MultiUploadWorker',
     'PreviewDownloadWorker',
+    'PreviewPrefetchWorker',
     'MultiDownloadWorker',
     'BoxDownloadWorker',
     'CreditsWorker',
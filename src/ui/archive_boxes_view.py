@@ -13,7 +13,6 @@ Design: ACENCIA Corporate Identity
 
 from typing import Optional, List, Dict
 from datetime import datetime
-import tempfile
 import os
 import logging
 
@@ -161,11 +160,16 @@ class ArchiveBoxesView(QWidget):
         self._pending_documents = None
         self._pending_force_rebuild = False
         
-        # Persistenter Vorschau-Cache (Dateien werden nur 1x heruntergeladen)
-        self._preview_cache_dir = os.path.join(tempfile.gettempdir(), 'bipro_preview_cache')
+        # Persistenter Vorschau-Cache (Groessenlimit + LRU, services/preview_cache.py)
+        from services.preview_cache import get_preview_cache
+        self._preview_cache = get_preview_cache()
+        self._preview_cache_dir = self._preview_cache.root
         os.makedirs(self._preview_cache_dir, exist_ok=True)
         self._preview_progress = None
         self._preview_cancelled = False
+        # Vorausschauendes Laden der naechsten Vorschauen
+        self._prefetch_worker = None
+        self._preview_awaiting_prefetch = None
         
         
         # Flag ob erste Ladung erfolgt ist
@@ -173,9 +177,6 @@ class ArchiveBoxesView(QWidget):
         self._missing_ai_data_checked = False
         
         
-        # Fingerprint der aktuellen Dokumente (verhindert unnoetige Tabellen-Rebuilds)
-        self._documents_fingerprint: str = ""
-        
         # Tracking: Wann wurde welche Box zuletzt manuell aktualisiert?
         # Key: box_type (oder '' fuer alle), Value: datetime
         self._last_manual_refresh: Dict[str, datetime] = {}
@@ -879,13 +880,11 @@ class ArchiveBoxesView(QWidget):
         
         # Thread-safe Zugriff ueber oeffentliche API (kein direkter Lock-Zugriff!)
         cache_key = actual_box if actual_box else None
-        documents = self._cache.get_documents(box_type=cache_key, force_refresh=False)
-        
-        # is_archived Filter client-seitig (wie CacheDocumentLoadWorker)
-        if is_archived_box:
-            documents = [d for d in documents if d.is_archived]
-        elif actual_box:
-            documents = [d for d in documents if not d.is_archived]
+        # is_archived Filter ueber den Cache-Index (wie CacheDocumentLoadWorker)
+        documents = self._cache.get_documents(
+            box_type=cache_key, force_refresh=False,
+            is_archived=self._archived_filter_for_box(self._current_box)
+        )
         
         # Wenn View nicht sichtbar: Rebuild aufschieben (verhindert UI-Freeze)
         if not self.isVisible():
@@ -1004,14 +1003,12 @@ class ArchiveBoxesView(QWidget):
             cache_key = actual_box if actual_box else None
             # Schneller Check ob Daten im RAM-Cache sind (ohne API-Call!)
             # WICHTIG: Oeffentliche API verwenden, NICHT direkten Lock-Zugriff!
-            documents = self._cache.get_documents_cached_only(box_type=cache_key)
+            documents = self._cache.get_documents_cached_only(
+                box_type=cache_key,
+                is_archived=self._archived_filter_for_box(self._current_box)
+            )
             if documents is not None:
                 # Daten sind im RAM -> direkt anzeigen (instant!)
-                # is_archived Filter client-seitig
-                if is_archived_box:
-                    documents = [d for d in documents if d.is_archived]
-                elif actual_box:
-                    documents = [d for d in documents if not d.is_archived]
                 self._apply_filters_and_display(documents, force_rebuild=True)
                 return
         
@@ -1024,12 +1021,8 @@ class ArchiveBoxesView(QWidget):
         self._show_loading(f"{box_name} wird geladen...")
         self.table.setEnabled(False)
         
-        # is_archived Filter bestimmen
-        is_archived_filter = None  # Gesamt Archiv: alle
-        if is_archived_box:
-            is_archived_filter = True
-        elif actual_box:
-            is_archived_filter = False
+        # is_archived Filter bestimmen (Gesamt Archiv: alle)
+        is_archived_filter = self._archived_filter_for_box(self._current_box)
         
         # CacheDocumentLoadWorker: Laedt ALLE Dokumente in Cache (1 API-Call),
         # filtert lokal nach box_type und is_archived.
@@ -1064,56 +1057,90 @@ class ArchiveBoxesView(QWidget):
         # Kein manuelles Befuellen noetig (und kein direkter Lock-Zugriff!)
     
     @staticmethod
-    def _compute_documents_fingerprint(documents: List[Document]) -> str:
+    def _archived_filter_for_box(box: Optional[str]) -> Optional[bool]:
+        """is_archived-Filter fuer eine Box-Auswahl (None = Gesamt Archiv: alle)."""
+        if box and box.endswith("_archived"):
+            return True
+        if box:
+            return False
+        return None
+    
+    def _build_filter_criteria(self) -> tuple:
         """
-        Berechnet einen Fingerprint fuer die Dokumentliste.
+        Uebersetzt Box-Auswahl und Filter-Comboboxen in Index-Kriterien.
         
-        Aendert sich nur wenn Dokumente hinzukommen, entfernt werden,
-        umbenannt, verschoben oder anderweitig aktualisiert werden.
+        Returns:
+            (criteria, exclude) fuer DataCacheService.query_documents()
         """
-        parts = []
-        for doc in documents:
-            parts.append(
-                f"{doc.id}:{doc.original_filename}:{doc.box_type}:"
-                f"{doc.display_color or ''}:{doc.ai_renamed}:{doc.is_archived}:"
-                f"{doc.processing_status or ''}:{doc.created_at or ''}:"
-                f"{doc.version}"
-            )
-        return "|".join(parts)
-    
-    def _apply_filters_and_display(self, documents: List[Document], force_rebuild: bool = False):
-        """Wendet Filter an und zeigt Dokumente in der Tabelle."""
+        box = self._current_box
+        actual_box = box.replace("_archived", "") if box else None
+        criteria = {
+            'box_type': actual_box or None,
+            'is_archived': self._archived_filter_for_box(box),
+        }
         # Admin-Filter: Falsch-Box Dokumente fuer Nicht-Admins ausblenden
-        if not self._is_admin:
-            documents = [d for d in documents if d.box_type != 'falsch']
+        exclude = {} if self._is_admin else {'box_type': 'falsch'}
         
-        # Quelle-Filter anwenden
         source = self.source_filter.currentData() if hasattr(self, 'source_filter') else None
         if source:
-            documents = [d for d in documents if d.source_type == source]
+            criteria['source_type'] = source
         
-        # Art-Filter anwenden (Dateityp)
+        # Art-Filter: Dateityp -> passende Endungen aus dem Index
         file_type = self.type_filter.currentData() if hasattr(self, 'type_filter') else None
-        if file_type:
-            documents = [d for d in documents if DocumentTableModel._get_file_type(d) == file_type]
+        if file_type == "GDV":
+            criteria['is_gdv'] = True
+        elif file_type:
+            criteria['is_gdv'] = False
+            criteria['file_extension'] = [
+                ext for ext in self._cache.get_document_field_values('file_extension')
+                if DocumentTableModel._file_type_for_extension(ext) == file_type
+            ]
         
-        # KI-Filter anwenden
         ki_status = self.ki_filter.currentData() if hasattr(self, 'ki_filter') else None
         if ki_status == "yes":
-            documents = [d for d in documents if d.ai_renamed]
+            criteria['ai_renamed'] = True
         elif ki_status == "no":
-            documents = [d for d in documents if not d.ai_renamed and d.is_pdf]
-        
-        # Fingerprint pruefen: Model nur aktualisieren wenn sich Daten geaendert haben
-        new_fingerprint = self._compute_documents_fingerprint(documents)
-        if not force_rebuild and new_fingerprint == self._documents_fingerprint:
+            criteria['ai_renamed'] = False
+            criteria['is_pdf'] = True
+        return criteria, exclude
+    
+    def _apply_filters_and_display(self, documents: List[Document], force_rebuild: bool = False):
+        """Wendet Filter an und zeigt Dokumente in der Tabelle."""
+        # Schnellpfad: Schnittmenge der Cache-Indizes statt Listen-Durchlaeufen,
+        # beschraenkt auf die uebergebenen Dokumente
+        criteria, exclude = self._build_filter_criteria()
+        indexed = self._cache.query_documents(criteria, exclude, within=documents)
+        if indexed is not None:
+            documents = indexed
+        else:
+            # Kein gueltiger Cache bzw. Liste nicht aus dem Cache: direkt filtern
+            # Admin-Filter: Falsch-Box Dokumente fuer Nicht-Admins ausblenden
+            if not self._is_admin:
+                documents = [d for d in documents if d.box_type != 'falsch']
+            
+            # Quelle-Filter anwenden
+            source = criteria.get('source_type')
+            if source:
+                documents = [d for d in documents if d.source_type == source]
+            
+            # Art-Filter anwenden (Dateityp)
+            file_type = self.type_filter.currentData() if hasattr(self, 'type_filter') else None
+            if file_type:
+                documents = [d for d in documents if DocumentTableModel._get_file_type(d) == file_type]
+            
+            # KI-Filter anwenden
+            ki_status = self.ki_filter.currentData() if hasattr(self, 'ki_filter') else None
+            if ki_status == "yes":
+                documents = [d for d in documents if d.ai_renamed]
+            elif ki_status == "no":
+                documents = [d for d in documents if not d.ai_renamed and d.is_pdf]
+        
+        # Model per Zeilen-Diff aktualisieren (Selektion/Scroll-Position bleiben erhalten)
+        changed = self._doc_model.set_documents(documents)
+        self._documents = self._doc_model.get_documents()
+        if not changed and not force_rebuild:
             logger.debug("Auto-Refresh: Keine Aenderungen - Tabelle uebersprungen")
             return
-        
-        self._documents_fingerprint = new_fingerprint
-        self._documents = documents
-        # Model aktualisieren - virtualisiert, kein Item-Spam
-        self._doc_model.set_documents(documents)
         self.table.setEnabled(True)
         
         # Box-Name ermitteln (inkl. archivierte Boxen)
@@ -1835,6 +1862,8 @@ class ArchiveBoxesView(QWidget):
             # Lokale Dokumente aktualisieren (ohne Server-Refresh)
             documents = getattr(self, '_color_change_documents', [])
             affected_ids = set()
+            # Farb-Index im Cache mitfuehren (vor dem Setzen, liest den alten Wert)
+            self._cache.set_documents_color([doc.id for doc in documents], color)
             for doc in documents:
                 doc.display_color = color
                 affected_ids.add(doc.id)
@@ -2033,6 +2062,7 @@ class ArchiveBoxesView(QWidget):
         - Filename wird direkt uebergeben (spart get_document() API-Call)
         - Persistenter Cache: Gleiche Datei wird nur 1x heruntergeladen
         - Cache-Hit: Kein Progress-Dialog, instant Anzeige
+        - Laedt der Prefetch das Dokument gerade, wird darauf gewartet
         """
         if hasattr(self, '_preview_worker') and self._preview_worker:
             if not isValid(self._preview_worker):
@@ -2045,9 +2075,8 @@ class ArchiveBoxesView(QWidget):
         self._preview_kind = preview_kind
         
         # Schnell-Check: Datei bereits im Cache?
-        from api.documents import safe_cache_filename
-        cached_path = os.path.join(self._preview_cache_dir, safe_cache_filename(doc.id, doc.original_filename))
-        if os.path.exists(cached_path) and os.path.getsize(cached_path) > 0:
+        cached_path = self._preview_cache.get(doc.id, doc.original_filename)
+        if cached_path:
             logger.info(f"Vorschau instant aus Cache: {doc.original_filename}")
             self._on_preview_download_finished(cached_path)
             return
@@ -2059,10 +2088,20 @@ class ArchiveBoxesView(QWidget):
         progress.show()
         self._preview_progress = progress
         
+        prefetch = self._running_prefetch_worker()
+        if prefetch is not None:
+            if prefetch.current_doc_id == doc.id:
+                # Wird gerade vorab geladen -> nicht doppelt laden (_on_prefetch_ready)
+                self._preview_awaiting_prefetch = doc.id
+                return
+            # Leitung fuer die angeforderte Vorschau freigeben
+            prefetch.cancel()
+        
         self._preview_worker = self._presenter.start_preview_download(
             doc.id, self._preview_cache_dir,
             filename=doc.original_filename,
             cache_dir=self._preview_cache_dir,
+            content_hash=doc.content_hash,
             finished_callback=self._on_preview_download_finished,
             error_callback=self._on_preview_download_error,
         )
@@ -2074,6 +2113,7 @@ class ArchiveBoxesView(QWidget):
             if isValid(self._preview_worker) and self._preview_worker.isRunning():
                 if hasattr(self._preview_worker, 'cancel'):
                     self._preview_worker.cancel()
+        self._preview_awaiting_prefetch = None
         if hasattr(self, '_preview_progress') and self._preview_progress:
             self._preview_progress.close()
 
@@ -2091,6 +2131,8 @@ class ArchiveBoxesView(QWidget):
             return
         
         if result and os.path.exists(result):
+            # Waehrend die Vorschau offen ist, die naechsten Dokumente vorab laden
+            self._schedule_preview_prefetch(getattr(self, '_preview_doc', None))
             if getattr(self, '_preview_kind', '') == "pdf":
                 doc = getattr(self, '_preview_doc', None)
                 viewer = PDFViewerDialog(
@@ -2099,7 +2141,8 @@ class ArchiveBoxesView(QWidget):
                     self,
                     doc_id=doc.id if doc else None,
                     docs_api=self._presenter.get_docs_api_for_dialog(),
-                    editable=True
+                    editable=True,
+                    content_hash=doc.content_hash if doc else None,
                 )
                 # PDF-Save-Flag: Refresh erst NACH viewer.exec() ausfuehren
                 # (verhindert Freeze durch Tabellen-Rebuild waehrend modaler Dialog)
@@ -2132,6 +2175,92 @@ class ArchiveBoxesView(QWidget):
             return
         self._toast_manager.show_error(f"Vorschau fehlgeschlagen:\n{error}")
     
+    def _running_prefetch_worker(self):
+        """Laufender PreviewPrefetchWorker oder None."""
+        worker = self._prefetch_worker
+        if worker is None or not isValid(worker) or not worker.isRunning():
+            self._prefetch_worker = None
+            return None
+        return worker
+    
+    def _schedule_preview_prefetch(self, doc: Optional[Document]):
+        """Laedt die Vorschauen der naechsten Dokumente (aktuelle Sortierung) vorab."""
+        from config.processing_rules import PREVIEW_CACHE_CONFIG
+        
+        count = int(PREVIEW_CACHE_CONFIG.get('prefetch_count', 0))
+        if doc is None or count <= 0:
+            return
+        upcoming = self._next_previewable_documents(doc, count)
+        
+        busy_doc_id = None
+        running = self._running_prefetch_worker()
+        if running is not None:
+            # Laufender Download wird zu Ende gefuehrt, nicht doppelt anfordern
+            running.cancel()
+            busy_doc_id = running.current_doc_id
+        upcoming = [d for d in upcoming if d.id != busy_doc_id]
+        if not upcoming:
+            return
+        self._prefetch_worker = self._presenter.start_preview_prefetch(
+            upcoming, self._preview_cache,
+            ready_callback=self._on_prefetch_ready,
+        )
+    
+    def _next_previewable_documents(self, doc: Document, count: int) -> List[Document]:
+        """Die naechsten `count` PDF-/Tabellen-Dokumente nach `doc` in der Tabellen-Sortierung."""
+        from config.processing_rules import PREVIEW_CACHE_CONFIG
+        
+        max_bytes = int(PREVIEW_CACHE_CONFIG.get('prefetch_max_file_mb', 25)) * 1024 * 1024
+        proxy = self._proxy_model
+        rows = proxy.rowCount()
+        
+        def doc_at(proxy_row: int) -> Optional[Document]:
+            source_index = proxy.mapToSource(proxy.index(proxy_row, 0))
+            return self._doc_model.get_document(source_index.row())
+        
+        # Meist ist das geoeffnete Dokument die aktuelle Zeile
+        start = self.table.currentIndex().row()
+        current = doc_at(start) if 0 <= start < rows else None
+        if current is None or current.id != doc.id:
+            start = next((r for r in range(rows) if (d := doc_at(r)) is not None and d.id == doc.id), -1)
+            if start < 0:
+                return []
+        
+        upcoming = []
+        for row in range(start + 1, rows):
+            candidate = doc_at(row)
+            if candidate is None or candidate.is_gdv:
+                continue
+            if not (self._is_pdf(candidate) or self._is_spreadsheet(candidate)):
+                continue
+            if candidate.file_size and candidate.file_size > max_bytes:
+                continue
+            upcoming.append(candidate)
+            if len(upcoming) >= count:
+                break
+        return upcoming
+    
+    def _on_prefetch_ready(self, doc_id: int, path: str):
+        """Prefetch hat ein Dokument geladen ('' = fehlgeschlagen)."""
+        if self._preview_awaiting_prefetch != doc_id:
+            return
+        self._preview_awaiting_prefetch = None
+        if path:
+            self._on_preview_download_finished(path)
+            return
+        # Prefetch fehlgeschlagen -> regulaerer Download (mit Fehlermeldung)
+        doc = getattr(self, '_preview_doc', None)
+        if doc is None or doc.id != doc_id:
+            return
+        self._preview_worker = self._presenter.start_preview_download(
+            doc.id, self._preview_cache_dir,
+            filename=doc.original_filename,
+            cache_dir=self._preview_cache_dir,
+            content_hash=doc.content_hash,
+            finished_callback=self._on_preview_download_finished,
+            error_callback=self._on_preview_download_error,
+        )
+    
     def _on_pdf_saved(self, doc_id: int):
         """Callback wenn ein PDF im Editor gespeichert wurde.
         
@@ -2142,15 +2271,7 @@ class ArchiveBoxesView(QWidget):
         from i18n.de import PDF_EDIT_SAVE_SUCCESS
         
         # Vorschau-Cache fuer dieses Dokument invalidieren (leichtgewichtig)
-        if self._preview_cache_dir:
-            import glob
-            cache_pattern = os.path.join(self._preview_cache_dir, f"{doc_id}_*")
-            for cached_file in glob.glob(cache_pattern):
-                try:
-                    os.unlink(cached_file)
-                    logger.info(f"Vorschau-Cache invalidiert: {cached_file}")
-                except Exception:
-                    pass
+        self._preview_cache.remove_document(doc_id)
         
         # Historie-Cache invalidieren (leichtgewichtig)
         if hasattr(self, '_history_panel'):
@@ -2196,6 +2317,7 @@ class ArchiveBoxesView(QWidget):
         self._upload_progress.show()
         
         self._upload_results = {'erfolge': [], 'fehler': [], 'duplikate': 0}
+        self._upload_label = "Lade hoch..."
         
         self._multi_upload_worker = self._presenter.start_multi_upload(
             file_paths, 'manual_upload',
@@ -2203,6 +2325,7 @@ class ArchiveBoxesView(QWidget):
             file_finished_callback=self._on_file_uploaded,
             file_error_callback=self._on_file_upload_error,
             all_finished_callback=self._on_multi_upload_finished,
+            bytes_progress_callback=self._on_multi_upload_bytes,
         )
     
     def _on_multi_upload_progress(self, current: int, total: int, filename: str):
@@ -2212,7 +2335,17 @@ class ArchiveBoxesView(QWidget):
             if total != self._upload_progress.maximum():
                 self._upload_progress.setMaximum(total)
             self._upload_progress.setValue(current)
-            self._upload_progress.setLabelText(f"Lade hoch ({current}/{total}):\n{filename}")
+            self._upload_label = f"Lade hoch ({current}/{total}):\n{filename}"
+            self._upload_progress.setLabelText(self._upload_label)
+    
+    def _on_multi_upload_bytes(self, sent: int, total: int):
+        """Zeigt die gesendete Datenmenge im Progress-Dialog an."""
+        from i18n import de as texts
+        if hasattr(self, '_upload_progress') and self._upload_progress and total:
+            self._upload_progress.setLabelText(
+                f"{self._upload_label}\n"
+                + texts.WORKER_UPLOAD_BYTES.format(sent_mb=sent / 1048576, total_mb=total / 1048576)
+            )
     
     def _on_file_uploaded(self, filename: str, doc: Document):
         """Callback wenn eine Datei erfolgreich hochgeladen wurde."""
@@ -2915,15 +3048,8 @@ class ArchiveBoxesView(QWidget):
         
         # Vorschau-Cache fuer alle verarbeiteten Dokumente invalidieren
         # (Dokumenten-Regeln koennen PDFs veraendern, z.B. leere Seiten entfernen)
-        if hasattr(self, '_preview_cache_dir') and self._preview_cache_dir:
-            import glob as _glob
-            for result in batch_result.results:
-                pattern = os.path.join(self._preview_cache_dir, f"{result.document_id}_*")
-                for cached_file in _glob.glob(pattern):
-                    try:
-                        os.unlink(cached_file)
-                    except Exception:
-                        pass
+        for result in batch_result.results:
+            self._preview_cache.remove_document(result.document_id)
         
         # Fazit im Overlay anzeigen (kein Popup!)
         if hasattr(self, '_processing_overlay'):
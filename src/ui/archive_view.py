@@ -484,7 +484,8 @@ class ArchiveView(QWidget):
 
         from ui.async_worker import AsyncWorker
         self._preview_worker = AsyncWorker(
-            lambda: self.docs_api.download(doc.id, temp_dir, filename_override=doc.original_filename),
+            lambda: self.docs_api.download(doc.id, temp_dir, filename_override=doc.original_filename,
+                                           expected_sha256=doc.content_hash),
             parent=self,
         )
 
@@ -556,7 +557,8 @@ class ArchiveView(QWidget):
 
         from ui.async_worker import AsyncWorker
         self._dl_single_worker = AsyncWorker(
-            lambda: self.docs_api.download(doc.id, target_dir, filename_override=doc.original_filename),
+            lambda: self.docs_api.download(doc.id, target_dir, filename_override=doc.original_filename,
+                                           expected_sha256=doc.content_hash),
             parent=self,
         )
         self._dl_single_worker.finished.connect(
@@ -673,7 +675,7 @@ class ArchiveView(QWidget):
         if not target_dir:
             return
 
-        items = [(d.id, d.original_filename) for d in selected_docs]
+        items = [(d.id, d.original_filename, d.content_hash) for d in selected_docs]
         docs_api = self.docs_api
 
         class _BulkDLWorker(QThread):
@@ -684,9 +686,10 @@ class ArchiveView(QWidget):
                 self._api, self._data, self._dest = api, data, dest
             def run(self):
                 ok = fail = 0
-                for i, (did, fname) in enumerate(self._data):
+                for i, (did, fname, content_hash) in enumerate(self._data):
                     self.progress_update.emit(i, f"Lade: {fname}")
-                    r = self._api.download(did, self._dest, filename_override=fname)
+                    r = self._api.download(did, self._dest, filename_override=fname,
+                                           expected_sha256=content_hash)
                     if r:
                         ok += 1
                     else:
@@ -3580,6 +3580,7 @@ class BiPROView(QWidget):
         self._mail_import_worker = MailImportWorker(self.api_client, account_id)
         self._mail_import_worker.progress.connect(self._on_mail_import_progress)
         self._mail_import_worker.progress_count.connect(self._on_mail_import_progress_count)
+        self._mail_import_worker.upload_bytes.connect(self._on_mail_import_upload_bytes)
         self._mail_import_worker.phase_changed.connect(self._on_mail_phase_changed)
         self._mail_import_worker.completed.connect(self._on_mail_import_completed)
         self._mail_import_worker.error.connect(self._on_mail_import_error)
@@ -3613,6 +3614,15 @@ class BiPROView(QWidget):
         if toast:
             toast.set_progress(current, total)
     
+    def _on_mail_import_upload_bytes(self, sent: int, total: int):
+        """Gesendete Datenmenge der laufenden Anhang-Uploads im Toast anzeigen."""
+        from i18n import de as texts
+        toast = getattr(self, '_mail_progress_toast', None)
+        if toast and total:
+            toast.set_status(
+                texts.WORKER_UPLOAD_BYTES.format(sent_mb=sent / 1048576, total_mb=total / 1048576)
+            )
+    
     def _on_mail_import_completed(self, stats: dict):
         """Mail-Import abgeschlossen."""
         from i18n import de as texts
@@ -217,16 +217,36 @@ class LoginDialog(QDialog):
     
     def _clear_local_caches(self):
         """Loescht alle lokalen Caches wenn keine gueltige Session vorhanden ist."""
-        import shutil
-        import tempfile
+        try:
+            from services.preview_cache import clear_preview_cache
+            clear_preview_cache()
+            logger.info("Vorschau-Cache geloescht")
+        except Exception as e:
+            logger.debug(f"Cache-Bereinigung fehlgeschlagen: {e}")
         
-        cache_dir = os.path.join(tempfile.gettempdir(), 'bipro_preview_cache')
-        if os.path.isdir(cache_dir):
-            try:
-                shutil.rmtree(cache_dir)
-                logger.info(f"Vorschau-Cache geloescht: {cache_dir}")
-            except Exception as e:
-                logger.debug(f"Cache-Bereinigung fehlgeschlagen: {e}")
+        try:
+            from services.blob_cache import clear_document_blob_caches
+            clear_document_blob_caches()
+        except Exception as e:
+            logger.debug(f"Blob-Cache-Bereinigung fehlgeschlagen: {e}")
+        
+        try:
+            from services.warm_cache import clear_warm_caches
+            clear_warm_caches()
+        except Exception as e:
+            logger.debug(f"Warm-Start-Cache-Bereinigung fehlgeschlagen: {e}")
+        
+        try:
+            from services.thumbnail_cache import clear_thumbnail_cache
+            clear_thumbnail_cache()
+        except Exception as e:
+            logger.debug(f"Thumbnail-Cache-Bereinigung fehlgeschlagen: {e}")
+        
+        try:
+            from services.search_index import clear_local_search_indexes
+            clear_local_search_indexes()
+        except Exception as e:
+            logger.debug(f"Suchindex-Bereinigung fehlgeschlagen: {e}")
     
     def _do_login(self):
         """Login durchführen."""
@@ -440,9 +440,23 @@ class MainHub(QMainWindow):
         self._system_status_worker = None
         self._maintenance_pending = False
         
+        # Warm-Start: letzten Archiv-Stand sofort laden, Abgleich im Hintergrund
+        self._load_warm_cache()
+        
         # Standardmaeßig Mitteilungszentrale anzeigen
         self._show_message_center()
     
+    def _load_warm_cache(self):
+        """Laedt den verschluesselten Warm-Start-Cache des Benutzers in den DataCacheService."""
+        user = self.auth_api.current_user
+        if not user:
+            return
+        try:
+            from services.data_cache import get_cache_service
+            get_cache_service(self.api_client).load_warm_start(user.username)
+        except Exception as e:
+            logger.debug(f"Warm-Start-Cache nicht geladen: {e}")
+    
     def _setup_ui(self):
         """UI aufbauen mit ACENCIA Corporate Design."""
         central = QWidget()
@@ -994,6 +1008,12 @@ class MainHub(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             self.auth_api.logout()
+            # Lokale Archiv-Kopie des Benutzers nicht ueber den Logout hinaus behalten
+            try:
+                from services.data_cache import get_cache_service
+                get_cache_service(self.api_client).discard_warm_start()
+            except Exception as e:
+                logger.debug(f"Warm-Start-Cache nicht geloescht: {e}")
             self.close()
     
     # ================================================================
@@ -1610,4 +1630,11 @@ class MainHub(QMainWindow):
             self._drop_upload_worker.cancel()
             self._drop_upload_worker.wait(3000)
         
+        # Archiv-Stand fuer den naechsten Start sichern (Warm-Start)
+        try:
+            from services.data_cache import get_cache_service
+            get_cache_service(self.api_client).save_warm_start()
+        except Exception as e:
+            logger.debug(f"Warm-Start-Cache nicht gespeichert: {e}")
+        
         event.accept()
@@ -8,16 +8,26 @@ ausgelagert aus archive_view.py.
 import os
 import logging
 import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QToolBar, QApplication, QMessageBox, QWidget,
 )
 from PySide6.QtCore import Qt, Signal, QThread, QUrl, QTimer
-from PySide6.QtGui import QAction, QFont, QColor
+from PySide6.QtGui import QAction, QFont, QColor, QImage
 
 logger = logging.getLogger(__name__)
 
+# Thumbnail-Breite in logischen Pixeln (Icon-Groesse der Seitenleiste: 120x160)
+THUMBNAIL_WIDTH = 120
+# Item-Rollen: Soll-Schluessel des Thumbnails ("Originalseite:Drehung") und
+# Schluessel des aktuell angezeigten Bildes (None = kein Bild im Speicher)
+_THUMB_KEY_ROLE = Qt.ItemDataRole.UserRole + 1
+_THUMB_SHOWN_ROLE = Qt.ItemDataRole.UserRole + 2
+
 # PDF-Viewer: Versuche QPdfView zu importieren (Qt6 native PDF)
 HAS_PDF_VIEW = False
 HAS_WEBENGINE = False
@@ -39,34 +49,109 @@ if not HAS_PDF_VIEW:
 
 
 class _ThumbnailWorker(QThread):
-    """Rendert PDF-Thumbnails im Hintergrund, damit die UI nicht blockiert."""
-    thumbnail_ready = Signal(int, bytes, int, int)  # page_idx, img_bytes, w, h
+    """Rendert PDF-Thumbnails im Hintergrund, damit die UI nicht blockiert.
+    
+    jobs: (Seitenindex, Originalseite, Drehung) in Wunsch-Reihenfolge;
+    set_jobs() ersetzt die offenen Auftraege (z.B. nach dem Scrollen, veraltete
+    Seiten werden nicht mehr gerendert). Mit content_hash
+    werden Thumbnails aus dem Thumbnail-Cache gelesen bzw. dort abgelegt.
+    Die Bilder gehen als eigenstaendige QImage ueber das Signal (keine
+    bytes-Kopie der Pixeldaten). current_path liefert die aktuelle PDF-Datei
+    des Viewers: nach Drehen/Loeschen rendert der Worker noch die alte Datei
+    und legt nichts mehr im Cache ab.
+    """
+    thumbnail_ready = Signal(int, int, int, QImage)  # page_idx, Originalseite, Drehung, Bild
 
-    def __init__(self, pdf_path: str, page_count: int):
+    def __init__(self, pdf_path: str, jobs: list, content_hash: str = None,
+                 width: int = THUMBNAIL_WIDTH, device_pixel_ratio: float = 1.0,
+                 current_path: Callable[[], str] = None):
         super().__init__()
         self._pdf_path = pdf_path
-        self._page_count = page_count
+        self._current_path = current_path
+        self._jobs = list(jobs)
+        self._jobs_lock = threading.Lock()
+        self._drained = False
+        self._content_hash = content_hash
+        self._dpr = max(1.0, device_pixel_ratio)
+        self._width = int(round(width * self._dpr))
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    @property
+    def pdf_path(self) -> str:
+        return self._pdf_path
+
+    def _is_current(self) -> bool:
+        return self._current_path is None or self._current_path() == self._pdf_path
+
+    def set_jobs(self, jobs: list) -> bool:
+        """Ersetzt die offenen Auftraege. False wenn der Worker bereits fertig ist."""
+        with self._jobs_lock:
+            if self._drained:
+                return False
+            self._jobs = list(jobs)
+            return True
+
+    def _next_job(self):
+        with self._jobs_lock:
+            if self._jobs and not self._cancelled:
+                return self._jobs.pop(0)
+            self._drained = True
+            return None
 
     def run(self):
+        doc = None
         try:
             import fitz
-            try:
-                doc = fitz.open(self._pdf_path)
-            except Exception:
-                with open(self._pdf_path, 'rb') as f:
-                    data = f.read()
-                doc = fitz.open(stream=data, filetype="pdf")
+            cache = None
+            if self._content_hash:
+                from services.thumbnail_cache import get_thumbnail_cache
+                cache = get_thumbnail_cache()
             
-            for i in range(min(len(doc), self._page_count)):
-                page = doc[i]
-                zoom = 120.0 / page.rect.width
-                mat = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=mat)
-                self.thumbnail_ready.emit(i, bytes(pix.samples), pix.width, pix.height)
+            while True:
+                job = self._next_job()
+                if job is None:
+                    break
+                page_idx, origin, rotation = job
+                
+                image = None
+                png = cache.load(self._content_hash, origin, rotation, self._width) if cache else None
+                if png:
+                    image = QImage.fromData(png, 'PNG')
+                if image is None or image.isNull():
+                    if doc is None:
+                        doc = self._open_document()
+                    if page_idx >= len(doc):
+                        continue
+                    page = doc[page_idx]
+                    zoom = self._width / page.rect.width
+                    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+                    # copy(): QImage besitzt die Pixel, pix darf freigegeben werden
+                    image = QImage(pix.samples_mv, pix.width, pix.height, pix.stride,
+                                   QImage.Format.Format_RGB888).copy()
+                    if cache and self._is_current():
+                        cache.store(self._content_hash, origin, rotation, self._width, pix.tobytes('png'))
+                image.setDevicePixelRatio(self._dpr)
+                self.thumbnail_ready.emit(page_idx, origin, rotation, image)
             
-            doc.close()
+            if cache:
+                cache.prune()
         except Exception as e:
             logger.warning(f"Thumbnail-Worker Fehler: {e}")
+        finally:
+            if doc is not None:
+                doc.close()
+
+    def _open_document(self):
+        import fitz
+        try:
+            return fitz.open(self._pdf_path)
+        except Exception:
+            with open(self._pdf_path, 'rb') as f:
+                data = f.read()
+            return fitz.open(stream=data, filetype="pdf")
 
 
 class PDFSaveWorker(QThread):
@@ -131,17 +216,39 @@ class PDFViewerDialog(QDialog):
     - Thumbnail-Sidebar links mit Seitenvorschau
     - Seiten drehen (CW/CCW) und loeschen
     - Bearbeitetes PDF auf dem Server speichern
+    
+    Thumbnails kommen aus dem Thumbnail-Cache (content_hash + Originalseite
+    + Drehung). Gerendert werden nur die sichtbaren Seiten der Seitenleiste
+    plus ein kleines Fenster davor/danach, nach Bearbeitungen nur veraenderte
+    Seiten; hoechstens _THUMB_MAX_IMAGES Bilder bleiben im Speicher. Die
+    Hauptansicht (QPdfView) rendert ohnehin nur sichtbare Seiten.
     """
     
     # Signal wenn PDF gespeichert wurde (fuer Cache-Invalidierung)
     pdf_saved = Signal(int)  # doc_id
     
+    # Thumbnails: Seiten vor/nach dem sichtbaren Bereich, Bilder im Speicher
+    _THUMB_WINDOW_ROWS = 6
+    _THUMB_MAX_IMAGES = 60
+    
     def __init__(self, pdf_path: str, title: str = "PDF-Vorschau", parent=None,
-                 doc_id: int = None, docs_api=None, editable: bool = False):
+                 doc_id: int = None, docs_api=None, editable: bool = False,
+                 content_hash: str = None):
         super().__init__(parent)
         self.pdf_path = pdf_path
         self.pdf_document = None
         self._doc_id = doc_id
+        self._content_hash = content_hash
+        # Seitenindex im aktuellen Stand -> Seitenindex in der geoeffneten Datei
+        self._page_origins: list = []
+        self._thumb_worker = None
+        self._stale_thumb_workers: list = []
+        # Seiten mit Bild im Speicher (Originalseite), aelteste zuerst
+        self._thumb_images: 'OrderedDict[int, None]' = OrderedDict()
+        self._thumb_scroll_timer = QTimer(self)
+        self._thumb_scroll_timer.setSingleShot(True)
+        self._thumb_scroll_timer.setInterval(50)
+        self._thumb_scroll_timer.timeout.connect(self._update_thumbnail_window)
         self._docs_api = docs_api
         self._editable = editable and doc_id is not None and docs_api is not None
         self._fitz_doc = None
@@ -337,6 +444,7 @@ class PDFViewerDialog(QDialog):
                     }
                 """)
                 self._thumbnail_list.itemSelectionChanged.connect(self._on_thumbnail_selection_changed)
+                self._thumbnail_list.verticalScrollBar().valueChanged.connect(self._on_thumbnails_scrolled)
                 splitter.addWidget(self._thumbnail_list)
                 
                 # QPdfView
@@ -413,6 +521,9 @@ class PDFViewerDialog(QDialog):
                 with open(self.pdf_path, 'rb') as f:
                     data = f.read()
                 self._fitz_doc = fitz.open(stream=data, filetype="pdf")
+            self._page_origins = list(range(len(self._fitz_doc)))
+            if not self._content_hash:
+                self._content_hash = self._file_sha256(self.pdf_path)
             self._refresh_thumbnails()
         except Exception as e:
             logger.error(f"PyMuPDF konnte PDF nicht laden: {e}")
@@ -422,50 +533,162 @@ class PDFViewerDialog(QDialog):
             )
             self._status_label.setVisible(True)
     
+    @staticmethod
+    def _file_sha256(path: str):
+        """SHA256 der Datei (Thumbnail-Cache-Schluessel) oder None."""
+        import hashlib
+        try:
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(chunk)
+            return sha.hexdigest()
+        except OSError:
+            return None
+    
     def _refresh_thumbnails(self):
-        """Rendert Thumbnails asynchron in einem Worker-Thread.
+        """Gleicht die Thumbnail-Liste mit dem Dokument ab und rendert den sichtbaren Bereich.
         
-        Platzhalter-Items werden sofort erstellt, die eigentlichen Pixmaps
-        werden im Hintergrund gerendert und per Signal stueckweise eingesetzt.
+        Platzhalter-Items werden sofort fuer alle Seiten erstellt; Bilder
+        entstehen im Hintergrund nur fuer den sichtbaren Bereich (siehe
+        _update_thumbnail_window). Items, deren Seite und Drehung unveraendert
+        sind, behalten ihr Bild.
         """
         if not self._fitz_doc or not hasattr(self, '_thumbnail_list'):
             return
         
-        from PySide6.QtGui import QPixmap, QImage, QIcon
         from PySide6.QtCore import QSize
         from PySide6.QtWidgets import QListWidgetItem
         
         page_count = len(self._fitz_doc)
+        first_build = self._thumbnail_list.count() == 0
         
         self._thumbnail_list.blockSignals(True)
-        self._thumbnail_list.clear()
+        while self._thumbnail_list.count() > page_count:
+            self._drop_thumbnail_image(self._thumbnail_list.takeItem(self._thumbnail_list.count() - 1))
         
         for i in range(page_count):
-            item = QListWidgetItem()
+            item = self._thumbnail_list.item(i)
+            if item is None:
+                item = QListWidgetItem()
+                self._thumbnail_list.addItem(item)
             item.setText(f"S. {i + 1}")
             item.setData(Qt.ItemDataRole.UserRole, i)
-            self._thumbnail_list.addItem(item)
+            origin = self._page_origins[i] if i < len(self._page_origins) else i
+            item.setData(_THUMB_KEY_ROLE, f"{origin}:{self._fitz_doc[i].rotation}")
         
         self._thumbnail_list.setIconSize(QSize(120, 160))
         self._thumbnail_list.blockSignals(False)
         
-        if self._thumbnail_list.count() > 0:
+        if first_build and self._thumbnail_list.count() > 0:
             self._thumbnail_list.setCurrentRow(0)
         
-        self._thumb_worker = _ThumbnailWorker(self.pdf_path, page_count)
+        self._update_thumbnail_window()
+    
+    def _update_thumbnail_window(self):
+        """Beauftragt Thumbnails fuer sichtbare Seiten + Fenster; veraltete Auftraege entfallen."""
+        if not hasattr(self, '_thumbnail_list') or self._thumbnail_list.count() == 0:
+            return
+        visible = self._visible_thumbnail_rows()
+        last = self._thumbnail_list.count() - 1
+        below = range(visible.stop, min(visible.stop + self._THUMB_WINDOW_ROWS, last + 1))
+        above = range(max(visible.start - self._THUMB_WINDOW_ROWS, 0), visible.start)
+        
+        jobs = []
+        for row in [*visible, *below, *reversed(above)]:
+            item = self._thumbnail_list.item(row)
+            key = item.data(_THUMB_KEY_ROLE)
+            if item.data(_THUMB_SHOWN_ROLE) != key:
+                origin, rotation = (int(part) for part in key.split(':'))
+                jobs.append((row, origin, rotation))
+        
+        # Nur ein Worker auf der aktuellen Datei darf die Auftraege uebernehmen
+        # (nach Drehen/Loeschen zeigen die Seitenindizes in eine neue Datei)
+        worker = self._thumb_worker
+        if (worker is not None and worker.isRunning()
+                and worker.pdf_path == self._thumbnail_source_path()
+                and worker.set_jobs(jobs)):
+            return
+        if jobs:
+            self._start_thumbnail_worker(jobs)
+    
+    def _start_thumbnail_worker(self, jobs: list):
+        """Startet den Thumbnail-Worker; ein laufender wird abgebrochen."""
+        self._stale_thumb_workers = [w for w in self._stale_thumb_workers if w.isRunning()]
+        if self._thumb_worker is not None and self._thumb_worker.isRunning():
+            self._thumb_worker.cancel()
+            self._stale_thumb_workers.append(self._thumb_worker)
+        
+        self._thumb_worker = _ThumbnailWorker(
+            self._thumbnail_source_path(), jobs,
+            content_hash=self._content_hash,
+            device_pixel_ratio=self.devicePixelRatioF(),
+            current_path=self._thumbnail_source_path,
+        )
         self._thumb_worker.thumbnail_ready.connect(self._on_thumbnail_ready)
         self._thumb_worker.start()
     
-    def _on_thumbnail_ready(self, page_idx: int, img_bytes: bytes, width: int, height: int):
+    def _thumbnail_source_path(self) -> str:
+        """PDF-Datei, aus der Thumbnails gerendert werden (nach Bearbeitung die Temp-Datei)."""
+        return self._temp_pdf_path or self.pdf_path
+    
+    def _visible_thumbnail_rows(self) -> range:
+        """Zeilen der Thumbnail-Liste, die gerade sichtbar sind (ungefaehr vor dem ersten Anzeigen)."""
+        from PySide6.QtCore import QPoint
+        
+        viewport = self._thumbnail_list.viewport()
+        top = self._thumbnail_list.indexAt(QPoint(5, 5)).row()
+        bottom = self._thumbnail_list.indexAt(QPoint(5, viewport.height() - 5)).row()
+        top = max(top, 0)
+        if bottom < top:
+            bottom = top + 8
+        return range(top, min(bottom, self._thumbnail_list.count() - 1) + 1)
+    
+    def _on_thumbnails_scrolled(self, _value: int):
+        """Beim Scrollen (entprellt) den neuen sichtbaren Bereich rendern."""
+        self._thumb_scroll_timer.start()
+    
+    def _on_thumbnail_ready(self, page_idx: int, origin: int, rotation: int, image):
         """Callback fuer einen fertig gerenderten Thumbnail."""
         if not hasattr(self, '_thumbnail_list') or page_idx >= self._thumbnail_list.count():
             return
-        from PySide6.QtGui import QPixmap, QImage, QIcon
-        img = QImage(img_bytes, width, height, width * 3, QImage.Format.Format_RGB888)
-        pixmap = QPixmap.fromImage(img)
+        from PySide6.QtGui import QPixmap, QIcon
         item = self._thumbnail_list.item(page_idx)
-        if item:
-            item.setIcon(QIcon(pixmap))
+        key = f"{origin}:{rotation}"
+        # Veraltete Ergebnisse (Seite inzwischen geloescht/gedreht) ignorieren
+        if item is None or item.data(_THUMB_KEY_ROLE) != key:
+            return
+        item.setIcon(QIcon(QPixmap.fromImage(image)))
+        item.setData(_THUMB_SHOWN_ROLE, key)
+        self._thumb_images[origin] = None
+        self._thumb_images.move_to_end(origin)
+        self._evict_thumbnail_images()
+    
+    def _evict_thumbnail_images(self):
+        """Begrenzt die Bilder im Speicher; sichtbare Seiten bleiben erhalten."""
+        if len(self._thumb_images) <= self._THUMB_MAX_IMAGES:
+            return
+        visible = self._visible_thumbnail_rows()
+        rows = {origin: row for row, origin in enumerate(self._page_origins)}
+        for origin in list(self._thumb_images):
+            if len(self._thumb_images) <= self._THUMB_MAX_IMAGES:
+                break
+            row = rows.get(origin)
+            if row is None:
+                self._thumb_images.pop(origin)
+            elif row not in visible:
+                self._drop_thumbnail_image(self._thumbnail_list.item(row))
+    
+    def _drop_thumbnail_image(self, item):
+        """Entfernt das Bild eines Items (Platzhalter bleibt)."""
+        from PySide6.QtGui import QIcon
+        if item is None:
+            return
+        key = item.data(_THUMB_KEY_ROLE)
+        if key:
+            self._thumb_images.pop(int(key.split(':')[0]), None)
+        item.setIcon(QIcon())
+        item.setData(_THUMB_SHOWN_ROLE, None)
     
     def _get_selected_page_indices(self) -> list:
         """Gibt die Indizes aller ausgewaehlten Seiten zurueck (sortiert)."""
@@ -556,8 +779,17 @@ class PDFViewerDialog(QDialog):
         
         # Loeschen in umgekehrter Reihenfolge (hoechster Index zuerst),
         # damit sich die Indizes der noch zu loeschenden Seiten nicht verschieben.
+        # Thumbnail-Items wandern mit, die restlichen Seiten behalten ihr Bild.
+        if hasattr(self, '_thumbnail_list'):
+            self._thumbnail_list.blockSignals(True)
         for idx in sorted(page_indices, reverse=True):
             self._fitz_doc.delete_page(idx)
+            if idx < len(self._page_origins):
+                del self._page_origins[idx]
+            if hasattr(self, '_thumbnail_list'):
+                self._drop_thumbnail_image(self._thumbnail_list.takeItem(idx))
+        if hasattr(self, '_thumbnail_list'):
+            self._thumbnail_list.blockSignals(False)
         
         self._change_count += len(page_indices)
         
@@ -819,6 +1051,10 @@ class PDFViewerDialog(QDialog):
             if worker and worker.isRunning():
                 worker.quit()
                 worker.wait(3000)
+        for worker in [self._thumb_worker, *self._stale_thumb_workers]:
+            if worker is not None and worker.isRunning():
+                worker.cancel()
+                worker.wait(3000)
         
         # Cleanup
         if self._fitz_doc:
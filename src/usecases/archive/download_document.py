@@ -19,6 +19,7 @@ class DownloadDocument:
         saved_path = self._repo.download(
             doc.id, target_dir,
             filename_override=doc.original_filename,
+            content_hash=doc.content_hash,
         )
 
         if not saved_path:
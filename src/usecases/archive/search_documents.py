@@ -2,7 +2,8 @@
 UseCase: Volltextsuche ueber Dokumente.
 """
 
-from typing import List
+import threading
+from typing import List, Optional
 
 from domain.archive.interfaces import IDocumentRepository
 from domain.archive.entities import SearchResult
@@ -19,10 +20,12 @@ class SearchDocuments:
         limit: int = 200,
         include_raw: bool = False,
         substring: bool = False,
+        cancel_event: Optional[threading.Event] = None,
     ) -> List[SearchResult]:
         if len(query) < 3:
             return []
         return self._repo.search_documents(
             query, limit=limit,
             include_raw=include_raw, substring=substring,
+            cancel_event=cancel_event,
         )
@@ -18,8 +18,10 @@ class UploadDocument:
         self, file_path: str, *,
         source_type: str = 'manual_upload',
         box_type: str = None,
+        progress_callback=None,
     ) -> UploadResult:
-        doc = self._repo.upload(file_path, source_type=source_type, box_type=box_type)
+        doc = self._repo.upload(file_path, source_type=source_type, box_type=box_type,
+                                progress_callback=progress_callback)
         if doc:
             return UploadResult(
                 success=True,
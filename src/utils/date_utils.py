@@ -2,6 +2,8 @@
 Datums-Hilfsfunktionen.
 """
 
+from typing import Optional
+
 
 def format_date_german(date_str: str) -> str:
     """Konvertiert ISO-Datum/Datetime ins deutsche Format (DD.MM.YYYY).
@@ -23,3 +25,68 @@ def format_date_german(date_str: str) -> str:
     except (ValueError, IndexError):
         pass
     return date_str
+
+
+_MONTHS = {
+    'januar': 1, 'jan': 1, 'februar': 2, 'feb': 2, 'maerz': 3, 'märz': 3, 'mär': 3,
+    'april': 4, 'apr': 4, 'mai': 5, 'juni': 6, 'jun': 6, 'juli': 7, 'jul': 7,
+    'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9, 'oktober': 10,
+    'okt': 10, 'november': 11, 'nov': 11, 'dezember': 12, 'dez': 12,
+}
+_DATE_PATTERNS = None
+# Hinweise auf das Dokumentdatum (Briefkopf "Ort, den ...", "Datum: ...")
+_DATE_CONTEXT = ('datum', ', den', 'den ', 'stand', 'erstellt')
+
+
+def _date_patterns():
+    global _DATE_PATTERNS
+    if _DATE_PATTERNS is None:
+        import re
+        months = '|'.join(sorted(_MONTHS, key=len, reverse=True))
+        _DATE_PATTERNS = (
+            re.compile(r'(?<!\d)(\d{1,2})\.\s?(\d{1,2})\.\s?(\d{4}|\d{2})(?!\d)'),
+            re.compile(rf'(?<!\d)(\d{{1,2}})\.?\s+({months})\.?\s+(\d{{4}})(?!\d)', re.IGNORECASE),
+            re.compile(r'(?<!\d)(\d{4})-(\d{2})-(\d{2})(?!\d)'),
+        )
+    return _DATE_PATTERNS
+
+
+def extract_document_date(text: str, max_chars: int = 3000) -> Optional[str]:
+    """Sucht das Dokumentdatum in einem (deutschen) Dokumenttext.
+
+    Lokaler Ersatz fuer document_date_iso der KI, wenn die Klassifikation
+    ohne KI erfolgt. Bevorzugt Daten mit Kontext ("Datum:", "Ort, den"),
+    sonst das erste plausible Datum im Textanfang.
+
+    Returns:
+        'YYYY-MM-DD' oder None
+    """
+    from datetime import date
+
+    if not text:
+        return None
+    head = text[:max_chars]
+    lower = head.lower()
+    max_year = date.today().year + 1
+    candidates = []
+    for kind, pattern in enumerate(_date_patterns()):
+        for match in pattern.finditer(head):
+            a, b, c = match.groups()
+            try:
+                if kind == 0:
+                    year = int(c) + (2000 if len(c) == 2 else 0)
+                    found = date(year, int(b), int(a))
+                elif kind == 1:
+                    found = date(int(c), _MONTHS[b.lower()], int(a))
+                else:
+                    found = date(int(a), int(b), int(c))
+            except (ValueError, KeyError):
+                continue
+            if not 1980 <= found.year <= max_year:
+                continue
+            context = lower[max(0, match.start() - 25):match.start()]
+            has_context = any(word in context for word in _DATE_CONTEXT)
+            candidates.append((not has_context, match.start(), found))
+    if not candidates:
+        return None
+    return min(candidates)[2].isoformat()
@@ -0,0 +1,164 @@
+"""
+Kompilierter Mehrfach-Keyword-Matcher.
+
+Die Keyword-Pruefungen (Courtage/Leben/Sach in config.processing_rules,
+Konflikt-Hints in api.openrouter.utils) liefen bisher als
+`kw.lower() in text.lower()` je Keyword und je Aufruf, jede Stelle mit
+eigener Kopie der Tabellen. Der Matcher wird EINMAL pro Keyword-Satz
+gebaut (Keywords vorab kleingeschrieben, leere entfernt) und teilt pro
+Aufruf den kleingeschriebenen Text und das Ergebnis je Keyword ueber alle
+Kategorien.
+
+Die eigentliche Suche bleibt bewusst `kw in text_lower`: CPythons
+Substring-Suche laeuft in C und ist fuer ~100-200 Keywords schneller als
+ein in Python geschriebener Automat (Aho-Corasick), der pro Zeichen
+Interpreter-Overhead hat (gemessen ~1 ms vs. ~0.2-0.3 ms auf 11 KB Text).
+
+Semantik wie vorher: case-insensitive Teilstring-Suche (auch ueberlappend),
+Treffer je Kategorie in Tabellen-Reihenfolge. contains() bricht beim
+ersten Treffer ab (wie das fruehere any()).
+
+Tabellen werden ueber register_keyword_source() angemeldet. Der globale
+Matcher wird nur neu gebaut, wenn sich eine Tabelle aendert (neues Objekt
+oder andere Laenge) oder invalidate_keyword_matcher() aufgerufen wird.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+KeywordHits = Dict[str, List[str]]
+
+
+class KeywordMatcher:
+    """
+    Vorbereitete Keyword-Tabellen mehrerer Kategorien.
+
+    Keywords, die in mehreren Kategorien vorkommen, werden pro Aufruf nur
+    einmal gesucht.
+    """
+
+    def __init__(self, tables: Mapping[str, Iterable[str]]):
+        self._tables: Dict[str, Tuple[str, ...]] = {}
+        for category, keywords in tables.items():
+            self._tables[category] = tuple(
+                kw for kw in ((keyword or '').lower() for keyword in keywords) if kw
+            )
+        self._categories: Tuple[str, ...] = tuple(self._tables.keys())
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        return self._categories
+
+    @property
+    def keyword_count(self) -> int:
+        return len({kw for keywords in self._tables.values() for kw in keywords})
+
+    def contains(self, text: str, category: str) -> bool:
+        """True sobald ein Keyword der Kategorie im Text vorkommt (Early Exit)."""
+        keywords = self._tables.get(category)
+        if not text or not keywords:
+            return False
+        text_lower = text.lower()
+        return any(kw in text_lower for kw in keywords)
+
+    def scan(self, text: str,
+             categories: Optional[Iterable[str]] = None) -> KeywordHits:
+        """
+        Findet alle Keywords der angefragten Kategorien.
+
+        Args:
+            text: Zu durchsuchender Text
+            categories: Nur diese Kategorien pruefen (None = alle)
+
+        Returns:
+            {Kategorie: [gefundene Keywords in Tabellen-Reihenfolge]}
+            (jede angefragte Kategorie ist enthalten, ggf. mit leerer Liste)
+        """
+        wanted = self._categories if categories is None else tuple(categories)
+        hits: KeywordHits = {category: [] for category in wanted}
+        if not text:
+            return hits
+
+        text_lower = text.lower()
+        seen: Dict[str, bool] = {}
+        for category in wanted:
+            found = hits[category]
+            for kw in self._tables.get(category, ()):
+                present = seen.get(kw)
+                if present is None:
+                    present = seen[kw] = kw in text_lower
+                if present:
+                    found.append(kw)
+        return hits
+
+
+# ============================================================================
+# Globaler Matcher ueber alle angemeldeten Keyword-Tabellen
+# ============================================================================
+
+_sources: Dict[str, Callable[[], Mapping[str, Iterable[str]]]] = {}
+_matcher: Optional[KeywordMatcher] = None
+_matcher_signature: Optional[tuple] = None
+_matcher_lock = threading.Lock()
+
+
+def register_keyword_source(name: str,
+                            source: Callable[[], Mapping[str, Iterable[str]]]) -> None:
+    """
+    Meldet eine Keyword-Quelle fuer den globalen Matcher an.
+
+    Args:
+        name: Eindeutiger Name der Quelle (erneute Anmeldung ersetzt sie)
+        source: Liefert {Kategorie: Keywords}; Kategorien sind global eindeutig
+    """
+    global _matcher
+    with _matcher_lock:
+        _sources[name] = source
+        _matcher = None
+
+
+def invalidate_keyword_matcher() -> None:
+    """Erzwingt einen Neubau beim naechsten Zugriff (z.B. nach In-Place-Aenderung)."""
+    global _matcher
+    with _matcher_lock:
+        _matcher = None
+
+
+def _collect_tables() -> Tuple[Dict[str, Iterable[str]], tuple]:
+    tables: Dict[str, Iterable[str]] = {}
+    for source in _sources.values():
+        tables.update(source())
+    # Aenderungserkennung ohne Inhaltsvergleich: Objekt-Identitaet + Laenge
+    signature = tuple(
+        (category, id(keywords), len(keywords)) for category, keywords in tables.items()
+    )
+    return tables, signature
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Gibt den globalen Matcher zurueck; baut ihn nur bei geaenderten Regeln neu."""
+    global _matcher, _matcher_signature
+    with _matcher_lock:
+        tables, signature = _collect_tables()
+        if _matcher is None or signature != _matcher_signature:
+            _matcher = KeywordMatcher(tables)
+            _matcher_signature = signature
+            logger.debug(
+                f"Keyword-Matcher gebaut: {len(tables)} Kategorien, "
+                f"{_matcher.keyword_count} Keywords"
+            )
+        return _matcher
+
+
+def scan_keywords(text: str,
+                  categories: Optional[Iterable[str]] = None) -> KeywordHits:
+    """Treffer der angemeldeten Kategorien (None = alle) fuer einen Text."""
+    return get_keyword_matcher().scan(text, categories)
+
+
+def contains_keyword(text: str, category: str) -> bool:
+    """True sobald ein Keyword der Kategorie im Text vorkommt."""
+    return get_keyword_matcher().contains(text, category)